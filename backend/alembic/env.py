@@ -13,7 +13,7 @@ from app.database import Base
 
 # Import ALL models so that Base.metadata is fully populated
 from app.auth.models import User  # noqa: F401
-from app.projects.models import Label, Project, ProjectMember, WorkflowStatus  # noqa: F401
+from app.projects.models import Label, Project, ProjectIssueCounter, ProjectMember, WorkflowStatus  # noqa: F401
 from app.sprints.models import Sprint  # noqa: F401
 from app.issues.models import Issue, IssueHistory, IssueLabel, IssueRelation  # noqa: F401
 from app.comments.models import Comment  # noqa: F401
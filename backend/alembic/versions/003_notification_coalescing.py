@@ -0,0 +1,44 @@
+"""Add notification coalescing columns and digest preference.
+
+Revision ID: 003_notification_coalescing
+Revises: 002_add_reset_token_fields_to_users
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "003_notification_coalescing"
+down_revision = "002_add_reset_token_fields_to_users"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add notifications.count/updated_at, the coalescing index and users.notification_digest."""
+    op.add_column("notifications", sa.Column("count", sa.Integer, nullable=False, server_default="1"))
+    op.add_column(
+        "notifications",
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.execute("UPDATE notifications SET updated_at = created_at")
+    op.create_index(
+        "idx_notifications_coalesce",
+        "notifications",
+        ["user_id", "issue_id", "type", "updated_at"],
+        postgresql_where=sa.text("read = false"),
+    )
+    op.add_column(
+        "users",
+        sa.Column("notification_digest", sa.Boolean, nullable=False, server_default="false"),
+    )
+
+
+def downgrade() -> None:
+    """Remove notification coalescing columns and digest preference."""
+    op.drop_column("users", "notification_digest")
+    op.drop_index("idx_notifications_coalesce", table_name="notifications")
+    op.drop_column("notifications", "updated_at")
+    op.drop_column("notifications", "count")
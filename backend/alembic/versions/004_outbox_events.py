@@ -0,0 +1,37 @@
+"""Add the transactional outbox table.
+
+Revision ID: 004_outbox_events
+Revises: 003_notification_coalescing
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+# revision identifiers
+revision = "004_outbox_events"
+down_revision = "003_notification_coalescing"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create outbox_events."""
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.BigInteger, primary_key=True, autoincrement=True),
+        sa.Column("kind", sa.String(50), nullable=False),
+        sa.Column("payload", JSONB, nullable=False),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text, nullable=True),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("idx_outbox_events_available", "outbox_events", ["available_at", "id"])
+
+
+def downgrade() -> None:
+    """Drop outbox_events."""
+    op.drop_table("outbox_events")
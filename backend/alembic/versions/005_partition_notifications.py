@@ -0,0 +1,115 @@
+"""Partition notifications by month on created_at.
+
+Revision ID: 005_partition_notifications
+Revises: 004_outbox_events
+Create Date: 2026-10-19
+
+The existing table is renamed, a partitioned table with primary key
+(id, created_at) is created in its place with one partition per month
+from the oldest row to two months ahead, and the rows are copied over.
+"""
+
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "005_partition_notifications"
+down_revision = "004_outbox_events"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, user_id, issue_id, type, title, message, read, count, created_at, updated_at"
+MONTHS_AHEAD = 2
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.execute(
+        "CREATE INDEX idx_notifications_user_id ON notifications (user_id, read, created_at DESC)"
+    )
+    op.execute(
+        "CREATE INDEX idx_notifications_coalesce ON notifications (user_id, issue_id, type, updated_at) "
+        "WHERE read = false"
+    )
+
+
+def _rename_legacy() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_legacy")
+    op.execute("ALTER INDEX idx_notifications_user_id RENAME TO idx_notifications_legacy_user_id")
+    op.execute("ALTER INDEX idx_notifications_coalesce RENAME TO idx_notifications_legacy_coalesce")
+    op.execute("ALTER TABLE notifications_legacy RENAME CONSTRAINT notifications_pkey TO notifications_legacy_pkey")
+
+
+def upgrade() -> None:
+    """Replace notifications with a monthly range-partitioned table."""
+    _rename_legacy()
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            id UUID NOT NULL DEFAULT uuid_generate_v4(),
+            user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            issue_id UUID REFERENCES issues(id) ON DELETE CASCADE,
+            type notification_type NOT NULL,
+            title VARCHAR(255) NOT NULL,
+            message TEXT,
+            read BOOLEAN NOT NULL DEFAULT false,
+            count INTEGER NOT NULL DEFAULT 1,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    _create_indexes()
+
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM notifications_legacy")).scalar()
+    today = datetime.now(timezone.utc).date()
+    month = date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE notifications_{month:%Y_%m} PARTITION OF notifications "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+        )
+        month = end
+
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_legacy")
+    op.execute("DROP TABLE notifications_legacy")
+
+
+def downgrade() -> None:
+    """Copy notifications back into a plain table."""
+    op.execute("ALTER TABLE notifications RENAME TO notifications_partitioned")
+    op.execute("ALTER INDEX idx_notifications_user_id RENAME TO idx_notifications_partitioned_user_id")
+    op.execute("ALTER INDEX idx_notifications_coalesce RENAME TO idx_notifications_partitioned_coalesce")
+    op.execute(
+        "ALTER TABLE notifications_partitioned RENAME CONSTRAINT notifications_pkey TO notifications_partitioned_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+            user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            issue_id UUID REFERENCES issues(id) ON DELETE CASCADE,
+            type notification_type NOT NULL,
+            title VARCHAR(255) NOT NULL,
+            message TEXT,
+            read BOOLEAN NOT NULL DEFAULT false,
+            count INTEGER NOT NULL DEFAULT 1,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+    _create_indexes()
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_partitioned")
+    op.execute("DROP TABLE notifications_partitioned")
@@ -0,0 +1,60 @@
+"""Add per-user notification counters and the inbox keyset index.
+
+Revision ID: 006_notification_counters
+Revises: 005_partition_notifications
+Create Date: 2026-10-19
+
+Counters are backfilled from the existing rows. A row trigger keeps them
+in step when notifications are removed by ON DELETE CASCADE.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers
+revision = "006_notification_counters"
+down_revision = "005_partition_notifications"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create notification_counters, its delete trigger and idx_notifications_inbox."""
+    op.create_table(
+        "notification_counters",
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("unread", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.execute(
+        "INSERT INTO notification_counters (user_id, total, unread) "
+        "SELECT user_id, count(*), count(*) FILTER (WHERE NOT read) FROM notifications GROUP BY user_id"
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notification_counters_on_delete() RETURNS trigger AS $$
+        BEGIN
+            UPDATE notification_counters
+            SET total = greatest(total - 1, 0),
+                unread = greatest(unread - CASE WHEN OLD.read THEN 0 ELSE 1 END, 0)
+            WHERE user_id = OLD.user_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER notifications_counter_delete AFTER DELETE ON notifications "
+        "FOR EACH ROW EXECUTE FUNCTION notification_counters_on_delete()"
+    )
+    op.create_index("idx_notifications_inbox", "notifications", ["user_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    """Drop the counters, trigger and inbox index."""
+    op.drop_index("idx_notifications_inbox", table_name="notifications")
+    op.execute("DROP TRIGGER notifications_counter_delete ON notifications")
+    op.execute("DROP FUNCTION notification_counters_on_delete()")
+    op.drop_table("notification_counters")
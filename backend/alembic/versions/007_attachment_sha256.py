@@ -0,0 +1,26 @@
+"""Add the SHA-256 digest of attachment contents.
+
+Revision ID: 007_attachment_sha256
+Revises: 006_notification_counters
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "007_attachment_sha256"
+down_revision = "006_notification_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add attachments.sha256 (null for files uploaded before this revision)."""
+    op.add_column("attachments", sa.Column("sha256", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop attachments.sha256."""
+    op.drop_column("attachments", "sha256")
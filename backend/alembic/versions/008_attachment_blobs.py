@@ -0,0 +1,55 @@
+"""Add the content-addressed attachment blob store.
+
+Revision ID: 008_attachment_blobs
+Revises: 007_attachment_sha256
+Create Date: 2026-10-19
+
+Existing attachments keep their per-upload files; only new uploads are
+stored as shared blobs. A row trigger releases a blob reference whenever
+a blob-backed attachment is deleted, including by ON DELETE CASCADE.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "008_attachment_blobs"
+down_revision = "007_attachment_sha256"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create attachment_blobs and the reference-release trigger on attachments."""
+    op.create_table(
+        "attachment_blobs",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("path", sa.String(500), nullable=False),
+        sa.Column("size", sa.BigInteger, nullable=False),
+        sa.Column("ref_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION attachment_blobs_release() RETURNS trigger AS $$
+        BEGIN
+            IF OLD.filepath LIKE 'blobs/%' THEN
+                UPDATE attachment_blobs SET ref_count = greatest(ref_count - 1, 0) WHERE sha256 = OLD.sha256;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER attachments_blob_release AFTER DELETE ON attachments "
+        "FOR EACH ROW EXECUTE FUNCTION attachment_blobs_release()"
+    )
+
+
+def downgrade() -> None:
+    """Drop the trigger and attachment_blobs (blob files are left on disk)."""
+    op.execute("DROP TRIGGER attachments_blob_release ON attachments")
+    op.execute("DROP FUNCTION attachment_blobs_release()")
+    op.drop_table("attachment_blobs")
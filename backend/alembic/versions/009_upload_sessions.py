@@ -0,0 +1,46 @@
+"""Add resumable upload sessions and allow attachments over 2GB.
+
+Revision ID: 009_upload_sessions
+Revises: 008_attachment_blobs
+Create Date: 2026-10-19
+
+Sessions track tus-style chunked uploads until they are completed into an
+attachment or expire. attachments.size becomes BIGINT, since resumable
+uploads are limited by MAX_RESUMABLE_UPLOAD_SIZE rather than MAX_FILE_SIZE.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers
+revision = "009_upload_sessions"
+down_revision = "008_attachment_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create upload_sessions and widen attachments.size."""
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("uuid_generate_v4()")),
+        sa.Column("issue_id", UUID(as_uuid=True), sa.ForeignKey("issues.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("uploader_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("mime_type", sa.String(100), nullable=False),
+        sa.Column("size", sa.BigInteger, nullable=False),
+        sa.Column("offset", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_upload_sessions_expires_at", "upload_sessions", ["expires_at"])
+    op.alter_column("attachments", "size", type_=sa.BigInteger, existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Drop upload_sessions (partial files are left for manual cleanup) and narrow attachments.size."""
+    op.alter_column("attachments", "size", type_=sa.Integer, existing_nullable=False)
+    op.drop_index("ix_upload_sessions_expires_at", table_name="upload_sessions")
+    op.drop_table("upload_sessions")
@@ -0,0 +1,68 @@
+"""Add issue import jobs and their source references.
+
+Revision ID: 010_import_jobs
+Revises: 009_upload_sessions
+Create Date: 2026-10-19
+
+import_jobs tracks CSV/JSON imports and their progress. import_issue_refs
+holds each imported issue's source key and parent reference until the job
+links parents at the end; rows are deleted when the job finishes.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+
+# revision identifiers
+revision = "010_import_jobs"
+down_revision = "009_upload_sessions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create import_jobs and import_issue_refs."""
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("uuid_generate_v4()")),
+        sa.Column("project_id", UUID(as_uuid=True), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("format", sa.String(10), nullable=False),
+        sa.Column("mapping", JSONB, nullable=False, server_default="{}"),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("total_bytes", sa.BigInteger, nullable=False),
+        sa.Column("processed_bytes", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("rows_imported", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("rows_failed", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("parents_linked", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("errors", JSONB, nullable=False, server_default="[]"),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("idx_import_jobs_status", "import_jobs", ["status", "created_at"])
+
+    op.create_table(
+        "import_issue_refs",
+        sa.Column(
+            "job_id", UUID(as_uuid=True), sa.ForeignKey("import_jobs.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column("issue_id", UUID(as_uuid=True), sa.ForeignKey("issues.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("source_key", sa.String(100), nullable=True),
+        sa.Column("source_id", sa.String(100), nullable=True),
+        sa.Column("parent_ref", sa.String(100), nullable=True),
+    )
+    op.create_index("idx_import_issue_refs_key", "import_issue_refs", ["job_id", "source_key"])
+    op.create_index("idx_import_issue_refs_id", "import_issue_refs", ["job_id", "source_id"])
+
+
+def downgrade() -> None:
+    """Drop import_issue_refs and import_jobs (queued upload files are left for manual cleanup)."""
+    op.drop_index("idx_import_issue_refs_id", table_name="import_issue_refs")
+    op.drop_index("idx_import_issue_refs_key", table_name="import_issue_refs")
+    op.drop_table("import_issue_refs")
+    op.drop_index("idx_import_jobs_status", table_name="import_jobs")
+    op.drop_table("import_jobs")
@@ -0,0 +1,70 @@
+"""Order board columns by lexicographic rank instead of integer position.
+
+Revision ID: 011_issue_rank
+Revises: 010_import_jobs
+Create Date: 2026-10-19
+
+issues.rank replaces issues.position. Existing issues get evenly spaced
+6-digit base-36 ranks per (project, status) column, in their current
+position order, matching app.issues.ranking.spread_ranks. The column uses
+the "C" collation so ranks compare bytewise.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "011_issue_rank"
+down_revision = "010_import_jobs"
+branch_labels = None
+depends_on = None
+
+# spread_ranks at 6 digits: the middle half of 36**6, split evenly per column
+BACKFILL_RANKS = """
+UPDATE issues SET rank = ranked.rank
+FROM (
+    SELECT id, rtrim((
+        SELECT string_agg(
+            substr('0123456789abcdefghijklmnopqrstuvwxyz', (value / power(36, 5 - i)::bigint % 36)::int + 1, 1),
+            '' ORDER BY i
+        )
+        FROM generate_series(0, 5) AS i
+    ), '0') AS rank
+    FROM (
+        SELECT
+            id,
+            544195584 + row_number() OVER w
+                * (1088391168 / (count(*) OVER (PARTITION BY project_id, status_id) + 1)) AS value
+        FROM issues
+        WINDOW w AS (PARTITION BY project_id, status_id ORDER BY position, created_at DESC, id)
+    ) AS spaced
+) AS ranked
+WHERE issues.id = ranked.id
+"""
+
+
+def upgrade() -> None:
+    """Add issues.rank, backfill it from position, and drop position."""
+    op.add_column("issues", sa.Column("rank", sa.String(64, collation="C"), nullable=True))
+    op.execute(BACKFILL_RANKS)
+    op.alter_column("issues", "rank", nullable=False)
+    op.drop_index("idx_issues_position", table_name="issues")
+    op.drop_column("issues", "position")
+    op.create_index("idx_issues_rank", "issues", ["project_id", "status_id", "rank"])
+
+
+def downgrade() -> None:
+    """Restore issues.position, numbered per column in rank order."""
+    op.add_column("issues", sa.Column("position", sa.Integer, nullable=False, server_default="0"))
+    op.execute("""
+        UPDATE issues SET position = numbered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY project_id, status_id ORDER BY rank, id) - 1 AS position
+            FROM issues
+        ) AS numbered
+        WHERE issues.id = numbered.id
+    """)
+    op.drop_index("idx_issues_rank", table_name="issues")
+    op.drop_column("issues", "rank")
+    op.create_index("idx_issues_position", "issues", ["project_id", "status_id", "position"])
@@ -0,0 +1,30 @@
+"""Add an optimistic concurrency version to issues.
+
+Revision ID: 012_issue_version
+Revises: 011_issue_rank
+Create Date: 2026-10-19
+
+Edits bump issues.version with UPDATE ... WHERE id = ? AND version = ?,
+so concurrent edits of one issue conflict instead of overwriting each
+other. Existing issues start at version 1.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "012_issue_version"
+down_revision = "011_issue_rank"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add issues.version."""
+    op.add_column("issues", sa.Column("version", sa.Integer, nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    """Drop issues.version."""
+    op.drop_column("issues", "version")
@@ -0,0 +1,46 @@
+"""Move issue numbering off the projects row into project_issue_counters.
+
+Revision ID: 013_project_issue_counters
+Revises: 012_issue_version
+Create Date: 2026-10-19
+
+Creating an issue used to UPDATE projects.issue_counter inside its own
+transaction, locking the project row until commit. The counters now live
+in a table of their own and are advanced in short transactions of their own
+(see app.issues.keys). They are backfilled from projects.issue_counter,
+which is then dropped.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers
+revision = "013_project_issue_counters"
+down_revision = "012_issue_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create project_issue_counters from projects.issue_counter and drop the column."""
+    op.create_table(
+        "project_issue_counters",
+        sa.Column(
+            "project_id", UUID(as_uuid=True), sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column("last_value", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.execute("INSERT INTO project_issue_counters (project_id, last_value) SELECT id, issue_counter FROM projects")
+    op.drop_column("projects", "issue_counter")
+
+
+def downgrade() -> None:
+    """Restore projects.issue_counter from the counters."""
+    op.add_column("projects", sa.Column("issue_counter", sa.Integer, nullable=False, server_default="0"))
+    op.execute(
+        "UPDATE projects SET issue_counter = c.last_value "
+        "FROM project_issue_counters c WHERE c.project_id = projects.id"
+    )
+    op.drop_table("project_issue_counters")
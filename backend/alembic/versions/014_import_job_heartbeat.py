@@ -0,0 +1,32 @@
+"""Add a heartbeat to import jobs so jobs of a dead worker are reclaimed.
+
+Revision ID: 014_import_job_heartbeat
+Revises: 013_project_issue_counters
+Create Date: 2026-10-19
+
+The import worker sets import_jobs.heartbeat_at when it claims a job and
+with every committed batch. A running job whose heartbeat is older than
+IMPORT_STALE_AFTER is claimed again and resumes after its imported rows.
+Jobs already running start with their started_at as heartbeat.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "014_import_job_heartbeat"
+down_revision = "013_project_issue_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add import_jobs.heartbeat_at."""
+    op.add_column("import_jobs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE import_jobs SET heartbeat_at = started_at WHERE status = 'running'")
+
+
+def downgrade() -> None:
+    """Drop import_jobs.heartbeat_at."""
+    op.drop_column("import_jobs", "heartbeat_at")
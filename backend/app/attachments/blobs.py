@@ -0,0 +1,169 @@
+"""Content-addressed attachment storage: one stored object per distinct SHA-256, reference-counted."""
+import asyncio
+import logging
+from pathlib import Path, PurePosixPath
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.attachments.models import AttachmentBlob
+from app.attachments.storage import get_storage
+from app.config import settings
+from app.database import async_session
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = "blobs"
+# Blobs removed per collector transaction
+COLLECT_BATCH_SIZE = 500
+
+
+def blob_path(sha256: str, filename: str = "") -> str:
+    """Return the storage key for a blob, fanned out over two directory levels.
+
+    The extension of ``filename`` is kept (lower-cased) so static serving
+    guesses a sensible content type.
+    """
+    suffix = PurePosixPath(filename).suffix.lower()
+    if not suffix[1:].isalnum() or len(suffix) > 10:
+        suffix = ""
+    return f"{BLOB_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}{suffix}"
+
+
+def is_blob_path(filepath: str) -> bool:
+    """Whether an attachment's filepath points into the blob store (rather than a per-upload copy)."""
+    return filepath.startswith(f"{BLOB_DIR}/")
+
+
+async def reference_blob(db: AsyncSession, sha256: str, size: int, filename: str) -> str:
+    """Take one reference on the blob for ``sha256``, creating its row if the content is new.
+
+    The reference is an upsert on ``attachment_blobs``, which locks the row
+    until the caller commits. The collector only removes rows it can lock
+    with ``ref_count = 0``, so it can never delete a file this upload is about
+    to reference. Nothing is written to storage here: the caller commits the
+    referencing attachment first and then calls ``write_blob``, so a failed
+    commit cannot leave behind an object no row points to.
+
+    Args:
+        db: Session the referencing attachment is added to (committed by the caller).
+        sha256: Hex digest of the contents.
+        size: Size in bytes.
+        filename: Original filename, used for the extension of a new blob.
+
+    Returns:
+        The blob's storage key, to store as ``Attachment.filepath``.
+    """
+    stmt = pg_insert(AttachmentBlob).values(sha256=sha256, path=blob_path(sha256, filename), size=size, ref_count=1)
+    return await db.scalar(
+        stmt.on_conflict_do_update(
+            index_elements=[AttachmentBlob.sha256],
+            set_={"ref_count": AttachmentBlob.ref_count + 1},
+        ).returning(AttachmentBlob.path)
+    )
+
+
+async def write_blob(path: str, temp: Path) -> None:
+    """Store ``temp`` as the blob at ``path`` unless the backend already has it, then remove ``temp``.
+
+    Called once the reference is committed. Duplicate content costs no
+    storage: the temp file is discarded without being written to the backend.
+    """
+    storage = get_storage()
+    if await storage.stat(path) is None:
+        await storage.put(path, temp)
+    await asyncio.to_thread(temp.unlink, missing_ok=True)
+
+
+async def _delete_objects(paths: list[str]) -> None:
+    storage = get_storage()
+    for path in paths:
+        try:
+            await storage.delete(path)
+        except Exception:
+            logger.warning(f"Could not remove attachment blob {path}", exc_info=True)
+
+
+async def collect_orphans(db: AsyncSession, batch_size: int = COLLECT_BATCH_SIZE) -> list[str]:
+    """Delete one batch of unreferenced blobs and their files.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` and their files are
+    removed before the deletion commits, while the row locks still hold back
+    any upload of the same content. An upload that then re-creates the row
+    finds the file gone and writes its own copy.
+
+    Args:
+        db: Database session.
+        batch_size: Maximum blobs removed.
+
+    Returns:
+        Paths of the removed blobs.
+    """
+    orphans = (
+        select(AttachmentBlob.sha256)
+        .where(AttachmentBlob.ref_count == 0)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        delete(AttachmentBlob).where(AttachmentBlob.sha256.in_(orphans)).returning(AttachmentBlob.path)
+    )
+    paths = list(result.scalars().all())
+    if paths:
+        await _delete_objects(paths)
+    await db.commit()
+    return paths
+
+
+class BlobCollector:
+    """Background task that removes attachment blobs no attachment references any more."""
+
+    def __init__(self, interval: float = settings.ATTACHMENT_GC_INTERVAL):
+        """Initialize the collector.
+
+        Args:
+            interval: Seconds between sweeps.
+        """
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """Remove every unreferenced blob, one batch per transaction.
+
+        Returns:
+            Number of blobs removed.
+        """
+        removed = 0
+        while True:
+            async with async_session() as db:
+                paths = await collect_orphans(db)
+            removed += len(paths)
+            if len(paths) < COLLECT_BATCH_SIZE:
+                return removed
+
+    def start(self) -> None:
+        """Start the periodic task (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the periodic task."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                removed = await self.run_once()
+                if removed:
+                    logger.info(f"Removed {removed} unreferenced attachment blobs")
+            except Exception:
+                logger.exception("Attachment blob collection failed")
+            await asyncio.sleep(self.interval)
+
+
+# Singleton instance started with the app
+blob_collector = BlobCollector()
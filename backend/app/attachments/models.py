@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DDL, BigInteger, DateTime, ForeignKey, Integer, String, event, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,8 +20,11 @@ class Attachment(Base):
     uploader_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     filepath: Mapped[str] = mapped_column(String(500), nullable=False)
-    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    # SHA-256 hex digest computed while streaming the upload; null for older rows.
+    # When filepath is a blob path (blobs/...), this row holds one reference on that blob.
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     # Relationships
@@ -30,3 +33,68 @@ class Attachment(Base):
 
     def __repr__(self) -> str:
         return f"<Attachment {self.filename}>"
+
+
+class AttachmentBlob(Base):
+    """Content-addressed file shared by every attachment with the same SHA-256."""
+
+    __tablename__ = "attachment_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # Path under UPLOAD_DIR, keeping the first uploader's extension so the file is served with a useful type
+    path: Mapped[str] = mapped_column(String(500), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Attachments referencing this blob; 0 means it is left for the collector
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<AttachmentBlob {self.sha256[:12]} refs={self.ref_count}>"
+
+
+class UploadSession(Base):
+    """A resumable upload in progress; its bytes so far are in a file under UPLOAD_DIR."""
+
+    __tablename__ = "upload_sessions"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    issue_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("issues.id", ondelete="CASCADE"), nullable=False
+    )
+    uploader_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Declared total length; the upload can be completed once offset reaches it
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Bytes received and written so far
+    offset: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Pushed forward by every chunk; the reaper removes sessions past it
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<UploadSession {self.filename} {self.offset}/{self.size}>"
+
+
+# Every deleted blob-backed attachment releases its reference, including rows
+# removed by ON DELETE CASCADE from issues and projects.
+BLOB_RELEASE_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION attachment_blobs_release() RETURNS trigger AS $$
+    BEGIN
+        IF OLD.filepath LIKE 'blobs/%' THEN
+            UPDATE attachment_blobs SET ref_count = greatest(ref_count - 1, 0) WHERE sha256 = OLD.sha256;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """
+)
+BLOB_RELEASE_TRIGGER = DDL(
+    "CREATE TRIGGER attachments_blob_release AFTER DELETE ON attachments "
+    "FOR EACH ROW EXECUTE FUNCTION attachment_blobs_release()"
+)
+event.listen(Attachment.__table__, "after_create", BLOB_RELEASE_FUNCTION)
+event.listen(Attachment.__table__, "after_create", BLOB_RELEASE_TRIGGER)
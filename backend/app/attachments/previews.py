@@ -0,0 +1,146 @@
+"""Thumbnail and preview rendering for image attachments, in a process pool."""
+import asyncio
+import logging
+import os
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+
+from app.attachments.storage import get_storage
+from app.config import settings
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow missing: previews are disabled and the originals are shown
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Longest edge, in pixels, of each rendition
+PREVIEW_SIZES = {"thumb": 256, "medium": 1024}
+PREVIEW_DIR = "previews"
+PREVIEW_MEDIA_TYPE = "image/webp"
+# Refuse to decode images larger than this (decompression bombs)
+MAX_SOURCE_PIXELS = 64_000_000
+
+
+def previews_available() -> bool:
+    """Whether Pillow is installed, so previews can be rendered."""
+    return Image is not None
+
+
+def preview_path(sha256: str, size: str) -> str:
+    """Return the path under UPLOAD_DIR of a rendition; renditions are shared by identical contents."""
+    return f"{PREVIEW_DIR}/{sha256[:2]}/{sha256}_{size}.webp"
+
+
+def _render(source: str, targets: dict[str, tuple[str, int]]) -> None:
+    """Decode ``source`` once and write each ``name -> (path, edge)`` rendition (runs in a worker process)."""
+    Image.MAX_IMAGE_PIXELS = MAX_SOURCE_PIXELS
+    with Image.open(source) as original:
+        original.draft("RGB", (max(edge for _, edge in targets.values()),) * 2)
+        image = original.convert("RGBA" if original.mode in ("RGBA", "LA", "P") else "RGB")
+    for path, edge in targets.values():
+        rendition = image.copy()
+        rendition.thumbnail((edge, edge))
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        partial = f"{path}.partial"
+        rendition.save(partial, format="WEBP", quality=80)
+        os.replace(partial, path)
+
+
+class PreviewRenderer:
+    """Renders previews off the event loop and caches them on disk by content hash.
+
+    Decoding and resizing are CPU-bound and hold the GIL, so they run in a
+    process pool. Concurrent requests for the same content share one render.
+    Renditions are a local cache under UPLOAD_DIR whatever the storage
+    backend; sources from a remote backend are downloaded for the render.
+    """
+
+    def __init__(self, workers: int = settings.PREVIEW_WORKERS, executor: Executor | None = None):
+        """Initialize the renderer.
+
+        Args:
+            workers: Size of the process pool, created on first use.
+            executor: Executor to use instead of a process pool (tests).
+        """
+        self.workers = workers
+        self._executor = executor
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._background: set[asyncio.Task] = set()
+
+    async def ensure(self, sha256: str, source: str) -> bool:
+        """Render any missing renditions of a blob.
+
+        Args:
+            sha256: Content hash of the source image.
+            source: Storage key of the source image.
+
+        Returns:
+            True if every rendition exists, False if rendering is unavailable or failed.
+        """
+        if not previews_available():
+            return False
+        root = Path(settings.UPLOAD_DIR)
+        targets = {
+            name: (str(root / preview_path(sha256, name)), edge)
+            for name, edge in PREVIEW_SIZES.items()
+        }
+        missing = {
+            name: target for name, target in targets.items()
+            if not await asyncio.to_thread(os.path.exists, target[0])
+        }
+        if not missing:
+            return True
+
+        future = self._inflight.get(sha256)
+        if future is None:
+            future = asyncio.ensure_future(self._render(source, missing))
+            self._inflight[sha256] = future
+            future.add_done_callback(lambda _: self._inflight.pop(sha256, None))
+        try:
+            await asyncio.shield(future)
+        except Exception:
+            logger.warning(f"Could not render previews for blob {sha256}", exc_info=True)
+            return False
+        return True
+
+    async def _render(self, source: str, targets: dict[str, tuple[str, int]]) -> None:
+        loop = asyncio.get_running_loop()
+        storage = get_storage()
+        path = storage.local_path(source)
+        if path is not None:
+            return await loop.run_in_executor(self._pool(), _render, str(path), targets)
+        fd, name = await asyncio.to_thread(tempfile.mkstemp, dir=settings.UPLOAD_DIR, suffix=Path(source).suffix)
+        os.close(fd)
+        try:
+            await storage.download(source, Path(name))
+            await loop.run_in_executor(self._pool(), _render, name, targets)
+        finally:
+            await asyncio.to_thread(Path(name).unlink, missing_ok=True)
+
+    def schedule(self, sha256: str, source: str) -> None:
+        """Render previews in the background, e.g. right after an upload."""
+        if previews_available():
+            task = asyncio.create_task(self.ensure(sha256, source))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def shutdown(self) -> None:
+        """Cancel background renders and stop the process pool."""
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+
+# Singleton instance shared by the API
+preview_renderer = PreviewRenderer()
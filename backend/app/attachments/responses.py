@@ -0,0 +1,116 @@
+"""File responses for attachment downloads, with zero-copy sending where the server supports it."""
+import asyncio
+import os
+
+from fastapi import HTTPException
+from starlette.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.attachments.storage import StorageBackend, content_disposition
+
+# ASGI extension letting the server os.sendfile() an open file descriptor
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+# Read size when the server has no zero-copy support (Starlette's default is 64KB)
+FALLBACK_CHUNK_SIZE = 256 * 1024
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag`` (weak comparison, ``*`` included)."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class AttachmentFileResponse(FileResponse):
+    """``FileResponse`` that hands whole-file and single-range bodies to the server's ``sendfile``.
+
+    Range parsing, ``If-Range`` and multipart ranges are Starlette's. When the
+    ASGI server advertises the ``http.response.zerocopysend`` extension, the
+    body is sent as a file descriptor and the kernel copies it straight to the
+    socket; otherwise it is streamed in larger chunks than the default.
+    """
+
+    chunk_size = FALLBACK_CHUNK_SIZE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._zerocopy = ZEROCOPY_EXTENSION in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool) -> None:
+        if not self._zerocopy or send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await self._sendfile(send, 0, None)
+
+    async def _handle_single_range(
+        self, send: Send, start: int, end: int, file_size: int, send_header_only: bool
+    ) -> None:
+        if not self._zerocopy or send_header_only:
+            return await super()._handle_single_range(send, start, end, file_size, send_header_only)
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        await self._sendfile(send, start, end - start)
+
+    async def _sendfile(self, send: Send, offset: int, count: int | None) -> None:
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            message = {"type": ZEROCOPY_EXTENSION, "file": fd, "offset": offset, "more_body": False}
+            if count is not None:
+                message["count"] = count
+            await send(message)
+        finally:
+            os.close(fd)
+
+
+async def storage_response(
+    storage: StorageBackend,
+    key: str,
+    filename: str,
+    media_type: str,
+    headers: dict[str, str],
+    inline: bool = False,
+) -> Response:
+    """Build the download response for a stored object.
+
+    Object stores that can presign answer with a redirect, so the bytes
+    never pass through the API. Local files are sent with
+    ``AttachmentFileResponse`` (ranges, zero-copy). Other remote objects are
+    proxied as a stream, without range support.
+
+    Raises:
+        HTTPException(404): If the object is missing.
+    """
+    url = await storage.presigned_url(key, filename, media_type, inline)
+    if url is not None:
+        # The URL expires, so the redirect itself must not be cached
+        return RedirectResponse(url, status_code=307, headers={**headers, "Cache-Control": "private, no-store"})
+
+    path = storage.local_path(key)
+    if path is not None:
+        try:
+            stat_result = await asyncio.to_thread(os.stat, path)
+        except FileNotFoundError:
+            raise HTTPException(404, "Attachment file is missing")
+        return AttachmentFileResponse(
+            path,
+            headers=headers,
+            media_type=media_type,
+            filename=filename,
+            stat_result=stat_result,
+            content_disposition_type="inline" if inline else "attachment",
+        )
+
+    info = await storage.stat(key)
+    if info is None:
+        raise HTTPException(404, "Attachment file is missing")
+    return StreamingResponse(
+        storage.get(key),
+        media_type=media_type,
+        headers={
+            **headers,
+            "Content-Length": str(info.size),
+            "Content-Disposition": content_disposition(filename, inline),
+        },
+    )
@@ -2,11 +2,36 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Request, Response, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.attachments.schemas import AttachmentResponse
-from app.attachments.service import delete_attachment, get_attachments, upload_attachment
+from app.attachments.archive import ArchiveEntry, stream_zip
+from app.attachments.previews import PREVIEW_MEDIA_TYPE
+from app.attachments.responses import etag_matches, storage_response
+from app.attachments.schemas import (
+    AttachmentResponse,
+    AttachmentStorageStats,
+    UploadSessionCreate,
+    UploadSessionResponse,
+)
+from app.attachments.service import (
+    delete_attachment,
+    get_archive_entries,
+    get_attachments,
+    get_preview,
+    get_project_attachment,
+    get_storage_stats,
+    upload_attachment,
+)
+from app.attachments.storage import content_disposition, get_storage
+from app.attachments.uploads import (
+    append_chunk,
+    cancel_upload,
+    complete_upload,
+    create_upload_session,
+    get_upload_session,
+)
 from app.auth.dependencies import get_current_user
 from app.auth.models import User
 from app.database import get_db
@@ -14,6 +39,25 @@ from app.projects.service import get_project, get_user_role_in_project
 
 router = APIRouter(prefix="/api/v1/projects", tags=["attachments"])
 
+PREVIEW_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# Downloads are revalidated every time; a matching ETag costs a 304 and no body
+CONTENT_CACHE_CONTROL = "private, no-cache"
+# Body type of upload chunks, as in the tus protocol
+CHUNK_CONTENT_TYPE = "application/offset+octet-stream"
+
+
+@router.get("/{project_id}/attachments/storage", response_model=AttachmentStorageStats)
+async def attachment_storage(
+    project_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> AttachmentStorageStats:
+    """Disk used by the project's attachments and the bytes saved by deduplication."""
+    # Verify user has access to the project
+    await get_project(db, project_id, user)
+
+    return await get_storage_stats(db, project_id)
+
 
 @router.get("/{project_id}/issues/{issue_id}/attachments", response_model=list[AttachmentResponse])
 async def list_attachments(
@@ -26,7 +70,7 @@ async def list_attachments(
     # Verify user has access to the project
     await get_project(db, project_id, user)
 
-    return await get_attachments(db, issue_id)
+    return await get_attachments(db, issue_id, project_id)
 
 
 @router.post("/{project_id}/issues/{issue_id}/attachments", response_model=AttachmentResponse)
@@ -41,7 +85,197 @@ async def create_attachment(
     # Verify user has access to the project
     await get_project(db, project_id, user)
 
-    return await upload_attachment(db, issue_id, file, user)
+    return await upload_attachment(db, issue_id, file, user, project_id)
+
+
+@router.get("/{project_id}/issues/{issue_id}/attachments/archive")
+async def issue_attachments_archive(
+    project_id: UUID,
+    issue_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Download every attachment of an issue as one ZIP, streamed as it is built."""
+    # Verify user has access to the project
+    await get_project(db, project_id, user)
+
+    name, entries = await get_archive_entries(db, project_id, issue_id=issue_id)
+    return _archive_response(name, entries)
+
+
+@router.get("/{project_id}/sprints/{sprint_id}/attachments/archive")
+async def sprint_attachments_archive(
+    project_id: UUID,
+    sprint_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Download the attachments of every issue in a sprint as one ZIP, one folder per issue."""
+    # Verify user has access to the project
+    await get_project(db, project_id, user)
+
+    name, entries = await get_archive_entries(db, project_id, sprint_id=sprint_id)
+    return _archive_response(name, entries)
+
+
+def _archive_response(name: str, entries: list[ArchiveEntry]) -> StreamingResponse:
+    # The length is unknown until the last entry is compressed, so the body is chunked
+    filename = "".join(c if c.isalnum() or c in "-_" else "-" for c in name) + "-attachments.zip"
+    return StreamingResponse(
+        stream_zip(get_storage(), entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(filename), "Cache-Control": "private, no-store"},
+    )
+
+
+@router.post(
+    "/{project_id}/issues/{issue_id}/attachments/uploads",
+    response_model=UploadSessionResponse,
+    status_code=201,
+)
+async def start_upload(
+    project_id: UUID,
+    issue_id: UUID,
+    data: UploadSessionCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> UploadSessionResponse:
+    """Start a resumable upload of a file up to ``MAX_RESUMABLE_UPLOAD_SIZE``."""
+    # Verify user has access to the project
+    await get_project(db, project_id, user)
+
+    session = await create_upload_session(db, issue_id, user, data)
+    response.headers["Location"] = f"/api/v1/projects/{project_id}/issues/{issue_id}/attachments/uploads/{session.id}"
+    response.headers["Upload-Offset"] = "0"
+    return UploadSessionResponse.model_validate(session)
+
+
+@router.get("/{project_id}/issues/{issue_id}/attachments/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def upload_status(
+    project_id: UUID,
+    issue_id: UUID,
+    upload_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> UploadSessionResponse:
+    """Report how many bytes of an upload have been received, to resume after a failure."""
+    # Verify user has access to the project
+    await get_project(db, project_id, user)
+
+    session = await get_upload_session(db, issue_id, upload_id, user)
+    response.headers["Upload-Offset"] = str(session.offset)
+    return UploadSessionResponse.model_validate(session)
+
+
+@router.patch("/{project_id}/issues/{issue_id}/attachments/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    project_id: UUID,
+    issue_id: UUID,
+    upload_id: UUID,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(...),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> UploadSessionResponse:
+    """Append the request body at ``Upload-Offset``, which must equal the upload's current offset."""
+    # Verify user has access to the project
+    await get_project(db, project_id, user)
+
+    if request.headers.get("content-type") != CHUNK_CONTENT_TYPE:
+        raise HTTPException(415, f"Chunks must be sent as {CHUNK_CONTENT_TYPE}")
+    session = await get_upload_session(db, issue_id, upload_id, user)
+    session = await append_chunk(db, session, upload_offset, request.stream())
+    response.headers["Upload-Offset"] = str(session.offset)
+    return UploadSessionResponse.model_validate(session)
+
+
+@router.post(
+    "/{project_id}/issues/{issue_id}/attachments/uploads/{upload_id}/complete",
+    response_model=AttachmentResponse,
+)
+async def finish_upload(
+    project_id: UUID,
+    issue_id: UUID,
+    upload_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> AttachmentResponse:
+    """Create the attachment from a fully received upload."""
+    # Verify user has access to the project
+    await get_project(db, project_id, user)
+
+    session = await get_upload_session(db, issue_id, upload_id, user)
+    return await complete_upload(db, session, user, project_id)
+
+
+@router.delete("/{project_id}/issues/{issue_id}/attachments/uploads/{upload_id}")
+async def abort_upload(
+    project_id: UUID,
+    issue_id: UUID,
+    upload_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> dict:
+    """Cancel an upload and discard the bytes received so far."""
+    # Verify user has access to the project
+    await get_project(db, project_id, user)
+
+    session = await get_upload_session(db, issue_id, upload_id, user)
+    await cancel_upload(db, session)
+    return {"success": True}
+
+
+@router.get("/{project_id}/issues/{issue_id}/attachments/{attachment_id}/content")
+async def download_attachment(
+    project_id: UUID,
+    issue_id: UUID,
+    attachment_id: UUID,
+    inline: bool = False,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> Response:
+    """Download an attachment's contents, for project members only.
+
+    Supports ``Range``/``If-Range`` (resumable and partial downloads of large
+    files) and ``If-None-Match`` against an ETag derived from the content
+    hash. Local files are sent with ``sendfile`` when the server supports
+    the zero-copy extension; object stores redirect to a presigned URL.
+    ``inline=true`` lets browsers display the file.
+    """
+    if await get_user_role_in_project(db, project_id, user.id) is None:
+        raise HTTPException(403, "You are not a member of this project")
+
+    attachment = await get_project_attachment(db, project_id, issue_id, attachment_id)
+    headers = {"Cache-Control": CONTENT_CACHE_CONTROL}
+    if attachment.sha256:
+        headers["ETag"] = f'"{attachment.sha256}"'
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    return await storage_response(
+        get_storage(), attachment.filepath, attachment.filename, attachment.mime_type, headers, inline
+    )
+
+
+@router.get("/{project_id}/issues/{issue_id}/attachments/{attachment_id}/preview/{size}")
+async def attachment_preview(
+    project_id: UUID,
+    issue_id: UUID,
+    attachment_id: UUID,
+    size: str,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> FileResponse:
+    """Serve an image attachment's ``thumb`` or ``medium`` preview, rendering it on first request."""
+    # Verify user has access to the project
+    await get_project(db, project_id, user)
+
+    path = await get_preview(db, project_id, issue_id, attachment_id, size)
+    # Previews are keyed by content hash, so they never change
+    return FileResponse(path, media_type=PREVIEW_MEDIA_TYPE, headers={"Cache-Control": PREVIEW_CACHE_CONTROL})
 
 
 @router.delete("/{project_id}/issues/{issue_id}/attachments/{attachment_id}")
@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class UserInfo(BaseModel):
@@ -22,8 +22,43 @@ class AttachmentResponse(BaseModel):
     filename: str
     size: int  # bytes
     mime_type: str
-    url: str  # /uploads/{filepath}
+    url: str  # authorized .../attachments/{id}/content endpoint
+    thumbnail_url: str | None = None  # 256px WebP rendition, images only
+    preview_url: str | None = None  # 1024px WebP rendition, images only
     created_at: datetime
     uploader: UserInfo
 
     model_config = {"from_attributes": True}
+
+
+class AttachmentStorageStats(BaseModel):
+    """Disk usage of a project's attachments."""
+
+    project_id: UUID
+    attachments: int
+    files: int  # distinct files on disk; identical uploads share one
+    logical_bytes: int  # sum of every attachment's size
+    stored_bytes: int  # bytes of the distinct files
+    saved_bytes: int  # logical_bytes - stored_bytes
+
+
+class UploadSessionCreate(BaseModel):
+    """Request body for starting a resumable upload."""
+
+    filename: str = Field(min_length=1, max_length=255)
+    size: int = Field(gt=0)  # total length in bytes, declared up front
+    mime_type: str = Field(max_length=100)
+
+
+class UploadSessionResponse(BaseModel):
+    """State of a resumable upload; the next chunk must start at ``offset``."""
+
+    id: UUID
+    issue_id: UUID
+    filename: str
+    mime_type: str
+    size: int
+    offset: int
+    expires_at: datetime
+
+    model_config = {"from_attributes": True}
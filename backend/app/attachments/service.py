@@ -1,18 +1,29 @@
 """Attachment business logic."""
 
-import os
-import uuid
+import asyncio
+import hashlib
+import logging
+import tempfile
 from pathlib import Path
+from typing import BinaryIO
 from uuid import UUID
 
 from fastapi import File, HTTPException, UploadFile
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.attachments.archive import ArchiveEntry, unique_names
+from app.attachments.blobs import is_blob_path, reference_blob, write_blob
 from app.attachments.models import Attachment
-from app.attachments.schemas import AttachmentResponse, UserInfo
+from app.attachments.previews import PREVIEW_SIZES, preview_path, preview_renderer, previews_available
+from app.attachments.schemas import AttachmentResponse, AttachmentStorageStats, UserInfo
+from app.attachments.storage import get_storage
 from app.auth.models import User
 from app.config import settings
+from app.issues.models import Issue
+from app.sprints.models import Sprint
+
+logger = logging.getLogger(__name__)
 
 ALLOWED_MIME_TYPES = {
     "image/jpeg",
@@ -26,70 +37,152 @@ ALLOWED_MIME_TYPES = {
     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
 }
 
+# Bytes read from the request per step; large enough that thread hand-offs stay cheap
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Directory under UPLOAD_DIR for partial uploads, on the same filesystem so os.replace is atomic
+INCOMING_DIR = ".incoming"
+
 
 def _sanitize_filename(filename: str) -> str:
     """Remove path separators and suspicious characters from filename."""
     return "".join(c for c in filename if c.isalnum() or c in "._- ").strip()
 
 
+def _write_chunk(out: BinaryIO, digest: "hashlib._Hash", chunk: bytes) -> None:
+    """Hash and write one chunk (runs in a worker thread; both release the GIL)."""
+    digest.update(chunk)
+    out.write(chunk)
+
+
+async def stream_to_temp(file: UploadFile, max_size: int) -> tuple[Path, int, str]:
+    """Stream an upload into a temporary file under UPLOAD_DIR chunk by chunk.
+
+    Chunks are hashed and written in a worker thread, so the event loop
+    never blocks on disk and only one chunk is held in memory. The size
+    limit is enforced as data arrives. The caller hands the finished file to
+    the storage backend (an ``os.replace`` for local storage), so readers
+    never see a partial file.
+
+    Returns:
+        The temporary file, its size in bytes and its SHA-256 hex digest.
+
+    Raises:
+        HTTPException(413): If the upload exceeds ``max_size``; nothing is left on disk.
+    """
+    incoming = Path(settings.UPLOAD_DIR) / INCOMING_DIR
+    await asyncio.to_thread(incoming.mkdir, parents=True, exist_ok=True)
+    out = await asyncio.to_thread(tempfile.NamedTemporaryFile, dir=incoming, delete=False)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(413, f"File too large. Maximum size is {max_size / 1024 / 1024:.0f}MB")
+                await asyncio.to_thread(_write_chunk, out, digest, chunk)
+        finally:
+            await asyncio.to_thread(out.close)
+    except BaseException:
+        await asyncio.to_thread(_remove_quietly, Path(out.name))
+        raise
+    return Path(out.name), size, digest.hexdigest()
+
+
+def _remove_quietly(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
 async def upload_attachment(
     db: AsyncSession,
     issue_id: UUID,
     file: UploadFile,
     uploader: User,
+    project_id: UUID | None = None,
 ) -> AttachmentResponse:
-    """Upload a file and create attachment record."""
+    """Upload a file and create attachment record.
+
+    Image previews are rendered in the background right after the upload
+    when ``PREVIEW_EAGER`` is set, otherwise on first request.
+    """
     # Validate MIME type
     if file.content_type not in ALLOWED_MIME_TYPES:
         raise HTTPException(
             400, f"File type {file.content_type} not allowed"
         )
 
-    # Read file in chunks and check size
-    contents = b""
-    max_size = settings.MAX_FILE_SIZE
-
-    while True:
-        chunk = await file.read(1024 * 64)  # 64KB chunks
-        if not chunk:
-            break
-        contents += chunk
-        if len(contents) > max_size:
-            raise HTTPException(
-                413, f"File too large. Maximum size is {max_size / 1024 / 1024:.0f}MB"
-            )
-
-    # Sanitize filename and generate safe filepath
-    safe_filename = _sanitize_filename(file.filename or "file")
-    upload_id = str(uuid.uuid4())[:8]
-    filepath = f"{issue_id}/{upload_id}_{safe_filename}"
-    full_path = Path(settings.UPLOAD_DIR) / filepath
-
-    # Create directory if it doesn't exist
-    full_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Save file to disk
-    with open(full_path, "wb") as f:
-        f.write(contents)
-
-    # Create attachment record
-    attachment = Attachment(
-        issue_id=issue_id,
-        uploader_id=uploader.id,
+    # Stream to disk, checking the size and hashing as data arrives
+    temp, size, sha256 = await stream_to_temp(file, settings.MAX_FILE_SIZE)
+
+    return await create_attachment_from_file(
+        db,
+        issue_id,
+        uploader,
+        temp,
+        size,
+        sha256,
         filename=file.filename or "file",
-        filepath=filepath,
-        size=len(contents),
         mime_type=file.content_type or "application/octet-stream",
+        project_id=project_id,
     )
-    db.add(attachment)
-    await db.commit()
+
+
+async def create_attachment_from_file(
+    db: AsyncSession,
+    issue_id: UUID,
+    uploader: User,
+    temp: Path,
+    size: int,
+    sha256: str,
+    filename: str,
+    mime_type: str,
+    project_id: UUID | None = None,
+) -> AttachmentResponse:
+    """Store a fully received file as a blob and create its attachment record.
+
+    ``temp`` must live under UPLOAD_DIR; it is stored or removed. Anything
+    else pending on ``db`` is committed with the attachment. The file is
+    written to storage only after that commit; if writing fails, the
+    attachment is deleted again, releasing its blob reference.
+    """
+    try:
+        # Reference the content-addressed blob; identical files share one copy
+        filepath = await reference_blob(db, sha256, size, _sanitize_filename(filename))
+
+        # Create attachment record
+        attachment = Attachment(
+            issue_id=issue_id,
+            uploader_id=uploader.id,
+            filename=filename,
+            filepath=filepath,
+            size=size,
+            sha256=sha256,
+            mime_type=mime_type,
+        )
+        db.add(attachment)
+        await db.commit()
+
+        try:
+            await write_blob(filepath, temp)
+        except Exception:
+            await db.delete(attachment)
+            await db.commit()
+            raise
+    finally:
+        await asyncio.to_thread(_remove_quietly, temp)
     await db.refresh(attachment)
 
+    if settings.PREVIEW_EAGER and _has_preview(attachment):
+        preview_renderer.schedule(sha256, filepath)
+
     # Return response with URL
-    return _to_response(attachment)
+    return _to_response(attachment, project_id)
 
 
-async def get_attachments(db: AsyncSession, issue_id: UUID) -> list[AttachmentResponse]:
+async def get_attachments(db: AsyncSession, issue_id: UUID, project_id: UUID | None = None) -> list[AttachmentResponse]:
     """Get all attachments for an issue."""
     result = await db.execute(
         select(Attachment)
@@ -97,7 +190,99 @@ async def get_attachments(db: AsyncSession, issue_id: UUID) -> list[AttachmentRe
         .order_by(Attachment.created_at.desc())
     )
     attachments = list(result.scalars().all())
-    return [_to_response(a) for a in attachments]
+    return [_to_response(a, project_id) for a in attachments]
+
+
+async def get_project_attachment(
+    db: AsyncSession, project_id: UUID, issue_id: UUID, attachment_id: UUID
+) -> Attachment:
+    """Get an attachment, checking it belongs to the issue and the issue to the project."""
+    result = await db.execute(
+        select(Attachment)
+        .join(Issue, Issue.id == Attachment.issue_id)
+        .where(Attachment.id == attachment_id, Attachment.issue_id == issue_id, Issue.project_id == project_id)
+    )
+    attachment = result.scalar_one_or_none()
+    if not attachment:
+        raise HTTPException(404, "Attachment not found")
+    return attachment
+
+
+async def get_archive_entries(
+    db: AsyncSession, project_id: UUID, issue_id: UUID | None = None, sprint_id: UUID | None = None
+) -> tuple[str, list[ArchiveEntry]]:
+    """List the attachments of an issue, or of every issue in a sprint, for a ZIP archive.
+
+    Sprint archives put each issue's files in a folder named by its key.
+    Returns the archive's base name (issue key or sprint name) and its entries.
+    """
+    query = (
+        select(Attachment, Issue.key)
+        .join(Issue, Issue.id == Attachment.issue_id)
+        .where(Issue.project_id == project_id)
+        .order_by(Issue.key, Attachment.created_at)
+    )
+    if sprint_id is not None:
+        sprint = await db.get(Sprint, sprint_id)
+        if not sprint or sprint.project_id != project_id:
+            raise HTTPException(404, "Sprint not found")
+        name, query = sprint.name, query.where(Issue.sprint_id == sprint_id)
+    else:
+        name = await db.scalar(select(Issue.key).where(Issue.id == issue_id, Issue.project_id == project_id))
+        if name is None:
+            raise HTTPException(404, "Issue not found")
+        query = query.where(Issue.id == issue_id)
+
+    rows = (await db.execute(query)).all()
+    paths = [
+        _sanitize_filename(a.filename) if sprint_id is None else f"{key}/{_sanitize_filename(a.filename)}"
+        for a, key in rows
+    ]
+    entries = [
+        ArchiveEntry(key=a.filepath, name=path, size=a.size, mime_type=a.mime_type, modified=a.created_at)
+        for (a, _), path in zip(rows, unique_names(paths))
+    ]
+    return name, entries
+
+
+async def get_preview(db: AsyncSession, project_id: UUID, issue_id: UUID, attachment_id: UUID, size: str) -> Path:
+    """Return the file of an image attachment's preview, rendering it on first request."""
+    if size not in PREVIEW_SIZES:
+        raise HTTPException(404, f"Unknown preview size {size}")
+    attachment = await get_project_attachment(db, project_id, issue_id, attachment_id)
+    if not _has_preview(attachment):
+        raise HTTPException(404, "No preview for this attachment")
+    if not await preview_renderer.ensure(attachment.sha256, attachment.filepath):
+        raise HTTPException(404, "Preview could not be rendered")
+    return Path(settings.UPLOAD_DIR) / preview_path(attachment.sha256, size)
+
+
+async def get_storage_stats(db: AsyncSession, project_id: UUID) -> AttachmentStorageStats:
+    """Report how much disk a project's attachments use, and how much sharing blobs saves."""
+    per_file = (
+        select(func.count(Attachment.id).label("refs"), func.max(Attachment.size).label("size"))
+        .join(Issue, Issue.id == Attachment.issue_id)
+        .where(Issue.project_id == project_id)
+        .group_by(Attachment.filepath)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            func.coalesce(func.sum(per_file.c.refs), 0),
+            func.count(),
+            func.coalesce(func.sum(per_file.c.refs * per_file.c.size), 0),
+            func.coalesce(func.sum(per_file.c.size), 0),
+        ).select_from(per_file)
+    )
+    attachments, files, logical, stored = result.one()
+    return AttachmentStorageStats(
+        project_id=project_id,
+        attachments=attachments,
+        files=files,
+        logical_bytes=logical,
+        stored_bytes=stored,
+        saved_bytes=logical - stored,
+    )
 
 
 async def delete_attachment(
@@ -105,7 +290,13 @@ async def delete_attachment(
     attachment_id: UUID,
     user: User,
 ) -> None:
-    """Delete an attachment. Only uploader or admin can delete."""
+    """Delete an attachment. Only uploader or admin can delete.
+
+    Blob-backed files are shared: deleting the row releases its reference
+    (via the attachments_blob_release trigger) and the blob collector removes
+    the file once nothing references it. Files from before the blob store
+    are removed directly.
+    """
     attachment = await db.get(Attachment, attachment_id)
     if not attachment:
         raise HTTPException(404, "Attachment not found")
@@ -114,33 +305,49 @@ async def delete_attachment(
     if attachment.uploader_id != user.id:
         raise HTTPException(403, "Only the uploader can delete this attachment")
 
-    # Delete file from disk
-    full_path = Path(settings.UPLOAD_DIR) / attachment.filepath
-    try:
-        if full_path.exists():
-            os.remove(full_path)
-    except OSError:
-        # Log but don't fail if file cleanup fails
-        pass
+    # Delete per-upload files from before the blob store
+    if not is_blob_path(attachment.filepath):
+        try:
+            await get_storage().delete(attachment.filepath)
+        except Exception:
+            # Log but don't fail if file cleanup fails
+            logger.warning(f"Could not remove attachment file {attachment.filepath}", exc_info=True)
 
     # Delete database record
     await db.delete(attachment)
     await db.commit()
 
 
-def _to_response(attachment: Attachment) -> AttachmentResponse:
-    """Convert Attachment model to response schema."""
+def _has_preview(attachment: Attachment) -> bool:
+    """Whether previews can be rendered for an attachment (hashed image, Pillow installed)."""
+    return attachment.mime_type.startswith("image/") and attachment.sha256 is not None and previews_available()
+
+
+def _to_response(attachment: Attachment, project_id: UUID | None = None) -> AttachmentResponse:
+    """Convert Attachment model to response schema.
+
+    When the project is known, ``url`` is the authorized content endpoint and
+    preview URLs are set for images; otherwise ``url`` is the legacy static path.
+    """
+    url = f"/uploads/{attachment.filepath}"
+    previews = {}
+    if project_id is not None:
+        base = f"/api/v1/projects/{project_id}/issues/{attachment.issue_id}/attachments/{attachment.id}"
+        url = f"{base}/content"
+        if _has_preview(attachment):
+            previews = {"thumbnail_url": f"{base}/preview/thumb", "preview_url": f"{base}/preview/medium"}
     return AttachmentResponse(
         id=attachment.id,
         issue_id=attachment.issue_id,
         filename=attachment.filename,
         size=attachment.size,
         mime_type=attachment.mime_type,
-        url=f"/uploads/{attachment.filepath}",
+        url=url,
         created_at=attachment.created_at,
         uploader=UserInfo(
             id=attachment.uploader.id,
             name=attachment.uploader.name,
             avatar_url=attachment.uploader.avatar_url,
         ),
+        **previews,
     )
@@ -0,0 +1,290 @@
+"""Where attachment bytes live: the local filesystem or an S3-compatible object store.
+
+Keys are the relative paths stored in ``Attachment.filepath`` (for example
+``blobs/ab/cd/<sha256>.png``), so switching backends needs no change to
+the database, only a copy of the files.
+"""
+import asyncio
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote
+
+from app.config import settings
+
+try:
+    import boto3
+    from botocore.config import Config as BotoConfig
+except ImportError:  # boto3 missing: only the local backend is available
+    boto3 = None
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per step when streaming an object
+READ_CHUNK_SIZE = 256 * 1024
+# S3 requires every multipart part but the last to be at least this large
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+@dataclass
+class ObjectInfo:
+    """Size and modification time of a stored object."""
+
+    size: int
+    modified: float
+
+
+def content_disposition(filename: str, inline: bool = False) -> str:
+    """Build a ``Content-Disposition`` value, RFC 5987-encoding non-ASCII filenames."""
+    disposition = "inline" if inline else "attachment"
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+class StorageBackend(ABC):
+    """Streaming put/get/delete/stat of attachment objects by key."""
+
+    @abstractmethod
+    async def put(self, key: str, source: Path) -> None:
+        """Store the file at ``source`` under ``key``, replacing any existing object.
+
+        ``source`` may be consumed (moved); callers remove it afterwards if it is still there.
+        """
+
+    @abstractmethod
+    def get(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        """Stream the bytes of ``key`` from ``start`` up to, not including, ``end``."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete ``key``; deleting a missing object is not an error."""
+
+    @abstractmethod
+    async def stat(self, key: str) -> ObjectInfo | None:
+        """Return the size and modification time of ``key``, or None if it does not exist."""
+
+    def local_path(self, key: str) -> Path | None:
+        """Filesystem path of ``key`` if the backend is local, so it can be ``sendfile``-d directly."""
+        return None
+
+    async def presigned_url(
+        self, key: str, filename: str, media_type: str, inline: bool = False
+    ) -> str | None:
+        """Short-lived URL clients can download ``key`` from directly, or None to proxy through the API."""
+        return None
+
+    async def download(self, key: str, target: Path) -> None:
+        """Copy ``key`` into the local file ``target`` (e.g. to render a preview)."""
+        out = await asyncio.to_thread(open, target, "wb")
+        try:
+            async for chunk in self.get(key):
+                await asyncio.to_thread(out.write, chunk)
+        finally:
+            await asyncio.to_thread(out.close)
+
+
+class LocalStorage(StorageBackend):
+    """Objects as files under ``UPLOAD_DIR`` (or ``root``)."""
+
+    def __init__(self, root: str | None = None):
+        """Initialize the backend.
+
+        Args:
+            root: Base directory; defaults to ``settings.UPLOAD_DIR``, read on each call.
+        """
+        self._root = root
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root or settings.UPLOAD_DIR)
+
+    def local_path(self, key: str) -> Path:
+        return self.root / key
+
+    async def put(self, key: str, source: Path) -> None:
+        target = self.local_path(key)
+        await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+        # Temp files are written under UPLOAD_DIR, so this is an atomic rename, not a copy
+        await asyncio.to_thread(os.replace, source, target)
+
+    async def get(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(open, self.local_path(key), "rb")
+        try:
+            await asyncio.to_thread(f.seek, start)
+            remaining = None if end is None else end - start
+            while remaining is None or remaining > 0:
+                size = READ_CHUNK_SIZE if remaining is None else min(READ_CHUNK_SIZE, remaining)
+                chunk = await asyncio.to_thread(f.read, size)
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.local_path(key).unlink, missing_ok=True)
+
+    async def stat(self, key: str) -> ObjectInfo | None:
+        try:
+            result = await asyncio.to_thread(os.stat, self.local_path(key))
+        except FileNotFoundError:
+            return None
+        return ObjectInfo(size=result.st_size, modified=result.st_mtime)
+
+
+def _is_missing(exc: Exception) -> bool:
+    """Whether a botocore ``ClientError`` means the object does not exist."""
+    code = getattr(exc, "response", {}).get("Error", {}).get("Code")
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Storage(StorageBackend):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, Ceph, R2, ...).
+
+    boto3 is synchronous, so calls run in worker threads on one shared
+    client whose connection pool is sized by ``max_connections``. Files
+    larger than ``part_size`` are uploaded in parts, reading one part at a
+    time, and an interrupted upload is aborted so no parts are left billed.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        part_size: int = 8 * 1024 * 1024,
+        presign: bool = True,
+        presign_expiry: int = 300,
+        client=None,
+        **client_options,
+    ):
+        """Initialize the backend.
+
+        Args:
+            bucket: Bucket name.
+            prefix: Key prefix inside the bucket, e.g. ``"flowboard/"``.
+            part_size: Multipart part size in bytes (at least 5MB).
+            presign: Whether downloads redirect to presigned URLs.
+            presign_expiry: Lifetime of presigned URLs in seconds.
+            client: boto3 S3 client to use instead of creating one (tests).
+            **client_options: ``endpoint_url``, ``region_name``, credentials and ``max_connections``.
+        """
+        self.bucket = bucket
+        self.prefix = prefix
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.presign = presign
+        self.presign_expiry = presign_expiry
+        self._client = client or self._create_client(**client_options)
+
+    @staticmethod
+    def _create_client(max_connections: int = 32, **options):
+        if boto3 is None:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (install flowboard-backend[s3])")
+        config = BotoConfig(max_pool_connections=max_connections, retries={"mode": "standard"})
+        return boto3.client("s3", config=config, **{k: v for k, v in options.items() if v})
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def put(self, key: str, source: Path) -> None:
+        size = (await asyncio.to_thread(os.stat, source)).st_size
+        if size <= self.part_size:
+            data = await asyncio.to_thread(source.read_bytes)
+            await asyncio.to_thread(self._client.put_object, Bucket=self.bucket, Key=self._key(key), Body=data)
+            return
+        await asyncio.to_thread(self._put_multipart, self._key(key), source)
+
+    def _put_multipart(self, key: str, source: Path) -> None:
+        upload_id = self._client.create_multipart_upload(Bucket=self.bucket, Key=key)["UploadId"]
+        parts = []
+        try:
+            with open(source, "rb") as f:
+                while data := f.read(self.part_size):
+                    number = len(parts) + 1
+                    response = self._client.upload_part(
+                        Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=data
+                    )
+                    parts.append({"PartNumber": number, "ETag": response["ETag"]})
+            self._client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            try:
+                self._client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            except Exception:
+                logger.warning(f"Could not abort multipart upload of {key}", exc_info=True)
+            raise
+
+    async def get(self, key: str, start: int = 0, end: int | None = None) -> AsyncIterator[bytes]:
+        options = {}
+        if start or end is not None:
+            options["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        response = await asyncio.to_thread(
+            self._client.get_object, Bucket=self.bucket, Key=self._key(key), **options
+        )
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, READ_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await asyncio.to_thread(body.close)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._client.delete_object, Bucket=self.bucket, Key=self._key(key))
+
+    async def stat(self, key: str) -> ObjectInfo | None:
+        try:
+            response = await asyncio.to_thread(self._client.head_object, Bucket=self.bucket, Key=self._key(key))
+        except Exception as exc:
+            if _is_missing(exc):
+                return None
+            raise
+        return ObjectInfo(size=response["ContentLength"], modified=response["LastModified"].timestamp())
+
+    async def presigned_url(
+        self, key: str, filename: str, media_type: str, inline: bool = False
+    ) -> str | None:
+        if not self.presign:
+            return None
+        # Signing is local computation, no request to the store
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._key(key),
+                "ResponseContentType": media_type,
+                "ResponseContentDisposition": content_disposition(filename, inline),
+            },
+            ExpiresIn=self.presign_expiry,
+        )
+
+
+_storage: StorageBackend | None = None
+
+
+def get_storage() -> StorageBackend:
+    """Return the process-wide backend selected by ``STORAGE_BACKEND``, created on first use."""
+    global _storage
+    if _storage is None:
+        if settings.STORAGE_BACKEND == "s3":
+            _storage = S3Storage(
+                bucket=settings.S3_BUCKET,
+                prefix=settings.S3_PREFIX,
+                part_size=settings.S3_PART_SIZE,
+                presign=settings.S3_PRESIGNED_DOWNLOADS,
+                presign_expiry=settings.S3_PRESIGN_EXPIRY,
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                region_name=settings.S3_REGION,
+                aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+                max_connections=settings.S3_MAX_CONNECTIONS,
+            )
+        else:
+            _storage = LocalStorage()
+    return _storage
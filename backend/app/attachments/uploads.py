@@ -0,0 +1,367 @@
+"""Resumable, tus-style chunked uploads for large attachments.
+
+A client creates an upload session declaring the file's length, sends the
+bytes with ``PATCH`` requests at increasing offsets (resuming from the
+offset the server reports after a failure), then completes the session
+into an attachment. Each chunk is streamed to a file of its own under
+UPLOAD_DIR as it arrives, nothing being buffered beyond one write, and
+then copied into the session's file.
+"""
+import asyncio
+import contextlib
+import hashlib
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.attachments.models import UploadSession
+from app.attachments.schemas import AttachmentResponse, UploadSessionCreate
+from app.attachments.service import (
+    ALLOWED_MIME_TYPES,
+    INCOMING_DIR,
+    UPLOAD_CHUNK_SIZE,
+    create_attachment_from_file,
+)
+from app.auth.models import User
+from app.config import settings
+from app.database import async_session
+
+logger = logging.getLogger(__name__)
+
+SESSION_DIR = "sessions"
+# Sessions removed per reaper transaction
+EXPIRE_BATCH_SIZE = 500
+
+
+def session_path(session_id: UUID) -> Path:
+    """Return the file holding the bytes received so far for a session."""
+    return Path(settings.UPLOAD_DIR) / INCOMING_DIR / SESSION_DIR / f"{session_id}.part"
+
+
+def _expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.UPLOAD_SESSION_TTL)
+
+
+def _create_empty(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+def _hash_file(path: Path) -> str:
+    """SHA-256 hex digest of a file, read chunk by chunk (runs in a worker thread)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def create_upload_session(
+    db: AsyncSession, issue_id: UUID, uploader: User, data: UploadSessionCreate
+) -> UploadSession:
+    """Start a resumable upload.
+
+    Raises:
+        HTTPException(400): If the file type is not allowed.
+        HTTPException(413): If the declared size exceeds ``MAX_RESUMABLE_UPLOAD_SIZE``.
+    """
+    if data.mime_type not in ALLOWED_MIME_TYPES:
+        raise HTTPException(400, f"File type {data.mime_type} not allowed")
+    if data.size > settings.MAX_RESUMABLE_UPLOAD_SIZE:
+        raise HTTPException(
+            413, f"File too large. Maximum size is {settings.MAX_RESUMABLE_UPLOAD_SIZE / 1024 / 1024:.0f}MB"
+        )
+
+    session = UploadSession(
+        id=uuid.uuid4(),
+        issue_id=issue_id,
+        uploader_id=uploader.id,
+        filename=data.filename,
+        mime_type=data.mime_type,
+        size=data.size,
+        offset=0,
+        expires_at=_expiry(),
+    )
+    await asyncio.to_thread(_create_empty, session_path(session.id))
+    db.add(session)
+    await db.commit()
+    await db.refresh(session)
+    return session
+
+
+async def get_upload_session(db: AsyncSession, issue_id: UUID, session_id: UUID, user: User) -> UploadSession:
+    """Get one of the user's live upload sessions on an issue.
+
+    Raises:
+        HTTPException(404): If the session does not exist, has expired or belongs to someone else.
+    """
+    result = await db.execute(
+        select(UploadSession).where(
+            UploadSession.id == session_id,
+            UploadSession.issue_id == issue_id,
+            UploadSession.uploader_id == user.id,
+            UploadSession.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    session = result.scalar_one_or_none()
+    if not session:
+        raise HTTPException(404, "Upload not found")
+    return session
+
+
+def _chunk_path(session_id: UUID) -> Path:
+    """Return a fresh file for one request's chunk, next to the session's partial file."""
+    return session_path(session_id).with_name(f"{session_id}.{uuid.uuid4().hex}.chunk")
+
+
+def _splice(chunk: Path, target: Path, offset: int) -> None:
+    """Copy ``chunk`` into ``target`` at ``offset``, dropping anything after it (runs in a worker thread)."""
+    with open(chunk, "rb") as src, open(target, "r+b") as out:
+        out.seek(offset)
+        while data := src.read(UPLOAD_CHUNK_SIZE):
+            out.write(data)
+        out.truncate()
+
+
+async def append_chunk(
+    db: AsyncSession, session: UploadSession, offset: int, chunks: AsyncIterator[bytes]
+) -> UploadSession:
+    """Receive a chunk for ``offset`` and append it to the session.
+
+    The request body is written as it arrives, in ``UPLOAD_CHUNK_SIZE``
+    writes, to a file of this request's own, with no transaction open, so a
+    slow client holds no pooled connection. The chunk is copied into the
+    session's file only after winning a compare-and-set on the offset,
+    whose row lock is held until the copy commits: of two concurrent
+    ``PATCH`` requests at the same offset, the loser gets a 409 and has
+    written nothing. If the client disconnects part way, the bytes already
+    received still count, so the client resumes from the offset it reads back.
+
+    Raises:
+        HTTPException(409): If ``offset`` is not the session's current offset.
+        HTTPException(413): If the chunk runs past the declared size.
+    """
+    if offset != session.offset:
+        raise HTTPException(409, f"Upload is at offset {session.offset}, not {offset}")
+    # End the transaction of the lookups before streaming the body
+    await db.commit()
+
+    path = _chunk_path(session.id)
+    out = await asyncio.to_thread(open, path, "wb")
+    written = 0
+    pending = bytearray()
+    try:
+        try:
+            async for chunk in chunks:
+                if offset + written + len(pending) + len(chunk) > session.size:
+                    raise HTTPException(413, f"Chunk runs past the declared upload size of {session.size} bytes")
+                pending += chunk
+                if len(pending) >= UPLOAD_CHUNK_SIZE:
+                    await asyncio.to_thread(out.write, pending)
+                    written += len(pending)
+                    pending = bytearray()
+        except HTTPException:
+            pending.clear()
+            raise
+        finally:
+            # Bytes received before a disconnect are kept
+            if pending:
+                await asyncio.to_thread(out.write, pending)
+                written += len(pending)
+            await asyncio.to_thread(out.close)
+    except BaseException:
+        if written:
+            # The request's own error is reported, not a conflict met while keeping its bytes
+            with contextlib.suppress(HTTPException):
+                await _advance(db, session, offset, path, written)
+        raise
+    else:
+        if written:
+            await _advance(db, session, offset, path, written)
+    finally:
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+    return session
+
+
+async def _advance(db: AsyncSession, session: UploadSession, offset: int, chunk: Path, written: int) -> None:
+    new_offset = await db.scalar(
+        update(UploadSession)
+        .where(UploadSession.id == session.id, UploadSession.offset == offset)
+        .values(offset=offset + written, expires_at=_expiry())
+        .returning(UploadSession.offset)
+    )
+    if new_offset is None:
+        await db.rollback()
+        raise HTTPException(409, "Upload was modified by a concurrent request")
+    try:
+        await asyncio.to_thread(_splice, chunk, session_path(session.id), offset)
+    except Exception:
+        await db.rollback()
+        raise
+    await db.commit()
+    await db.refresh(session)
+
+
+async def complete_upload(
+    db: AsyncSession, session: UploadSession, uploader: User, project_id: UUID | None = None
+) -> AttachmentResponse:
+    """Turn a fully received session into an attachment.
+
+    The file is hashed, stored as a blob and attached in one transaction
+    with the session's deletion, so completing twice cannot create two
+    attachments. The file is consumed either way: if creating the
+    attachment fails, the session is deleted in a transaction of its own
+    rather than left behind without its bytes.
+
+    Raises:
+        HTTPException(409): If not every byte has been received.
+        HTTPException(404): If a concurrent request already completed or cancelled the session.
+    """
+    if session.offset != session.size:
+        raise HTTPException(409, f"Upload is incomplete: {session.offset} of {session.size} bytes received")
+
+    path = session_path(session.id)
+    try:
+        sha256 = await asyncio.to_thread(_hash_file, path)
+    except FileNotFoundError:
+        raise HTTPException(404, "Upload not found")
+    claimed = await db.scalar(
+        delete(UploadSession)
+        .where(UploadSession.id == session.id, UploadSession.offset == UploadSession.size)
+        .returning(UploadSession.id)
+    )
+    if claimed is None:
+        await db.rollback()
+        raise HTTPException(404, "Upload not found")
+    try:
+        return await create_attachment_from_file(
+            db,
+            session.issue_id,
+            uploader,
+            path,
+            session.size,
+            sha256,
+            filename=session.filename,
+            mime_type=session.mime_type,
+            project_id=project_id,
+        )
+    except Exception:
+        await db.rollback()
+        await db.execute(delete(UploadSession).where(UploadSession.id == session.id))
+        await db.commit()
+        raise
+
+
+async def cancel_upload(db: AsyncSession, session: UploadSession) -> None:
+    """Abandon an upload session and remove its partial file."""
+    await db.execute(delete(UploadSession).where(UploadSession.id == session.id))
+    await db.commit()
+    await asyncio.to_thread(session_path(session.id).unlink, missing_ok=True)
+
+
+def _remove_stale_files(max_age: float) -> int:
+    """Remove partial and chunk files untouched for ``max_age`` seconds, including those of cascaded sessions."""
+    directory = Path(settings.UPLOAD_DIR) / INCOMING_DIR / SESSION_DIR
+    if not directory.exists():
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in directory.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+async def expire_sessions(db: AsyncSession, batch_size: int = EXPIRE_BATCH_SIZE) -> list[UUID]:
+    """Delete one batch of expired sessions and their partial files.
+
+    Args:
+        db: Database session.
+        batch_size: Maximum sessions removed.
+
+    Returns:
+        IDs of the removed sessions.
+    """
+    expired = (
+        select(UploadSession.id)
+        .where(UploadSession.expires_at < datetime.now(timezone.utc))
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        delete(UploadSession).where(UploadSession.id.in_(expired)).returning(UploadSession.id)
+    )
+    ids = list(result.scalars().all())
+    await db.commit()
+    for session_id in ids:
+        await asyncio.to_thread(session_path(session_id).unlink, missing_ok=True)
+    return ids
+
+
+class UploadSessionReaper:
+    """Background task that removes expired upload sessions and orphaned partial files."""
+
+    def __init__(self, interval: float = settings.UPLOAD_SESSION_SWEEP_INTERVAL):
+        """Initialize the reaper.
+
+        Args:
+            interval: Seconds between sweeps.
+        """
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """Remove every expired session, one batch per transaction, then stale files.
+
+        Every chunk rewrites a session's file, so a file older than the TTL
+        belongs to an expired session or to one deleted with its issue.
+
+        Returns:
+            Number of sessions and orphaned files removed.
+        """
+        removed = 0
+        while True:
+            async with async_session() as db:
+                ids = await expire_sessions(db)
+            removed += len(ids)
+            if len(ids) < EXPIRE_BATCH_SIZE:
+                break
+        return removed + await asyncio.to_thread(_remove_stale_files, settings.UPLOAD_SESSION_TTL)
+
+    def start(self) -> None:
+        """Start the periodic task (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the periodic task."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                removed = await self.run_once()
+                if removed:
+                    logger.info(f"Removed {removed} expired upload sessions and partial files")
+            except Exception:
+                logger.exception("Upload session expiry failed")
+            await asyncio.sleep(self.interval)
+
+
+# Singleton instance started with the app
+upload_session_reaper = UploadSessionReaper()
@@ -36,6 +36,8 @@ class User(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     reset_token_hash: Mapped[str | None] = mapped_column(String(255), nullable=True)
     reset_token_expires: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Batch real-time notification pushes into periodic digests
+    notification_digest: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
 
     # Relationships (back-populated from other models)
     owned_projects = relationship("Project", back_populates="owner", lazy="selectin")
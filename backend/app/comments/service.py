@@ -2,15 +2,16 @@
 
 from uuid import UUID
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User
 from app.comments.models import Comment
 from app.comments.schemas import CommentCreate, CommentUpdate
 from app.issues.models import Issue
-from app.notifications.schemas import NotificationCreate
-from app.notifications.service import create_notification
+from app.notifications.board import board_events
+from app.notifications.schemas import NotificationTemplate
+from app.notifications.service import enqueue_notifications
 
 
 async def get_comments(db: AsyncSession, issue_id: UUID) -> list[Comment]:
@@ -45,35 +46,28 @@ async def create_comment(
         content=data.content,
     )
     db.add(comment)
+
+    # Notify issue assignee and reporter (unless they are the author) in one event; delivered after commit
+    recipients = [
+        user_id
+        for user_id in dict.fromkeys((issue.assignee_id, issue.reporter_id))
+        if user_id and str(user_id) != str(author.id)
+    ]
+    preview = f"{data.content[:100]}..." if len(data.content) > 100 else data.content
+    enqueue_notifications(
+        db,
+        recipients,
+        NotificationTemplate(
+            issue_id=issue.id,
+            type="commented",
+            title=f"New comment on {issue.key}",
+            body=f"{author.name}: {preview}",
+        ),
+    )
+
     await db.commit()
     await db.refresh(comment)
-
-    # Notify issue assignee and reporter (unless they are the author)
-    # Assignee notification
-    if issue.assignee_id and str(issue.assignee_id) != str(author.id):
-        await create_notification(
-            db,
-            NotificationCreate(
-                user_id=issue.assignee_id,
-                issue_id=issue.id,
-                type="commented",
-                title=f"New comment on {issue.key}",
-                body=f"{author.name}: {data.content[:100]}..." if len(data.content) > 100 else f"{author.name}: {data.content}",
-            ),
-        )
-
-    # Reporter notification (only if assignee is different)
-    if issue.reporter_id and str(issue.reporter_id) != str(author.id) and issue.reporter_id != issue.assignee_id:
-        await create_notification(
-            db,
-            NotificationCreate(
-                user_id=issue.reporter_id,
-                issue_id=issue.id,
-                type="commented",
-                title=f"New comment on {issue.key}",
-                body=f"{author.name}: {data.content[:100]}..." if len(data.content) > 100 else f"{author.name}: {data.content}",
-            ),
-        )
+    await _publish_comment_count(db, issue)
 
     return comment
 
@@ -112,6 +106,18 @@ async def delete_comment(
     await db.delete(comment)
     await db.commit()
 
+    issue = await db.get(Issue, comment.issue_id)
+    if issue:
+        await _publish_comment_count(db, issue)
+
+
+async def _publish_comment_count(db: AsyncSession, issue: Issue) -> None:
+    """Push the issue's new comment count to anyone watching its board."""
+    if not board_events.is_watched(issue.project_id):
+        return
+    count = await db.scalar(select(func.count(Comment.id)).where(Comment.issue_id == issue.id))
+    board_events.publish(issue.project_id, "issue", issue.id, "updated", {"comment_count": count or 0})
+
 
 async def get_comment(db: AsyncSession, comment_id: UUID) -> Comment | None:
     """Get a comment by ID."""
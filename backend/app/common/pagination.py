@@ -0,0 +1,41 @@
+"""Opaque keyset cursors for ``(created_at, id)``-ordered pages."""
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encode a row's ``(created_at, id)`` keyset position as an opaque string.
+
+    Args:
+        created_at: The row's creation time.
+        row_id: The row UUID.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: The cursor string.
+
+    Returns:
+        The ``(created_at, id)`` position.
+
+    Raises:
+        HTTPException(400): If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(400, "Invalid cursor")
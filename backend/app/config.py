@@ -15,9 +15,29 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     UPLOAD_DIR: str = "uploads"
+    UPLOADS_STATIC_MOUNT: bool = False  # Also serve UPLOAD_DIR at /uploads without authorization (legacy links)
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    MAX_RESUMABLE_UPLOAD_SIZE: int = 2 * 1024 * 1024 * 1024  # 2GB, for chunked uploads through upload sessions
+    UPLOAD_SESSION_TTL: float = 24 * 3600.0  # Seconds an upload session survives without receiving a chunk
+    UPLOAD_SESSION_SWEEP_INTERVAL: float = 900.0  # Seconds between sweeps removing expired upload sessions
+    ATTACHMENT_GC_INTERVAL: float = 3600.0  # Seconds between sweeps removing unreferenced attachment blobs
+    PREVIEW_WORKERS: int = 2  # Processes rendering image thumbnails and previews
+    PREVIEW_EAGER: bool = True  # Render previews right after an image upload instead of on first request
     CORS_ORIGINS: list[str] = ["http://localhost:5173"]
 
+    # Attachment storage (UPLOAD_DIR still holds in-flight uploads and the preview cache)
+    STORAGE_BACKEND: str = "local"  # "local" (files under UPLOAD_DIR) or "s3" (any S3-compatible store)
+    S3_BUCKET: str = ""  # Bucket holding attachment objects
+    S3_PREFIX: str = ""  # Key prefix inside the bucket, e.g. "flowboard/"
+    S3_ENDPOINT_URL: str = ""  # e.g. http://minio:9000; empty = AWS
+    S3_REGION: str = ""  # Empty = boto3 default
+    S3_ACCESS_KEY_ID: str = ""  # Empty = boto3 default credential chain
+    S3_SECRET_ACCESS_KEY: str = ""  # Paired with S3_ACCESS_KEY_ID
+    S3_PART_SIZE: int = 8 * 1024 * 1024  # Multipart upload part size (minimum 5MB)
+    S3_MAX_CONNECTIONS: int = 32  # HTTP connections pooled by the shared S3 client
+    S3_PRESIGNED_DOWNLOADS: bool = True  # Redirect downloads to presigned URLs instead of proxying bytes
+    S3_PRESIGN_EXPIRY: int = 300  # Seconds a presigned download URL stays valid
+
     # Database Connection Pool Configuration (E1.6)
     # Optimized for 100+ concurrent users
     DB_POOL_SIZE: int = 20  # Number of connections to maintain
@@ -25,6 +45,41 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30  # Timeout in seconds for acquiring connection
     DB_POOL_RECYCLE: int = 3600  # Recycle connections after 1 hour
     DB_POOL_PRE_PING: bool = True  # Test connection before use
+    DB_COUNTER_POOL_SIZE: int = 5  # Connections of the separate pool issue keys are reserved on
+
+    # WebSocket delivery
+    WS_SEND_QUEUE_SIZE: int = 256  # Pending messages buffered per connection
+    WS_OVERFLOW_POLICY: str = "drop_oldest"  # "drop_oldest" or "disconnect" when a queue is full
+    WS_HEARTBEAT_INTERVAL: float = 25.0  # Seconds between server pings per connection
+    WS_IDLE_TIMEOUT: float = 75.0  # Close connections silent for this long
+    WS_TIMER_TICK: float = 1.0  # Resolution of the shared heartbeat timer wheel
+    WS_REPLAY_BUFFER_SIZE: int = 100  # Frames kept per channel for replay on reconnect
+    WS_REPLAY_MAX_CHANNELS: int = 10000  # Channels with replay buffers kept per worker (LRU)
+    BOARD_EVENT_WINDOW: float = 0.1  # Seconds over which board deltas are coalesced per project
+
+    # Notifications
+    NOTIFICATION_COALESCE_WINDOW: float = 3600.0  # Merge unread (user, issue, type) notifications this recent; 0 = off
+    NOTIFICATION_DIGEST_INTERVAL: float = 300.0  # Seconds between pushes for users in digest mode
+    NOTIFICATION_PARTITIONS_AHEAD: int = 2  # Future monthly partitions kept created
+    NOTIFICATION_RETENTION_MONTHS: int = 12  # Full months kept before the current one; 0 = keep forever
+    NOTIFICATION_ARCHIVE_DIR: str = "archive/notifications"  # Dropped partitions exported here; "" = no archive
+    NOTIFICATION_MAINTENANCE_INTERVAL: float = 6 * 3600.0  # Seconds between partition maintenance runs
+    NOTIFICATION_COALESCE_LOOKBACK_DAYS: int = 90  # Oldest rows coalescing considers, so old partitions are pruned
+
+    # Issue keys
+    ISSUE_KEY_BLOCK_SIZE: int = 1  # Issue numbers a worker reserves per project at once; >1 leaves gaps on restart
+
+    # Issue imports
+    MAX_IMPORT_FILE_SIZE: int = 500 * 1024 * 1024  # 500MB CSV/JSON export
+    IMPORT_BATCH_SIZE: int = 1000  # Issues written per import transaction
+    IMPORT_POLL_INTERVAL: float = 5.0  # Seconds between checks for pending imports when none wakes the worker
+    IMPORT_STALE_AFTER: float = 600.0  # Seconds without a committed batch before a running import is reclaimed
+
+    # Transactional outbox
+    OUTBOX_WORKERS: int = 2  # Dispatcher worker tasks per process
+    OUTBOX_BATCH_SIZE: int = 100  # Events claimed per dispatcher transaction
+    OUTBOX_POLL_INTERVAL: float = 1.0  # Seconds between polls when no commit wakes the dispatcher
+    OUTBOX_MAX_ATTEMPTS: int = 10  # Failed attempts before an event is left as dead
 
     model_config = {
         "env_file": ".env",
@@ -20,6 +20,20 @@ engine = create_async_engine(
 )
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Small pool of its own for the short transactions issue keys are reserved in.
+# Callers already hold a connection from the main pool, so waiting on that pool
+# for a second one would deadlock it once every connection belongs to such a caller.
+counter_engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    pool_size=settings.DB_COUNTER_POOL_SIZE,
+    max_overflow=0,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+counter_session = async_sessionmaker(counter_engine, class_=AsyncSession, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
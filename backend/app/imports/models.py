@@ -0,0 +1,74 @@
+"""Issue import models — map to the 'import_jobs' and 'import_issue_refs' tables."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ImportJob(Base):
+    """A CSV or JSON issue import, processed in the background in batches."""
+
+    __tablename__ = "import_jobs"
+    __table_args__ = (
+        Index("idx_import_jobs_status", "status", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    format: Mapped[str] = mapped_column(String(10), nullable=False)  # "csv" or "json"
+    # Column (CSV) or field (JSON) name to issue field, over the Jira defaults
+    mapping: Mapped[dict] = mapped_column(JSONB, nullable=False, server_default="{}")
+    status: Mapped[str] = mapped_column(String(20), nullable=False, server_default="pending")
+    total_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    processed_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    rows_imported: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    rows_failed: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    parents_linked: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # First MAX_IMPORT_ERRORS skipped rows, as {"row": n, "error": "..."}
+    errors: Mapped[list] = mapped_column(JSONB, nullable=False, server_default="[]")
+    # Why the job failed, when it did
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Set when claimed and with every batch; a running job not heard from for IMPORT_STALE_AFTER lost its worker
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ImportJob {self.filename} {self.status}>"
+
+
+class ImportIssueRef(Base):
+    """Source identifiers of an imported issue, kept until parents are linked at the end of the job.
+
+    Parents often come after their children in an export, so links are
+    resolved in the database once every row is in, rather than from an
+    in-memory index that would grow with the file.
+    """
+
+    __tablename__ = "import_issue_refs"
+    __table_args__ = (
+        Index("idx_import_issue_refs_key", "job_id", "source_key"),
+        Index("idx_import_issue_refs_id", "job_id", "source_id"),
+    )
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("import_jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    issue_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("issues.id", ondelete="CASCADE"), primary_key=True
+    )
+    source_key: Mapped[str | None] = mapped_column(String(100), nullable=True)  # e.g. Jira "Issue key"
+    source_id: Mapped[str | None] = mapped_column(String(100), nullable=True)  # e.g. Jira "Issue id"
+    parent_ref: Mapped[str | None] = mapped_column(String(100), nullable=True)  # key or id of the parent
@@ -0,0 +1,220 @@
+"""Streaming readers for CSV and JSON issue exports (Jira and similar).
+
+Each reader yields one record per issue, mapping FlowBoard field names to
+the raw text found in the export, and never holds more than one record
+plus a read buffer in memory.
+"""
+import csv
+import json
+import re
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+# Issue fields a column can be mapped to
+IMPORT_FIELDS = {
+    "title",
+    "description",
+    "type",
+    "status",
+    "priority",
+    "assignee",
+    "reporter",
+    "labels",
+    "parent",
+    "story_points",
+    "due_date",
+    "source_key",
+    "source_id",
+}
+
+# Jira CSV column headers and JSON field names (lowercase) to issue fields
+DEFAULT_MAPPING = {
+    "summary": "title",
+    "title": "title",
+    "description": "description",
+    "issue type": "type",
+    "issuetype": "type",
+    "type": "type",
+    "status": "status",
+    "priority": "priority",
+    "assignee": "assignee",
+    "reporter": "reporter",
+    "labels": "labels",
+    "parent": "parent",
+    "parent id": "parent",
+    "parent key": "parent",
+    "epic link": "parent",
+    "custom field (epic link)": "parent",
+    "story points": "story_points",
+    "story point estimate": "story_points",
+    "custom field (story points)": "story_points",
+    "custom field (story point estimate)": "story_points",
+    "due date": "due_date",
+    "duedate": "due_date",
+    "issue key": "source_key",
+    "key": "source_key",
+    "issue id": "source_id",
+    "id": "source_id",
+}
+
+# Characters read from the file per step
+READ_SIZE = 64 * 1024
+# Largest CSV cell accepted (long descriptions exceed csv's 128KB default)
+MAX_FIELD_SIZE = 10 * 1024 * 1024
+# Largest JSON issue object accepted; also bounds the buffer when the JSON is malformed
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+csv.field_size_limit(MAX_FIELD_SIZE)
+
+_JSON_SEPARATORS = re.compile(r"[\s,]*")
+# Attributes giving the text of a Jira object value, in order of preference
+_OBJECT_TEXT = ("emailAddress", "name", "value", "displayName", "key")
+_PARENT_TEXT = ("key", "id")
+
+
+class ImportFormatError(ValueError):
+    """The file cannot be read as the declared format."""
+
+
+Record = dict[str, str | list[str]]
+
+
+def build_mapping(overrides: dict[str, str | None] | None = None) -> dict[str, str]:
+    """Merge column overrides into the defaults; a ``None`` override ignores that column.
+
+    Raises:
+        ValueError: If an override names an unknown issue field.
+    """
+    mapping = dict(DEFAULT_MAPPING)
+    for column, field in (overrides or {}).items():
+        if field is None:
+            mapping.pop(column.strip().lower(), None)
+        elif field not in IMPORT_FIELDS:
+            raise ValueError(f"Unknown issue field '{field}' for column '{column}'")
+        else:
+            mapping[column.strip().lower()] = field
+    return mapping
+
+
+def _add(record: Record, field: str, value: str) -> None:
+    value = value.strip()
+    if not value:
+        return
+    if field == "labels":
+        # Jira repeats the Labels column once per label; a cell may also hold several
+        record.setdefault("labels", []).extend(value.split())
+    else:
+        record.setdefault(field, value)
+
+
+def read_csv(f: TextIO, mapping: dict[str, str]) -> Iterator[Record]:
+    """Yield one record per CSV row; the first row holds the column headers.
+
+    Repeated columns (Jira writes one ``Labels`` column per label) are all
+    read; for other fields the first non-empty column wins.
+    """
+    reader = csv.reader(f)
+    try:
+        header = next(reader, None)
+    except csv.Error as exc:
+        raise ImportFormatError(f"Invalid CSV: {exc}") from exc
+    if header is None:
+        return
+    columns = [(i, mapping[name.strip().lower()]) for i, name in enumerate(header) if name.strip().lower() in mapping]
+    if not any(field == "title" for _, field in columns):
+        raise ImportFormatError("No column maps to the issue title (e.g. 'Summary')")
+    try:
+        for row in reader:
+            record: Record = {}
+            for i, field in columns:
+                if i < len(row):
+                    _add(record, field, row[i])
+            yield record
+    except csv.Error as exc:
+        raise ImportFormatError(f"Invalid CSV on line {reader.line_num}: {exc}") from exc
+
+
+def _adf_text(node: Any) -> str:
+    """Plain text of an Atlassian Document Format value (Jira Cloud descriptions)."""
+    if isinstance(node, dict):
+        if node.get("type") == "text":
+            return node.get("text", "")
+        text = "".join(_adf_text(child) for child in node.get("content", []))
+        return text + "\n" if node.get("type") in ("paragraph", "heading", "listItem") else text
+    if isinstance(node, list):
+        return "".join(_adf_text(child) for child in node)
+    return ""
+
+
+def _text(field: str, value: Any) -> str | list[str] | None:
+    """Reduce a JSON value to the text the field needs."""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        if field == "description":
+            return _adf_text(value).strip()
+        # Jira objects: users have emailAddress/displayName, parents key, the rest name/value
+        for attr in _PARENT_TEXT if field == "parent" else _OBJECT_TEXT:
+            if value.get(attr):
+                return str(value[attr])
+        return None
+    if isinstance(value, list):
+        return [str(_text("labels", v)) for v in value if v is not None] if field == "labels" else None
+    return str(value)
+
+
+def _json_record(obj: Any, mapping: dict[str, str]) -> Record:
+    if not isinstance(obj, dict):
+        raise ImportFormatError(f"Expected an issue object, got {type(obj).__name__}")
+    flat = {k: v for k, v in obj.items() if k != "fields"}
+    if isinstance(obj.get("fields"), dict):
+        # Jira REST format: {"id", "key", "fields": {...}}
+        flat.update(obj["fields"])
+    record: Record = {}
+    for name, value in flat.items():
+        field = mapping.get(name.lower())
+        if field is None:
+            continue
+        text = _text(field, value)
+        if isinstance(text, list):
+            for label in text:
+                _add(record, field, label)
+        elif text:
+            _add(record, field, text)
+    return record
+
+
+def read_json(f: TextIO, mapping: dict[str, str]) -> Iterator[Record]:
+    """Yield one record per issue object of a JSON array or of JSON Lines.
+
+    Objects are decoded one at a time from a sliding buffer, so the whole
+    document is never parsed at once. Jira REST objects have their
+    ``fields`` flattened, and object values (users, statuses, parents) are
+    reduced to their email, name or key.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof, started = "", 0, False, False
+    while True:
+        pos = _JSON_SEPARATORS.match(buf, pos).end()
+        if pos < len(buf):
+            if not started:
+                started = True
+                if buf[pos] == "[":
+                    pos += 1
+                    continue
+            if buf[pos] == "]":
+                return
+            try:
+                obj, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as exc:
+                if eof or len(buf) - pos > MAX_RECORD_SIZE:
+                    raise ImportFormatError(f"Invalid JSON: {exc.msg}") from exc
+            else:
+                yield _json_record(obj, mapping)
+                continue
+        elif eof:
+            return
+        # Need more input: drop what has been decoded and read the next block
+        chunk = f.read(READ_SIZE)
+        eof = not chunk
+        buf, pos = buf[pos:] + chunk, 0
@@ -0,0 +1,62 @@
+"""Issue import API router."""
+import json
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Response, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_current_user
+from app.auth.models import User
+from app.common.permissions import ROLE_HIERARCHY
+from app.database import get_db
+from app.imports import service
+from app.imports.schemas import ImportJobResponse
+from app.projects import service as project_service
+
+router = APIRouter(prefix="/api/v1/projects/{project_id}/imports", tags=["imports"])
+
+
+@router.post("", response_model=ImportJobResponse, status_code=202)
+async def start_import(
+    project_id: UUID,
+    response: Response,
+    file: UploadFile = File(...),
+    mapping: str | None = Form(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Queue a CSV or JSON export (e.g. from Jira) for import; poll the returned job for progress.
+
+    ``mapping`` is an optional JSON object of column name to issue field,
+    applied over the Jira column names; ``null`` ignores a column.
+    """
+    await project_service.get_project(db, project_id, current_user)
+    role = await project_service.get_user_role_in_project(db, project_id, current_user.id)
+    if ROLE_HIERARCHY.get(role, 0) < ROLE_HIERARCHY["project_manager"]:
+        raise HTTPException(403, "Only project managers can import issues")
+    overrides = None
+    if mapping:
+        try:
+            overrides = json.loads(mapping)
+        except ValueError as exc:
+            raise HTTPException(422, "mapping must be a JSON object") from exc
+        if not isinstance(overrides, dict):
+            raise HTTPException(422, "mapping must be a JSON object")
+
+    job = await service.create_import_job(db, project_id, current_user, file, overrides)
+    service.import_worker.wake()
+    response.headers["Location"] = f"/api/v1/projects/{project_id}/imports/{job.id}"
+    return ImportJobResponse.model_validate(job)
+
+
+@router.get("/{import_id}", response_model=ImportJobResponse)
+async def import_status(
+    project_id: UUID,
+    import_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Report an import's progress, counts and skipped rows."""
+    await project_service.get_project(db, project_id, current_user)
+    job = await service.get_import_job(db, project_id, import_id)
+    return ImportJobResponse.model_validate(job)
@@ -0,0 +1,35 @@
+"""Pydantic schemas for issue import endpoints."""
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    """A row that was skipped, numbered from 1 after the header."""
+
+    row: int
+    error: str
+
+
+class ImportJobResponse(BaseModel):
+    """State of an import; poll until ``status`` is completed or failed."""
+
+    id: UUID
+    project_id: UUID
+    filename: str
+    format: str
+    status: str  # pending, running, completed or failed
+    total_bytes: int
+    processed_bytes: int  # bytes of the file read so far
+    rows_imported: int
+    rows_failed: int
+    parents_linked: int  # set once every row is in
+    errors: list[ImportRowError]  # first MAX_IMPORT_ERRORS skipped rows
+    error: str | None  # why the job failed
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = {"from_attributes": True}
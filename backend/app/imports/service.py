@@ -0,0 +1,520 @@
+"""Issue import business logic: jobs, row mapping and the batch writer.
+
+An upload is stored under UPLOAD_DIR and recorded as a pending job; the
+import worker then reads it as a stream, maps each record to an issue with
+lookup tables built once per job, and writes ``IMPORT_BATCH_SIZE`` issues
+per transaction. Parents are linked in the database after the last batch.
+"""
+import asyncio
+import io
+import itertools
+import logging
+import os
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO
+from uuid import UUID
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import delete, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.attachments.service import INCOMING_DIR, stream_to_temp
+from app.auth.models import User
+from app.config import settings
+from app.database import async_session
+from app.imports.models import ImportIssueRef, ImportJob
+from app.imports.parsers import ImportFormatError, Record, build_mapping, read_csv, read_json
+from app.issues.keys import issue_keys
+from app.issues.models import Issue, IssueLabel, IssuePriority, IssueType
+from app.issues.ranking import append_ranks
+from app.issues.service import VALID_PARENTS
+from app.projects.models import Label, ProjectMember, StatusCategory, WorkflowStatus
+
+logger = logging.getLogger(__name__)
+
+IMPORT_DIR = "imports"
+# File suffix to import format
+FORMATS = {".csv": "csv", ".json": "json", ".jsonl": "json", ".ndjson": "json"}
+# Skipped rows reported on the job; later ones are only counted
+MAX_IMPORT_ERRORS = 100
+
+# Jira issue type and priority names (lowercase); unknown types import as tasks
+TYPE_NAMES = {
+    "epic": IssueType.epic,
+    "story": IssueType.story,
+    "task": IssueType.task,
+    "bug": IssueType.bug,
+    "sub-task": IssueType.subtask,
+    "subtask": IssueType.subtask,
+}
+PRIORITY_NAMES = {
+    "highest": IssuePriority.critical,
+    "blocker": IssuePriority.critical,
+    "critical": IssuePriority.critical,
+    "high": IssuePriority.high,
+    "major": IssuePriority.high,
+    "medium": IssuePriority.medium,
+    "low": IssuePriority.low,
+    "minor": IssuePriority.low,
+    "lowest": IssuePriority.low,
+    "trivial": IssuePriority.low,
+}
+# Date formats tried after ISO 8601; the first is Jira's CSV export format
+DATE_FORMATS = ("%d/%b/%y %I:%M %p", "%d/%b/%y", "%m/%d/%Y", "%d.%m.%Y")
+
+
+def import_path(job_id: UUID) -> Path:
+    """Return the file holding an import's upload until the job finishes."""
+    return Path(settings.UPLOAD_DIR) / INCOMING_DIR / IMPORT_DIR / str(job_id)
+
+
+def _move_into_place(temp: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp, target)
+
+
+async def create_import_job(
+    db: AsyncSession,
+    project_id: UUID,
+    user: User,
+    file: UploadFile,
+    mapping: dict[str, str | None] | None = None,
+) -> ImportJob:
+    """Store an uploaded export and queue it for import.
+
+    Raises:
+        HTTPException(400): If the file is not .csv, .json, .jsonl or .ndjson.
+        HTTPException(413): If it exceeds ``MAX_IMPORT_FILE_SIZE``.
+        HTTPException(422): If ``mapping`` names an unknown issue field.
+    """
+    filename = file.filename or "import"
+    import_format = FORMATS.get(Path(filename).suffix.lower())
+    if import_format is None:
+        raise HTTPException(400, "Unsupported import file; upload a .csv, .json or .jsonl export")
+    try:
+        build_mapping(mapping)
+    except ValueError as exc:
+        raise HTTPException(422, str(exc)) from exc
+
+    temp, size, _ = await stream_to_temp(file, settings.MAX_IMPORT_FILE_SIZE)
+    job = ImportJob(
+        id=uuid.uuid4(),
+        project_id=project_id,
+        user_id=user.id,
+        filename=filename[:255],
+        format=import_format,
+        mapping=mapping or {},
+        status="pending",
+        total_bytes=size,
+    )
+    try:
+        await asyncio.to_thread(_move_into_place, temp, import_path(job.id))
+        db.add(job)
+        await db.commit()
+    except BaseException:
+        await asyncio.to_thread(import_path(job.id).unlink, missing_ok=True)
+        await asyncio.to_thread(temp.unlink, missing_ok=True)
+        raise
+    await db.refresh(job)
+    return job
+
+
+async def get_import_job(db: AsyncSession, project_id: UUID, job_id: UUID) -> ImportJob:
+    """Get an import of the project.
+
+    Raises:
+        HTTPException(404): If the job does not exist in this project.
+    """
+    job = await db.get(ImportJob, job_id)
+    if not job or job.project_id != project_id:
+        raise HTTPException(404, "Import not found")
+    return job
+
+
+@dataclass
+class Lookups:
+    """Project data that rows are resolved against, loaded once per job.
+
+    Sized by the project (statuses, members, labels), not by the file.
+    """
+
+    statuses: dict[str, UUID]  # lowercase name
+    default_status_id: UUID
+    users: dict[str, UUID]  # lowercase email and name of project members
+    labels: dict[str, UUID] = field(default_factory=dict)  # exact name; grows with labels the import creates
+
+
+async def load_lookups(db: AsyncSession, project_id: UUID) -> Lookups:
+    """Build the lookup tables for a project with one query each.
+
+    Raises:
+        ImportFormatError: If the project has no 'todo' status for rows without a known status.
+    """
+    statuses = (
+        await db.execute(
+            select(WorkflowStatus.name, WorkflowStatus.id, WorkflowStatus.category)
+            .where(WorkflowStatus.project_id == project_id)
+            .order_by(WorkflowStatus.position)
+        )
+    ).all()
+    default = next((s.id for s in statuses if s.category == StatusCategory.todo), None)
+    if default is None:
+        raise ImportFormatError("Project has no 'todo' workflow status")
+
+    users: dict[str, UUID] = {}
+    members = await db.execute(
+        select(User.id, User.email, User.name)
+        .join(ProjectMember, ProjectMember.user_id == User.id)
+        .where(ProjectMember.project_id == project_id)
+    )
+    for user_id, email, name in members.all():
+        users.setdefault(name.lower(), user_id)
+        users[email.lower()] = user_id
+
+    labels = await db.execute(select(Label.name, Label.id).where(Label.project_id == project_id))
+    return Lookups(
+        statuses={s.name.lower(): s.id for s in reversed(statuses)},
+        default_status_id=default,
+        users=users,
+        labels=dict(labels.all()),
+    )
+
+
+@dataclass
+class PendingIssue:
+    """A mapped row waiting for its key, label ids and batch insert."""
+
+    values: dict  # Issue columns other than id, project_id and key
+    labels: list[str]
+    source_key: str | None
+    source_id: str | None
+    parent_ref: str | None
+
+
+def _parse_date(value: str) -> date | None:
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_points(value: str) -> int | None:
+    try:
+        points = round(float(value))
+    except (ValueError, OverflowError):
+        return None
+    return points if 0 <= points <= 100 else None
+
+
+def _ref(record: Record, name: str) -> str | None:
+    value = record.get(name)
+    return value[:100] if value else None
+
+
+def prepare_issue(record: Record, lookups: Lookups, reporter_id: UUID) -> PendingIssue:
+    """Map one record to issue column values.
+
+    Unknown types import as tasks, unknown statuses as the project's first
+    'todo' status, unknown assignees as unassigned and unknown reporters as
+    the user running the import. Unparseable dates and story points are
+    dropped.
+
+    Raises:
+        ValueError: If the row has no title.
+    """
+    title = record.get("title")
+    if not title:
+        raise ValueError("Missing title")
+    lower = {name: record[name].lower() for name in ("type", "status", "priority", "assignee", "reporter")
+             if name in record}
+    return PendingIssue(
+        values={
+            "type": TYPE_NAMES.get(lower.get("type", ""), IssueType.task),
+            "title": title[:500],
+            "description": record.get("description"),
+            "status_id": lookups.statuses.get(lower.get("status", ""), lookups.default_status_id),
+            "priority": PRIORITY_NAMES.get(lower.get("priority", ""), IssuePriority.medium),
+            "assignee_id": lookups.users.get(lower.get("assignee", "")),
+            "reporter_id": lookups.users.get(lower.get("reporter", ""), reporter_id),
+            "story_points": _parse_points(record["story_points"]) if "story_points" in record else None,
+            "due_date": _parse_date(record["due_date"]) if "due_date" in record else None,
+        },
+        labels=list(dict.fromkeys(label[:100] for label in record.get("labels", []))),
+        source_key=_ref(record, "source_key"),
+        source_id=_ref(record, "source_id"),
+        parent_ref=_ref(record, "parent"),
+    )
+
+
+def read_batch(
+    records: Iterator[Record], lookups: Lookups, reporter_id: UUID, row: int, size: int
+) -> tuple[list[PendingIssue], list[dict], int]:
+    """Read and map up to ``size`` records (runs in a worker thread, as parsing is CPU-bound).
+
+    Returns:
+        The mapped issues, the skipped rows as ``{"row", "error"}`` and the last row number read.
+    """
+    batch: list[PendingIssue] = []
+    errors: list[dict] = []
+    for record in records:
+        row += 1
+        try:
+            batch.append(prepare_issue(record, lookups, reporter_id))
+        except ValueError as exc:
+            errors.append({"row": row, "error": str(exc)})
+        if len(batch) + len(errors) >= size:
+            break
+    return batch, errors, row
+
+
+async def _resolve_labels(db: AsyncSession, project_id: UUID, lookups: Lookups, batch: list[PendingIssue]) -> None:
+    """Create the batch's labels that the project does not have yet, in one statement."""
+    missing = list(dict.fromkeys(name for pending in batch for name in pending.labels if name not in lookups.labels))
+    if not missing:
+        return
+    stmt = pg_insert(Label).values([{"project_id": project_id, "name": name} for name in missing])
+    # A label created concurrently is returned too, as the no-op update still produces a row
+    stmt = stmt.on_conflict_do_update(constraint="uq_labels_project_name", set_={"name": stmt.excluded.name})
+    result = await db.execute(stmt.returning(Label.name, Label.id))
+    lookups.labels.update(result.all())
+
+
+async def write_batch(db: AsyncSession, job: ImportJob, lookups: Lookups, batch: list[PendingIssue]) -> None:
+    """Insert one batch of issues with their labels and source references (no commit).
+
+    Keys come from one counter update and every table is written with a
+    multi-row INSERT. Imports don't notify assignees.
+    """
+    await _resolve_labels(db, job.project_id, lookups, batch)
+    keys = await issue_keys.reserve(db, job.project_id, len(batch))
+    ids = [uuid.uuid4() for _ in batch]
+    ranks = await append_ranks(db, job.project_id, [pending.values["status_id"] for pending in batch])
+    await db.execute(
+        insert(Issue),
+        [
+            {"id": ids[n], "project_id": job.project_id, "key": keys[n], "rank": ranks[n], **pending.values}
+            for n, pending in enumerate(batch)
+        ],
+    )
+    label_rows = [
+        {"issue_id": ids[n], "label_id": lookups.labels[name]}
+        for n, pending in enumerate(batch)
+        for name in pending.labels
+    ]
+    if label_rows:
+        await db.execute(insert(IssueLabel), label_rows)
+    ref_rows = [
+        {
+            "job_id": job.id,
+            "issue_id": ids[n],
+            "source_key": pending.source_key,
+            "source_id": pending.source_id,
+            "parent_ref": pending.parent_ref,
+        }
+        for n, pending in enumerate(batch)
+        if pending.source_key or pending.source_id or pending.parent_ref
+    ]
+    if ref_rows:
+        await db.execute(insert(ImportIssueRef), ref_rows)
+
+
+async def link_parents(db: AsyncSession, job_id: UUID) -> int:
+    """Set the parents of the job's issues from their source references, then drop the references.
+
+    Runs as one UPDATE joining the references to themselves; links that
+    break the hierarchy rules, or point outside the file, are left unset.
+
+    Returns:
+        Number of issues given a parent.
+    """
+    child, parent = aliased(ImportIssueRef), aliased(ImportIssueRef)
+    parent_issue = aliased(Issue)
+    allowed = [(issue_type, parent_type) for issue_type, parents in VALID_PARENTS.items() for parent_type in parents]
+    result = await db.execute(
+        update(Issue)
+        .where(
+            Issue.id == child.issue_id,
+            child.job_id == job_id,
+            parent.job_id == job_id,
+            or_(parent.source_key == child.parent_ref, parent.source_id == child.parent_ref),
+            parent_issue.id == parent.issue_id,
+            tuple_(Issue.type, parent_issue.type).in_(allowed),
+        )
+        .values(parent_id=parent.issue_id)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(delete(ImportIssueRef).where(ImportIssueRef.job_id == job_id))
+    return result.rowcount
+
+
+def _open_text(raw: BinaryIO) -> io.TextIOWrapper:
+    # utf-8-sig drops the BOM Excel and Jira put at the start of CSV files
+    return io.TextIOWrapper(raw, encoding="utf-8-sig", errors="replace", newline="")
+
+
+async def _process(db: AsyncSession, job: ImportJob) -> None:
+    lookups = await load_lookups(db, job.project_id)
+    raw = await asyncio.to_thread(open, import_path(job.id), "rb")
+    try:
+        text = _open_text(raw)
+        mapping = build_mapping(job.mapping)
+        records = read_csv(text, mapping) if job.format == "csv" else read_json(text, mapping)
+        # A reclaimed job resumes after the rows of its committed batches
+        row = job.rows_imported + job.rows_failed
+        records = itertools.islice(records, row, None)
+        while True:
+            batch, errors, row = await asyncio.to_thread(
+                read_batch, records, lookups, job.user_id, row, settings.IMPORT_BATCH_SIZE
+            )
+            if not batch and not errors:
+                break
+            if batch:
+                await write_batch(db, job, lookups, batch)
+            # Progress commits with its batch, so it always matches what is in the database
+            job.processed_bytes = raw.tell()
+            job.rows_imported += len(batch)
+            job.rows_failed += len(errors)
+            if len(job.errors) < MAX_IMPORT_ERRORS:
+                job.errors = job.errors + errors[:MAX_IMPORT_ERRORS - len(job.errors)]
+            job.heartbeat_at = datetime.now(timezone.utc)
+            await db.commit()
+    finally:
+        await asyncio.to_thread(raw.close)
+
+    job.parents_linked = await link_parents(db, job.id)
+    job.processed_bytes = job.total_bytes
+    job.status = "completed"
+    job.finished_at = datetime.now(timezone.utc)
+    await db.commit()
+
+
+async def run_import(job_id: UUID) -> None:
+    """Import a claimed job's file, one bounded transaction per batch.
+
+    Batches committed before a failure stay imported; the job records how
+    far it got and why it failed. The uploaded file is removed either way.
+    """
+    try:
+        async with async_session() as db:
+            job = await db.get(ImportJob, job_id)
+            try:
+                await _process(db, job)
+            except Exception as exc:
+                await db.rollback()
+                if not isinstance(exc, ImportFormatError):
+                    logger.exception(f"Import {job_id} failed")
+                await db.execute(
+                    update(ImportJob)
+                    .where(ImportJob.id == job_id)
+                    .values(status="failed", error=str(exc)[:1000], finished_at=func.now())
+                )
+                await db.execute(delete(ImportIssueRef).where(ImportIssueRef.job_id == job_id))
+                await db.commit()
+    finally:
+        await asyncio.to_thread(import_path(job_id).unlink, missing_ok=True)
+
+
+async def claim_job(db: AsyncSession) -> UUID | None:
+    """Mark the oldest pending job as running and return it; workers skip each other's claims.
+
+    A running job whose worker has not committed a batch for
+    ``IMPORT_STALE_AFTER`` seconds is taken to have lost its worker and is
+    claimed again; it resumes after the rows already imported.
+    """
+    stale = datetime.now(timezone.utc) - timedelta(seconds=settings.IMPORT_STALE_AFTER)
+    pending = (
+        select(ImportJob.id)
+        .where(or_(
+            ImportJob.status == "pending",
+            (ImportJob.status == "running") & (ImportJob.heartbeat_at < stale),
+        ))
+        .order_by(ImportJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    job_id = await db.scalar(
+        update(ImportJob)
+        .where(ImportJob.id == pending)
+        .values(
+            status="running",
+            started_at=func.coalesce(ImportJob.started_at, func.now()),
+            heartbeat_at=func.now(),
+        )
+        .returning(ImportJob.id)
+    )
+    await db.commit()
+    return job_id
+
+
+class ImportWorker:
+    """Background task running pending imports one at a time."""
+
+    def __init__(self, interval: float = settings.IMPORT_POLL_INTERVAL):
+        """Initialize the worker.
+
+        Args:
+            interval: Seconds between polls when no new import wakes the worker.
+        """
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    def wake(self) -> None:
+        """Look for pending jobs now rather than at the next poll."""
+        self._wake.set()
+
+    async def run_once(self) -> int:
+        """Run pending jobs until none is left.
+
+        Returns:
+            Number of jobs run.
+        """
+        ran = 0
+        while True:
+            async with async_session() as db:
+                job_id = await claim_job(db)
+            if job_id is None:
+                return ran
+            await run_import(job_id)
+            ran += 1
+
+    def start(self) -> None:
+        """Start the periodic task (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the periodic task."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Import worker failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+# Singleton instance started with the app
+import_worker = ImportWorker()
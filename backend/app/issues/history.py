@@ -0,0 +1,124 @@
+"""Field-level issue history: change tracking and paginated reads."""
+import enum
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.pagination import decode_cursor
+from app.issues.models import Issue, IssueHistory
+
+# Issue attributes recorded in issue_history when they change
+TRACKED_FIELDS = (
+    "type",
+    "title",
+    "description",
+    "status_id",
+    "priority",
+    "assignee_id",
+    "sprint_id",
+    "parent_id",
+    "story_points",
+    "due_date",
+)
+# History field of label changes; one row per label added (old_value null) or removed (new_value null)
+LABELS_FIELD = "labels"
+
+
+def history_value(value) -> str | None:
+    """Render a field value for an issue history row."""
+    if value is None:
+        return None
+    if isinstance(value, enum.Enum):
+        return value.value
+    return str(value)
+
+
+class ChangeTracker:
+    """Collects the field changes of one edit and writes them as a single multi-row insert.
+
+    ``watch`` snapshots the tracked attributes of a loaded issue before it
+    is modified (a snapshot, unlike the ORM's attribute history, survives
+    autoflushes triggered by validation queries); ``record`` adds a change
+    made without loading issues, as the set-based bulk paths do. ``flush``
+    diffs the watched issues and inserts every row in the caller's
+    transaction, so history commits or rolls back with the change itself.
+    """
+
+    def __init__(self, user_id: UUID):
+        """Initialize the tracker.
+
+        Args:
+            user_id: User making the changes.
+        """
+        self.user_id = user_id
+        self.rows: list[dict] = []
+        self._watched: list[tuple[Issue, dict]] = []
+
+    def watch(self, issue: Issue) -> None:
+        """Snapshot an issue's tracked attributes; changes are diffed on flush."""
+        self._watched.append((issue, {name: getattr(issue, name) for name in TRACKED_FIELDS}))
+
+    def record(self, issue_id: UUID, field: str, old, new) -> None:
+        """Record one field change (ignored when the value did not change)."""
+        if old != new:
+            self.rows.append({
+                "issue_id": issue_id,
+                "user_id": self.user_id,
+                "field": field,
+                "old_value": history_value(old),
+                "new_value": history_value(new),
+            })
+
+    def changed(self) -> dict[UUID, set[str]]:
+        """Diff the watched issues, then return the changed fields of every issue so far."""
+        for issue, before in self._watched:
+            for name, old in before.items():
+                self.record(issue.id, name, old, getattr(issue, name))
+        self._watched.clear()
+        fields: dict[UUID, set[str]] = {}
+        for row in self.rows:
+            fields.setdefault(row["issue_id"], set()).add(row["field"])
+        return fields
+
+    async def flush(self, db: AsyncSession) -> None:
+        """Insert the recorded history rows (no commit)."""
+        self.changed()
+        if self.rows:
+            await db.execute(insert(IssueHistory), self.rows)
+            self.rows = []
+
+
+async def get_issue_history(
+    db: AsyncSession, project_id: UUID, issue_id: UUID, limit: int = 50, cursor: str | None = None
+) -> list[IssueHistory]:
+    """Get one page of an issue's history, newest first.
+
+    Pages are keyset-paginated on ``(created_at, id)`` over
+    ``idx_issue_history_issue_id``; the issue itself is not loaded.
+
+    Args:
+        db: Database session.
+        project_id: Project the issue must belong to.
+        issue_id: The issue UUID.
+        limit: Maximum number of entries to return.
+        cursor: Return entries after this position (see :func:`app.common.pagination.encode_cursor`).
+
+    Returns:
+        History entries, ordered by created_at then id, descending.
+
+    Raises:
+        HTTPException(404): If the issue is not in the project.
+        HTTPException(400): If the cursor is malformed.
+    """
+    exists = await db.scalar(select(Issue.id).where(Issue.id == issue_id, Issue.project_id == project_id))
+    if exists is None:
+        raise HTTPException(404, "Issue not found")
+
+    query = select(IssueHistory).where(IssueHistory.issue_id == issue_id)
+    if cursor is not None:
+        query = query.where(tuple_(IssueHistory.created_at, IssueHistory.id) < tuple_(*decode_cursor(cursor)))
+    query = query.order_by(IssueHistory.created_at.desc(), IssueHistory.id.desc()).limit(limit)
+    result = await db.execute(query)
+    return list(result.scalars().all())
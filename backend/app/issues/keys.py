@@ -0,0 +1,93 @@
+"""Issue key allocation from per-project counters."""
+import asyncio
+from collections import defaultdict
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import counter_session
+from app.projects.models import Project, ProjectIssueCounter
+
+
+class IssueKeyAllocator:
+    """Hands out issue keys ("FB-42") from ``project_issue_counters``.
+
+    Numbers are reserved in a transaction of their own, committed at once,
+    so a project's counter row is locked for one statement instead of until
+    the issue commits, and the projects row is never written. That
+    transaction runs on ``counter_session``, a small pool separate from the
+    one the caller's session holds a connection of, so reservations never
+    wait on the main pool. An issue that fails to commit leaves a gap in its
+    project's numbering.
+
+    With ``block_size`` above 1, each worker reserves numbers a block at a
+    time and hands them out from memory: one counter update per block, at
+    the cost of keys following creation order only within a worker, and of
+    the unused rest of a block being skipped when the worker stops. Only
+    numbers are cached; the key prefix is read from the project on every
+    call, so keys follow a project's current key.
+    """
+
+    def __init__(self, block_size: int = settings.ISSUE_KEY_BLOCK_SIZE, session_factory=counter_session):
+        """Initialize the allocator.
+
+        Args:
+            block_size: Numbers reserved per counter update; 1 reserves exactly what is asked.
+            session_factory: Opens the sessions counter updates run (and commit) in.
+        """
+        self.block_size = max(block_size, 1)
+        self.session_factory = session_factory
+        self._blocks: dict[UUID, range] = {}
+        self._locks: defaultdict[UUID, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def reserve(self, db: AsyncSession, project_id: UUID, count: int) -> list[str]:
+        """Reserve ``count`` keys of a project, in increasing order.
+
+        Args:
+            db: The caller's session, which the project's key is read through in block mode.
+            project_id: Project the issues belong to.
+            count: Number of keys.
+
+        Raises:
+            HTTPException(404): If the project does not exist.
+        """
+        if self.block_size == 1:
+            prefix, numbers = await self._reserve_numbers(project_id, count)
+            return [f"{prefix}-{n}" for n in numbers]
+
+        prefix = await db.scalar(select(Project.key).where(Project.id == project_id))
+        if prefix is None:
+            raise HTTPException(404, "Project not found")
+        async with self._locks[project_id]:
+            numbers = self._blocks.pop(project_id, range(0))
+            if len(numbers) >= count:
+                taken, rest = list(numbers[:count]), numbers[count:]
+            else:
+                needed = count - len(numbers)
+                _, block = await self._reserve_numbers(project_id, max(needed, self.block_size))
+                taken, rest = [*numbers, *block[:needed]], block[needed:]
+            if rest:
+                self._blocks[project_id] = rest
+        return [f"{prefix}-{n}" for n in taken]
+
+    async def _reserve_numbers(self, project_id: UUID, count: int) -> tuple[str, range]:
+        """Advance the project's counter by ``count``; returns the key prefix and the numbers reserved."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(ProjectIssueCounter)
+                .where(ProjectIssueCounter.project_id == project_id, Project.id == ProjectIssueCounter.project_id)
+                .values(last_value=ProjectIssueCounter.last_value + count)
+                .returning(ProjectIssueCounter.last_value, Project.key)
+                .execution_options(synchronize_session=False)
+            )
+            row = result.one_or_none()
+            await db.commit()
+        if row is None:
+            raise HTTPException(404, "Project not found")
+        return row.key, range(row.last_value - count + 1, row.last_value + 1)
+
+
+issue_keys = IssueKeyAllocator()
@@ -42,7 +42,7 @@ class Issue(Base):
         Index("idx_issues_parent_id", "parent_id"),
         Index("idx_issues_type", "type"),
         Index("idx_issues_priority", "priority"),
-        Index("idx_issues_position", "project_id", "status_id", "position"),
+        Index("idx_issues_rank", "project_id", "status_id", "rank"),
         Index("idx_issues_key", "key"),
         UniqueConstraint("project_id", "key", name="uq_issues_project_key"),
     )
@@ -78,7 +78,10 @@ class Issue(Base):
     )
     story_points: Mapped[int | None] = mapped_column(Integer, nullable=True)
     due_date: Mapped[date | None] = mapped_column(Date, nullable=True)
-    position: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # Board order within a column (see app.issues.ranking); "C" collation compares ranks bytewise
+    rank: Mapped[str] = mapped_column(String(64, collation="C"), nullable=False)
+    # Optimistic concurrency token: every edit bumps it (see app.issues.service.claim_version)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
@@ -92,7 +95,10 @@ class Issue(Base):
     labels = relationship("Label", secondary="issue_labels", lazy="selectin")
     comments = relationship("Comment", back_populates="issue", cascade="all, delete-orphan", lazy="selectin")
     attachments = relationship("Attachment", back_populates="issue", cascade="all, delete-orphan", lazy="selectin")
-    history = relationship("IssueHistory", back_populates="issue", cascade="all, delete-orphan", lazy="selectin")
+    # Read a page at a time through app.issues.history; the database cascades deletes
+    history = relationship(
+        "IssueHistory", back_populates="issue", cascade="all, delete-orphan", passive_deletes=True, lazy="raise"
+    )
 
     def __repr__(self) -> str:
         return f"<Issue {self.key}: {self.title[:40]}>"
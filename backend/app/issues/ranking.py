@@ -0,0 +1,244 @@
+"""Lexicographic ranks ordering issues within a board column.
+
+A rank is a string over ``0-9a-z`` read as a base-36 fraction (``"i"`` is
+18/36). No rank ends in ``"0"``, so string order (the column uses the "C"
+collation) matches numeric order and there is always room between two
+distinct ranks: moving a card computes one rank between its neighbours and
+updates a single row. Repeated moves into the same gap lengthen ranks; once
+one passes ``REBALANCE_LENGTH`` its column is respaced in the background.
+Appends that run out of leading digits respace their column at once.
+"""
+import asyncio
+import logging
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.issues.models import Issue
+
+logger = logging.getLogger(__name__)
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+# Leading digits stepped when appending to a column, and the width respaced ranks start from
+HEAD_WIDTH = 6
+# Gap left by each append or prepend (36**6 / 36**3 = 46656 appends to fill the space)
+APPEND_STEP = BASE ** 3
+# Ranks longer than this get their column respaced in the background
+REBALANCE_LENGTH = 24
+# Width of the rank column; a move that would need more respaces its column first
+MAX_RANK_LENGTH = 64
+
+
+def _encode(value: int, width: int) -> str:
+    """Render ``value / BASE**width`` as a rank (trailing zeros dropped)."""
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def _head(rank: str) -> int:
+    """Value of the first ``HEAD_WIDTH`` digits of a rank."""
+    return int(rank[:HEAD_WIDTH].ljust(HEAD_WIDTH, "0"), BASE)
+
+
+def _midpoint(low: str, high: str | None) -> str:
+    """Shortest rank strictly between ``low`` ("" for the start) and ``high`` (None for the end)."""
+    digits = []
+    i = 0
+    while True:
+        lo = DIGITS.index(low[i]) if i < len(low) else 0
+        if high is None:
+            hi = BASE
+        else:
+            hi = DIGITS.index(high[i]) if i < len(high) else 0
+        if hi - lo > 1:
+            digits.append(DIGITS[(lo + hi) // 2])
+            return "".join(digits)
+        digits.append(DIGITS[lo])
+        if hi > lo:
+            # Past the first differing digit anything above ``low`` sorts below ``high``
+            high = None
+        i += 1
+
+
+def rank_between(after: str | None, before: str | None) -> str:
+    """Compute a rank sorting after ``after`` and before ``before``.
+
+    Args:
+        after: Rank of the issue above, or None at the top of the column.
+        before: Rank of the issue below, or None at the end of the column.
+
+    Returns:
+        The new rank. Appending and prepending step the leading digits so
+        ranks stay short; only inserts between two issues bisect.
+
+    Raises:
+        ValueError: If ``after`` does not sort before ``before``.
+    """
+    if after is None and before is None:
+        return DIGITS[BASE // 2]
+    if before is None:
+        value = _head(after) + APPEND_STEP
+        return _encode(value, HEAD_WIDTH) if value < BASE ** HEAD_WIDTH else _midpoint(after, None)
+    if after is None:
+        value = _head(before) - APPEND_STEP
+        return _encode(value, HEAD_WIDTH) if value > 0 else _midpoint("", before)
+    if after >= before:
+        raise ValueError(f"Rank {after!r} does not sort before {before!r}")
+    return _midpoint(after, before)
+
+
+def spread_ranks(count: int) -> list[str]:
+    """Evenly spaced ranks for a column of ``count`` issues.
+
+    The ranks fill the middle half of the space, leaving room to append
+    and prepend by ``APPEND_STEP`` before the ends need bisecting.
+    """
+    width = HEAD_WIDTH
+    while BASE ** width // 2 // (count + 1) < 2:
+        width += 1
+    step = BASE ** width // 2 // (count + 1)
+    start = BASE ** width // 4
+    return [_encode(start + step * (n + 1), width) for n in range(count)]
+
+
+def _appends_fit(tail: str | None, count: int) -> bool:
+    """Whether ``count`` appends after ``tail`` can all step the leading digits."""
+    if tail is None:
+        return count <= (BASE ** HEAD_WIDTH - _head(DIGITS[BASE // 2])) // APPEND_STEP
+    return len(tail) <= REBALANCE_LENGTH and _head(tail) + count * APPEND_STEP < BASE ** HEAD_WIDTH
+
+
+def _spread_after(tail: str, count: int) -> list[str]:
+    """Evenly spaced ranks for ``count`` issues between ``tail`` ("" for none) and the end of the space."""
+    width = max(HEAD_WIDTH, len(tail))
+    while (BASE ** width - int(tail.ljust(width, "0"), BASE)) // (count + 1) < 2:
+        width += 1
+    low = int(tail.ljust(width, "0"), BASE)
+    step = (BASE ** width - low) // (count + 1)
+    return [_encode(low + step * (n + 1), width) for n in range(count)]
+
+
+async def append_ranks(db: AsyncSession, project_id: UUID, status_ids: list[UUID]) -> list[str]:
+    """Rank new issues after the last issue of their columns, in the given order.
+
+    A column whose tail has no room left to step the leading digits for
+    its new issues is respaced first, in the caller's transaction, so
+    appending never falls back to bisecting towards the end of the space.
+    A batch too large even for a respaced column is spread evenly over
+    the space after its tail.
+
+    Args:
+        db: Session the issues will be inserted with.
+        project_id: Project the issues belong to.
+        status_ids: Column of each new issue.
+
+    Returns:
+        One rank per entry of ``status_ids``, none longer than ``MAX_RANK_LENGTH``.
+    """
+    columns: dict[UUID, list[str]] = {}
+    for status_id, count in Counter(status_ids).items():
+        # max() over the (project_id, status_id, rank) index is a single index probe
+        tail = await db.scalar(
+            select(func.max(Issue.rank)).where(Issue.project_id == project_id, Issue.status_id == status_id)
+        )
+        if not _appends_fit(tail, count):
+            respaced = await rebalance_column(db, project_id, status_id)
+            tail = max(respaced.values(), default=None)
+            logger.info(f"Respaced {len(respaced)} issue ranks in column {status_id} of project {project_id}")
+        if _appends_fit(tail, count):
+            ranks = []
+            for _ in range(count):
+                tail = rank_between(tail, None)
+                ranks.append(tail)
+        else:
+            ranks = _spread_after(tail or "", count)
+        columns[status_id] = ranks[::-1]
+    return [columns[status_id].pop() for status_id in status_ids]
+
+
+async def rebalance_column(db: AsyncSession, project_id: UUID, status_id: UUID) -> dict[UUID, str]:
+    """Respace the ranks of one board column, keeping its order.
+
+    The column's rows stay locked until the caller commits, so a move
+    reading its neighbours' ranks waits for the new ones.
+
+    Returns:
+        New rank of every issue in the column, by issue id.
+    """
+    ids = list(await db.scalars(
+        select(Issue.id)
+        .where(Issue.project_id == project_id, Issue.status_id == status_id)
+        .order_by(Issue.rank, Issue.id)
+        .with_for_update()
+    ))
+    ranks = dict(zip(ids, spread_ranks(len(ids))))
+    if ranks:
+        await db.execute(update(Issue), [{"id": issue_id, "rank": rank} for issue_id, rank in ranks.items()])
+    return ranks
+
+
+class RankRebalancer:
+    """Background task respacing board columns whose ranks ran out of precision.
+
+    Columns are queued in memory as moves notice long ranks; a request lost
+    with the process is made again by the next move into the column.
+    """
+
+    def __init__(self):
+        """Initialize the rebalancer."""
+        self._pending: set[tuple[UUID, UUID]] = set()
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    def request(self, project_id: UUID, status_id: UUID) -> None:
+        """Queue a column for respacing."""
+        self._pending.add((project_id, status_id))
+        self._wake.set()
+
+    async def run_once(self) -> int:
+        """Respace every queued column, one transaction each.
+
+        Returns:
+            Number of columns respaced.
+        """
+        done = 0
+        while self._pending:
+            project_id, status_id = self._pending.pop()
+            async with async_session() as db:
+                ranks = await rebalance_column(db, project_id, status_id)
+                await db.commit()
+            logger.info(f"Respaced {len(ranks)} issue ranks in column {status_id} of project {project_id}")
+            done += 1
+        return done
+
+    def start(self) -> None:
+        """Start the background task (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Rank rebalancing failed")
+
+
+# Singleton instance started with the app
+rank_rebalancer = RankRebalancer()
@@ -1,18 +1,26 @@
 """Issues API router."""
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
 from app.auth.models import User
+from app.common.pagination import encode_cursor
 from app.common.permissions import ROLE_HIERARCHY
 from app.database import get_db
-from app.issues import schemas, service
-from app.issues.models import Issue
+from app.issues import history, schemas, service
+from app.issues.models import Issue, IssueHistory
 from app.projects import service as project_service
 
 router = APIRouter(prefix="/api/v1/projects/{project_id}/issues", tags=["issues"])
 
+# Export format to file extension and media type
+EXPORT_FORMATS = {
+    "csv": ("csv", "text/csv; charset=utf-8"),
+    "ndjson": ("ndjson", "application/x-ndjson"),
+}
+
 
 def _to_response(issue: Issue, children: list[Issue]) -> schemas.IssueResponse:
     return schemas.IssueResponse(
@@ -67,12 +75,55 @@ def _to_response(issue: Issue, children: list[Issue]) -> schemas.IssueResponse:
         ],
         story_points=issue.story_points,
         due_date=issue.due_date,
-        position=issue.position,
+        rank=issue.rank,
+        version=issue.version,
         created_at=issue.created_at,
         updated_at=issue.updated_at,
     )
 
 
+def _etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _if_match_version(if_match: str | None) -> int | None:
+    """Issue version an edit is based on, from an If-Match ETag; None for no header or ``*``."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        raise HTTPException(400, "If-Match must be the issue's ETag")
+    return int(tag)
+
+
+async def _version_conflict(db: AsyncSession, project_id: UUID, issue_id: UUID) -> HTTPException:
+    """409 carrying the issue's current state, for the client to redo its edit on."""
+    issue = await service.get_issue(db, project_id, issue_id)
+    current = _to_response(issue, await service.get_children(db, issue.id))
+    return HTTPException(
+        409,
+        {"message": "Issue was changed by someone else", "issue": current.model_dump(mode="json")},
+        headers={"ETag": _etag(current.version)},
+    )
+
+
+def _to_history_entry(entry: IssueHistory) -> schemas.IssueHistoryEntry:
+    return schemas.IssueHistoryEntry(
+        id=str(entry.id),
+        field=entry.field,
+        old_value=entry.old_value,
+        new_value=entry.new_value,
+        user=schemas.UserBrief(
+            id=str(entry.user.id),
+            name=entry.user.name,
+            email=entry.user.email,
+            avatar_url=entry.user.avatar_url,
+        ),
+        created_at=entry.created_at,
+        cursor=encode_cursor(entry.created_at, entry.id),
+    )
+
+
 def _to_list_item(issue: Issue) -> schemas.IssueListItem:
     return schemas.IssueListItem(
         id=str(issue.id),
@@ -95,6 +146,8 @@ def _to_list_item(issue: Issue) -> schemas.IssueListItem:
         story_points=issue.story_points,
         due_date=issue.due_date,
         label_count=len(issue.labels),
+        rank=issue.rank,
+        version=issue.version,
         created_at=issue.created_at,
     )
 
@@ -113,6 +166,53 @@ async def create_issue(
     return _to_response(issue, children)
 
 
+@router.post("/bulk", response_model=schemas.IssueBulkCreateResponse, status_code=201)
+async def create_issues_bulk(
+    project_id: UUID,
+    data: schemas.IssueBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create up to MAX_BULK_ISSUES issues in one transaction, with consecutive keys."""
+    await project_service.get_project(db, project_id, current_user)
+    role = await project_service.get_user_role_in_project(db, project_id, current_user.id)
+    if ROLE_HIERARCHY.get(role, 0) < ROLE_HIERARCHY["developer"]:
+        raise HTTPException(403, "Viewers cannot create issues")
+    rows = await service.create_issues_bulk(db, project_id, data.issues, current_user)
+    return schemas.IssueBulkCreateResponse(
+        created=len(rows),
+        issues=[
+            schemas.IssueBrief(
+                id=str(row["id"]),
+                key=row["key"],
+                title=row["title"],
+                type=row["type"].value,
+                priority=row["priority"].value,
+            )
+            for row in rows
+        ],
+    )
+
+
+@router.patch("/bulk", response_model=schemas.IssueBulkUpdateResponse)
+async def update_issues_bulk(
+    project_id: UUID,
+    data: schemas.IssueBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Apply one change to up to MAX_BULK_ISSUES issues, e.g. a multi-select action on the backlog."""
+    await project_service.get_project(db, project_id, current_user)
+    role = await project_service.get_user_role_in_project(db, project_id, current_user.id)
+    if ROLE_HIERARCHY.get(role, 0) < ROLE_HIERARCHY["developer"]:
+        raise HTTPException(403, "Viewers cannot edit issues")
+    updated, missing = await service.update_issues_bulk(db, project_id, data.ids, data.patch, current_user)
+    return schemas.IssueBulkUpdateResponse(
+        updated=[str(issue_id) for issue_id in updated],
+        missing=[str(issue_id) for issue_id in missing],
+    )
+
+
 @router.get("", response_model=schemas.IssueListResponse)
 async def list_issues(
     project_id: UUID,
@@ -140,16 +240,47 @@ async def list_issues(
     )
 
 
+@router.get("/export")
+async def export_issues(
+    project_id: UUID,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    type: str | None = Query(None),
+    status_id: UUID | None = Query(None),
+    priority: str | None = Query(None),
+    assignee_id: UUID | None = Query(None),
+    sprint_id: UUID | None = Query(None),
+    label_id: UUID | None = Query(None),
+    search: str | None = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream every issue matching the list filters as CSV or NDJSON, in one response."""
+    project = await project_service.get_project(db, project_id, current_user)
+    extension, media_type = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        service.export_issues(
+            project_id, export_format, type, status_id, priority, assignee_id, sprint_id, label_id, search
+        ),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{project.key}-issues.{extension}"',
+            "Cache-Control": "private, no-store",
+        },
+    )
+
+
 @router.get("/{issue_id}", response_model=schemas.IssueResponse)
 async def get_issue(
     project_id: UUID,
     issue_id: UUID,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     await project_service.get_project(db, project_id, current_user)
     issue = await service.get_issue(db, project_id, issue_id)
     children = await service.get_children(db, issue.id)
+    response.headers["ETag"] = _etag(issue.version)
     return _to_response(issue, children)
 
 
@@ -158,19 +289,73 @@ async def update_issue(
     project_id: UUID,
     issue_id: UUID,
     data: schemas.IssueUpdate,
+    response: Response,
+    if_match: str | None = Header(None, description="ETag of the version this edit is based on"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    """Edit an issue; a version mismatch is a 409 carrying the current issue."""
     await project_service.get_project(db, project_id, current_user)
     role = await project_service.get_user_role_in_project(db, project_id, current_user.id)
     if ROLE_HIERARCHY.get(role, 0) < ROLE_HIERARCHY["developer"]:
         raise HTTPException(403, "Viewers cannot edit issues")
+    version = _if_match_version(if_match)
     issue = await service.get_issue(db, project_id, issue_id)
-    updated = await service.update_issue(db, issue, data, current_user)
+    try:
+        updated = await service.update_issue(db, issue, data, current_user, version)
+    except service.IssueVersionConflict:
+        raise await _version_conflict(db, project_id, issue_id)
     children = await service.get_children(db, updated.id)
+    response.headers["ETag"] = _etag(updated.version)
     return _to_response(updated, children)
 
 
+@router.get("/{issue_id}/history", response_model=schemas.IssueHistoryPage)
+async def get_issue_history(
+    project_id: UUID,
+    issue_id: UUID,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get one page of an issue's field changes, newest first."""
+    await project_service.get_project(db, project_id, current_user)
+    # One extra row tells whether another page follows
+    entries = await history.get_issue_history(db, project_id, issue_id, limit=limit + 1, cursor=cursor)
+    items = [_to_history_entry(entry) for entry in entries[:limit]]
+    return schemas.IssueHistoryPage(items=items, next_cursor=items[-1].cursor if len(entries) > limit else None)
+
+
+@router.post("/{issue_id}/move", response_model=schemas.IssueResponse)
+async def move_issue(
+    project_id: UUID,
+    issue_id: UUID,
+    data: schemas.IssueMove,
+    response: Response,
+    if_match: str | None = Header(None, description="ETag of the version this move is based on"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Drop an issue into a board column between two neighbouring issues.
+
+    A version mismatch is a 409 carrying the current issue.
+    """
+    await project_service.get_project(db, project_id, current_user)
+    role = await project_service.get_user_role_in_project(db, project_id, current_user.id)
+    if ROLE_HIERARCHY.get(role, 0) < ROLE_HIERARCHY["developer"]:
+        raise HTTPException(403, "Viewers cannot move issues")
+    version = _if_match_version(if_match)
+    issue = await service.get_issue(db, project_id, issue_id)
+    try:
+        moved = await service.move_issue(db, issue, data, current_user, version)
+    except service.IssueVersionConflict:
+        raise await _version_conflict(db, project_id, issue_id)
+    children = await service.get_children(db, moved.id)
+    response.headers["ETag"] = _etag(moved.version)
+    return _to_response(moved, children)
+
+
 @router.delete("/{issue_id}", status_code=204)
 async def delete_issue(
     project_id: UUID,
@@ -1,7 +1,7 @@
 """Pydantic schemas for issue endpoints."""
 from datetime import date, datetime
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from app.issues.models import IssueType, IssuePriority
 
 
@@ -57,6 +57,24 @@ class IssueCreate(BaseModel):
     label_ids: list[UUID] = []
 
 
+# Largest batch accepted by POST /issues/bulk
+MAX_BULK_ISSUES = 5000
+
+
+class IssueBulkItem(IssueCreate):
+    """One issue of a bulk create; may name an earlier item of the same batch as its parent."""
+    parent_index: int | None = Field(None, ge=0)  # index into IssueBulkCreate.issues, instead of parent_id
+
+
+class IssueBulkCreate(BaseModel):
+    issues: list[IssueBulkItem] = Field(min_length=1, max_length=MAX_BULK_ISSUES)
+
+
+class IssueBulkCreateResponse(BaseModel):
+    created: int
+    issues: list[IssueBrief]  # in request order
+
+
 class IssueUpdate(BaseModel):
     title: str | None = Field(None, min_length=1, max_length=500)
     description: str | None = None
@@ -71,6 +89,41 @@ class IssueUpdate(BaseModel):
     label_ids: list[UUID] | None = None
 
 
+class IssueBulkPatch(BaseModel):
+    """Changes applied to every selected issue; only fields present in the request are changed."""
+    status_id: UUID | None = None
+    priority: IssuePriority | None = None
+    assignee_id: UUID | None = None        # null unassigns
+    sprint_id: UUID | None = None          # null moves to the backlog
+    add_label_ids: list[UUID] = []
+    remove_label_ids: list[UUID] = []
+
+    @field_validator("status_id", "priority")
+    @classmethod
+    def validate_not_null(cls, v):
+        """Status and priority can be changed but not cleared."""
+        if v is None:
+            raise ValueError("Cannot be null")
+        return v
+
+
+class IssueBulkUpdate(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=MAX_BULK_ISSUES)
+    patch: IssueBulkPatch
+
+
+class IssueBulkUpdateResponse(BaseModel):
+    updated: list[str]                     # issues that changed
+    missing: list[str]                     # ids not found in the project
+
+
+class IssueMove(BaseModel):
+    """Board drag-and-drop target: a column and the issues the card lands between."""
+    status_id: UUID
+    after_id: UUID | None = None           # issue just above the card; None at the top of the column
+    before_id: UUID | None = None          # issue just below the card; both None appends to the column
+
+
 class IssueResponse(BaseModel):
     id: str
     project_id: str
@@ -88,7 +141,8 @@ class IssueResponse(BaseModel):
     labels: list[LabelBrief]
     story_points: int | None
     due_date: date | None
-    position: int
+    rank: str
+    version: int
     created_at: datetime
     updated_at: datetime
     model_config = {"from_attributes": True}
@@ -106,10 +160,27 @@ class IssueListItem(BaseModel):
     story_points: int | None
     due_date: date | None
     label_count: int
+    rank: str
+    version: int
     created_at: datetime
     model_config = {"from_attributes": True}
 
 
+class IssueHistoryEntry(BaseModel):
+    id: str
+    field: str
+    old_value: str | None
+    new_value: str | None
+    user: UserBrief
+    created_at: datetime
+    cursor: str                            # keyset position, for paging
+
+
+class IssueHistoryPage(BaseModel):
+    items: list[IssueHistoryEntry]         # newest first
+    next_cursor: str | None                # null on the last page
+
+
 class IssueListResponse(BaseModel):
     items: list[IssueListItem]
     total: int
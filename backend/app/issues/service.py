@@ -1,18 +1,66 @@
 """Issue business logic."""
-from datetime import datetime, timezone
+import csv
+import enum
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timezone
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import ColumnElement, Select, and_, any_, bindparam, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.auth.models import User
+from app.database import async_session
+from app.issues.history import LABELS_FIELD, ChangeTracker
+from app.issues.keys import issue_keys
 from app.issues.models import Issue, IssueType, IssueLabel
-from app.issues.schemas import IssueCreate, IssueUpdate
-from app.projects.models import Project, WorkflowStatus, Label
-from app.notifications.schemas import NotificationCreate
-from app.notifications.service import create_notification
+from app.issues.ranking import (
+    MAX_RANK_LENGTH,
+    REBALANCE_LENGTH,
+    append_ranks,
+    rank_between,
+    rank_rebalancer,
+    rebalance_column,
+)
+from app.issues.schemas import IssueBulkItem, IssueBulkPatch, IssueCreate, IssueMove, IssueUpdate
+from app.projects.models import WorkflowStatus, Label
+from app.notifications.board import ISSUE_DELTA_FIELDS, board_events, issue_fields
+from app.notifications.schemas import NotificationTemplate
+from app.notifications.service import enqueue_notifications
+from app.sprints.models import Sprint
+
+# Columns of GET /issues/export, with their CSV headers (Jira's, so the importer maps them back)
+EXPORT_CSV_HEADERS = {
+    "key": "Issue key",
+    "type": "Issue Type",
+    "title": "Summary",
+    "status": "Status",
+    "priority": "Priority",
+    "assignee": "Assignee",
+    "reporter": "Reporter",
+    "sprint": "Sprint",
+    "parent": "Parent",
+    "labels": "Labels",
+    "story_points": "Story Points",
+    "due_date": "Due Date",
+    "created_at": "Created",
+    "updated_at": "Updated",
+    "description": "Description",
+}
+EXPORT_COLUMNS = tuple(EXPORT_CSV_HEADERS)
+# Rows fetched from the server-side cursor and sent per chunk
+EXPORT_BATCH_SIZE = 1000
+
+# Fields PATCH /issues/bulk sets on every selected issue
+BULK_UPDATE_FIELDS = ("status_id", "priority", "assignee_id", "sprint_id")
 
 # Hierarchy rules: what types can be parents of what
 VALID_PARENTS = {
@@ -24,6 +72,10 @@ VALID_PARENTS = {
 }
 
 
+class IssueVersionConflict(Exception):
+    """The issue changed since the version an edit was based on."""
+
+
 async def _get_default_status(db: AsyncSession, project_id: UUID) -> WorkflowStatus:
     """Returns the first 'todo' status of the project."""
     result = await db.execute(
@@ -41,43 +93,35 @@ async def _get_default_status(db: AsyncSession, project_id: UUID) -> WorkflowSta
     return status
 
 
-async def _generate_key(db: AsyncSession, project_id: UUID) -> str:
-    """Atomically increment issue_counter and return the new key."""
-    result = await db.execute(
-        update(Project)
-        .where(Project.id == project_id)
-        .values(issue_counter=Project.issue_counter + 1)
-        .returning(Project.issue_counter, Project.key)
-    )
-    row = result.one()
-    return f"{row.key}-{row.issue_counter}"
+def _hierarchy_error(issue_type: IssueType, parent_type: IssueType | None) -> str | None:
+    """Explain why an issue of ``issue_type`` cannot have a ``parent_type`` parent, or None if it can."""
+    if issue_type == IssueType.epic:
+        return "Epics cannot have a parent issue"
+    allowed_parent_types = VALID_PARENTS.get(issue_type, [])
+    if not allowed_parent_types:
+        return f"{issue_type.value} cannot have a parent"
+    if parent_type not in allowed_parent_types:
+        allowed_names = [t.value for t in allowed_parent_types]
+        return f"{issue_type.value} parent must be one of: {', '.join(allowed_names)}"
+    return None
 
 
 async def _validate_hierarchy(db: AsyncSession, issue_type: IssueType, parent_id: UUID | None) -> None:
     """Validate parent-child type constraints."""
-    if issue_type == IssueType.epic:
-        if parent_id is not None:
-            raise HTTPException(422, "Epics cannot have a parent issue")
+    if parent_id is None:
         return
+    if not VALID_PARENTS.get(issue_type):
+        raise HTTPException(422, _hierarchy_error(issue_type, None))
 
-    allowed_parent_types = VALID_PARENTS.get(issue_type, [])
-    if not allowed_parent_types and parent_id is not None:
-        raise HTTPException(422, f"{issue_type.value} cannot have a parent")
-
-    if parent_id is not None:
-        parent = await db.get(Issue, parent_id)
-        if not parent:
-            raise HTTPException(404, "Parent issue not found")
-        if parent.type not in allowed_parent_types:
-            allowed_names = [t.value for t in allowed_parent_types]
-            raise HTTPException(
-                422,
-                f"{issue_type.value} parent must be one of: {', '.join(allowed_names)}"
-            )
+    parent = await db.get(Issue, parent_id)
+    if not parent:
+        raise HTTPException(404, "Parent issue not found")
+    if error := _hierarchy_error(issue_type, parent.type):
+        raise HTTPException(422, error)
 
 
 async def create_issue(db: AsyncSession, project_id: UUID, data: IssueCreate, reporter: User) -> Issue:
-    """Create a new issue with atomic key generation."""
+    """Create a new issue, numbered from the project's issue counter (see app.issues.keys)."""
     # Validate hierarchy
     await _validate_hierarchy(db, data.type, data.parent_id)
 
@@ -92,8 +136,9 @@ async def create_issue(db: AsyncSession, project_id: UUID, data: IssueCreate, re
     # Validate assignee is project member (optional check)
     # Validate sprint belongs to project (optional check)
 
-    # Generate atomic key
-    key = await _generate_key(db, project_id)
+    # Reserved outside this transaction: a failed create leaves a gap, not a lock
+    [key] = await issue_keys.reserve(db, project_id, 1)
+    [rank] = await append_ranks(db, project_id, [status.id])
 
     issue = Issue(
         project_id=project_id,
@@ -109,7 +154,7 @@ async def create_issue(db: AsyncSession, project_id: UUID, data: IssueCreate, re
         parent_id=data.parent_id,
         story_points=data.story_points,
         due_date=data.due_date,
-        position=0,
+        rank=rank,
     )
     db.add(issue)
     await db.flush()  # get issue.id
@@ -122,15 +167,12 @@ async def create_issue(db: AsyncSession, project_id: UUID, data: IssueCreate, re
                 issue_label = IssueLabel(issue_id=issue.id, label_id=label_id)
                 db.add(issue_label)
 
-    await db.commit()
-    await db.refresh(issue)
-
-    # Notify assignee if assigned (and different from reporter)
+    # Notify assignee if assigned (and different from reporter); delivered after commit
     if data.assignee_id and str(data.assignee_id) != str(reporter.id):
-        await create_notification(
+        enqueue_notifications(
             db,
-            NotificationCreate(
-                user_id=data.assignee_id,
+            [data.assignee_id],
+            NotificationTemplate(
                 issue_id=issue.id,
                 type="assigned",
                 title=f"You were assigned to {issue.key}",
@@ -138,14 +180,287 @@ async def create_issue(db: AsyncSession, project_id: UUID, data: IssueCreate, re
             ),
         )
 
+    await db.commit()
+    await db.refresh(issue)
+    board_events.publish_issue(issue, "created")
+
     return issue
 
 
-async def get_issues(
-    db: AsyncSession,
+async def create_issues_bulk(
+    db: AsyncSession, project_id: UUID, items: list[IssueBulkItem], reporter: User
+) -> list[dict]:
+    """Create many issues in one transaction.
+
+    Parents, statuses and labels are each validated with one query for the
+    whole batch, keys come from one counter update, and issues and their
+    labels are written with multi-row INSERTs. Items can reference an
+    earlier item of the batch as their parent with ``parent_index``.
+    Labels from other projects are skipped, as in :func:`create_issue`.
+
+    Args:
+        db: Database session.
+        project_id: Project receiving the issues.
+        items: Issues to create, in key order.
+        reporter: User recorded as reporter of every issue.
+
+    Returns:
+        The inserted rows (column name to value), in request order.
+
+    Raises:
+        HTTPException(404): If a parent or status is not in the project.
+        HTTPException(422): If an item breaks the hierarchy rules; the detail names its index.
+    """
+    # Validate hierarchy: one query for parents that already exist
+    parent_ids = {item.parent_id for item in items if item.parent_id}
+    existing_parents: dict[UUID, IssueType] = {}
+    if parent_ids:
+        result = await db.execute(
+            select(Issue.id, Issue.type).where(Issue.id.in_(parent_ids), Issue.project_id == project_id)
+        )
+        existing_parents = dict(result.all())
+    for n, item in enumerate(items):
+        if item.parent_index is not None:
+            if item.parent_id is not None:
+                raise HTTPException(422, f"issues[{n}]: set parent_id or parent_index, not both")
+            if item.parent_index >= n:
+                raise HTTPException(422, f"issues[{n}]: parent_index must refer to an earlier issue")
+            parent_type = items[item.parent_index].type
+        elif item.parent_id is not None:
+            parent_type = existing_parents.get(item.parent_id)
+            if parent_type is None:
+                raise HTTPException(404, f"issues[{n}]: Parent issue not found")
+        else:
+            continue
+        if error := _hierarchy_error(item.type, parent_type):
+            raise HTTPException(422, f"issues[{n}]: {error}")
+
+    # Validate statuses, and look up the default once
+    status_ids = {item.status_id for item in items if item.status_id}
+    if status_ids:
+        found = set(await db.scalars(
+            select(WorkflowStatus.id).where(WorkflowStatus.id.in_(status_ids), WorkflowStatus.project_id == project_id)
+        ))
+        if status_ids - found:
+            raise HTTPException(404, "Status not found in this project")
+    default_status_id = None
+    if any(item.status_id is None for item in items):
+        default_status_id = (await _get_default_status(db, project_id)).id
+
+    # Keep only labels of this project
+    label_ids = {label_id for item in items for label_id in item.label_ids}
+    project_labels = set()
+    if label_ids:
+        project_labels = set(await db.scalars(
+            select(Label.id).where(Label.id.in_(label_ids), Label.project_id == project_id)
+        ))
+
+    keys = await issue_keys.reserve(db, project_id, len(items))
+    ids = [uuid.uuid4() for _ in items]
+    ranks = await append_ranks(db, project_id, [item.status_id or default_status_id for item in items])
+    rows = [
+        {
+            "id": ids[n],
+            "project_id": project_id,
+            "type": item.type,
+            "key": keys[n],
+            "title": item.title,
+            "description": item.description,
+            "status_id": item.status_id or default_status_id,
+            "priority": item.priority,
+            "assignee_id": item.assignee_id,
+            "reporter_id": reporter.id,
+            "sprint_id": item.sprint_id,
+            "parent_id": ids[item.parent_index] if item.parent_index is not None else item.parent_id,
+            "story_points": item.story_points,
+            "due_date": item.due_date,
+            "rank": ranks[n],
+        }
+        for n, item in enumerate(items)
+    ]
+    # Batched into multi-row INSERTs; parents precede children, so the FK holds within a statement
+    await db.execute(insert(Issue), rows)
+    label_rows = [
+        {"issue_id": ids[n], "label_id": label_id}
+        for n, item in enumerate(items)
+        for label_id in dict.fromkeys(item.label_ids)
+        if label_id in project_labels
+    ]
+    if label_rows:
+        await db.execute(insert(IssueLabel), label_rows)
+
+    # Notify assignees (other than the reporter); delivered after commit
+    for row in rows:
+        if row["assignee_id"] and row["assignee_id"] != reporter.id:
+            enqueue_notifications(
+                db,
+                [row["assignee_id"]],
+                NotificationTemplate(
+                    issue_id=row["id"],
+                    type="assigned",
+                    title=f"You were assigned to {row['key']}",
+                    body=row["title"],
+                ),
+            )
+
+    await db.commit()
+
+    if board_events.is_watched(project_id):
+        labels_by_issue: dict[UUID, list[str]] = {}
+        for label_row in label_rows:
+            labels_by_issue.setdefault(label_row["issue_id"], []).append(str(label_row["label_id"]))
+        for row in rows:
+            fields = issue_fields(Issue(**row), set(ISSUE_DELTA_FIELDS) - {"label_ids"})
+            fields["label_ids"] = labels_by_issue.get(row["id"], [])
+            board_events.publish(project_id, "issue", row["id"], "created", fields)
+
+    return rows
+
+
+def _any(ids) -> ColumnElement:
+    """``= ANY(:ids)`` operand: one array parameter however many ids there are."""
+    return any_(bindparam(None, list(ids), type_=ARRAY(PG_UUID(as_uuid=True))))
+
+
+async def update_issues_bulk(
+    db: AsyncSession, project_id: UUID, ids: list[UUID], patch: IssueBulkPatch, user: User
+) -> tuple[list[UUID], list[UUID]]:
+    """Apply one patch to many issues of a project in a single transaction.
+
+    The selected issues are read once to diff them against the patch. Scalar
+    fields are written with one set-based UPDATE over the issues they change
+    (bumping their versions, so open single-issue edits conflict), and
+    labels are added and removed with one statement each. History rows and
+    assignment notifications are written in bulk before the commit.
+
+    Returns:
+        Ids of the issues that changed, and requested ids not found in the project.
+    """
+    values = patch.model_dump(exclude_unset=True, include=set(BULK_UPDATE_FIELDS))
+    add_label_ids, remove_label_ids = set(patch.add_label_ids), set(patch.remove_label_ids)
+    if add_label_ids & remove_label_ids:
+        raise HTTPException(422, "A label cannot be both added and removed")
+    if values.get("status_id"):
+        status = await db.get(WorkflowStatus, values["status_id"])
+        if not status or status.project_id != project_id:
+            raise HTTPException(404, "Status not found in this project")
+    if values.get("sprint_id"):
+        sprint = await db.get(Sprint, values["sprint_id"])
+        if not sprint or sprint.project_id != project_id:
+            raise HTTPException(404, "Sprint not found in this project")
+    label_ids = add_label_ids | remove_label_ids
+    label_names: dict[UUID, str] = {}
+    if label_ids:
+        result = await db.execute(
+            select(Label.id, Label.name).where(Label.id.in_(label_ids), Label.project_id == project_id)
+        )
+        label_names = dict(result.all())
+        if label_ids - label_names.keys():
+            raise HTTPException(404, "Label not found in this project")
+
+    # Rank order, so issues moving to another column keep their relative order there
+    result = await db.execute(
+        select(Issue.id, Issue.key, Issue.title, *(getattr(Issue, name) for name in BULK_UPDATE_FIELDS))
+        .where(Issue.project_id == project_id, Issue.id == _any(ids))
+        .order_by(Issue.rank, Issue.id)
+        .with_for_update()
+    )
+    rows = result.all()
+    found = [row.id for row in rows]
+    found_ids = set(found)
+    missing = [issue_id for issue_id in dict.fromkeys(ids) if issue_id not in found_ids]
+
+    tracker = ChangeTracker(user.id)
+    for row in rows:
+        for name, value in values.items():
+            tracker.record(row.id, name, getattr(row, name), value)
+    changed = tracker.changed()
+
+    now = datetime.now(timezone.utc)
+    if changed:
+        await db.execute(
+            update(Issue)
+            .where(Issue.id == _any(changed))
+            .values(**values, version=Issue.version + 1, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    moved = [issue_id for issue_id in found if "status_id" in changed.get(issue_id, ())]
+    ranks = {}
+    if moved:
+        # Moved issues land at the end of their new column
+        ranks = dict(zip(moved, await append_ranks(db, project_id, [values["status_id"]] * len(moved))))
+        await db.execute(update(Issue), [{"id": issue_id, "rank": rank} for issue_id, rank in ranks.items()])
+
+    relabeled = set()
+    if add_label_ids and found:
+        stmt = pg_insert(IssueLabel).from_select(
+            ["issue_id", "label_id"],
+            select(Issue.id, Label.id).where(Issue.id == _any(found), Label.id == _any(add_label_ids)),
+        )
+        result = await db.execute(
+            stmt.on_conflict_do_nothing().returning(IssueLabel.issue_id, IssueLabel.label_id)
+        )
+        for issue_id, label_id in result.all():
+            tracker.record(issue_id, LABELS_FIELD, None, label_names[label_id])
+            relabeled.add(issue_id)
+    if remove_label_ids and found:
+        result = await db.execute(
+            delete(IssueLabel)
+            .where(IssueLabel.issue_id == _any(found), IssueLabel.label_id == _any(remove_label_ids))
+            .returning(IssueLabel.issue_id, IssueLabel.label_id)
+        )
+        for issue_id, label_id in result.all():
+            tracker.record(issue_id, LABELS_FIELD, label_names[label_id], None)
+            relabeled.add(issue_id)
+    if relabeled - changed.keys():
+        await db.execute(
+            update(Issue)
+            .where(Issue.id == _any(relabeled - changed.keys()))
+            .values(version=Issue.version + 1, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    changed = tracker.changed()
+    await tracker.flush(db)
+
+    # Notify new assignees (other than the editor); delivered after commit
+    assignee_id = values.get("assignee_id")
+    if assignee_id and assignee_id != user.id:
+        for row in rows:
+            if "assignee_id" in changed.get(row.id, ()):
+                enqueue_notifications(
+                    db,
+                    [assignee_id],
+                    NotificationTemplate(
+                        issue_id=row.id,
+                        type="assigned",
+                        title=f"You were assigned to {row.key}",
+                        body=row.title,
+                    ),
+                )
+
+    await db.commit()
+
+    if changed and board_events.is_watched(project_id):
+        labels_by_issue: dict[UUID, list[str]] = {}
+        if relabeled:
+            result = await db.execute(
+                select(IssueLabel.issue_id, IssueLabel.label_id).where(IssueLabel.issue_id == _any(relabeled))
+            )
+            for issue_id, label_id in result.all():
+                labels_by_issue.setdefault(issue_id, []).append(str(label_id))
+        for issue_id, names in changed.items():
+            fields = issue_fields(Issue(**values), names - {LABELS_FIELD})
+            if issue_id in ranks:
+                fields["rank"] = ranks[issue_id]
+            if issue_id in relabeled:
+                fields["label_ids"] = labels_by_issue.get(issue_id, [])
+            board_events.publish(project_id, "issue", issue_id, "moved" if issue_id in ranks else "updated", fields)
+
+    return [issue_id for issue_id in found if issue_id in changed], missing
+
+
+def _issue_filters(
     project_id: UUID,
-    page: int = 1,
-    size: int = 50,
     type: str | None = None,
     status_id: UUID | None = None,
     priority: str | None = None,
@@ -153,8 +468,8 @@ async def get_issues(
     sprint_id: UUID | None = None,
     label_id: UUID | None = None,
     search: str | None = None,
-) -> tuple[list[Issue], int]:
-    """List issues for a project with optional filters and search."""
+) -> list:
+    """WHERE clauses shared by the issue list and the export."""
     filters = [Issue.project_id == project_id]
     if type:
         filters.append(Issue.type == type)
@@ -166,6 +481,12 @@ async def get_issues(
         filters.append(Issue.assignee_id == assignee_id)
     if sprint_id:
         filters.append(Issue.sprint_id == sprint_id)
+    if label_id:
+        filters.append(
+            select(IssueLabel.issue_id)
+            .where(IssueLabel.issue_id == Issue.id, IssueLabel.label_id == label_id)
+            .exists()
+        )
 
     # Text search on title and key
     if search:
@@ -173,29 +494,134 @@ async def get_issues(
         filters.append(
             (Issue.title.ilike(search_pattern)) | (Issue.key.ilike(search_pattern))
         )
+    return filters
 
-    q = select(Issue).where(and_(*filters))
 
-    # Join for label filtering if needed
-    if label_id:
-        q = q.join(IssueLabel).where(IssueLabel.label_id == label_id)
+async def get_issues(
+    db: AsyncSession,
+    project_id: UUID,
+    page: int = 1,
+    size: int = 50,
+    type: str | None = None,
+    status_id: UUID | None = None,
+    priority: str | None = None,
+    assignee_id: UUID | None = None,
+    sprint_id: UUID | None = None,
+    label_id: UUID | None = None,
+    search: str | None = None,
+) -> tuple[list[Issue], int]:
+    """List issues for a project with optional filters and search."""
+    filters = _issue_filters(project_id, type, status_id, priority, assignee_id, sprint_id, label_id, search)
 
-    count_q = select(func.count(Issue.id)).where(and_(*filters))
-    if label_id:
-        count_q = count_q.select_from(Issue).join(IssueLabel).where(IssueLabel.label_id == label_id)
-    total = await db.scalar(count_q) or 0
+    total = await db.scalar(select(func.count(Issue.id)).where(and_(*filters))) or 0
 
     q = (
-        q
-        .order_by(Issue.position.asc(), Issue.created_at.desc())
+        select(Issue)
+        .where(and_(*filters))
+        .order_by(Issue.rank.asc(), Issue.id.asc())
         .offset((page - 1) * size)
         .limit(size)
-        .distinct()
     )
     result = await db.execute(q)
     return list(result.scalars().all()), total
 
 
+def _export_query(filters: list) -> Select:
+    """Project the export columns with joins instead of loading Issue objects and their relationships."""
+    assignee, reporter, parent = aliased(User), aliased(User), aliased(Issue)
+    labels = (
+        select(func.array_agg(aggregate_order_by(Label.name, Label.name)))
+        .join(IssueLabel, IssueLabel.label_id == Label.id)
+        .where(IssueLabel.issue_id == Issue.id)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Issue.key,
+            Issue.type,
+            Issue.title,
+            WorkflowStatus.name.label("status"),
+            Issue.priority,
+            assignee.email.label("assignee"),
+            reporter.email.label("reporter"),
+            Sprint.name.label("sprint"),
+            parent.key.label("parent"),
+            labels.label("labels"),
+            Issue.story_points,
+            Issue.due_date,
+            Issue.created_at,
+            Issue.updated_at,
+            Issue.description,
+        )
+        .join(WorkflowStatus, WorkflowStatus.id == Issue.status_id)
+        .join(reporter, reporter.id == Issue.reporter_id)
+        .outerjoin(assignee, assignee.id == Issue.assignee_id)
+        .outerjoin(Sprint, Sprint.id == Issue.sprint_id)
+        .outerjoin(parent, parent.id == Issue.parent_id)
+        .where(and_(*filters))
+        .order_by(Issue.created_at, Issue.id)
+    )
+
+
+def _export_value(name: str, value) -> str | int | list | None:
+    if name == "labels":
+        return value or []
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunk(rows: list, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_CSV_HEADERS.values())
+    for row in rows:
+        # Labels are space-separated, as Jira label names cannot contain spaces
+        writer.writerow(
+            " ".join(value or []) if name == "labels" else ("" if value is None else _export_value(name, value))
+            for name, value in zip(EXPORT_COLUMNS, row)
+        )
+    return buffer.getvalue().encode()
+
+
+def _ndjson_chunk(rows: list) -> bytes:
+    return "".join(
+        json.dumps({name: _export_value(name, value) for name, value in zip(EXPORT_COLUMNS, row)}) + "\n"
+        for row in rows
+    ).encode()
+
+
+async def export_issues(
+    project_id: UUID,
+    export_format: str = "csv",
+    type: str | None = None,
+    status_id: UUID | None = None,
+    priority: str | None = None,
+    assignee_id: UUID | None = None,
+    sprint_id: UUID | None = None,
+    label_id: UUID | None = None,
+    search: str | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield every matching issue as CSV or NDJSON, ``EXPORT_BATCH_SIZE`` rows per chunk.
+
+    Rows come from a server-side cursor as plain tuples, so memory use is
+    one batch whatever the project's size. The generator opens its own
+    session, as it runs after the request's session has been closed.
+    CSV headers follow Jira's, so an export can be imported again.
+    """
+    filters = _issue_filters(project_id, type, status_id, priority, assignee_id, sprint_id, label_id, search)
+    if export_format == "csv":
+        yield _csv_chunk([], header=True)
+    encode = _csv_chunk if export_format == "csv" else _ndjson_chunk
+    async with async_session() as db:
+        result = await db.stream(_export_query(filters).execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield encode(rows)
+
+
 async def get_issue(db: AsyncSession, project_id: UUID, issue_id: UUID) -> Issue:
     issue = await db.get(Issue, issue_id)
     if not issue or issue.project_id != project_id:
@@ -217,17 +643,56 @@ async def get_children(db: AsyncSession, issue_id: UUID) -> list[Issue]:
     result = await db.execute(
         select(Issue)
         .where(Issue.parent_id == issue_id)
-        .order_by(Issue.position.asc())
+        .order_by(Issue.rank.asc(), Issue.id.asc())
     )
     return list(result.scalars().all())
 
 
+async def claim_version(db: AsyncSession, issue: Issue, version: int | None = None) -> None:
+    """Bump an issue's version if it is still the one an edit was based on.
+
+    One ``UPDATE ... WHERE id = ? AND version = ?`` replaces a
+    ``SELECT ... FOR UPDATE``: readers never wait, and of two edits based on
+    the same version exactly one matches. It runs before the edit writes
+    anything else, so losing the race costs a single statement.
+
+    Args:
+        db: Database session.
+        issue: The loaded issue being edited.
+        version: Version the client based its edit on (If-Match); defaults
+            to the loaded one, which still catches edits that land in between.
+
+    Raises:
+        IssueVersionConflict: If the version no longer matches; the
+            transaction is rolled back.
+    """
+    expected = issue.version if version is None else version
+    claimed = await db.scalar(
+        update(Issue)
+        .where(Issue.id == issue.id, Issue.version == expected)
+        .values(version=Issue.version + 1)
+        .returning(Issue.version)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed is None:
+        await db.rollback()
+        raise IssueVersionConflict(issue.id)
+
+
 async def update_issue(
-    db: AsyncSession, issue: Issue, data: IssueUpdate, user: User
+    db: AsyncSession, issue: Issue, data: IssueUpdate, user: User, version: int | None = None
 ) -> Issue:
-    """Update issue fields and send notifications for key changes."""
-    # Track if assignee changed
+    """Update issue fields, record their history and send notifications for key changes.
+
+    Raises IssueVersionConflict if the issue is no longer at ``version``
+    (see :func:`claim_version`).
+    """
+    await claim_version(db, issue, version)
+    # Track if assignee or status changed
     old_assignee_id = issue.assignee_id
+    old_status_id = issue.status_id
+    tracker = ChangeTracker(user.id)
+    tracker.watch(issue)
 
     if data.title is not None:
         issue.title = data.title
@@ -235,7 +700,9 @@ async def update_issue(
         issue.description = data.description
     if data.priority is not None:
         issue.priority = data.priority
-    if data.status_id is not None:
+    if data.status_id is not None and data.status_id != issue.status_id:
+        # Lands at the end of its new column
+        [issue.rank] = await append_ranks(db, issue.project_id, [data.status_id])
         issue.status_id = data.status_id
     if data.assignee_id is not None:
         issue.assignee_id = data.assignee_id
@@ -250,26 +717,31 @@ async def update_issue(
             await _validate_hierarchy(db, data.type or issue.type, data.parent_id)
         issue.parent_id = data.parent_id
 
-    # Update labels if provided
+    # Update labels if provided: only the difference is written
     if data.label_ids is not None:
-        # Remove existing labels
-        await db.execute(
-            delete(IssueLabel).where(IssueLabel.issue_id == issue.id)
-        )
-        # Add new labels
-        for label_id in data.label_ids:
-            db.add(IssueLabel(issue_id=issue.id, label_id=label_id))
-
-    issue.updated_at = datetime.now(timezone.utc)
-    await db.commit()
-    await db.refresh(issue)
+        current = {label.id: label.name for label in issue.labels}
+        removed = [label_id for label_id in current if label_id not in data.label_ids]
+        if removed:
+            await db.execute(
+                delete(IssueLabel).where(IssueLabel.issue_id == issue.id, IssueLabel.label_id.in_(removed))
+            )
+        for label_id in removed:
+            tracker.record(issue.id, LABELS_FIELD, current[label_id], None)
+        added = [label_id for label_id in dict.fromkeys(data.label_ids) if label_id not in current]
+        if added:
+            result = await db.execute(
+                select(Label.id, Label.name).where(Label.id.in_(added), Label.project_id == issue.project_id)
+            )
+            for label_id, name in result.all():
+                db.add(IssueLabel(issue_id=issue.id, label_id=label_id))
+                tracker.record(issue.id, LABELS_FIELD, None, name)
 
     # Send notification if assignee changed (only notify new assignee if different from old)
     if data.assignee_id is not None and str(data.assignee_id) != str(old_assignee_id):
-        await create_notification(
+        enqueue_notifications(
             db,
-            NotificationCreate(
-                user_id=data.assignee_id,
+            [data.assignee_id],
+            NotificationTemplate(
                 issue_id=issue.id,
                 type="assigned",
                 title=f"You were assigned to {issue.key}",
@@ -277,6 +749,82 @@ async def update_issue(
             ),
         )
 
+    issue.updated_at = datetime.now(timezone.utc)
+    await tracker.flush(db)
+    await db.commit()
+    await db.refresh(issue)
+
+    if board_events.is_watched(issue.project_id):
+        changed = {name for name, value in data if value is not None}
+        op = "moved" if issue.status_id != old_status_id else "updated"
+        if op == "moved":
+            changed.add("rank")
+        board_events.publish_issue(issue, op, changed)
+
+    return issue
+
+
+async def move_issue(
+    db: AsyncSession, issue: Issue, data: IssueMove, user: User, version: int | None = None
+) -> Issue:
+    """Move an issue on the board: into a column, between two neighbouring issues.
+
+    Only the neighbours' ranks are read, so a move updates a single row
+    however long the column is. A column whose ranks tie or would outgrow
+    the rank column is respaced first, in the same transaction; one whose
+    ranks merely got long is queued for respacing in the background.
+    Raises IssueVersionConflict if the issue is no longer at ``version``
+    (see :func:`claim_version`).
+    """
+    status = await db.get(WorkflowStatus, data.status_id)
+    if not status or status.project_id != issue.project_id:
+        raise HTTPException(404, "Status not found in this project")
+    neighbour_ids = {data.after_id, data.before_id} - {None}
+    if issue.id in neighbour_ids:
+        raise HTTPException(422, "An issue cannot be moved next to itself")
+
+    await claim_version(db, issue, version)
+    if not neighbour_ids:
+        [rank] = await append_ranks(db, issue.project_id, [data.status_id])
+    else:
+        # Locking the neighbours makes a concurrent respacing of the column finish (or wait) first
+        result = await db.execute(
+            select(Issue.id, Issue.rank)
+            .where(
+                Issue.id.in_(neighbour_ids),
+                Issue.project_id == issue.project_id,
+                Issue.status_id == data.status_id,
+            )
+            .with_for_update()
+        )
+        ranks = dict(result.all())
+        if len(ranks) < len(neighbour_ids):
+            raise HTTPException(409, "Neighbouring issue is no longer in the target column")
+        after, before = ranks.get(data.after_id), ranks.get(data.before_id)
+        if after is not None and before is not None and after > before:
+            raise HTTPException(409, "after_id must come before before_id in the column")
+        # Neighbours tie after concurrent moves into the same gap
+        rank = rank_between(after, before) if after != before else None
+        if rank is None or len(rank) > MAX_RANK_LENGTH:
+            ranks = await rebalance_column(db, issue.project_id, data.status_id)
+            try:
+                rank = rank_between(ranks.get(data.after_id), ranks.get(data.before_id))
+            except ValueError:
+                raise HTTPException(409, "after_id must come before before_id in the column")
+
+    tracker = ChangeTracker(user.id)
+    tracker.watch(issue)
+    issue.status_id = data.status_id
+    issue.rank = rank
+    issue.updated_at = datetime.now(timezone.utc)
+    await tracker.flush(db)
+    await db.commit()
+    await db.refresh(issue)
+
+    if len(rank) > REBALANCE_LENGTH:
+        rank_rebalancer.request(issue.project_id, issue.status_id)
+    board_events.publish_issue(issue, "moved", {"status_id", "rank"})
+
     return issue
 
 
@@ -284,3 +832,4 @@ async def delete_issue(db: AsyncSession, issue: Issue) -> None:
     """Delete issue and its subtasks (cascade handles children via FK)."""
     await db.delete(issue)
     await db.commit()
+    board_events.publish_issue(issue, "deleted")
@@ -7,10 +7,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
 
+from app.attachments.blobs import blob_collector
+from app.attachments.previews import preview_renderer
 from app.attachments.router import router as attachments_router
+from app.attachments.uploads import upload_session_reaper
 from app.auth.router import router as auth_router
 from app.database import async_session
+from app.imports.router import router as imports_router
+from app.imports.service import import_worker
+from app.issues.ranking import rank_rebalancer
+from app.notifications.manager import board_manager
+from app.notifications.manager import manager as notification_manager
+from app.notifications.partitions import ensure_partitions, partition_maintenance
 from app.notifications.router import router as notifications_router
+from app.notifications.service import NOTIFICATION_EVENT, deliver_outbox_notifications
+from app.outbox.dispatcher import dispatcher as outbox_dispatcher
 from app.projects.router import router as projects_router
 from app.issues.router import router as issues_router
 from app.sprints.router import router as sprints_router
@@ -29,6 +40,8 @@ import app.comments.models  # noqa: F401
 import app.attachments.models  # noqa: F401
 import app.notifications.models  # noqa: F401
 import app.search.models  # noqa: F401
+import app.outbox.models  # noqa: F401
+import app.imports.models  # noqa: F401
 
 app = FastAPI(title="FlowBoard API", version="0.1.0")
 
@@ -38,6 +51,33 @@ async def create_tables():
     """Create all tables on startup (idempotent — uses CREATE TABLE IF NOT EXISTS)."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await ensure_partitions(conn)
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    """Start the outbox dispatcher, partition maintenance, attachment cleanup, import and rank tasks."""
+    outbox_dispatcher.register(NOTIFICATION_EVENT, deliver_outbox_notifications)
+    outbox_dispatcher.start()
+    partition_maintenance.start()
+    blob_collector.start()
+    upload_session_reaper.start()
+    import_worker.start()
+    rank_rebalancer.start()
+
+
+@app.on_event("shutdown")
+async def stop_realtime_delivery():
+    """Stop background tasks and WebSocket writer tasks so they don't outlive the app."""
+    await outbox_dispatcher.stop()
+    await partition_maintenance.stop()
+    await blob_collector.stop()
+    await upload_session_reaper.stop()
+    await import_worker.stop()
+    await rank_rebalancer.stop()
+    await preview_renderer.shutdown()
+    await notification_manager.shutdown()
+    await board_manager.shutdown()
 
 # Register routers
 app.include_router(auth_router)
@@ -48,11 +88,14 @@ app.include_router(comments_router)
 app.include_router(attachments_router)
 app.include_router(search_router)
 app.include_router(notifications_router)
+app.include_router(imports_router)
 
-# Mount static files for uploads
-uploads_dir = Path("uploads")
-uploads_dir.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Unauthenticated static uploads, only for legacy links; attachments are served
+# through the authorized /attachments/{id}/content endpoint
+if settings.UPLOADS_STATIC_MOUNT and settings.STORAGE_BACKEND == "local":
+    uploads_dir = Path("uploads")
+    uploads_dir.mkdir(exist_ok=True)
+    app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 app.add_middleware(
     CORSMiddleware,
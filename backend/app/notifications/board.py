@@ -0,0 +1,133 @@
+"""Project-scoped board event stream with burst coalescing."""
+import asyncio
+import logging
+from typing import Any
+from uuid import UUID
+
+from app.config import settings
+from app.notifications.manager import ConnectionManager, board_manager
+
+logger = logging.getLogger(__name__)
+
+# Issue fields carried in board deltas (everything a card needs to re-render)
+ISSUE_DELTA_FIELDS = (
+    "key",
+    "title",
+    "type",
+    "status_id",
+    "priority",
+    "assignee_id",
+    "sprint_id",
+    "parent_id",
+    "story_points",
+    "rank",
+    "label_ids",
+)
+
+# When several ops on the same entity land in one window, the strongest wins
+_OP_PRECEDENCE = {"updated": 0, "moved": 1, "created": 2, "deleted": 3}
+
+
+def _compact(value: Any) -> Any:
+    """Render a field value for the wire (UUIDs and enums as plain strings)."""
+    if isinstance(value, UUID):
+        return str(value)
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def issue_fields(issue: Any, fields: tuple[str, ...] | set[str] = ISSUE_DELTA_FIELDS) -> dict:
+    """Build the compact field dict for an issue delta."""
+    result = {}
+    for name in fields:
+        if name == "label_ids":
+            result[name] = [str(label.id) for label in issue.labels]
+        elif name in ISSUE_DELTA_FIELDS:
+            result[name] = _compact(getattr(issue, name))
+    return result
+
+
+class BoardEventBus:
+    """Publishes board deltas to ``/ws/projects/{project_id}`` subscribers.
+
+    Deltas for the same entity within one ``window`` are merged, and each
+    project gets a single ``board`` frame per window listing one delta per
+    entity. Publishing to a project nobody is watching is a no-op; projects
+    with a replay buffer count as watched so reconnecting boards can resume.
+    """
+
+    def __init__(self, connections: ConnectionManager, window: float = settings.BOARD_EVENT_WINDOW):
+        """Initialize the bus.
+
+        Args:
+            connections: Manager holding the project channel subscriptions.
+            window: Coalescing window in seconds.
+        """
+        self.connections = connections
+        self.window = window
+        self._pending: dict[str, dict[tuple[str, str], dict]] = {}
+
+    def is_watched(self, project_id: UUID | str) -> bool:
+        """Return True if anyone is (or recently was) watching this project's board."""
+        return self.connections.is_watched(str(project_id))
+
+    def publish(self, project_id: UUID | str, entity: str, entity_id: UUID | str, op: str, fields: dict | None = None):
+        """Queue a delta for the next flush of this project's window.
+
+        Args:
+            project_id: Project whose board changed.
+            entity: "issue" or "sprint".
+            entity_id: ID of the changed entity.
+            op: "created", "updated", "moved" or "deleted".
+            fields: Changed fields (omitted for deletes).
+        """
+        channel = str(project_id)
+        if not self.connections.is_watched(channel):
+            return
+
+        deltas = self._pending.get(channel)
+        if deltas is None:
+            deltas = self._pending[channel] = {}
+            asyncio.get_running_loop().call_later(self.window, self._flush, channel)
+
+        key = (entity, str(entity_id))
+        delta = deltas.get(key)
+        if delta is None:
+            delta = deltas[key] = {"entity": entity, "id": key[1], "op": op}
+        elif _OP_PRECEDENCE[op] > _OP_PRECEDENCE[delta["op"]]:
+            delta["op"] = op
+        if op == "deleted":
+            delta.pop("fields", None)
+        elif fields:
+            delta.setdefault("fields", {}).update(fields)
+
+    def publish_issue(self, issue: Any, op: str, fields: tuple[str, ...] | set[str] = ISSUE_DELTA_FIELDS):
+        """Queue an issue delta carrying the given fields."""
+        if op == "deleted":
+            self.publish(issue.project_id, "issue", issue.id, op)
+        else:
+            self.publish(issue.project_id, "issue", issue.id, op, issue_fields(issue, fields))
+
+    def publish_sprint(self, sprint: Any, op: str):
+        """Queue a sprint delta."""
+        fields = None
+        if op != "deleted":
+            fields = {
+                "name": sprint.name,
+                "status": _compact(sprint.status),
+                "start_date": sprint.start_date.isoformat() if sprint.start_date else None,
+                "end_date": sprint.end_date.isoformat() if sprint.end_date else None,
+            }
+        self.publish(sprint.project_id, "sprint", sprint.id, op, fields)
+
+    def _flush(self, channel: str) -> None:
+        """Send one frame with every coalesced delta for a project."""
+        deltas = self._pending.pop(channel, None)
+        if deltas:
+            frame = {"type": "board", "project_id": channel, "events": list(deltas.values())}
+            self.connections.broadcast(channel, frame)
+
+
+# Singleton instance used by the issue, sprint and comment services
+board_events = BoardEventBus(board_manager)
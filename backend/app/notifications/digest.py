@@ -0,0 +1,51 @@
+"""Batched delivery of notification pushes for users in digest mode."""
+import asyncio
+import logging
+
+from app.config import settings
+from app.notifications.manager import ConnectionManager, manager
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDigest:
+    """Buffers notification payloads per user and pushes them as one frame per interval.
+
+    Frames have the shape ``{"type": "digest", "data": [...]}``. A row that
+    is coalesced again before the flush replaces its earlier payload, so
+    each notification appears at most once per digest.
+    """
+
+    def __init__(self, connections: ConnectionManager, interval: float = settings.NOTIFICATION_DIGEST_INTERVAL):
+        """Initialize the digest buffer.
+
+        Args:
+            connections: Manager holding the per-user notification channels.
+            interval: Seconds between digest pushes for a user.
+        """
+        self.connections = connections
+        self.interval = interval
+        self._pending: dict[str, dict[str, dict]] = {}
+
+    def add(self, user_id: str, payload: dict) -> None:
+        """Queue a serialized notification for the user's next digest.
+
+        Args:
+            user_id: The user UUID as string.
+            payload: NotificationResponse dumped in JSON mode.
+        """
+        batch = self._pending.get(user_id)
+        if batch is None:
+            batch = self._pending[user_id] = {}
+            asyncio.get_running_loop().call_later(self.interval, self._flush, user_id)
+        batch[payload["id"]] = payload
+
+    def _flush(self, user_id: str) -> None:
+        """Push every buffered notification for a user in one frame."""
+        batch = self._pending.pop(user_id, None)
+        if batch:
+            self.connections.broadcast(user_id, {"type": "digest", "data": list(batch.values())})
+
+
+# Singleton instance used by the notification service
+digest = NotificationDigest(manager)
@@ -1,61 +1,474 @@
-"""WebSocket connection manager for real-time notifications."""
-from collections import defaultdict
+"""Connection manager for real-time notifications over WebSocket and SSE."""
+import asyncio
+import enum
+import json
 import logging
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import asdict, dataclass
 
 from fastapi import WebSocket
 
+from app.config import settings
+from app.notifications.replay import ReplayLogs
+from app.notifications.timers import TimerWheel
+
 logger = logging.getLogger(__name__)
 
+# Close code sent to a client that cannot keep up with its send queue
+SLOW_CONSUMER_CLOSE_CODE = 1013  # "Try Again Later"
+# Close code sent to a client that stopped answering heartbeats
+IDLE_CLOSE_CODE = 1001  # "Going Away"
+
+
+class Frame:
+    """A message encoded once and shared by every connection it is delivered to.
+
+    The JSON text is produced once per message; the SSE form is derived the
+    first time an SSE connection needs it and then reused.
+    """
+
+    __slots__ = ("text", "seq", "epoch", "_sse")
+
+    def __init__(self, text: str, seq: int | None = None, epoch: str | None = None, sse: str | None = None):
+        self.text = text
+        self.seq = seq
+        self.epoch = epoch
+        self._sse = sse
+
+    def sse(self) -> str:
+        """Return the frame as a Server-Sent Events message (``id`` is ``epoch:seq``)."""
+        if self._sse is None:
+            event_id = f"id: {self.epoch}:{self.seq}\n" if self.seq is not None else ""
+            self._sse = f"{event_id}data: {self.text}\n\n"
+        return self._sse
+
+
+# Pre-encoded control frames, shared by every connection
+PING_FRAME = Frame('{"type":"ping"}')
+PONG_FRAME = Frame("pong")
+KEEPALIVE_FRAME = Frame("", sse=": keep-alive\n\n")
+
+
+class OverflowPolicy(str, enum.Enum):
+    """What to do when a connection's send queue is full."""
+
+    drop_oldest = "drop_oldest"
+    disconnect = "disconnect"
+
+
+@dataclass
+class DeliveryMetrics:
+    """Counters describing real-time delivery since process start."""
+
+    enqueued: int = 0
+    sent: int = 0
+    dropped: int = 0
+    send_failures: int = 0
+    slow_consumer_disconnects: int = 0
+    idle_disconnects: int = 0
+    replayed: int = 0
+    resyncs: int = 0
+
+
+class Connection(ABC):
+    """A registered subscriber plus its pending frames and heartbeat state.
+
+    Uses ``__slots__`` and only references shared frames, so an idle
+    connection costs a few hundred bytes. Subclasses decide how pending
+    frames reach the client.
+    """
+
+    __slots__ = ("channel", "pending", "last_seen", "wheel_slot")
+
+    # Frame enqueued on every heartbeat
+    heartbeat_frame = PING_FRAME
+    # Whether the client is expected to answer heartbeats (otherwise never reaped as idle)
+    expects_client_activity = True
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.pending: deque[Frame] = deque()
+        self.last_seen = time.monotonic()
+        self.wheel_slot: int | None = None
+
+    def touch(self) -> None:
+        """Record client activity (any inbound frame)."""
+        self.last_seen = time.monotonic()
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by this connection record and its queue (frames are shared)."""
+        return sys.getsizeof(self) + sys.getsizeof(self.pending)
+
+    @abstractmethod
+    def wake(self, manager: "ConnectionManager") -> None:
+        """Make sure pending frames get delivered."""
+
+    @abstractmethod
+    def detach(self) -> None:
+        """Stop delivering frames to this connection."""
+
+    def close(self, code: int) -> None:
+        """Close the underlying transport in the background."""
+
+
+class WebSocketConnection(Connection):
+    """A WebSocket subscriber, drained by a writer task that only exists while frames are pending."""
+
+    __slots__ = ("websocket", "writer")
+
+    def __init__(self, websocket: WebSocket, channel: str):
+        super().__init__(channel)
+        self.websocket = websocket
+        self.writer: asyncio.Task | None = None
+
+    def memory_usage(self) -> int:
+        size = super().memory_usage()
+        if self.writer is not None:
+            size += sys.getsizeof(self.writer)
+        return size
+
+    def wake(self, manager: "ConnectionManager") -> None:
+        if self.writer is None:
+            self.writer = asyncio.create_task(manager._writer(self))
+
+    def detach(self) -> None:
+        if self.writer and self.writer is not asyncio.current_task():
+            self.writer.cancel()
+
+    def close(self, code: int) -> None:
+        asyncio.create_task(_close_quietly(self.websocket, code))
+
+
+class StreamConnection(Connection):
+    """A Server-Sent Events subscriber, drained by its streaming response.
+
+    SSE is one-way: the heartbeat is a comment line that keeps proxies from
+    timing the stream out, and a gone client is noticed by the server when
+    a write fails rather than by an idle timeout.
+    """
+
+    __slots__ = ("ready", "closed")
+
+    heartbeat_frame = KEEPALIVE_FRAME
+    expects_client_activity = False
+
+    def __init__(self, channel: str):
+        super().__init__(channel)
+        self.ready = asyncio.Event()
+        self.closed = False
+
+    def wake(self, manager: "ConnectionManager") -> None:
+        self.ready.set()
+
+    def detach(self) -> None:
+        self.closed = True
+        self.ready.set()
+
 
 class ConnectionManager:
-    """Manages WebSocket connections per user for real-time notifications.
+    """Manages real-time connections per channel for notifications and board events.
+
+    A channel is a user (notifications) or a project (board events), and each
+    channel supports multiple concurrent connections (e.g., multiple tabs/windows)
+    over WebSocket or Server-Sent Events. Messages are encoded once into a
+    shared Frame and fanned out to per-connection bounded queues, so a slow
+    client never stalls the others. Heartbeats and idle timeouts for every
+    connection run on a single timer wheel rather than a timer per socket.
 
-    Supports multiple concurrent connections per user (e.g., multiple tabs/windows).
+    Every broadcast frame carries a per-channel ``seq`` and is kept in a
+    bounded replay buffer, so a reconnecting client that presents its last
+    ``epoch``/``seq`` receives only the frames it missed (including frames
+    dropped by the overflow policy) or a ``resync_required`` frame.
     """
 
-    def __init__(self):
-        """Initialize connection manager with empty connections dict."""
-        self.active_connections: dict[str, list[WebSocket]] = defaultdict(list)
+    def __init__(
+        self,
+        queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy | str = settings.WS_OVERFLOW_POLICY,
+        heartbeat_interval: float = settings.WS_HEARTBEAT_INTERVAL,
+        idle_timeout: float = settings.WS_IDLE_TIMEOUT,
+        timer_tick: float = settings.WS_TIMER_TICK,
+        replay_buffer_size: int = settings.WS_REPLAY_BUFFER_SIZE,
+        replay_max_channels: int = settings.WS_REPLAY_MAX_CHANNELS,
+    ):
+        """Initialize connection manager with an empty registry.
 
-    async def connect(self, websocket: WebSocket, user_id: str) -> None:
+        Args:
+            queue_size: Maximum number of pending messages per connection.
+            overflow_policy: Policy applied when a connection's queue is full.
+            heartbeat_interval: Seconds between server pings on a connection.
+            idle_timeout: Seconds without client activity before disconnecting.
+            timer_tick: Resolution of the heartbeat timer wheel, in seconds.
+            replay_buffer_size: Frames retained per channel for replay on reconnect.
+            replay_max_channels: Channels whose replay buffers are retained (LRU).
+        """
+        self.queue_size = queue_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.active_connections: dict[str, set[Connection]] = {}
+        self.metrics = DeliveryMetrics()
+        self.wheel = TimerWheel(timer_tick, heartbeat_interval, self._heartbeat)
+        self.logs = ReplayLogs(replay_buffer_size, replay_max_channels)
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        channel: str,
+        last_seq: int | None = None,
+        epoch: str | None = None,
+    ) -> WebSocketConnection:
         """Accept and register a WebSocket connection.
 
+        The first frame is ``{"type": "hello", "epoch": ..., "seq": ...}``.
+        When ``last_seq`` is given, the missed frames follow, or a
+        ``{"type": "resync_required"}`` frame if they can't be replayed.
+
         Args:
             websocket: The WebSocket connection to accept.
-            user_id: The user UUID as string who owns this connection.
+            channel: The channel key, e.g. the user UUID as string who owns this connection.
+            last_seq: Last sequence number the client processed, when resuming.
+            epoch: Epoch the client's ``last_seq`` belongs to.
+
+        Returns:
+            The connection record, used by the endpoint to report activity.
         """
         await websocket.accept()
-        self.active_connections[user_id].append(websocket)
-        logger.info(f"User {user_id} connected. Total connections: {len(self.active_connections[user_id])}")
+        conn = WebSocketConnection(websocket, channel)
+        self._register(conn, last_seq, epoch)
+        return conn
+
+    def open_stream(self, channel: str, last_seq: int | None = None, epoch: str | None = None) -> StreamConnection:
+        """Register a Server-Sent Events subscriber.
+
+        Frames are queued exactly as for :meth:`connect`; drain them with
+        :meth:`stream`.
+
+        Args:
+            channel: The channel key, e.g. the user UUID as string.
+            last_seq: Last sequence number the client processed, when resuming.
+            epoch: Epoch the client's ``last_seq`` belongs to.
+
+        Returns:
+            The stream connection record.
+        """
+        conn = StreamConnection(channel)
+        self._register(conn, last_seq, epoch)
+        return conn
+
+    async def stream(self, conn: StreamConnection) -> AsyncIterator[str]:
+        """Yield SSE-encoded frames for a stream connection until it is detached.
 
-    def disconnect(self, websocket: WebSocket, user_id: str) -> None:
+        The connection is unregistered when the generator finishes or is
+        closed (client disconnect).
+
+        Args:
+            conn: Connection returned by :meth:`open_stream`.
+
+        Yields:
+            Server-Sent Events messages, ready to write to the response body.
+        """
+        try:
+            while not conn.closed:
+                if not conn.pending:
+                    conn.ready.clear()
+                    await conn.ready.wait()
+                    continue
+                yield conn.pending.popleft().sse()
+                self.metrics.sent += 1
+        finally:
+            self.remove(conn)
+
+    def disconnect(self, websocket: WebSocket, channel: str) -> None:
         """Unregister and remove a WebSocket connection.
 
+        Safe to call for a connection that was already reaped.
+
         Args:
             websocket: The WebSocket connection to remove.
-            user_id: The user UUID as string who owns this connection.
+            channel: The channel key the connection was registered under.
         """
-        if websocket in self.active_connections.get(user_id, []):
-            self.active_connections[user_id].remove(websocket)
-            logger.info(f"User {user_id} disconnected. Remaining connections: {len(self.active_connections[user_id])}")
+        for conn in self.active_connections.get(channel, ()):
+            if isinstance(conn, WebSocketConnection) and conn.websocket is websocket:
+                self.remove(conn)
+                return
 
-    async def send_to_user(self, user_id: str, data: dict) -> None:
-        """Send a JSON message to all connections of a user.
+    def remove(self, conn: Connection) -> None:
+        """Remove a connection from the registry, the timer wheel and its delivery loop.
+
+        Safe to call more than once.
+
+        Args:
+            conn: The connection to remove.
+        """
+        connections = self.active_connections.get(conn.channel)
+        if connections is not None:
+            connections.discard(conn)
+            if not connections:
+                del self.active_connections[conn.channel]
+        self.wheel.cancel(conn)
+        conn.pending.clear()
+        conn.detach()
 
-        Silently skips connections that have been closed.
+    async def send_to_user(self, user_id: str, data: dict) -> None:
+        """Queue a JSON message for all connections of a user.
 
         Args:
             user_id: The user UUID as string to send the message to.
             data: Dictionary to send as JSON to the user's connections.
         """
-        for ws in self.active_connections.get(user_id, []):
-            try:
-                await ws.send_json(data)
-            except Exception as e:
-                logger.debug(f"Error sending to user {user_id}: {e}")
-                # Connection may have closed; we don't remove it here
-                # It will be removed on next disconnect() call
+        self.broadcast(user_id, data)
+
+    def broadcast(self, channel: str, data: dict) -> None:
+        """Queue a JSON message for every connection subscribed to a channel.
+
+        The message is stamped with the channel's next ``seq``, encoded once,
+        stored in the replay buffer and enqueued on every connection without
+        awaiting any socket, so this returns immediately. Channels that have
+        neither connections nor a replay buffer are skipped.
+
+        Args:
+            channel: The channel key (a user or project UUID as string).
+            data: Dictionary to send as JSON to the channel's connections.
+        """
+        connections = self.active_connections.get(channel)
+        if not connections and channel not in self.logs:
+            return
+        log = self.logs.get_or_create(channel)
+        seq = log.next_seq()
+        frame = Frame(encode_message({**data, "seq": seq}), seq, log.epoch)
+        log.append(frame)
+        for conn in list(connections or ()):
+            self.enqueue(conn, frame)
+
+    def broadcast_many(self, messages: Iterable[tuple[str, dict]]) -> None:
+        """Queue a batch of per-channel messages, e.g. one notification per recipient.
+
+        Args:
+            messages: ``(channel, data)`` pairs, delivered as by :meth:`broadcast`.
+        """
+        for channel, data in messages:
+            self.broadcast(channel, data)
+
+    def is_watched(self, channel: str) -> bool:
+        """Return True if a channel has connections or a replay buffer for reconnecting clients."""
+        return channel in self.active_connections or channel in self.logs
+
+    def enqueue(self, conn: Connection, frame: Frame) -> None:
+        """Put a frame on a connection queue, applying the overflow policy."""
+        if len(conn.pending) >= self.queue_size:
+            if self.overflow_policy == OverflowPolicy.disconnect:
+                self.metrics.slow_consumer_disconnects += 1
+                logger.warning(f"Disconnecting slow consumer on channel {conn.channel}")
+                self._reap(conn, SLOW_CONSUMER_CLOSE_CODE)
+                return
+            conn.pending.popleft()
+            self.metrics.dropped += 1
+        conn.pending.append(frame)
+        self.metrics.enqueued += 1
+        conn.wake(self)
+
+    async def shutdown(self) -> None:
+        """Stop the timer wheel and every delivery loop, and forget all connections."""
+        await self.wheel.stop()
+        connections = [conn for conns in self.active_connections.values() for conn in conns]
+        writers = [conn.writer for conn in connections if isinstance(conn, WebSocketConnection) and conn.writer]
+        self.active_connections.clear()
+        self.logs.clear()
+        for conn in connections:
+            conn.detach()
+        await asyncio.gather(*writers, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Return delivery counters plus current queue depth and memory figures."""
+        connections = [conn for conns in self.active_connections.values() for conn in conns]
+        depths = [len(conn.pending) for conn in connections]
+        memory = sum(conn.memory_usage() for conn in connections)
+        streams = sum(1 for conn in connections if isinstance(conn, StreamConnection))
+        return {
+            "channels": len(self.active_connections),
+            "connections": len(connections),
+            "websocket_connections": len(connections) - streams,
+            "sse_connections": streams,
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "queue_size": self.queue_size,
+            "overflow_policy": self.overflow_policy.value,
+            "memory_bytes": memory,
+            "memory_bytes_per_connection": memory // len(connections) if connections else 0,
+            "replay_channels": len(self.logs),
+            **asdict(self.metrics),
+        }
+
+    def _register(self, conn: Connection, last_seq: int | None, epoch: str | None) -> None:
+        """Add a connection, schedule its heartbeat and queue hello plus any replay."""
+        self.active_connections.setdefault(conn.channel, set()).add(conn)
+        self.wheel.schedule(conn, self.heartbeat_interval)
+        self.wheel.start()
+
+        # No awaits from here on, so no broadcast can slip between hello and replay
+        log = self.logs.get_or_create(conn.channel)
+        self.enqueue(conn, Frame(encode_message({"type": "hello", "epoch": log.epoch, "seq": log.last_seq})))
+        if last_seq is not None:
+            frames = log.since(last_seq) if epoch == log.epoch else None
+            if frames is None:
+                self.metrics.resyncs += 1
+                resync = {"type": "resync_required", "epoch": log.epoch, "seq": log.last_seq}
+                self.enqueue(conn, Frame(encode_message(resync)))
+            else:
+                self.metrics.replayed += len(frames)
+                for frame in frames:
+                    self.enqueue(conn, frame)
+        total = len(self.active_connections[conn.channel])
+        logger.debug(f"Channel {conn.channel} connected. Total connections: {total}")
+
+    async def _writer(self, conn: WebSocketConnection) -> None:
+        """Drain a WebSocket connection's queue onto its socket, then exit."""
+        try:
+            while conn.pending:
+                frame = conn.pending.popleft()
+                try:
+                    await conn.websocket.send_text(frame.text)
+                except Exception as e:
+                    logger.debug(f"Error sending on channel {conn.channel}: {e}")
+                    self.metrics.send_failures += 1
+                    self.remove(conn)
+                    return
+                self.metrics.sent += 1
+        finally:
+            conn.writer = None
+
+    def _heartbeat(self, conn: Connection) -> None:
+        """Timer wheel callback: ping a live connection or drop an idle one."""
+        if conn.expects_client_activity and time.monotonic() - conn.last_seen > self.idle_timeout:
+            self.metrics.idle_disconnects += 1
+            self._reap(conn, IDLE_CLOSE_CODE)
+            return
+        self.enqueue(conn, conn.heartbeat_frame)
+        self.wheel.schedule(conn, self.heartbeat_interval)
+
+    def _reap(self, conn: Connection, code: int) -> None:
+        """Unregister a connection and close its transport in the background."""
+        self.remove(conn)
+        conn.close(code)
+
+
+def encode_message(data: dict) -> str:
+    """Serialize a message once for every connection it is delivered to."""
+    return json.dumps(data, separators=(",", ":"), default=str)
+
+
+async def _close_quietly(websocket: WebSocket, code: int) -> None:
+    try:
+        await websocket.close(code=code)
+    except Exception:
+        pass
 
 
-# Singleton instance used across the app
+# Singleton instances used across the app: per-user notifications and per-project board events
 manager = ConnectionManager()
+board_manager = ConnectionManager()
@@ -4,7 +4,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, String, Text, func
+from sqlalchemy import DDL, Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text, event, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -28,6 +28,19 @@ class Notification(Base):
             "created_at",
             postgresql_ops={"created_at": "DESC"},
         ),
+        # Keyset pagination of the inbox on (created_at, id)
+        Index("idx_notifications_inbox", "user_id", "created_at", "id"),
+        # Finds the unread row a new notification can be merged into
+        Index(
+            "idx_notifications_coalesce",
+            "user_id",
+            "issue_id",
+            "type",
+            "updated_at",
+            postgresql_where=text("read = false"),
+        ),
+        # Monthly range partitions on created_at (see app.notifications.partitions)
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -44,7 +57,13 @@ class Notification(Base):
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     message: Mapped[str | None] = mapped_column(Text, nullable=True)
     read: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Number of events merged into this row by coalescing
+    count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    # Part of the primary key because the table is partitioned by it
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, nullable=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     # Relationships
     user = relationship("User", lazy="selectin")
@@ -52,3 +71,42 @@ class Notification(Base):
 
     def __repr__(self) -> str:
         return f"<Notification {self.type.value} for user={self.user_id}>"
+
+
+class NotificationCounter(Base):
+    """Per-user notification totals, so the inbox never counts rows."""
+
+    __tablename__ = "notification_counters"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    total: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    unread: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"<NotificationCounter user={self.user_id} unread={self.unread}/{self.total}>"
+
+
+# Rows removed by ON DELETE CASCADE (e.g. a deleted issue) never pass through the
+# service, so a row trigger keeps the counters in step. Inserts and read changes
+# are counted by the service in bulk; dropped partitions in partitions.py.
+COUNTER_DELETE_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION notification_counters_on_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE notification_counters
+        SET total = greatest(total - 1, 0),
+            unread = greatest(unread - CASE WHEN OLD.read THEN 0 ELSE 1 END, 0)
+        WHERE user_id = OLD.user_id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """
+)
+COUNTER_DELETE_TRIGGER = DDL(
+    "CREATE TRIGGER notifications_counter_delete AFTER DELETE ON notifications "
+    "FOR EACH ROW EXECUTE FUNCTION notification_counters_on_delete()"
+)
+event.listen(Notification.__table__, "after_create", COUNTER_DELETE_FUNCTION)
+event.listen(Notification.__table__, "after_create", COUNTER_DELETE_TRIGGER)
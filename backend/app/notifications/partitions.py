@@ -0,0 +1,242 @@
+"""Monthly range partitions of the notifications table, with archival retention."""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.config import settings
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "notifications"
+# Partitions are named notifications_YYYY_MM and cover [first of month, first of next month) in UTC
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_(\d{{4}})_(\d{{2}})$")
+# Rows fetched per round trip when archiving a partition
+ARCHIVE_BATCH_SIZE = 5000
+# Dropping a partition fires no row triggers, so its rows are taken off the counters first
+_RELEASE_COUNTERS = (
+    "UPDATE notification_counters AS c "
+    "SET total = greatest(c.total - d.total, 0), unread = greatest(c.unread - d.unread, 0) "
+    "FROM (SELECT user_id, count(*) AS total, count(*) FILTER (WHERE NOT read) AS unread "
+    "FROM {partition} GROUP BY user_id) AS d "
+    "WHERE c.user_id = d.user_id"
+)
+# Advisory lock key so only one worker runs maintenance at a time
+MAINTENANCE_LOCK_KEY = 0x6E6F7469  # "noti"
+
+
+def month_start(value: date) -> date:
+    """Return the first day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Return the first day of the month ``months`` after (or before) ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Return the partition table name for a month."""
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+
+def _bound(month: date) -> str:
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    months_ahead: int = settings.NOTIFICATION_PARTITIONS_AHEAD,
+    today: date | None = None,
+) -> list[str]:
+    """Create the current month's partition and ``months_ahead`` future ones if missing.
+
+    Args:
+        conn: Connection inside a transaction.
+        months_ahead: Future months to pre-create, so inserts never lack a partition.
+        today: Reference date (defaults to the current UTC date).
+
+    Returns:
+        Names of the partitions that now exist for those months.
+    """
+    current = month_start(today or datetime.now(timezone.utc).date())
+    names = []
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        name = partition_name(start)
+        await conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{_bound(start)}') TO ('{_bound(add_months(start, 1))}')"
+            )
+        )
+        names.append(name)
+    return names
+
+
+async def list_partitions(conn: AsyncConnection) -> list[tuple[str, date]]:
+    """Return ``(name, month)`` for every monthly partition, oldest first."""
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    partitions = []
+    for (name,) in result.all():
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def archive_partition(conn: AsyncConnection, name: str, archive_dir: str) -> Path:
+    """Export a partition to ``<archive_dir>/<name>.ndjson.gz``, one JSON object per row.
+
+    Rows are read through a server-side cursor and compressed off the event
+    loop, so large partitions are never held in memory.
+
+    Args:
+        conn: Connection inside a transaction.
+        name: Partition table name.
+        archive_dir: Directory receiving the archive file.
+
+    Returns:
+        Path of the written archive.
+    """
+    directory = Path(archive_dir)
+    await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+    path = directory / f"{name}.ndjson.gz"
+    partial = path.with_suffix(".gz.partial")
+
+    result = await conn.stream(text(f"SELECT * FROM {name} ORDER BY created_at, id"))
+    archive = await asyncio.to_thread(gzip.open, partial, "wt", encoding="utf-8")
+    try:
+        async for rows in result.mappings().partitions(ARCHIVE_BATCH_SIZE):
+            chunk = "".join(json.dumps(dict(row), default=str) + "\n" for row in rows)
+            await asyncio.to_thread(archive.write, chunk)
+    finally:
+        await asyncio.to_thread(archive.close)
+    await asyncio.to_thread(os.replace, partial, path)
+    return path
+
+
+async def drop_expired_partitions(
+    conn: AsyncConnection,
+    retention_months: int = settings.NOTIFICATION_RETENTION_MONTHS,
+    archive_dir: str = settings.NOTIFICATION_ARCHIVE_DIR,
+    today: date | None = None,
+) -> list[str]:
+    """Archive and drop partitions entirely older than the retention period.
+
+    Whole partitions are detached and dropped, which is instant and leaves
+    no dead tuples or index bloat, unlike ``DELETE``. Their rows are
+    subtracted from the per-user notification counters first.
+
+    Each partition is archived in a read-only transaction of its own, then
+    released, detached and dropped in a short one. ``DETACH PARTITION``
+    holds an ACCESS EXCLUSIVE lock on ``notifications`` until commit, so it
+    must never wait on an archive export.
+
+    Args:
+        conn: Connection outside a transaction; every step commits on its own.
+        retention_months: Full months kept before the current one; 0 keeps everything.
+        archive_dir: Where dropped partitions are exported first; empty disables archival.
+        today: Reference date (defaults to the current UTC date).
+
+    Returns:
+        Names of the dropped partitions.
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(today or datetime.now(timezone.utc).date()), -retention_months)
+
+    async with conn.begin():
+        expired = [name for name, month in await list_partitions(conn) if month < cutoff]
+    dropped = []
+    for name in expired:
+        if archive_dir:
+            async with conn.begin():
+                path = await archive_partition(conn, name, archive_dir)
+            logger.info(f"Archived notification partition {name} to {path}")
+        async with conn.begin():
+            await conn.execute(text(_RELEASE_COUNTERS.format(partition=name)))
+            await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            await conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+class PartitionMaintenance:
+    """Background task that keeps future partitions created and applies retention.
+
+    Runs once at start and then every ``interval`` seconds. A session-level
+    advisory lock, held across the run's transactions, makes concurrent
+    workers skip a run another worker is already doing.
+    """
+
+    def __init__(self, interval: float = settings.NOTIFICATION_MAINTENANCE_INTERVAL):
+        """Initialize the maintenance task.
+
+        Args:
+            interval: Seconds between maintenance runs.
+        """
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> list[str]:
+        """Ensure upcoming partitions and drop expired ones.
+
+        Returns:
+            Names of the dropped partitions (empty if another worker holds the lock).
+        """
+        async with engine.connect() as conn:
+            locked = await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+            await conn.commit()
+            if not locked:
+                return []
+            try:
+                async with conn.begin():
+                    await ensure_partitions(conn)
+                return await drop_expired_partitions(conn)
+            finally:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+                await conn.commit()
+
+    def start(self) -> None:
+        """Start the periodic task (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the periodic task."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                dropped = await self.run_once()
+                if dropped:
+                    logger.info(f"Dropped expired notification partitions: {', '.join(dropped)}")
+            except Exception:
+                logger.exception("Notification partition maintenance failed")
+            await asyncio.sleep(self.interval)
+
+
+# Singleton instance started with the app
+partition_maintenance = PartitionMaintenance()
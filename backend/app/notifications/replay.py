@@ -0,0 +1,84 @@
+"""Per-channel event sequencing and bounded replay buffers."""
+import uuid
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.notifications.manager import Frame
+
+
+class EventLog:
+    """Sequence counter and ring buffer of recently pushed frames for one channel.
+
+    Every log gets a random ``epoch`` when created. Sequence numbers are only
+    comparable within an epoch, so a client whose ``last_seq`` comes from a
+    different epoch (worker restart, another worker, evicted log) is told to
+    resync instead of being replayed the wrong events.
+    """
+
+    __slots__ = ("epoch", "last_seq", "entries")
+
+    def __init__(self, capacity: int):
+        self.epoch = uuid.uuid4().hex[:12]
+        self.last_seq = 0
+        self.entries: deque["Frame"] = deque(maxlen=capacity)
+
+    def next_seq(self) -> int:
+        """Allocate the next sequence number."""
+        self.last_seq += 1
+        return self.last_seq
+
+    def append(self, frame: "Frame") -> None:
+        """Record a sequenced frame."""
+        self.entries.append(frame)
+
+    def since(self, last_seq: int) -> list["Frame"] | None:
+        """Return the frames after ``last_seq``, or None if they are no longer buffered."""
+        if last_seq > self.last_seq:
+            return None
+        if last_seq == self.last_seq:
+            return []
+        oldest = self.entries[0].seq if self.entries else self.last_seq + 1
+        if last_seq + 1 < oldest:
+            return None
+        return [frame for frame in self.entries if frame.seq > last_seq]
+
+
+class ReplayLogs:
+    """LRU-bounded collection of EventLogs keyed by channel."""
+
+    def __init__(self, capacity: int, max_channels: int):
+        """Initialize the collection.
+
+        Args:
+            capacity: Frames retained per channel.
+            max_channels: Channels retained before the least recently used is evicted.
+        """
+        self.capacity = capacity
+        self.max_channels = max_channels
+        self._logs: OrderedDict[str, EventLog] = OrderedDict()
+
+    def __contains__(self, channel: str) -> bool:
+        return channel in self._logs
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+    def get(self, channel: str) -> EventLog | None:
+        """Return a channel's log (marking it recently used), or None."""
+        log = self._logs.get(channel)
+        if log is not None:
+            self._logs.move_to_end(channel)
+        return log
+
+    def get_or_create(self, channel: str) -> EventLog:
+        """Return a channel's log, creating it (and evicting the LRU log) if needed."""
+        log = self.get(channel)
+        if log is None:
+            log = self._logs[channel] = EventLog(self.capacity)
+            while len(self._logs) > self.max_channels:
+                self._logs.popitem(last=False)
+        return log
+
+    def clear(self) -> None:
+        self._logs.clear()
@@ -1,36 +1,53 @@
-"""Notifications API router — REST endpoints and WebSocket."""
+"""Notifications API router — REST endpoints, WebSocket and Server-Sent Events."""
 import logging
+from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
-from app.auth.models import User
+from app.auth.models import User, UserRole
 from app.auth.utils import decode_token
-from app.database import get_db
+from app.database import async_session, get_db
 from app.notifications import schemas, service
-from app.notifications.manager import manager
+from app.notifications.manager import PONG_FRAME, board_manager, manager
+from app.projects.service import get_user_role_in_project
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["notifications"])
 
+# Reconnect delay suggested to EventSource clients, in milliseconds
+SSE_RETRY_MS = 3000
+
 
 @router.websocket("/ws/notifications")
 async def websocket_notifications(
     websocket: WebSocket,
     token: str,
+    last_seq: int | None = None,
+    epoch: str | None = None,
     db: AsyncSession = Depends(get_db),
 ) -> None:
     """WebSocket endpoint for real-time notifications.
 
     Expects a query parameter 'token' with a valid JWT access token.
-    The connection is kept alive by sending/receiving ping-pong frames.
+    The server sends a ``{"type": "ping"}`` frame every heartbeat interval;
+    any inbound frame counts as activity, and connections that stay silent
+    past the idle timeout are closed. Text "ping" frames are still answered
+    with "pong" for older clients.
+
+    Pushed events carry a ``seq``. A reconnecting client passes the ``epoch``
+    from the server's hello frame and its ``last_seq`` to receive only the
+    events it missed, or a ``resync_required`` frame if the gap is too large.
 
     Args:
         websocket: The WebSocket connection.
         token: JWT access token passed as query param.
+        last_seq: Last event sequence number the client processed.
+        epoch: Stream epoch that ``last_seq`` belongs to.
         db: Database session.
     """
     user_id = None
@@ -43,14 +60,15 @@ async def websocket_notifications(
             return
 
         # Accept and register the connection
-        await manager.connect(websocket, user_id)
+        conn = await manager.connect(websocket, user_id, last_seq=last_seq, epoch=epoch)
 
-        # Keep the connection alive; client will send ping-pong
+        # Heartbeats are driven by the manager's timer wheel; this loop only
+        # records client activity and detects the disconnect.
         while True:
             data = await websocket.receive_text()
-            # Echo back pings (simple keep-alive mechanism)
+            conn.touch()
             if data == "ping":
-                await websocket.send_text("pong")
+                manager.enqueue(conn, PONG_FRAME)
 
     except Exception as e:
         logger.error(f"WebSocket error for user {user_id}: {e}")
@@ -63,28 +81,162 @@ async def websocket_notifications(
             manager.disconnect(websocket, user_id)
 
 
+@router.websocket("/ws/projects/{project_id}")
+async def websocket_project_board(
+    websocket: WebSocket,
+    project_id: UUID,
+    token: str,
+    last_seq: int | None = None,
+    epoch: str | None = None,
+) -> None:
+    """WebSocket endpoint streaming board deltas for one project.
+
+    Membership is checked once, at subscribe time, with a short-lived session
+    so the socket never pins a pooled database connection. Frames have the
+    shape ``{"type": "board", "project_id": ..., "events": [...]}``, with at
+    most one delta per issue or sprint per coalescing window. Frames carry a
+    ``seq`` and support ``epoch``/``last_seq`` resume like the notification socket.
+
+    Args:
+        websocket: The WebSocket connection.
+        project_id: The project to subscribe to.
+        token: JWT access token passed as query param.
+        last_seq: Last event sequence number the client processed.
+        epoch: Stream epoch that ``last_seq`` belongs to.
+    """
+    channel = str(project_id)
+    try:
+        payload = decode_token(token)
+        user_id = payload.get("sub")
+    except Exception:
+        user_id = None
+    if not user_id:
+        await websocket.close(code=1008, reason="Invalid token")
+        return
+
+    async with async_session() as db:
+        role = await get_user_role_in_project(db, project_id, UUID(user_id))
+    if role is None:
+        await websocket.close(code=1008, reason="You are not a member of this project")
+        return
+
+    try:
+        conn = await board_manager.connect(websocket, channel, last_seq=last_seq, epoch=epoch)
+        while True:
+            data = await websocket.receive_text()
+            conn.touch()
+            if data == "ping":
+                board_manager.enqueue(conn, PONG_FRAME)
+    except Exception as e:
+        logger.debug(f"Board WebSocket for project {channel} closed: {e}")
+    finally:
+        board_manager.disconnect(websocket, channel)
+
+
+def _parse_last_event_id(value: str | None) -> tuple[str | None, int | None]:
+    """Split an SSE ``Last-Event-ID`` of the form ``epoch:seq``; malformed IDs are ignored."""
+    epoch, _, seq = (value or "").rpartition(":")
+    if not epoch or not seq.isdigit():
+        return None, None
+    return epoch, int(seq)
+
+
+@router.get("/notifications/stream")
+async def stream_notifications(
+    token: str,
+    last_seq: int | None = None,
+    epoch: str | None = None,
+    last_event_id: str | None = Header(None),
+) -> StreamingResponse:
+    """Server-Sent Events alternative to the notification WebSocket.
+
+    Frames are the same JSON messages as on ``/ws/notifications`` (including
+    the initial hello), sent as ``data:`` lines with an ``id`` of
+    ``epoch:seq``. Browsers resend that ID as ``Last-Event-ID`` when they
+    reconnect, which resumes the stream exactly like ``epoch``/``last_seq``
+    on the WebSocket. A comment line is sent every heartbeat interval to keep
+    proxies from closing the idle stream. Authenticates with a ``token``
+    query param because ``EventSource`` cannot set headers.
+
+    Args:
+        token: JWT access token passed as query param.
+        last_seq: Last event sequence number the client processed (first connect).
+        epoch: Stream epoch that ``last_seq`` belongs to.
+        last_event_id: ``Last-Event-ID`` header sent by reconnecting clients.
+
+    Returns:
+        A ``text/event-stream`` response that stays open until the client leaves.
+
+    Raises:
+        HTTPException(401): If the token is invalid.
+    """
+    try:
+        user_id = decode_token(token).get("sub")
+    except Exception:
+        user_id = None
+    if not user_id:
+        raise HTTPException(401, "Invalid token")
+
+    if last_event_id:
+        epoch, last_seq = _parse_last_event_id(last_event_id)
+    conn = manager.open_stream(user_id, last_seq=last_seq, epoch=epoch)
+
+    async def events():
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            async for message in manager.stream(conn):
+                yield message
+        finally:
+            manager.remove(conn)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/notifications", response_model=schemas.NotificationListResponse)
 async def list_notifications(
     unread_only: bool = Query(False, description="Only return unread notifications"),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    since: datetime | None = Query(None, description="Oldest creation time to include"),
+    until: datetime | None = Query(None, description="Only notifications created before this time"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
 ) -> schemas.NotificationListResponse:
-    """Get notifications for the current user.
+    """Get one page of notifications for the current user, newest first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next
+    page. ``total`` comes from the user's notification counter, not from
+    counting rows.
 
     Args:
         unread_only: If true, return only unread notifications.
         limit: Maximum number of notifications to return (1-100).
+        cursor: Position after which the page starts.
+        since: Oldest creation time to include.
+        until: Only include notifications created before this time.
         db: Database session.
         user: Current authenticated user.
 
     Returns:
-        List of notifications with total count.
+        The page of notifications, the total count and the next cursor.
+
+    Raises:
+        HTTPException(400): If the cursor is malformed.
     """
-    notifications = await service.get_notifications(db, user.id, unread_only=unread_only, limit=limit)
+    # One extra row tells whether another page follows
+    notifications = await service.get_notifications(
+        db, user.id, unread_only=unread_only, limit=limit + 1, since=since, until=until, cursor=cursor
+    )
+    items = [service.to_response(n) for n in notifications[:limit]]
+    total, unread = await service.get_counters(db, user.id)
     return schemas.NotificationListResponse(
-        items=[schemas.NotificationResponse.model_validate(n) for n in notifications],
-        total=len(notifications),
+        items=items,
+        total=unread if unread_only else total,
+        next_cursor=items[-1].cursor if len(notifications) > limit else None,
     )
 
 
@@ -106,6 +258,91 @@ async def get_unread_count(
     return {"count": count}
 
 
+@router.get("/notifications/delivery-stats", response_model=dict)
+async def get_delivery_stats(
+    user: User = Depends(get_current_user),
+) -> dict:
+    """Get WebSocket delivery metrics for this worker (admins only).
+
+    Args:
+        user: Current authenticated user.
+
+    Returns:
+        Connection counts, queue depth and delivery/drop counters.
+
+    Raises:
+        HTTPException(403): If the user is not a system admin.
+    """
+    if user.role != UserRole.admin:
+        raise HTTPException(403, "Only admins can view delivery metrics")
+    return manager.stats()
+
+
+@router.get("/notifications/preferences", response_model=schemas.NotificationPreferences)
+async def get_preferences(
+    user: User = Depends(get_current_user),
+) -> schemas.NotificationPreferences:
+    """Get the current user's notification delivery preferences.
+
+    Args:
+        user: Current authenticated user.
+
+    Returns:
+        The user's preferences.
+    """
+    return service.get_preferences(user)
+
+
+@router.put("/notifications/preferences", response_model=schemas.NotificationPreferences)
+async def update_preferences(
+    data: schemas.NotificationPreferences,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> schemas.NotificationPreferences:
+    """Update the current user's notification delivery preferences.
+
+    With ``digest`` enabled, real-time pushes are batched into one
+    ``{"type": "digest", "data": [...]}`` frame per digest interval.
+
+    Args:
+        data: New preferences.
+        db: Database session.
+        user: Current authenticated user.
+
+    Returns:
+        The updated preferences.
+    """
+    return await service.update_preferences(db, user, data)
+
+
+@router.post("/notifications/read", response_model=schemas.MarkReadResponse)
+async def mark_notifications_read(
+    data: schemas.MarkReadRequest,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user),
+) -> schemas.MarkReadResponse:
+    """Mark several notifications as read in one request.
+
+    Either ``ids`` or an ``up_to`` cursor (a notification's ``cursor``; it
+    and everything older is marked read) selects the notifications. The new
+    unread count is also pushed as ``{"type": "unread_count", "count": n}``
+    to the user's other open tabs.
+
+    Args:
+        data: The notifications to mark.
+        db: Database session.
+        user: Current authenticated user.
+
+    Returns:
+        Count of notifications marked as read and the unread count left.
+
+    Raises:
+        HTTPException(400): If the cursor is malformed.
+    """
+    count, unread = await service.mark_read_bulk(db, user, ids=data.ids, up_to=data.up_to)
+    return schemas.MarkReadResponse(count=count, unread_count=unread)
+
+
 @router.patch("/notifications/{notification_id}/read", response_model=schemas.NotificationResponse)
 async def mark_notification_read(
     notification_id: UUID,
@@ -127,7 +364,7 @@ async def mark_notification_read(
         HTTPException(403): If user doesn't own the notification.
     """
     notif = await service.mark_read(db, notification_id, user)
-    return schemas.NotificationResponse.model_validate(notif)
+    return service.to_response(notif)
 
 
 @router.post("/notifications/read-all", response_model=schemas.MarkReadResponse)
@@ -144,5 +381,5 @@ async def mark_all_read(
     Returns:
         Count of notifications marked as read.
     """
-    count = await service.mark_all_read(db, user)
-    return schemas.MarkReadResponse(count=count)
+    count, unread = await service.mark_read_bulk(db, user)
+    return schemas.MarkReadResponse(count=count, unread_count=unread)
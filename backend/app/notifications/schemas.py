@@ -2,7 +2,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class NotificationResponse(BaseModel):
@@ -13,30 +13,60 @@ class NotificationResponse(BaseModel):
     title: str = Field(description="Notification title")
     body: str | None = Field(None, description="Notification body/details")
     read: bool = Field(description="Whether notification has been read")
+    count: int = Field(1, description="Number of events merged into this notification")
     issue_id: str | None = Field(None, description="Related issue UUID, if any")
     created_at: datetime = Field(description="Creation timestamp")
+    cursor: str | None = Field(None, description="Keyset position, for paging and mark-read watermarks")
 
     model_config = {"from_attributes": True}
 
 
-class NotificationCreate(BaseModel):
-    """Notification creation schema — used to create notifications."""
+class NotificationTemplate(BaseModel):
+    """Notification content shared by every recipient of a multi-recipient event."""
 
-    user_id: UUID = Field(description="User to notify")
     issue_id: UUID | None = Field(None, description="Related issue")
     type: str = Field(description="Notification type")
     title: str = Field(description="Notification title")
     body: str | None = Field(None, description="Notification body")
 
 
+class NotificationCreate(NotificationTemplate):
+    """Notification creation schema — used to create a notification for one user."""
+
+    user_id: UUID = Field(description="User to notify")
+
+
 class NotificationListResponse(BaseModel):
-    """List of notifications with pagination."""
+    """One page of notifications, newest first, with a keyset cursor."""
 
     items: list[NotificationResponse] = Field(description="Notification items")
-    total: int = Field(description="Total count of notifications")
+    total: int = Field(description="Total count of notifications (unread only when filtered)")
+    next_cursor: str | None = Field(None, description="Cursor of the next page; null on the last page")
+
+
+class MarkReadRequest(BaseModel):
+    """Notifications to mark as read: an id list or everything up to a cursor."""
+
+    ids: list[UUID] | None = Field(None, max_length=500, description="Notification UUIDs")
+    up_to: str | None = Field(
+        None, description="Cursor of a notification; it and every older notification are marked read"
+    )
+
+    @model_validator(mode="after")
+    def _one_selector(self) -> "MarkReadRequest":
+        if (self.ids is None) == (self.up_to is None):
+            raise ValueError("Provide exactly one of 'ids' or 'up_to'")
+        return self
 
 
 class MarkReadResponse(BaseModel):
     """Response when marking notification(s) as read."""
 
     count: int = Field(description="Number of notifications marked as read")
+    unread_count: int = Field(0, description="Unread notifications left")
+
+
+class NotificationPreferences(BaseModel):
+    """Per-user notification delivery preferences."""
+
+    digest: bool = Field(False, description="Batch real-time pushes into periodic digests")
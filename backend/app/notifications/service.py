@@ -1,72 +1,347 @@
 """Notification business logic."""
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import and_, delete, select, update
+from sqlalchemy import ColumnElement, Row, and_, false, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User
+from app.common.pagination import decode_cursor, encode_cursor
+from app.config import settings
+from app.notifications.digest import digest
 from app.notifications.manager import manager
-from app.notifications.models import Notification, NotificationType
-from app.notifications.schemas import NotificationCreate, NotificationResponse
+from app.notifications.models import Notification, NotificationCounter, NotificationType
+from app.notifications.schemas import (
+    NotificationPreferences,
+    NotificationResponse,
+    NotificationTemplate,
+)
+from app.outbox import service as outbox
+from app.outbox.dispatcher import AfterCommit
+
+# Outbox event kind handled by deliver_outbox_notifications
+NOTIFICATION_EVENT = "notification"
+
+# Columns returned by bulk writes; enough to build a NotificationResponse and route the push
+_RETURNED_COLUMNS = (
+    Notification.id,
+    Notification.user_id,
+    Notification.issue_id,
+    Notification.type,
+    Notification.title,
+    Notification.message,
+    Notification.read,
+    Notification.count,
+    Notification.created_at,
+)
+
+
+async def create_notifications_bulk(
+    db: AsyncSession,
+    recipients: list[UUID],
+    template: NotificationTemplate,
+    coalesce_window: float | None = None,
+) -> list[NotificationResponse]:
+    """Create one notification per recipient and push them with a single fan-out.
+
+    A recipient with an unread row for the same (issue, type) updated within
+    the coalescing window gets that row's ``count`` incremented, and the row
+    takes over the new title and body. All such rows are merged in one
+    ``UPDATE ... RETURNING``. The other recipients get new rows from one
+    multi-row ``INSERT ... RETURNING``, so no refresh or relationship load is
+    needed. The push carries the row's id, so clients replace the earlier
+    entry. Users in digest mode receive pushes batched into periodic
+    ``digest`` frames.
+
+    Domain services should use :func:`enqueue_notifications` instead, so the
+    notifications are written by the outbox dispatcher after their commit.
 
+    Args:
+        db: Database session.
+        recipients: Users to notify (duplicates are ignored).
+        template: Notification content shared by every recipient.
+        coalesce_window: Coalescing window in seconds; defaults to
+            ``NOTIFICATION_COALESCE_WINDOW``. 0 always inserts new rows.
+
+    Returns:
+        The created or coalesced notifications, one per distinct recipient.
+    """
+    rows = await _store_notifications(db, recipients, template, coalesce_window)
+    await db.commit()
 
-async def create_notification(db: AsyncSession, data: NotificationCreate) -> Notification:
-    """Create a new notification and broadcast to user via WebSocket.
+    await _push(db, rows)
+    return [to_response(row) for row in rows]
+
+
+def enqueue_notifications(db: AsyncSession, recipients: list[UUID], template: NotificationTemplate) -> None:
+    """Record a multi-recipient notification in the outbox, to be created once the caller commits.
 
     Args:
-        db: Database session.
-        data: Notification creation data.
+        db: Database session holding the domain change that triggers the notification.
+        recipients: Users to notify; nothing is recorded when empty.
+        template: Notification content shared by every recipient.
+    """
+    if recipients:
+        payload = {"recipients": [str(user_id) for user_id in recipients], "template": template.model_dump(mode="json")}
+        outbox.enqueue(db, NOTIFICATION_EVENT, payload)
+
+
+async def deliver_outbox_notifications(db: AsyncSession, payloads: list[dict]) -> AfterCommit:
+    """Outbox handler: store a batch of notification events and push them after commit.
+
+    Args:
+        db: The dispatcher's database session (committed by the dispatcher).
+        payloads: Events recorded by :func:`enqueue_notifications`. Single-recipient
+            ``NotificationCreate`` dumps written by earlier versions are accepted too.
 
     Returns:
-        The created Notification model instance.
+        The push for the whole batch, to run once it has committed.
     """
-    notif = Notification(
-        user_id=data.user_id,
-        issue_id=data.issue_id,
-        type=NotificationType(data.type),
-        title=data.title,
-        message=data.body,
+    rows = []
+    for payload in payloads:
+        if "recipients" in payload:
+            recipients = [UUID(user_id) for user_id in payload["recipients"]]
+            template = NotificationTemplate.model_validate(payload["template"])
+        else:
+            recipients = [UUID(payload["user_id"])]
+            template = NotificationTemplate.model_validate(payload)
+        rows.extend(await _store_notifications(db, recipients, template))
+
+    async def push() -> None:
+        await _push(db, rows)
+
+    return push
+
+
+def to_response(notif: Notification | Row) -> NotificationResponse:
+    """Build the API/push representation of a notification.
+
+    Args:
+        notif: The Notification model, or a row of its columns.
+
+    Returns:
+        The response schema, with UUIDs as strings and the message as ``body``.
+    """
+    return NotificationResponse(
+        id=str(notif.id),
+        type=notif.type.value,
+        title=notif.title,
+        body=notif.message,
+        read=notif.read,
+        count=notif.count,
+        issue_id=str(notif.issue_id) if notif.issue_id else None,
+        created_at=notif.created_at,
+        cursor=encode_cursor(notif.created_at, notif.id),
     )
-    db.add(notif)
-    await db.commit()
-    await db.refresh(notif)
 
-    # Broadcast to user via WebSocket if connected
-    response = NotificationResponse.model_validate(notif)
-    await manager.send_to_user(str(data.user_id), {"type": "notification", "data": response.model_dump(mode="json")})
 
-    return notif
+async def _store_notifications(
+    db: AsyncSession,
+    recipients: list[UUID],
+    template: NotificationTemplate,
+    coalesce_window: float | None = None,
+) -> list[Row]:
+    """Coalesce or insert one notification per recipient without committing; returns the rows."""
+    recipients = list(dict.fromkeys(recipients))
+    if not recipients:
+        return []
+
+    rows: list[Row] = []
+    window = settings.NOTIFICATION_COALESCE_WINDOW if coalesce_window is None else coalesce_window
+    if window > 0 and template.issue_id is not None:
+        rows = await _coalesce(db, recipients, template, window)
+
+    merged = {row.user_id for row in rows}
+    values = [
+        {
+            "user_id": user_id,
+            "issue_id": template.issue_id,
+            "type": NotificationType(template.type),
+            "title": template.title,
+            "message": template.body,
+        }
+        for user_id in recipients
+        if user_id not in merged
+    ]
+    if values:
+        result = await db.execute(insert(Notification).values(values).returning(*_RETURNED_COLUMNS))
+        rows.extend(result.all())
+        await _count_new(db, [row["user_id"] for row in values])
+    return rows
+
+
+async def _count_new(db: AsyncSession, user_ids: list[UUID]) -> None:
+    """Add one new unread notification to each user's counters, in one upsert."""
+    stmt = pg_insert(NotificationCounter).values(
+        [{"user_id": user_id, "total": 1, "unread": 1} for user_id in user_ids]
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[NotificationCounter.user_id],
+            set_={
+                "total": NotificationCounter.total + stmt.excluded.total,
+                "unread": NotificationCounter.unread + stmt.excluded.unread,
+            },
+        )
+    )
+
+
+async def _coalesce(
+    db: AsyncSession, recipients: list[UUID], template: NotificationTemplate, window: float
+) -> list[Row]:
+    """Merge the notification into each recipient's newest matching unread row, if recent enough."""
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=window)
+    newest_first = func.row_number().over(partition_by=Notification.user_id, order_by=Notification.updated_at.desc())
+    candidates = (
+        select(Notification.id, newest_first.label("rank"))
+        .where(
+            and_(
+                Notification.user_id.in_(recipients),
+                Notification.issue_id == template.issue_id,
+                Notification.type == NotificationType(template.type),
+                Notification.read == false(),
+                Notification.updated_at >= cutoff,
+                # Lets the planner skip old partitions
+                Notification.created_at >= now - timedelta(days=settings.NOTIFICATION_COALESCE_LOOKBACK_DAYS),
+            )
+        )
+        .subquery()
+    )
+    targets = select(candidates.c.id).where(candidates.c.rank == 1)
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.id.in_(targets))
+        .values(count=Notification.count + 1, title=template.title, message=template.body, updated_at=func.now())
+        .returning(*_RETURNED_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.all())
+
+
+async def _push(db: AsyncSession, rows: list[Row]) -> None:
+    """Fan notifications out to their users' live connections, immediately or via their digests."""
+    watched = [row for row in rows if manager.is_watched(str(row.user_id))]
+    if not watched:
+        return
+
+    digest_users = set(
+        await db.scalars(
+            select(User.id).where(User.id.in_({row.user_id for row in watched}), User.notification_digest.is_(True))
+        )
+    )
+    messages = []
+    for row in watched:
+        payload = to_response(row).model_dump(mode="json")
+        if row.user_id in digest_users:
+            digest.add(str(row.user_id), payload)
+        else:
+            messages.append((str(row.user_id), {"type": "notification", "data": payload}))
+    manager.broadcast_many(messages)
+
+
+def get_preferences(user: User) -> NotificationPreferences:
+    """Get the user's notification delivery preferences.
+
+    Args:
+        user: The current user.
+
+    Returns:
+        The user's preferences.
+    """
+    return NotificationPreferences(digest=user.notification_digest)
+
+
+async def update_preferences(db: AsyncSession, user: User, data: NotificationPreferences) -> NotificationPreferences:
+    """Update the user's notification delivery preferences.
+
+    Args:
+        db: Database session.
+        user: The current user.
+        data: New preferences.
+
+    Returns:
+        The updated preferences.
+    """
+    user.notification_digest = data.digest
+    await db.commit()
+    return NotificationPreferences(digest=user.notification_digest)
 
 
 async def get_notifications(
-    db: AsyncSession, user_id: UUID, unread_only: bool = False, limit: int = 50
+    db: AsyncSession,
+    user_id: UUID,
+    unread_only: bool = False,
+    limit: int = 50,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
 ) -> list[Notification]:
-    """Get notifications for a user, optionally filtered to unread only.
+    """Get one page of a user's notifications, newest first.
+
+    Pages are keyset-paginated on ``(created_at, id)``: ``cursor`` is the
+    position of the last notification of the previous page, so each page
+    is an index range scan however deep the client pages. Because the
+    table is partitioned on ``created_at``, the cursor's upper bound also
+    lets PostgreSQL skip the newer monthly partitions.
 
     Args:
         db: Database session.
         user_id: The user UUID.
         unread_only: If True, only return unread notifications.
         limit: Maximum number of notifications to return.
+        since: Oldest creation time to include.
+        until: Only include notifications created before this time.
+        cursor: Return notifications after this position (see :func:`app.common.pagination.encode_cursor`).
 
     Returns:
-        List of Notification models, ordered by created_at descending.
+        List of Notification models, ordered by created_at then id, descending.
+
+    Raises:
+        HTTPException(400): If the cursor is malformed.
     """
     query = select(Notification).where(Notification.user_id == user_id)
 
+    if since is not None:
+        query = query.where(Notification.created_at >= since)
+    if until is not None:
+        query = query.where(Notification.created_at < until)
+    if cursor is not None:
+        query = query.where(tuple_(Notification.created_at, Notification.id) < tuple_(*decode_cursor(cursor)))
     if unread_only:
-        query = query.where(Notification.read == False)
+        query = query.where(Notification.read == false())
 
-    query = query.order_by(Notification.created_at.desc()).limit(limit)
+    query = query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit)
 
     result = await db.execute(query)
     return list(result.scalars().all())
 
 
+async def get_counters(db: AsyncSession, user_id: UUID) -> tuple[int, int]:
+    """Get a user's notification totals without counting rows.
+
+    Args:
+        db: Database session.
+        user_id: The user UUID.
+
+    Returns:
+        ``(total, unread)``; zeros for users who never had a notification.
+    """
+    result = await db.execute(
+        select(NotificationCounter.total, NotificationCounter.unread).where(NotificationCounter.user_id == user_id)
+    )
+    row = result.one_or_none()
+    return (row.total, row.unread) if row else (0, 0)
+
+
 async def get_notification(db: AsyncSession, notification_id: UUID) -> Notification | None:
     """Get a single notification by ID.
 
+    The primary key is ``(id, created_at)`` on the partitioned table, so
+    this looks the row up by id across partitions.
+
     Args:
         db: Database session.
         notification_id: The notification UUID.
@@ -74,7 +349,8 @@ async def get_notification(db: AsyncSession, notification_id: UUID) -> Notificat
     Returns:
         The Notification model, or None if not found.
     """
-    return await db.get(Notification, notification_id)
+    result = await db.execute(select(Notification).where(Notification.id == notification_id))
+    return result.scalar_one_or_none()
 
 
 async def mark_read(db: AsyncSession, notification_id: UUID, user: User) -> Notification:
@@ -92,37 +368,75 @@ async def mark_read(db: AsyncSession, notification_id: UUID, user: User) -> Noti
         HTTPException(404): If notification not found.
         HTTPException(403): If user doesn't own the notification.
     """
-    notif = await db.get(Notification, notification_id)
+    notif = await get_notification(db, notification_id)
     if not notif:
         raise HTTPException(404, "Notification not found")
 
     if notif.user_id != user.id:
         raise HTTPException(403, "You can only mark your own notifications as read")
 
-    notif.read = True
-    await db.commit()
-    await db.refresh(notif)
+    if not notif.read:
+        await _mark_read(db, user.id, Notification.id == notif.id, Notification.created_at == notif.created_at)
+        await db.refresh(notif)
     return notif
 
 
-async def mark_all_read(db: AsyncSession, user: User) -> int:
-    """Mark all unread notifications as read for the current user.
+async def mark_read_bulk(
+    db: AsyncSession, user: User, ids: list[UUID] | None = None, up_to: str | None = None
+) -> tuple[int, int]:
+    """Mark a set of the user's notifications as read in one ``UPDATE``.
 
     Args:
         db: Database session.
-        user: The current user.
+        user: The current user; other users' notifications are never touched.
+        ids: Notification UUIDs to mark read.
+        up_to: Cursor of a notification; it and every older one are marked read.
+            With neither selector, every unread notification is marked read.
 
     Returns:
-        The count of notifications marked as read.
+        ``(marked, unread)``: notifications marked read and unread ones left.
+
+    Raises:
+        HTTPException(400): If the cursor is malformed.
+    """
+    conditions = []
+    if ids is not None:
+        conditions.append(Notification.id.in_(ids))
+    if up_to is not None:
+        conditions.append(tuple_(Notification.created_at, Notification.id) <= tuple_(*decode_cursor(up_to)))
+    return await _mark_read(db, user.id, *conditions)
+
+
+async def _mark_read(db: AsyncSession, user_id: UUID, *conditions: ColumnElement[bool]) -> tuple[int, int]:
+    """Mark the user's matching unread notifications read, update the counter and push the new unread count.
+
+    Only rows this statement actually flips are returned, so concurrent
+    mark-read calls never decrement the counter twice for the same row.
     """
     result = await db.execute(
         update(Notification)
-        .where(and_(Notification.user_id == user.id, Notification.read == False))
+        .where(Notification.user_id == user_id, Notification.read == false(), *conditions)
         .values(read=True)
         .returning(Notification.id)
+        .execution_options(synchronize_session=False)
+    )
+    marked = len(result.all())
+    if not marked:
+        _, unread = await get_counters(db, user_id)
+        return 0, unread
+
+    unread = await db.scalar(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(unread=func.greatest(NotificationCounter.unread - marked, 0))
+        .returning(NotificationCounter.unread)
     )
     await db.commit()
-    return len(result.fetchall())
+
+    unread = unread or 0
+    if manager.is_watched(str(user_id)):
+        manager.broadcast(str(user_id), {"type": "unread_count", "count": unread})
+    return marked, unread
 
 
 async def get_unread_count(db: AsyncSession, user_id: UUID) -> int:
@@ -135,7 +449,5 @@ async def get_unread_count(db: AsyncSession, user_id: UUID) -> int:
     Returns:
         The count of unread notifications.
     """
-    result = await db.execute(
-        select(Notification).where(and_(Notification.user_id == user_id, Notification.read == False))
-    )
-    return len(result.scalars().all())
+    _, unread = await get_counters(db, user_id)
+    return unread
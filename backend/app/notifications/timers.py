@@ -0,0 +1,78 @@
+"""Hashed timer wheel for per-connection heartbeats and idle timeouts."""
+import asyncio
+import logging
+import math
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TimerWheel:
+    """Schedules many coarse timers on a single asyncio task.
+
+    Entries are bucketed into ``slots`` that are ``tick`` seconds apart, so
+    scheduling and cancelling are O(1) and an idle worker with tens of
+    thousands of connections wakes once per tick instead of once per socket.
+    Entries must expose a writable ``wheel_slot`` attribute.
+    """
+
+    def __init__(self, tick: float, horizon: float, callback: Callable[[Any], None]):
+        """Initialize the wheel.
+
+        Args:
+            tick: Seconds between wheel advances (timer resolution).
+            horizon: Longest delay that will be scheduled, in seconds.
+            callback: Called with each entry whose timer expires.
+        """
+        self.tick = tick
+        self.callback = callback
+        self.slots: list[set] = [set() for _ in range(math.ceil(horizon / tick) + 1)]
+        self.position = 0
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return sum(len(slot) for slot in self.slots)
+
+    def schedule(self, entry: Any, delay: float) -> None:
+        """(Re)schedule an entry to fire after roughly ``delay`` seconds."""
+        self.cancel(entry)
+        ticks = min(max(1, math.ceil(delay / self.tick)), len(self.slots) - 1)
+        slot = (self.position + ticks) % len(self.slots)
+        self.slots[slot].add(entry)
+        entry.wheel_slot = slot
+
+    def cancel(self, entry: Any) -> None:
+        """Remove an entry from the wheel if it is scheduled."""
+        if entry.wheel_slot is not None:
+            self.slots[entry.wheel_slot].discard(entry)
+            entry.wheel_slot = None
+
+    def advance(self) -> None:
+        """Move to the next slot and fire every entry stored there."""
+        self.position = (self.position + 1) % len(self.slots)
+        expired = self.slots[self.position]
+        self.slots[self.position] = set()
+        for entry in expired:
+            entry.wheel_slot = None
+            try:
+                self.callback(entry)
+            except Exception:
+                logger.exception("Timer wheel callback failed")
+
+    def start(self) -> None:
+        """Start the ticking task if it is not already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the ticking task."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            self.advance()
@@ -0,0 +1 @@
+"""Transactional outbox for side effects of domain writes."""
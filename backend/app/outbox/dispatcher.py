@@ -0,0 +1,171 @@
+"""Background dispatcher draining the outbox in batches."""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import async_session
+from app.outbox.models import OutboxEvent
+from app.outbox.service import PENDING_FLAG
+
+logger = logging.getLogger(__name__)
+
+# Runs once the handler's database work has committed (socket pushes, webhooks)
+AfterCommit = Callable[[], Awaitable[None]]
+# Applies a batch of payloads of one kind inside the dispatcher's transaction
+Handler = Callable[[AsyncSession, list[dict]], Awaitable[AfterCommit | None]]
+
+# Longest delay between retries of a failing event, in seconds
+MAX_RETRY_DELAY = 300
+
+
+class OutboxDispatcher:
+    """Pool of worker tasks that claim outbox events and run their handlers.
+
+    Each worker claims up to ``batch_size`` events with ``FOR UPDATE SKIP
+    LOCKED``, so workers (and other processes) never claim the same event.
+    Events are grouped by kind; a handler's database writes and the removal
+    of its events commit together, and its after-commit action (e.g. the
+    WebSocket push) runs once that commit succeeds. A failing group is kept
+    and retried with exponential backoff until ``max_attempts``, after
+    which it stays in the table for inspection.
+
+    Workers are woken as soon as a session that enqueued events commits,
+    and otherwise poll every ``poll_interval`` to pick up events left by
+    a crash or written by another process.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.OUTBOX_WORKERS,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+    ):
+        """Initialize the dispatcher.
+
+        Args:
+            workers: Number of concurrent worker tasks.
+            batch_size: Maximum events claimed per transaction.
+            poll_interval: Seconds between polls when no commit wakes the workers.
+            max_attempts: Attempts before an event is left as dead.
+        """
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.handlers: dict[str, Handler] = {}
+        self._wake = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """Register the handler for an event kind (notifications, webhooks, ...)."""
+        self.handlers[kind] = handler
+
+    def wake(self) -> None:
+        """Ask idle workers to look for new events now."""
+        self._wake.set()
+
+    def start(self) -> None:
+        """Start the worker tasks (idempotent)."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks; unprocessed events stay in the outbox."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_once(self) -> int:
+        """Claim and dispatch one batch of events.
+
+        Returns:
+            The number of events claimed.
+        """
+        async with async_session() as db:
+            result = await db.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.attempts < self.max_attempts, OutboxEvent.available_at <= func.now())
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            events = list(result.scalars().all())
+            if not events:
+                return 0
+
+            groups: dict[str, list[OutboxEvent]] = {}
+            for outbox_event in events:
+                groups.setdefault(outbox_event.kind, []).append(outbox_event)
+
+            after_commit: list[AfterCommit] = []
+            done: list[int] = []
+            for kind, group in groups.items():
+                try:
+                    handler = self.handlers.get(kind)
+                    if handler is None:
+                        raise LookupError(f"No outbox handler registered for {kind!r}")
+                    async with db.begin_nested():
+                        action = await handler(db, [e.payload for e in group])
+                except Exception as e:
+                    logger.exception(f"Outbox handler for {kind!r} failed on {len(group)} events")
+                    self._schedule_retry(group, e)
+                    continue
+                done.extend(e.id for e in group)
+                if action is not None:
+                    after_commit.append(action)
+
+            if done:
+                await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(done)))
+            await db.commit()
+
+            for action in after_commit:
+                try:
+                    await action()
+                except Exception:
+                    logger.exception("Outbox after-commit action failed")
+            return len(events)
+
+    def _schedule_retry(self, group: list[OutboxEvent], error: Exception) -> None:
+        """Record a failed attempt and push the events back with exponential backoff."""
+        now = datetime.now(timezone.utc)
+        for outbox_event in group:
+            outbox_event.attempts += 1
+            outbox_event.last_error = str(error)[:1000]
+            delay = min(2 ** outbox_event.attempts, MAX_RETRY_DELAY)
+            outbox_event.available_at = now + timedelta(seconds=delay)
+
+    async def _worker(self) -> None:
+        """Drain full batches back to back, then sleep until woken or the poll interval passes."""
+        while True:
+            self._wake.clear()
+            try:
+                claimed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+# Singleton instance started with the app
+dispatcher = OutboxDispatcher()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    """Wake the dispatcher when a transaction that enqueued events commits."""
+    if session.info.pop(PENDING_FLAG, False):
+        dispatcher.wake()
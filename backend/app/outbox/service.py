@@ -0,0 +1,28 @@
+"""Outbox business logic — recording side effects inside the caller's transaction."""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.outbox.models import OutboxEvent
+
+# Session.info flag telling the commit hook to wake the dispatcher
+PENDING_FLAG = "outbox_pending"
+
+
+def enqueue(db: AsyncSession, kind: str, payload: dict) -> OutboxEvent:
+    """Add an outbox event to the session without committing.
+
+    The event is written by the caller's next commit, atomically with the
+    domain change it describes, and dispatched after that commit. If the
+    transaction rolls back, the side effect never happens.
+
+    Args:
+        db: Database session holding the domain change.
+        kind: Handler key registered with the dispatcher, e.g. "notification".
+        payload: JSON-serializable event data.
+
+    Returns:
+        The pending OutboxEvent.
+    """
+    event = OutboxEvent(kind=kind, payload=payload)
+    db.add(event)
+    db.info[PENDING_FLAG] = True
+    return event
@@ -1,12 +1,12 @@
-"""Project, ProjectMember, WorkflowStatus, and Label models."""
+"""Project, ProjectIssueCounter, ProjectMember, WorkflowStatus, and Label models."""
 
 import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func, select
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.database import Base
 
@@ -22,6 +22,23 @@ class StatusCategory(str, enum.Enum):
     done = "done"
 
 
+class ProjectIssueCounter(Base):
+    """Last issue number handed out in a project (see app.issues.keys).
+
+    Kept off the projects row, so creating issues never locks the project.
+    """
+
+    __tablename__ = "project_issue_counters"
+
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"<ProjectIssueCounter project={self.project_id} last={self.last_value}>"
+
+
 class Project(Base):
     __tablename__ = "projects"
 
@@ -35,7 +52,12 @@ class Project(Base):
         server_default="kanban",
     )
     owner_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    issue_counter: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # Read-only: issue numbers handed out so far, from project_issue_counters
+    issue_counter: Mapped[int] = column_property(
+        func.coalesce(
+            select(ProjectIssueCounter.last_value).where(ProjectIssueCounter.project_id == id).scalar_subquery(), 0
+        )
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
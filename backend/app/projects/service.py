@@ -10,7 +10,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User as AuthUser
-from app.projects.models import Project, ProjectMember, WorkflowStatus, StatusCategory, Label
+from app.projects.models import Project, ProjectIssueCounter, ProjectMember, WorkflowStatus, StatusCategory, Label
 from app.projects.schemas import ProjectCreate, ProjectUpdate
 
 DEFAULT_STATUSES = [
@@ -40,7 +40,6 @@ async def create_project(db: AsyncSession, data: ProjectCreate, owner: AuthUser)
         description=data.description,
         methodology=data.methodology,
         owner_id=owner.id,
-        issue_counter=0,
     )
     db.add(project)
 
@@ -50,6 +49,8 @@ async def create_project(db: AsyncSession, data: ProjectCreate, owner: AuthUser)
         await db.rollback()
         raise HTTPException(409, "Project key already in use")
 
+    db.add(ProjectIssueCounter(project_id=project.id))
+
     # Add owner as admin member
     member = ProjectMember(project_id=project.id, user_id=owner.id, role="admin")
     db.add(member)
@@ -37,6 +37,8 @@ def _to_list_item(issue):
         story_points=issue.story_points,
         due_date=issue.due_date,
         label_count=len(issue.labels),
+        rank=issue.rank,
+        version=issue.version,
         created_at=issue.created_at,
     )
 
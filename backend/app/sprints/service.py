@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User
 from app.issues.models import Issue
+from app.notifications.board import board_events
 from app.projects.models import WorkflowStatus, StatusCategory
 from app.sprints.models import Sprint, SprintStatus
 from app.sprints.schemas import SprintCreate, SprintUpdate
@@ -33,6 +34,7 @@ async def create_sprint(db: AsyncSession, project_id: UUID, data: SprintCreate,
     db.add(sprint)
     await db.commit()
     await db.refresh(sprint)
+    board_events.publish_sprint(sprint, "created")
     return sprint
 
 
@@ -94,6 +96,7 @@ async def update_sprint(
     sprint.updated_at = datetime.now(timezone.utc)
     await db.commit()
     await db.refresh(sprint)
+    board_events.publish_sprint(sprint, "updated")
     return sprint
 
 
@@ -124,6 +127,7 @@ async def start_sprint(db: AsyncSession, project_id: UUID, sprint_id: UUID, user
     sprint.updated_at = datetime.now(timezone.utc)
     await db.commit()
     await db.refresh(sprint)
+    board_events.publish_sprint(sprint, "updated")
     return sprint
 
 
@@ -153,8 +157,9 @@ async def complete_sprint(db: AsyncSession, project_id: UUID, sprint_id: UUID, u
         )
     ).scalars().all()
 
+    returned_ids = []
     if incomplete_statuses:
-        await db.execute(
+        result = await db.execute(
             update(Issue)
             .where(
                 and_(
@@ -162,13 +167,18 @@ async def complete_sprint(db: AsyncSession, project_id: UUID, sprint_id: UUID, u
                     Issue.status_id.in_(incomplete_statuses),
                 )
             )
-            .values(sprint_id=None)
+            .values(sprint_id=None, version=Issue.version + 1)
+            .returning(Issue.id)
         )
+        returned_ids = result.scalars().all()
 
     sprint.status = SprintStatus.completed
     sprint.updated_at = datetime.now(timezone.utc)
     await db.commit()
     await db.refresh(sprint)
+    board_events.publish_sprint(sprint, "updated")
+    for issue_id in returned_ids:
+        board_events.publish(project_id, "issue", issue_id, "updated", {"sprint_id": None})
     return sprint
 
 
@@ -188,6 +198,7 @@ async def delete_sprint(db: AsyncSession, project_id: UUID, sprint_id: UUID, use
 
     await db.delete(sprint)
     await db.commit()
+    board_events.publish_sprint(sprint, "deleted")
 
 
 async def add_issues_to_sprint(
@@ -212,11 +223,15 @@ async def add_issues_to_sprint(
                 Issue.project_id == project_id,
             )
         )
-        .values(sprint_id=sprint_id)
+        .values(sprint_id=sprint_id, version=Issue.version + 1)
+        .returning(Issue.id)
     )
     result = await db.execute(stmt)
+    updated_ids = result.scalars().all()
     await db.commit()
-    return result.rowcount
+    for issue_id in updated_ids:
+        board_events.publish(project_id, "issue", issue_id, "updated", {"sprint_id": str(sprint_id)})
+    return len(updated_ids)
 
 
 async def remove_issue_from_sprint(
@@ -237,4 +252,6 @@ async def remove_issue_from_sprint(
         raise HTTPException(404, "Issue not found")
 
     issue.sprint_id = None
+    issue.version = Issue.version + 1
     await db.commit()
+    board_events.publish(project_id, "issue", issue_id, "updated", {"sprint_id": None})
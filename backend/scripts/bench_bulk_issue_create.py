@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Bulk issue creation benchmark.
+
+Creates the same batch of issues in a project twice against the configured
+database and reports throughput for:
+
+- single: one issues.service.create_issue call per issue (one counter
+          update, INSERT and commit each)
+- bulk:   one issues.service.create_issues_bulk call (one counter update,
+          multi-row INSERTs and a single commit)
+
+Every other issue is a subtask of the previous one, so the bulk run also
+exercises in-batch parents. Issues created by the run are deleted
+afterwards and the project's issue counter is restored.
+
+Usage:
+    python scripts/bench_bulk_issue_create.py --count=2000
+    python scripts/bench_bulk_issue_create.py --project-id=<uuid> --count=5000
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from uuid import UUID
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, select, update
+
+from app.auth.models import User
+from app.database import async_session
+from app.issues import service
+from app.issues.models import Issue, IssueType
+from app.issues.schemas import IssueBulkItem, IssueCreate
+from app.projects.models import Project, ProjectIssueCounter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def pick_project(project_id: str | None) -> tuple[UUID, UUID]:
+    """Resolve the target project and its owner (the reporter), defaulting to any project."""
+    async with async_session() as db:
+        if project_id:
+            project = await db.get(Project, UUID(project_id))
+        else:
+            project = await db.scalar(select(Project).limit(1))
+        if project is None:
+            raise SystemExit("No project found: pass --project-id")
+        return project.id, project.owner_id
+
+
+async def cleanup(project_id: UUID, counter: int) -> None:
+    """Delete the issues numbered after ``counter`` and reset the counter to it."""
+    async with async_session() as db:
+        key = await db.scalar(select(Project.key).where(Project.id == project_id))
+        created = await db.scalars(select(Issue.key).where(Issue.project_id == project_id))
+        keys = [k for k in created if int(k.rsplit("-", 1)[1]) > counter]
+        # Children first, so parent foreign keys never block the delete
+        await db.execute(delete(Issue).where(Issue.key.in_(keys), Issue.type == IssueType.subtask))
+        await db.execute(delete(Issue).where(Issue.key.in_(keys)))
+        await db.execute(
+            update(ProjectIssueCounter).where(ProjectIssueCounter.project_id == project_id).values(last_value=counter)
+        )
+        await db.commit()
+        logger.info(f"Removed {len(keys)} {key} issues")
+
+
+async def run_single(project_id: UUID, reporter: User, count: int) -> float:
+    async with async_session() as db:
+        start = time.perf_counter()
+        parent = None
+        for n in range(count):
+            if n % 2 == 0:
+                parent = await service.create_issue(
+                    db, project_id, IssueCreate(type=IssueType.task, title=f"Bench task {n}"), reporter
+                )
+            else:
+                await service.create_issue(
+                    db,
+                    project_id,
+                    IssueCreate(type=IssueType.subtask, title=f"Bench subtask {n}", parent_id=parent.id),
+                    reporter,
+                )
+        return time.perf_counter() - start
+
+
+async def run_bulk(project_id: UUID, reporter: User, count: int) -> float:
+    items = [
+        IssueBulkItem(type=IssueType.task, title=f"Bench task {n}")
+        if n % 2 == 0
+        else IssueBulkItem(type=IssueType.subtask, title=f"Bench subtask {n}", parent_index=n - 1)
+        for n in range(count)
+    ]
+    async with async_session() as db:
+        start = time.perf_counter()
+        await service.create_issues_bulk(db, project_id, items, reporter)
+        return time.perf_counter() - start
+
+
+async def run_bench(project_id: str | None, count: int):
+    project, owner = await pick_project(project_id)
+    async with async_session() as db:
+        reporter = await db.get(User, owner)
+        counter = await db.scalar(select(Project.issue_counter).where(Project.id == project))
+    logger.info(f"Creating {count} issues in project {project}, twice")
+
+    results = []
+    for name, run in (("single", run_single), ("bulk", run_bulk)):
+        try:
+            results.append((name, await run(project, reporter, count)))
+        finally:
+            await cleanup(project, counter)
+
+    logger.info("=" * 60)
+    logger.info("BULK CREATE RESULTS")
+    logger.info("=" * 60)
+    for name, secs in results:
+        logger.info(f"{name:<7} {secs:>8.2f}s  {count / secs:>9.0f} issues/s")
+    logger.info(f"speedup: {results[0][1] / results[1][1]:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk issue creation against one-by-one creation")
+    parser.add_argument("--project-id", help="Project to create issues in (default: any project)")
+    parser.add_argument("--count", type=int, default=2000, help="Issues per run")
+    args = parser.parse_args()
+
+    asyncio.run(run_bench(args.project_id, args.count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Issue import benchmark (Jira CSV export).
+
+Generates a Jira-style CSV fixture (50k rows by default: every 25th row an
+epic listed after its stories, as Jira exports newest first, plus
+repeated Labels columns and story points), imports it into a project
+through imports.service.run_import against the configured database, and
+reports throughput and memory:
+
+- rows/s and MB/s for the whole job, parent linking included
+- with --trace-memory, peak Python allocations during the job (tracemalloc,
+  which slows parsing several times over), which should stay flat as
+  --rows grows; compare --rows=10000 with --rows=50000
+
+Issues, labels and the job created by the run are deleted afterwards and
+the project's issue counter is restored.
+
+Usage:
+    python scripts/bench_issue_import.py
+    python scripts/bench_issue_import.py --rows=10000 --batch-size=500 --trace-memory
+    python scripts/bench_issue_import.py --project-id=<uuid> --fixture=/tmp/jira-50k.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import logging
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from uuid import UUID
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, select, update
+
+from app.config import settings
+from app.database import async_session
+from app.imports import service
+from app.imports.models import ImportJob
+from app.issues.models import Issue
+from app.projects.models import Label, Project, ProjectIssueCounter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+HEADER = [
+    "Summary", "Issue key", "Issue id", "Issue Type", "Status", "Priority", "Labels", "Labels",
+    "Parent id", "Custom field (Story Points)", "Due Date", "Description",
+]
+EPIC_EVERY = 25
+LABEL_PREFIX = "bench-import-"
+
+
+def write_fixture(path: Path, rows: int) -> None:
+    """Write a Jira CSV export of ``rows`` issues; each epic follows the stories that reference it."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for n in range(1, rows + 1):
+            if n % EPIC_EVERY == 0:
+                writer.writerow([
+                    f"Epic {n}", f"JIRA-{n}", 10000 + n, "Epic", "To Do", "High", "", "", "", "", "", "",
+                ])
+            else:
+                epic = (n // EPIC_EVERY + 1) * EPIC_EVERY
+                writer.writerow([
+                    f"Story {n}: imported from Jira",
+                    f"JIRA-{n}",
+                    10000 + n,
+                    "Story" if n % 3 else "Bug",
+                    "Done" if n % 4 == 0 else "In Progress",
+                    ("Highest", "High", "Medium", "Low")[n % 4],
+                    f"{LABEL_PREFIX}{n % 20}",
+                    f"{LABEL_PREFIX}team-{n % 5}",
+                    10000 + epic if epic <= rows else "",
+                    n % 8,
+                    "12/Mar/24 10:00 AM",
+                    f"Steps to reproduce issue {n}.\nExpected: works.\nActual: does not. " * 3,
+                ])
+
+
+async def pick_project(project_id: str | None) -> tuple[UUID, UUID, int]:
+    """Resolve the target project, its owner (who runs the import) and its issue counter."""
+    async with async_session() as db:
+        if project_id:
+            project = await db.get(Project, UUID(project_id))
+        else:
+            project = await db.scalar(select(Project).limit(1))
+        if project is None:
+            raise SystemExit("No project found: pass --project-id")
+        return project.id, project.owner_id, project.issue_counter
+
+
+async def cleanup(project_id: UUID, counter: int, job_id: UUID) -> None:
+    """Delete the imported issues, labels and job, and reset the issue counter."""
+    async with async_session() as db:
+        keys = [
+            key for key in await db.scalars(select(Issue.key).where(Issue.project_id == project_id))
+            if int(key.rsplit("-", 1)[1]) > counter
+        ]
+        for start in range(0, len(keys), 5000):
+            chunk = keys[start:start + 5000]
+            await db.execute(delete(Issue).where(Issue.project_id == project_id, Issue.key.in_(chunk)))
+        await db.execute(delete(Label).where(Label.project_id == project_id, Label.name.like(f"{LABEL_PREFIX}%")))
+        await db.execute(delete(ImportJob).where(ImportJob.id == job_id))
+        await db.execute(
+            update(ProjectIssueCounter).where(ProjectIssueCounter.project_id == project_id).values(last_value=counter)
+        )
+        await db.commit()
+        logger.info(f"Removed {len(keys)} imported issues")
+
+
+async def run_bench(project_id: str | None, rows: int, fixture: str | None, batch_size: int, trace_memory: bool):
+    project, owner, counter = await pick_project(project_id)
+    workdir = Path(tempfile.mkdtemp(prefix="bench-import-"))
+    fixture_path = Path(fixture) if fixture else workdir / f"jira-{rows}.csv"
+    if not fixture_path.exists():
+        write_fixture(fixture_path, rows)
+    size = fixture_path.stat().st_size
+    logger.info(f"Importing {fixture_path} ({size / 1024 / 1024:.1f}MB) into project {project}")
+
+    job_id = uuid.uuid4()
+    async with async_session() as db:
+        db.add(ImportJob(
+            id=job_id, project_id=project, user_id=owner, filename=fixture_path.name, format="csv", mapping={},
+            status="running", total_bytes=size,
+        ))
+        await db.commit()
+    service.import_path(job_id).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(fixture_path, service.import_path(job_id))
+
+    settings.IMPORT_BATCH_SIZE = batch_size
+    try:
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        await service.run_import(job_id)
+        elapsed = time.perf_counter() - start
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        async with async_session() as db:
+            job = await db.get(ImportJob, job_id)
+        logger.info("=" * 60)
+        logger.info("IMPORT RESULTS")
+        logger.info("=" * 60)
+        logger.info(f"status          {job.status}{f' ({job.error})' if job.error else ''}")
+        logger.info(f"rows imported   {job.rows_imported} ({job.rows_failed} skipped)")
+        logger.info(f"parents linked  {job.parents_linked}")
+        logger.info(f"elapsed         {elapsed:.2f}s  ({job.rows_imported / elapsed:.0f} rows/s, "
+                    f"{size / 1024 / 1024 / elapsed:.1f}MB/s)")
+        if trace_memory:
+            logger.info(f"peak allocated  {peak / 1024 / 1024:.1f}MB (batch size {batch_size})")
+    finally:
+        await cleanup(project, counter, job_id)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming issue importer with a Jira CSV fixture")
+    parser.add_argument("--project-id", help="Project to import into (default: any project)")
+    parser.add_argument("--rows", type=int, default=50000, help="Rows in the generated fixture")
+    parser.add_argument("--fixture", help="CSV to import; generated there first if it does not exist")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE, help="Issues per transaction")
+    parser.add_argument("--trace-memory", action="store_true", help="Report peak allocations (slower)")
+    args = parser.parse_args()
+
+    asyncio.run(run_bench(args.project_id, args.rows, args.fixture, args.batch_size, args.trace_memory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Concurrent issue creation benchmark (issue key allocation).
+
+Runs --writers parallel writers (50 by default), each creating issues one at
+a time in the same project through issues.service.create_issue with its own
+session, and reports creates/s for each way of numbering them:
+
+- in-transaction: the counter is advanced inside each issue's transaction
+                  and stays locked until it commits, as when keys came
+                  from projects.issue_counter; writers queue behind it
+- counter:        app.issues.keys with one number per counter update, in a
+                  short transaction of its own
+- block:          app.issues.keys reserving --block-size numbers per update
+                  and handing them out from memory
+
+Keys are checked for duplicates after every run. Issues created by the run
+are deleted afterwards and the project's issue counter is restored. Every
+writer holds a pooled connection, so keep --writers below DB_POOL_SIZE +
+DB_MAX_OVERFLOW; the counter modes reserve on the separate
+DB_COUNTER_POOL_SIZE pool.
+
+Usage:
+    python scripts/bench_issue_key_allocation.py
+    python scripts/bench_issue_key_allocation.py --writers=50 --count=40 --block-size=50
+    python scripts/bench_issue_key_allocation.py --project-id=<uuid> --modes=counter,block
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from uuid import UUID
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.models import User
+from app.database import async_session
+from app.issues import service
+from app.issues.keys import IssueKeyAllocator
+from app.issues.models import Issue, IssueType
+from app.issues.schemas import IssueCreate
+from app.projects.models import Project, ProjectIssueCounter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MODES = ("in-transaction", "counter", "block")
+
+class InTransactionKeys:
+    """Advances the counter in the creating transaction, so its row lock lasts until the issue commits."""
+
+    async def reserve(self, db: AsyncSession, project_id: UUID, count: int) -> list[str]:
+        result = await db.execute(
+            update(ProjectIssueCounter)
+            .where(ProjectIssueCounter.project_id == project_id, Project.id == ProjectIssueCounter.project_id)
+            .values(last_value=ProjectIssueCounter.last_value + count)
+            .returning(ProjectIssueCounter.last_value, Project.key)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one()
+        return [f"{row.key}-{n}" for n in range(row.last_value - count + 1, row.last_value + 1)]
+
+
+async def pick_project(project_id: str | None) -> tuple[UUID, UUID, int]:
+    """Resolve the target project, its owner (the reporter) and issue counter, defaulting to any project."""
+    async with async_session() as db:
+        if project_id:
+            project = await db.get(Project, UUID(project_id))
+        else:
+            project = await db.scalar(select(Project).limit(1))
+        if project is None:
+            raise SystemExit("No project found: pass --project-id")
+        return project.id, project.owner_id, project.issue_counter
+
+
+async def cleanup(project_id: UUID, counter: int) -> list[str]:
+    """Delete the issues numbered after ``counter``, reset the counter to it and return their keys."""
+    async with async_session() as db:
+        created = await db.scalars(select(Issue.key).where(Issue.project_id == project_id))
+        keys = [k for k in created if int(k.rsplit("-", 1)[1]) > counter]
+        await db.execute(delete(Issue).where(Issue.project_id == project_id, Issue.key.in_(keys)))
+        await db.execute(
+            update(ProjectIssueCounter).where(ProjectIssueCounter.project_id == project_id).values(last_value=counter)
+        )
+        await db.commit()
+        return keys
+
+
+async def writer(project_id: UUID, reporter: User, count: int, n: int) -> None:
+    async with async_session() as db:
+        for i in range(count):
+            await service.create_issue(
+                db, project_id, IssueCreate(type=IssueType.task, title=f"Bench writer {n} issue {i}"), reporter
+            )
+
+
+async def run_mode(project_id: UUID, reporter: User, writers: int, count: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(writer(project_id, reporter, count, n) for n in range(writers)))
+    return time.perf_counter() - start
+
+
+async def run_bench(project_id: str | None, modes: list[str], writers: int, count: int, block_size: int):
+    project, owner, counter = await pick_project(project_id)
+    async with async_session() as db:
+        reporter = await db.get(User, owner)
+    total = writers * count
+    logger.info(f"Creating {total} issues in project {project} with {writers} parallel writers, per mode")
+
+    allocators = {
+        "in-transaction": InTransactionKeys(),
+        "counter": IssueKeyAllocator(block_size=1),
+        "block": IssueKeyAllocator(block_size=block_size),
+    }
+    results = []
+    for mode in modes:
+        service.issue_keys = allocators[mode]
+        try:
+            secs = await run_mode(project, reporter, writers, count)
+        finally:
+            keys = await cleanup(project, counter)
+        if len(keys) != len(set(keys)):
+            raise SystemExit(f"{mode}: duplicate issue keys")
+        results.append((mode, secs, len(keys)))
+
+    logger.info("=" * 60)
+    logger.info(f"KEY ALLOCATION RESULTS ({writers} writers)")
+    logger.info("=" * 60)
+    for mode, secs, created in results:
+        logger.info(f"{mode:<15} {secs:>8.2f}s  {created / secs:>9.0f} creates/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent issue creation by key allocation scheme")
+    parser.add_argument("--project-id", help="Project to create issues in (default: any project)")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--writers", type=int, default=50, help="Parallel writers")
+    parser.add_argument("--count", type=int, default=40, help="Issues created by each writer")
+    parser.add_argument("--block-size", type=int, default=20, help="Numbers reserved per update in block mode")
+    args = parser.parse_args()
+
+    modes = args.modes.split(",")
+    if unknown := set(modes) - set(MODES):
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+    asyncio.run(run_bench(args.project_id, modes, args.writers, args.count, args.block_size))
+
+
+if __name__ == "__main__":
+    main()
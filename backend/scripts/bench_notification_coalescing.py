@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Notification coalescing benchmark (comment storm).
+
+Replays a storm of `commented` notifications for one (user, issue) pair
+through notifications.service.create_notifications_bulk against the configured
+database, with a stub WebSocket subscribed for the user, and reports rows
+written and frames pushed for three modes:
+
+- baseline:  coalescing off, immediate pushes (previous behaviour)
+- coalesced: rows merged within the coalescing window, immediate pushes
+- digest:    rows merged, pushes batched by the user's digest
+
+Rows created by the run are deleted afterwards and the user's digest
+preference is restored.
+
+Usage:
+    python scripts/bench_notification_coalescing.py --comments=30 --window=3600
+    python scripts/bench_notification_coalescing.py --issue-id=<uuid> --user-id=<uuid>
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import UUID
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, func, select, update
+
+from app.auth.models import User
+from app.database import async_session
+from app.issues.models import Issue
+from app.notifications import service
+from app.notifications.models import Notification
+from app.notifications.schemas import NotificationTemplate
+from scripts.soak_ws_connections import StubWebSocket
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def pick_target(issue_id: str | None, user_id: str | None) -> tuple[UUID, UUID]:
+    """Resolve the (issue, recipient) pair, defaulting to any assigned issue."""
+    async with async_session() as db:
+        if issue_id:
+            issue = await db.get(Issue, UUID(issue_id))
+        else:
+            issue = await db.scalar(select(Issue).where(Issue.assignee_id.is_not(None)).limit(1))
+        if issue is None:
+            raise SystemExit("No issue found: pass --issue-id (and --user-id if it has no assignee)")
+        recipient = UUID(user_id) if user_id else issue.assignee_id or issue.reporter_id
+        return issue.id, recipient
+
+
+async def run_mode(name: str, issue_id: UUID, user_id: UUID, comments: int, window: float, digest: bool) -> dict:
+    channel = str(user_id)
+    ws = StubWebSocket()
+    conn = await service.manager.connect(ws, channel)
+    await asyncio.sleep(0)
+    frames_before = ws.frames
+    started = datetime.now(timezone.utc)
+
+    async with async_session() as db:
+        previous = await db.scalar(select(User.notification_digest).where(User.id == user_id))
+        await db.execute(update(User).where(User.id == user_id).values(notification_digest=digest))
+        await db.commit()
+
+        start = time.perf_counter()
+        for n in range(comments):
+            await service.create_notifications_bulk(
+                db,
+                [user_id],
+                NotificationTemplate(
+                    issue_id=issue_id,
+                    type="commented",
+                    title="New comment (benchmark)",
+                    body=f"storm comment {n}",
+                ),
+                coalesce_window=window,
+            )
+        elapsed = time.perf_counter() - start
+
+        # Let any digest flush, then let writers drain
+        service.digest._flush(channel)
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        created = Notification.user_id == user_id, Notification.issue_id == issue_id, Notification.created_at >= started
+        rows = await db.scalar(select(func.count()).select_from(Notification).where(*created))
+        await db.execute(delete(Notification).where(*created))
+        await db.execute(update(User).where(User.id == user_id).values(notification_digest=previous))
+        await db.commit()
+
+    service.manager.remove(conn)
+    return {"mode": name, "rows": rows, "pushes": ws.frames - frames_before, "secs": elapsed}
+
+
+async def run_bench(comments: int, window: float, issue_id: str | None, user_id: str | None):
+    issue, user = await pick_target(issue_id, user_id)
+    logger.info(f"Comment storm: {comments} notifications for user {user} on issue {issue}")
+
+    results = [
+        await run_mode("baseline", issue, user, comments, 0, digest=False),
+        await run_mode("coalesced", issue, user, comments, window, digest=False),
+        await run_mode("digest", issue, user, comments, window, digest=True),
+    ]
+    await service.manager.shutdown()
+
+    logger.info("=" * 60)
+    logger.info("COALESCING RESULTS")
+    logger.info("=" * 60)
+    for r in results:
+        logger.info(f"{r['mode']:<10} rows {r['rows']:>5}  pushes {r['pushes']:>5}  "
+                    f"({1000 * r['secs'] / comments:.2f} ms/notification)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark notification coalescing for a comment storm")
+    parser.add_argument("--comments", type=int, default=30, help="Notifications in the storm")
+    parser.add_argument("--window", type=float, default=3600.0, help="Coalescing window in seconds")
+    parser.add_argument("--issue-id", help="Issue to notify about (default: any assigned issue)")
+    parser.add_argument("--user-id", help="Recipient (default: the issue's assignee)")
+    args = parser.parse_args()
+
+    asyncio.run(run_bench(args.comments, args.window, args.issue_id, args.user_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+SSE vs WebSocket connection capacity benchmark.
+
+Registers N subscribers of one kind with a fresh ConnectionManager, each
+served by a task shaped like its endpoint (a WebSocket receive loop parked
+on the next inbound frame, or an SSE response generator draining the
+stream), then broadcasts to every channel. Reports RSS per connection, the
+manager's own per-connection accounting and fan-out time for both kinds,
+so the difference reflects the application side only; ASGI server and
+kernel socket buffers are not included.
+
+Usage:
+    python scripts/bench_sse_vs_ws.py --connections=20000 --broadcasts=5
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.notifications.manager import ConnectionManager
+from scripts.soak_ws_connections import StubWebSocket, rss_bytes
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class ParkedWebSocket(StubWebSocket):
+    """Stub socket whose receive_text blocks like an idle client."""
+
+    __slots__ = ("inbound",)
+
+    def __init__(self):
+        super().__init__()
+        self.inbound = asyncio.get_running_loop().create_future()
+
+    async def receive_text(self) -> str:
+        return await self.inbound
+
+
+async def _websocket_endpoint(manager: ConnectionManager, channel: str, ready: asyncio.Event):
+    ws = ParkedWebSocket()
+    conn = await manager.connect(ws, channel)
+    ready.set()
+    try:
+        while True:
+            await ws.receive_text()
+            conn.touch()
+    finally:
+        manager.disconnect(ws, channel)
+
+
+async def _sse_endpoint(manager: ConnectionManager, channel: str, ready: asyncio.Event, counter: list[int]):
+    conn = manager.open_stream(channel)
+    ready.set()
+    async for _ in manager.stream(conn):
+        counter[0] += 1
+
+
+async def measure(kind: str, connections: int, users: int, broadcasts: int) -> dict:
+    manager = ConnectionManager(heartbeat_interval=60.0, idle_timeout=180.0)
+    counter = [0]
+    tasks = []
+
+    gc.collect()
+    baseline = rss_bytes()
+    start = time.perf_counter()
+    for i in range(connections):
+        ready = asyncio.Event()
+        channel = f"user-{i % users}"
+        if kind == "websocket":
+            task = asyncio.create_task(_websocket_endpoint(manager, channel, ready))
+        else:
+            task = asyncio.create_task(_sse_endpoint(manager, channel, ready, counter))
+        tasks.append(task)
+        await ready.wait()
+    await asyncio.sleep(0.1)
+    connect_secs = time.perf_counter() - start
+
+    gc.collect()
+    loaded = rss_bytes()
+    accounted = manager.stats()["memory_bytes_per_connection"]
+
+    fanout = []
+    for n in range(broadcasts):
+        start = time.perf_counter()
+        for user in range(users):
+            manager.broadcast(f"user-{user}", {"type": "notification", "data": {"n": n}})
+        while manager.stats()["queue_depth_total"]:
+            await asyncio.sleep(0)
+        fanout.append(time.perf_counter() - start)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await manager.shutdown()
+
+    return {
+        "kind": kind,
+        "connect_secs": connect_secs,
+        "rss_per_conn": (loaded - baseline) / connections,
+        "accounted_per_conn": accounted,
+        "fanout_ms": 1000 * sum(fanout) / len(fanout) if fanout else 0.0,
+    }
+
+
+async def run_bench(connections: int, users: int, broadcasts: int):
+    results = []
+    for kind in ("websocket", "sse"):
+        results.append(await measure(kind, connections, users, broadcasts))
+        gc.collect()
+
+    logger.info("=" * 60)
+    logger.info(f"SSE vs WEBSOCKET ({connections} connections, {users} users)")
+    logger.info("=" * 60)
+    for r in results:
+        logger.info(f"{r['kind']:<10} connect {r['connect_secs']:.2f}s  "
+                    f"RSS/conn {r['rss_per_conn']:.0f} B  "
+                    f"accounted/conn {r['accounted_per_conn']} B  "
+                    f"fan-out {r['fanout_ms']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SSE and WebSocket connection capacity")
+    parser.add_argument("--connections", type=int, default=10000, help="Subscribers of each kind")
+    parser.add_argument("--users", type=int, default=5000, help="Distinct users the connections belong to")
+    parser.add_argument("--broadcasts", type=int, default=5, help="Broadcast rounds to time")
+    args = parser.parse_args()
+
+    asyncio.run(run_bench(args.connections, args.users, args.broadcasts))
+
+
+if __name__ == "__main__":
+    main()
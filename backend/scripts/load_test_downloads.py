@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Attachment download load test: authorized content endpoint vs static mount.
+
+Downloads one attachment repeatedly from a running server with N concurrent
+clients, first through the legacy static mount (/uploads/<filepath>) and
+then through the authorized endpoint
+(/api/v1/projects/{project}/issues/{issue}/attachments/{id}/content), and
+reports requests/s, MB/s and latency percentiles for each. A third pass
+requests 1 MB ranges from the content endpoint, as PDF viewers and resumed
+downloads do, and a fourth revalidates with If-None-Match.
+
+The static pass needs --static-path (the attachment's filepath under
+UPLOAD_DIR) and the server started with UPLOADS_STATIC_MOUNT=true; it is
+skipped otherwise.
+
+Usage:
+    python scripts/load_test_downloads.py --token=<jwt> --project-id=<uuid> \\
+        --issue-id=<uuid> --attachment-id=<uuid> --static-path=blobs/ab/cd/<sha>.pdf \\
+        --concurrent=50 --requests=2000
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+RANGE_SIZE = 1024 * 1024
+
+
+async def run_pass(
+    name: str, client: httpx.AsyncClient, url: str, headers: dict, concurrent: int, requests: int, size: int
+) -> dict:
+    """Issue ``requests`` GETs with ``concurrent`` workers and collect timings."""
+    latencies: list[float] = []
+    received = 0
+    failures = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+
+    async def worker():
+        nonlocal received, failures
+        while not queue.empty():
+            i = queue.get_nowait()
+            request_headers = dict(headers)
+            if name == "range" and size > RANGE_SIZE:
+                start = (i * RANGE_SIZE) % (size - RANGE_SIZE)
+                request_headers["Range"] = f"bytes={start}-{start + RANGE_SIZE - 1}"
+            began = time.perf_counter()
+            try:
+                response = await client.get(url, headers=request_headers)
+                received += len(response.content)
+                if response.status_code not in (200, 206, 304):
+                    failures += 1
+            except httpx.HTTPError:
+                failures += 1
+            latencies.append(time.perf_counter() - began)
+
+    began = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrent)))
+    elapsed = time.perf_counter() - began
+    latencies.sort()
+    return {
+        "name": name,
+        "rps": requests / elapsed,
+        "mb_s": received / elapsed / 1024 / 1024,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p95_ms": 1000 * latencies[int(len(latencies) * 0.95) - 1],
+        "failures": failures,
+    }
+
+
+async def run(args):
+    auth = {"Authorization": f"Bearer {args.token}"}
+    content_url = (
+        f"{args.base_url}/api/v1/projects/{args.project_id}/issues/{args.issue_id}"
+        f"/attachments/{args.attachment_id}/content"
+    )
+    limits = httpx.Limits(max_connections=args.concurrent, max_keepalive_connections=args.concurrent)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        probe = await client.get(content_url, headers=auth)
+        probe.raise_for_status()
+        size = len(probe.content)
+        etag = probe.headers.get("etag")
+
+        passes = []
+        static_url = f"{args.base_url}/uploads/{args.static_path}" if args.static_path else None
+        if static_url and (await client.head(static_url)).status_code == 200:
+            passes.append(("static", static_url, {}))
+        else:
+            logger.info("Static mount not available (start the server with UPLOADS_STATIC_MOUNT=true); skipping")
+        passes.append(("content", content_url, auth))
+        passes.append(("range", content_url, auth))
+        if etag:
+            passes.append(("not-modified", content_url, {**auth, "If-None-Match": etag}))
+
+        results = [
+            await run_pass(name, client, url, headers, args.concurrent, args.requests, size)
+            for name, url, headers in passes
+        ]
+
+    logger.info("=" * 60)
+    logger.info(f"ATTACHMENT DOWNLOADS ({size / 1024 / 1024:.1f}MB file, {args.concurrent} concurrent)")
+    logger.info("=" * 60)
+    for r in results:
+        logger.info(f"{r['name']:<13} {r['rps']:8.1f} req/s  {r['mb_s']:8.1f} MB/s  "
+                    f"p50 {r['p50_ms']:.1f} ms  p95 {r['p95_ms']:.1f} ms  failures {r['failures']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test attachment downloads")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--token", required=True, help="Access token of a project member")
+    parser.add_argument("--project-id", required=True)
+    parser.add_argument("--issue-id", required=True)
+    parser.add_argument("--attachment-id", required=True)
+    parser.add_argument("--static-path", default="", help="Attachment filepath under UPLOAD_DIR, for the static pass")
+    parser.add_argument("--concurrent", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per pass")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Tests for streaming ZIP archives of attachments."""
+
+import io
+import os
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from app.attachments.archive import ArchiveEntry, stream_zip, unique_names
+from app.attachments.models import Attachment
+from app.attachments.service import get_archive_entries
+from app.attachments.storage import LocalStorage
+from app.auth.dependencies import get_current_user
+from app.database import get_db
+from app.main import app
+from app.sprints.models import Sprint
+from tests.conftest import _make_test_user
+
+NOW = datetime(2026, 10, 19, 12, 30, tzinfo=timezone.utc)
+
+
+def _entry(storage: LocalStorage, key: str, data: bytes, mime_type: str, name: str | None = None) -> ArchiveEntry:
+    path = storage.local_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return ArchiveEntry(key=key, name=name or key, size=len(data), mime_type=mime_type, modified=NOW)
+
+
+async def _collect(storage, entries) -> list[bytes]:
+    return [chunk async for chunk in stream_zip(storage, entries)]
+
+
+@pytest.mark.asyncio
+async def test_archive_stores_compressed_types_and_deflates_the_rest(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    photo = _entry(storage, "blobs/photo.jpg", os.urandom(3000), "image/jpeg")
+    log = _entry(storage, "blobs/build.log", b"line\n" * 2000, "text/plain")
+    missing = ArchiveEntry(key="blobs/gone", name="gone.txt", size=1, mime_type="text/plain", modified=NOW)
+
+    data = b"".join(await _collect(storage, [photo, missing, log]))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["blobs/photo.jpg", "blobs/build.log"]
+        assert archive.getinfo("blobs/photo.jpg").compress_type == zipfile.ZIP_STORED
+        info = archive.getinfo("blobs/build.log")
+        assert info.compress_type == zipfile.ZIP_DEFLATED and info.compress_size < info.file_size
+        assert archive.read("blobs/build.log") == b"line\n" * 2000
+        assert info.date_time == (2026, 10, 19, 12, 30, 0)
+
+
+@pytest.mark.asyncio
+async def test_archive_is_streamed_in_bounded_chunks(tmp_path):
+    """A large entry arrives as many small pieces, never as one buffer."""
+    storage = LocalStorage(str(tmp_path))
+    big = _entry(storage, "blobs/video.webm", os.urandom(8 * 1024 * 1024), "application/zip")
+
+    chunks = await _collect(storage, [big])
+
+    assert len(chunks) > 8 and max(len(c) for c in chunks) <= 512 * 1024
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.getinfo("blobs/video.webm").file_size == big.size
+
+
+def test_unique_names_numbers_repeats_and_drops_dot_names():
+    assert unique_names(["a.png", "A.png", "FB-1/a.png", "a.png", ".."]) == [
+        "a.png", "A (2).png", "FB-1/a.png", "a (3).png", "file"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sprint_archive_puts_files_in_issue_folders():
+    project_id = uuid.uuid4()
+    attachments = [
+        MagicMock(spec=Attachment, filename=name, filepath=f"blobs/{i}", size=1, mime_type="text/plain", created_at=NOW)
+        for i, name in enumerate(["notes.txt", "notes.txt", "../etc/passwd"])
+    ]
+    db = AsyncMock()
+    db.get = AsyncMock(return_value=MagicMock(spec=Sprint, project_id=project_id))
+    db.get.return_value.name = "Sprint 4"
+    db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(
+        return_value=[(attachments[0], "FB-1"), (attachments[1], "FB-2"), (attachments[2], "FB-2")]
+    )))
+
+    name, entries = await get_archive_entries(db, project_id, sprint_id=uuid.uuid4())
+
+    assert name == "Sprint 4"
+    assert [e.name for e in entries] == ["FB-1/notes.txt", "FB-2/notes.txt", "FB-2/etcpasswd"]
+
+
+@pytest.mark.asyncio
+async def test_sprint_archive_of_other_project_is_not_found():
+    db = AsyncMock()
+    db.get = AsyncMock(return_value=MagicMock(spec=Sprint, project_id=uuid.uuid4()))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_archive_entries(db, uuid.uuid4(), sprint_id=uuid.uuid4())
+
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_issue_archive_endpoint_streams_zip(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    entries = [_entry(storage, "blobs/a.txt", b"hello", "text/plain", name="a.txt")]
+
+    async def override_get_db():
+        yield AsyncMock()
+
+    async def override_get_current_user():
+        return _make_test_user()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    url = f"/api/v1/projects/{uuid.uuid4()}/issues/{uuid.uuid4()}/attachments/archive"
+    try:
+        with patch("app.attachments.router.get_project", AsyncMock()), \
+             patch("app.attachments.router.get_archive_entries", AsyncMock(return_value=("FB-7", entries))), \
+             patch("app.attachments.router.get_storage", return_value=storage):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get(url)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200 and response.headers["content-type"] == "application/zip"
+    assert response.headers["content-disposition"] == 'attachment; filename="FB-7-attachments.zip"'
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.read("a.txt") == b"hello"
@@ -0,0 +1,109 @@
+"""Tests for the content-addressed attachment blob store."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.attachments import blobs
+from app.attachments.models import Attachment
+from app.attachments.service import delete_attachment, get_storage_stats
+from app.config import settings
+
+SHA = "ab" * 32
+
+
+def test_blob_path_fans_out_and_keeps_safe_extension():
+    assert blobs.blob_path(SHA, "Screen Shot.PNG") == f"blobs/ab/ab/{SHA}.png"
+    assert blobs.blob_path(SHA, "archive.tar.$gz") == f"blobs/ab/ab/{SHA}"
+    assert blobs.blob_path(SHA, "README") == f"blobs/ab/ab/{SHA}"
+    assert blobs.is_blob_path(blobs.blob_path(SHA)) and not blobs.is_blob_path(f"{uuid.uuid4()}/x_a.png")
+
+
+@pytest.mark.asyncio
+async def test_reference_blob_upserts_reference_without_touching_storage(tmp_path):
+    db = AsyncMock()
+    db.scalar = AsyncMock(return_value=blobs.blob_path(SHA, "a.png"))
+
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)):
+        path = await blobs.reference_blob(db, SHA, 8, "b.PNG")
+
+    assert path == blobs.blob_path(SHA, "a.png")
+    assert not list(tmp_path.iterdir())
+    sql = str(db.scalar.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (sha256) DO UPDATE SET ref_count = (attachment_blobs.ref_count + " in sql
+
+
+@pytest.mark.asyncio
+async def test_write_blob_dedupes_existing_file(tmp_path):
+    """A second upload of the same content discards its copy."""
+    existing = tmp_path / blobs.blob_path(SHA, "a.png")
+    existing.parent.mkdir(parents=True)
+    existing.write_bytes(b"original")
+    temp = tmp_path / "upload.tmp"
+    temp.write_bytes(b"original")
+
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)):
+        await blobs.write_blob(blobs.blob_path(SHA, "a.png"), temp)
+
+    assert not temp.exists() and existing.read_bytes() == b"original"
+
+
+@pytest.mark.asyncio
+async def test_write_blob_moves_new_content_into_place(tmp_path):
+    temp = tmp_path / "upload.tmp"
+    temp.write_bytes(b"new")
+    path = blobs.blob_path(SHA, "n.txt")
+
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)):
+        await blobs.write_blob(path, temp)
+
+    assert (tmp_path / path).read_bytes() == b"new" and not temp.exists()
+
+
+@pytest.mark.asyncio
+async def test_collect_orphans_removes_unreferenced_files(tmp_path):
+    orphan = tmp_path / blobs.blob_path(SHA)
+    orphan.parent.mkdir(parents=True)
+    orphan.write_bytes(b"x")
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=MagicMock(scalars=MagicMock(return_value=MagicMock(
+        all=MagicMock(return_value=[blobs.blob_path(SHA), "blobs/cd/cd/already-gone"])
+    ))))
+
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)):
+        removed = await blobs.collect_orphans(db)
+
+    assert len(removed) == 2 and not orphan.exists()
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "attachment_blobs.ref_count = " in sql and "FOR UPDATE SKIP LOCKED" in sql
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_blob_backed_attachment_keeps_shared_file():
+    """Deleting the row releases the reference (trigger); the file stays for other attachments."""
+    user = MagicMock(id=uuid.uuid4())
+    attachment = MagicMock(spec=Attachment, uploader_id=user.id, filepath=blobs.blob_path(SHA, "a.png"))
+    db = AsyncMock()
+    db.get = AsyncMock(return_value=attachment)
+
+    with patch("os.remove") as mock_remove:
+        await delete_attachment(db, uuid.uuid4(), user)
+
+    mock_remove.assert_not_called()
+    db.delete.assert_awaited_once_with(attachment)
+
+
+@pytest.mark.asyncio
+async def test_storage_stats_report_savings():
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=MagicMock(one=MagicMock(return_value=(5, 2, 5000, 1500))))
+    project_id = uuid.uuid4()
+
+    stats = await get_storage_stats(db, project_id)
+
+    assert (stats.attachments, stats.files, stats.saved_bytes) == (5, 2, 3500)
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "GROUP BY attachments.filepath" in sql
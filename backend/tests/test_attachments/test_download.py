@@ -0,0 +1,130 @@
+"""Tests for authorized, range-capable attachment downloads."""
+
+import os
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.attachments.models import Attachment
+from app.attachments.responses import AttachmentFileResponse, etag_matches
+from app.attachments.storage import LocalStorage
+from app.auth.dependencies import get_current_user
+from app.database import get_db
+from app.main import app
+from tests.conftest import _make_test_user
+
+SHA = "ef" * 32
+CONTENT = b"0123456789" * 100
+
+
+@pytest.fixture
+def stored_file(tmp_path):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(CONTENT)
+    attachment = MagicMock(
+        spec=Attachment, sha256=SHA, mime_type="application/pdf", filename="Q3 report.pdf", filepath="report.pdf"
+    )
+    return attachment, path, os.stat(path)
+
+
+async def _get(stored_file, role: str | None = "developer", **kwargs):
+    attachment, path, _ = stored_file
+
+    async def override_get_db():
+        yield AsyncMock()
+
+    async def override_get_current_user():
+        return _make_test_user()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    url = f"/api/v1/projects/{uuid.uuid4()}/issues/{uuid.uuid4()}/attachments/{uuid.uuid4()}/content"
+    try:
+        with patch("app.attachments.router.get_user_role_in_project", AsyncMock(return_value=role)), \
+             patch("app.attachments.router.get_project_attachment", AsyncMock(return_value=attachment)), \
+             patch("app.attachments.router.get_storage", return_value=LocalStorage(str(path.parent))):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                return await client.get(url, **kwargs)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_download_sends_file_with_content_etag(stored_file):
+    response = await _get(stored_file)
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == f'"{SHA}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-disposition"].startswith("attachment;")
+
+
+@pytest.mark.asyncio
+async def test_download_honours_range(stored_file):
+    response = await _get(stored_file, headers={"Range": "bytes=10-29"})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[10:30]
+    assert response.headers["content-range"] == f"bytes 10-29/{len(CONTENT)}"
+
+
+@pytest.mark.asyncio
+async def test_download_if_none_match_is_not_modified(stored_file):
+    response = await _get(stored_file, headers={"If-None-Match": f'W/"{SHA}"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_download_of_missing_file_is_not_found(stored_file):
+    stored_file[1].unlink()
+    response = await _get(stored_file)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_download_requires_membership(stored_file):
+    response = await _get(stored_file, role=None)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_static_uploads_mount_is_off_by_default():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/uploads/anything.png")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_zero_copy_range_is_handed_to_the_server(stored_file):
+    """With the zerocopysend extension, the body is a file descriptor plus offset and count."""
+    _, path, stat_result = stored_file
+    sent = []
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            message = {**message, "file_was_open": os.fstat(message["file"]).st_size == len(CONTENT)}
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"range", b"bytes=100-")],
+        "extensions": {"http.response.zerocopysend": {}},
+    }
+    await AttachmentFileResponse(path, stat_result=stat_result)(scope, AsyncMock(), send)
+
+    start, body = sent
+    assert start["status"] == 206
+    assert (body["offset"], body["count"], body["file_was_open"]) == (100, len(CONTENT) - 100, True)
+
+
+def test_etag_matching():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches(None, '"b"') and not etag_matches('"a"', '"b"')
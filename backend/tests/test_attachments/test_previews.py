@@ -0,0 +1,114 @@
+"""Tests for image preview rendering."""
+
+import asyncio
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.attachments import previews, service
+from app.attachments.models import Attachment
+from app.config import settings
+
+SHA = "cd" * 32
+
+
+def _fake_render(calls: list, gate: threading.Event):
+    def render(source: str, targets: dict[str, tuple[str, int]]) -> None:
+        calls.append(sorted(targets))
+        gate.wait(1)
+        for path, _ in targets.values():
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_bytes(b"webp")
+    return render
+
+
+def _attachment(mime_type: str = "image/png", sha256: str | None = SHA) -> MagicMock:
+    uploader = MagicMock(id=uuid.uuid4(), avatar_url=None)
+    uploader.name = "Ann"
+    return MagicMock(
+        spec=Attachment,
+        id=uuid.uuid4(),
+        issue_id=uuid.uuid4(),
+        filename="shot.png",
+        filepath="blobs/cd/cd/shot.png",
+        size=10,
+        mime_type=mime_type,
+        sha256=sha256,
+        created_at=datetime.now(timezone.utc),
+        uploader=uploader,
+    )
+
+
+def test_previews_are_keyed_by_content_hash():
+    assert previews.preview_path(SHA, "thumb") == f"previews/cd/{SHA}_thumb.webp"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_render(tmp_path):
+    """Two requests for the same image wait on one render; afterwards the disk cache answers."""
+    calls, gate = [], threading.Event()
+    renderer = previews.PreviewRenderer(executor=ThreadPoolExecutor(1))
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)), patch.object(previews, "Image", object()), \
+         patch.object(previews, "_render", _fake_render(calls, gate)):
+        first = asyncio.create_task(renderer.ensure(SHA, "blobs/x.png"))
+        second = asyncio.create_task(renderer.ensure(SHA, "blobs/x.png"))
+        await asyncio.sleep(0.05)
+        gate.set()
+        assert await asyncio.gather(first, second) == [True, True]
+        assert await renderer.ensure(SHA, "blobs/x.png")
+    await renderer.shutdown()
+
+    assert calls == [["medium", "thumb"]]
+    assert (tmp_path / previews.preview_path(SHA, "medium")).exists()
+
+
+@pytest.mark.asyncio
+async def test_previews_disabled_without_pillow():
+    renderer = previews.PreviewRenderer(executor=ThreadPoolExecutor(1))
+    with patch.object(previews, "Image", None):
+        assert await renderer.ensure(SHA, "blobs/x.png") is False
+        assert service._to_response(_attachment(), uuid.uuid4()).thumbnail_url is None
+    await renderer.shutdown()
+
+
+def test_response_carries_preview_urls_for_images():
+    project_id = uuid.uuid4()
+    image, pdf = _attachment(), _attachment(mime_type="application/pdf")
+    with patch.object(previews, "Image", object()):
+        response = service._to_response(image, project_id)
+        assert service._to_response(pdf, project_id).preview_url is None
+
+    base = f"/api/v1/projects/{project_id}/issues/{image.issue_id}/attachments/{image.id}/preview"
+    assert (response.thumbnail_url, response.preview_url) == (f"{base}/thumb", f"{base}/medium")
+
+
+@pytest.mark.asyncio
+async def test_get_preview_rejects_non_images_and_unknown_sizes():
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=_attachment(sha256=None))))
+    ids = (uuid.uuid4(), uuid.uuid4(), uuid.uuid4())
+
+    with pytest.raises(HTTPException) as unknown:
+        await service.get_preview(db, *ids, "huge")
+    with patch.object(previews, "Image", object()), pytest.raises(HTTPException) as unhashed:
+        await service.get_preview(db, *ids, "thumb")
+
+    assert (unknown.value.status_code, unhashed.value.status_code) == (404, 404)
+
+
+def test_render_writes_webp_renditions(tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    source = tmp_path / "source.png"
+    image_module.new("RGB", (2000, 1000), "red").save(source)
+    targets = {name: (str(tmp_path / f"{name}.webp"), edge) for name, edge in previews.PREVIEW_SIZES.items()}
+
+    previews._render(str(source), targets)
+
+    with image_module.open(targets["thumb"][0]) as thumb:
+        assert thumb.format == "WEBP" and thumb.size == (256, 128)
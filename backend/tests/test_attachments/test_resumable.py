@@ -0,0 +1,279 @@
+"""Tests for resumable (chunked) attachment uploads."""
+
+import hashlib
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from starlette.requests import ClientDisconnect
+
+from app.attachments import uploads
+from app.attachments.models import UploadSession
+from app.attachments.schemas import UploadSessionCreate
+from app.auth.dependencies import get_current_user
+from app.config import settings
+from app.database import get_db
+from app.main import app
+from tests.conftest import _make_test_user
+
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)):
+        yield tmp_path
+
+
+def _session(size: int, offset: int = 0) -> UploadSession:
+    session = UploadSession(
+        id=uuid.uuid4(),
+        issue_id=uuid.uuid4(),
+        uploader_id=uuid.uuid4(),
+        filename="server.log",
+        mime_type="text/plain",
+        size=size,
+        offset=offset,
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+    path = uploads.session_path(session.id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * offset)
+    return session
+
+
+def _db_advancing(session: UploadSession) -> AsyncMock:
+    """Mock session whose compare-and-set succeeds and whose refresh applies it."""
+    db = AsyncMock()
+
+    async def scalar(stmt):
+        params = stmt.compile().params
+        session.offset = params["offset"]
+        return session.offset
+
+    db.scalar = AsyncMock(side_effect=scalar)
+    return db
+
+
+async def _stream(*chunks: bytes, disconnect: bool = False):
+    for chunk in chunks:
+        yield chunk
+    if disconnect:
+        raise ClientDisconnect()
+
+
+@pytest.mark.asyncio
+async def test_create_session_validates_type_and_size(upload_dir):
+    db, user, issue_id = AsyncMock(), _make_test_user(), uuid.uuid4()
+    too_large = settings.MAX_RESUMABLE_UPLOAD_SIZE + 1
+
+    with pytest.raises(HTTPException) as bad_type:
+        await uploads.create_upload_session(
+            db, issue_id, user, UploadSessionCreate(filename="a.exe", size=10, mime_type="application/x-msdos")
+        )
+    with pytest.raises(HTTPException) as too_big:
+        await uploads.create_upload_session(
+            db, issue_id, user, UploadSessionCreate(filename="a.zip", size=too_large, mime_type="application/zip")
+        )
+    session = await uploads.create_upload_session(
+        db, issue_id, user, UploadSessionCreate(filename="a.zip", size=300 * 1024 * 1024, mime_type="application/zip")
+    )
+
+    assert (bad_type.value.status_code, too_big.value.status_code) == (400, 413)
+    assert session.offset == 0 and uploads.session_path(session.id).stat().st_size == 0
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_written_at_the_offset(upload_dir):
+    session = _session(size=10, offset=4)
+    db = _db_advancing(session)
+
+    await uploads.append_chunk(db, session, 4, _stream(b"abc", b"def"))
+
+    assert uploads.session_path(session.id).read_bytes() == b"xxxxabcdef"
+    assert session.offset == 10
+    sql = str(db.scalar.call_args.args[0])
+    assert "upload_sessions.\"offset\" = " in sql and "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_chunk_at_wrong_offset_conflicts(upload_dir):
+    session = _session(size=10, offset=4)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await uploads.append_chunk(AsyncMock(), session, 0, _stream(b"abc"))
+
+    assert exc_info.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_chunk_losing_the_offset_race_writes_nothing(upload_dir):
+    """A concurrent request that already advanced the offset wins; this chunk is discarded with a 409."""
+    session = _session(size=10, offset=4)
+    db = AsyncMock()
+    db.scalar = AsyncMock(return_value=None)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await uploads.append_chunk(db, session, 4, _stream(b"abc"))
+
+    assert exc_info.value.status_code == 409
+    assert uploads.session_path(session.id).read_bytes() == b"xxxx"
+    assert [p.name for p in uploads.session_path(session.id).parent.iterdir()] == [f"{session.id}.part"]
+    db.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_body_is_streamed_outside_a_transaction(upload_dir):
+    session = _session(size=10)
+    db = _db_advancing(session)
+    commits_before_body = []
+
+    async def body():
+        commits_before_body.append(db.commit.await_count)
+        yield b"abc"
+
+    await uploads.append_chunk(db, session, 0, body())
+
+    assert commits_before_body == [1] and db.commit.await_count == 2
+    assert uploads.session_path(session.id).read_bytes() == b"abc"
+
+
+@pytest.mark.asyncio
+async def test_chunk_past_declared_size_is_rejected(upload_dir):
+    session = _session(size=5)
+    db = _db_advancing(session)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await uploads.append_chunk(db, session, 0, _stream(b"abc", b"def"))
+
+    assert exc_info.value.status_code == 413
+    assert session.offset == 0 and uploads.session_path(session.id).read_bytes() == b""
+
+
+@pytest.mark.asyncio
+async def test_disconnect_keeps_received_bytes(upload_dir):
+    """A dropped connection still advances the offset, so the client resumes from there."""
+    session = _session(size=100)
+    db = _db_advancing(session)
+
+    with pytest.raises(ClientDisconnect):
+        await uploads.append_chunk(db, session, 0, _stream(b"partial", disconnect=True))
+
+    assert session.offset == 7 and uploads.session_path(session.id).read_bytes() == b"partial"
+
+
+@pytest.mark.parametrize("stream, error", [
+    (_stream(b"abc", b"defghi"), HTTPException),
+    (_stream(b"partial", disconnect=True), ClientDisconnect),
+])
+@pytest.mark.asyncio
+async def test_conflict_while_keeping_bytes_does_not_hide_the_request_error(upload_dir, stream, error):
+    """A 413 or disconnect is reported even if a concurrent request took the offset meanwhile."""
+    session = _session(size=8)
+    db = AsyncMock()
+    db.scalar = AsyncMock(return_value=None)
+
+    with patch.object(uploads, "UPLOAD_CHUNK_SIZE", 2), pytest.raises(error) as exc_info:
+        await uploads.append_chunk(db, session, 0, stream)
+
+    assert getattr(exc_info.value, "status_code", None) in (None, 413)
+    db.scalar.assert_awaited_once()
+    assert uploads.session_path(session.id).read_bytes() == b""
+
+
+@pytest.mark.asyncio
+async def test_complete_requires_every_byte(upload_dir):
+    with pytest.raises(HTTPException) as exc_info:
+        await uploads.complete_upload(AsyncMock(), _session(size=10, offset=9), _make_test_user())
+    assert exc_info.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_complete_hashes_and_creates_attachment(upload_dir):
+    session = _session(size=6, offset=6)
+    db = AsyncMock()
+    db.scalar = AsyncMock(return_value=session.id)
+    user = _make_test_user()
+
+    with patch.object(uploads, "create_attachment_from_file", AsyncMock()) as create:
+        await uploads.complete_upload(db, session, user)
+
+    args = create.call_args
+    assert args.args[3:6] == (uploads.session_path(session.id), 6, hashlib.sha256(b"xxxxxx").hexdigest())
+    assert args.kwargs["filename"] == "server.log"
+    assert "DELETE FROM upload_sessions" in str(db.scalar.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_failed_complete_deletes_the_session_it_consumed(upload_dir):
+    """The attachment path removes the file on failure, so the session goes too instead of lingering without it."""
+    session = _session(size=6, offset=6)
+    db = AsyncMock()
+    db.scalar = AsyncMock(return_value=session.id)
+
+    with patch.object(uploads, "create_attachment_from_file", AsyncMock(side_effect=RuntimeError("commit failed"))), \
+         pytest.raises(RuntimeError):
+        await uploads.complete_upload(db, session, _make_test_user())
+
+    db.rollback.assert_awaited_once()
+    assert "DELETE FROM upload_sessions" in str(db.execute.call_args.args[0])
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_complete_without_the_session_file_is_not_found(upload_dir):
+    session = _session(size=1, offset=1)
+    uploads.session_path(session.id).unlink()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await uploads.complete_upload(AsyncMock(), session, _make_test_user())
+
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_complete_raced_by_another_request_is_not_found(upload_dir):
+    db = AsyncMock()
+    db.scalar = AsyncMock(return_value=None)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await uploads.complete_upload(db, _session(size=1, offset=1), _make_test_user())
+
+    assert exc_info.value.status_code == 404
+    db.rollback.assert_awaited_once()
+
+
+def test_stale_partial_files_are_removed(upload_dir):
+    stale, fresh = _session(size=5, offset=1), _session(size=5, offset=1)
+    old = time.time() - 2 * settings.UPLOAD_SESSION_TTL
+    os.utime(uploads.session_path(stale.id), (old, old))
+
+    assert uploads._remove_stale_files(settings.UPLOAD_SESSION_TTL) == 1
+    assert uploads.session_path(fresh.id).exists() and not uploads.session_path(stale.id).exists()
+
+
+@pytest.mark.asyncio
+async def test_patch_endpoint_requires_chunk_content_type():
+    async def override_get_db():
+        yield AsyncMock()
+
+    async def override_get_current_user():
+        return _make_test_user()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    url = f"/api/v1/projects/{uuid.uuid4()}/issues/{uuid.uuid4()}/attachments/uploads/{uuid.uuid4()}"
+    try:
+        with patch("app.attachments.router.get_project", AsyncMock()):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.patch(
+                    url, content=b"abc", headers={"Upload-Offset": "0", "Content-Type": "application/json"}
+                )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 415
@@ -0,0 +1,160 @@
+"""Tests for the attachment storage backends."""
+
+import io
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.attachments.responses import storage_response
+from app.attachments.storage import MIN_PART_SIZE, LocalStorage, S3Storage, content_disposition
+
+
+class _ClientError(Exception):
+    def __init__(self, code: str):
+        self.response = {"Error": {"Code": code}}
+
+
+class FakeS3Client:
+    """In-memory stand-in for the subset of the boto3 S3 client the backend uses (MinIO-style)."""
+
+    def __init__(self, fail_on_part: int | None = None):
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, list[bytes]] = {}
+        self.aborted: list[str] = []
+        self.calls: list[str] = []
+        self.fail_on_part = fail_on_part
+
+    def put_object(self, Bucket, Key, Body):
+        self.calls.append("put_object")
+        self.objects[Key] = Body
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = []
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_on_part:
+            raise _ClientError("InternalError")
+        self.uploads[UploadId].append(Body)
+        return {"ETag": f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        assert [p["PartNumber"] for p in MultipartUpload["Parts"]] == list(range(1, len(self.uploads[UploadId]) + 1))
+        self.objects[Key] = b"".join(self.uploads.pop(UploadId))
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(UploadId)
+        self.uploads.pop(UploadId)
+
+    def get_object(self, Bucket, Key, Range=None):
+        data = self.objects[Key]
+        if Range:
+            start, _, end = Range.removeprefix("bytes=").partition("-")
+            data = data[int(start):int(end) + 1 if end else None]
+        return {"Body": io.BytesIO(data)}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise _ClientError("404")
+        return {"ContentLength": len(self.objects[Key]), "LastModified": datetime.now(timezone.utc)}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn):
+        return f"https://store.test/{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+
+async def _read(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio
+async def test_local_storage_round_trip(tmp_path):
+    storage = LocalStorage(str(tmp_path / "store"))
+    source = tmp_path / "upload.tmp"
+    source.write_bytes(b"0123456789")
+
+    await storage.put("blobs/ab/cd/x.txt", source)
+
+    assert not source.exists()
+    assert (await storage.stat("blobs/ab/cd/x.txt")).size == 10
+    assert await _read(storage.get("blobs/ab/cd/x.txt", 2, 5)) == b"234"
+    await storage.delete("blobs/ab/cd/x.txt")
+    await storage.delete("blobs/ab/cd/x.txt")
+    assert await storage.stat("blobs/ab/cd/x.txt") is None
+
+
+@pytest.mark.asyncio
+async def test_s3_small_files_use_a_single_put(tmp_path):
+    client = FakeS3Client()
+    storage = S3Storage("bucket", prefix="fb/", client=client)
+    source = tmp_path / "small"
+    source.write_bytes(b"tiny")
+
+    await storage.put("blobs/x", source)
+
+    assert client.calls == ["put_object"] and client.objects == {"fb/blobs/x": b"tiny"}
+    assert await _read(storage.get("blobs/x", 1, 3)) == b"in"
+    assert (await storage.stat("blobs/x")).size == 4 and await storage.stat("blobs/missing") is None
+
+
+@pytest.mark.asyncio
+async def test_s3_large_files_upload_in_parts(tmp_path):
+    client = FakeS3Client()
+    storage = S3Storage("bucket", part_size=MIN_PART_SIZE, client=client)
+    data = bytes(range(256)) * (MIN_PART_SIZE * 2 // 256 + 7)
+    source = tmp_path / "large"
+    source.write_bytes(data)
+
+    await storage.put("blobs/large", source)
+
+    assert client.objects["blobs/large"] == data and "put_object" not in client.calls
+    assert source.exists()  # copied, not consumed; the caller removes it
+
+
+@pytest.mark.asyncio
+async def test_s3_failed_multipart_upload_is_aborted(tmp_path):
+    client = FakeS3Client(fail_on_part=2)
+    storage = S3Storage("bucket", part_size=MIN_PART_SIZE, client=client)
+    source = tmp_path / "large"
+    source.write_bytes(b"x" * (MIN_PART_SIZE * 2))
+
+    with pytest.raises(_ClientError):
+        await storage.put("blobs/large", source)
+
+    assert client.aborted == ["upload-0"] and not client.uploads and not client.objects
+
+
+@pytest.mark.asyncio
+async def test_s3_downloads_redirect_to_presigned_url():
+    storage = S3Storage("bucket", client=FakeS3Client())
+
+    response = await storage_response(storage, "blobs/x", "a.pdf", "application/pdf", {"ETag": '"e"'})
+
+    assert response.status_code == 307
+    assert response.headers["location"].startswith("https://store.test/bucket/blobs/x")
+    assert response.headers["cache-control"] == "private, no-store"
+
+
+@pytest.mark.asyncio
+async def test_s3_downloads_are_proxied_when_presigning_is_off():
+    client = FakeS3Client()
+    client.objects["blobs/x"] = b"pdf bytes"
+    storage = S3Storage("bucket", presign=False, client=client)
+
+    response = await storage_response(storage, "blobs/x", "résumé.pdf", "application/pdf", {}, inline=True)
+
+    assert response.headers["content-length"] == "9"
+    assert response.headers["content-disposition"] == content_disposition("résumé.pdf", inline=True)
+    assert await _read(response.body_iterator) == b"pdf bytes"
+    with pytest.raises(HTTPException) as missing:
+        await storage_response(storage, "blobs/gone", "a.pdf", "application/pdf", {})
+    assert missing.value.status_code == 404
+
+
+def test_content_disposition_encodes_non_ascii_names():
+    assert content_disposition("report.pdf") == 'attachment; filename="report.pdf"'
+    assert content_disposition("résumé.pdf", inline=True) == "inline; filename*=utf-8''r%C3%A9sum%C3%A9.pdf"
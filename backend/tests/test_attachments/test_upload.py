@@ -1,11 +1,12 @@
 """Tests for attachment upload functionality."""
 
-import io
+import hashlib
 import uuid
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.attachments.blobs import blob_path
 from app.attachments.models import Attachment
 from app.attachments.service import upload_attachment
 from app.config import settings
@@ -67,30 +68,57 @@ async def test_upload_image_success(mock_db, test_issue_id, test_user, tmp_path)
         obj.uploader = test_user
 
     mock_db.refresh = AsyncMock(side_effect=refresh_attachment)
+    digest = hashlib.sha256(image_content).hexdigest()
+    mock_db.scalar = AsyncMock(return_value=blob_path(digest, "test.png"))
 
-    with patch("app.attachments.service.Path") as mock_path:
-        mock_path_instance = MagicMock()
-        mock_path.return_value = mock_path_instance
-        mock_path_instance.parent.mkdir = MagicMock()
-        mock_path_instance.exists.return_value = False
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)):
+        result = await upload_attachment(mock_db, test_issue_id, file, test_user)
 
-        with patch("builtins.open", create=True) as mock_open:
-            mock_open.return_value.__enter__.return_value.write = MagicMock()
+    # Verify file was moved into the blob store with its digest recorded
+    saved = mock_db.add.call_args.args[0]
+    assert saved.filepath == f"blobs/{digest[:2]}/{digest[2:4]}/{digest}.png"
+    assert (tmp_path / saved.filepath).read_bytes() == image_content
+    assert saved.size == len(image_content)
+    assert saved.sha256 == hashlib.sha256(image_content).hexdigest()
+    assert not list((tmp_path / ".incoming").iterdir())
 
-            result = await upload_attachment(mock_db, test_issue_id, file, test_user)
+    # Verify attachment was added to DB
+    mock_db.add.assert_called_once()
+    mock_db.commit.assert_called_once()
+    mock_db.refresh.assert_called_once()
+    assert result.url == f"/uploads/{saved.filepath}"
 
-            # Verify file was saved
-            mock_open.assert_called()
 
-            # Verify attachment was added to DB
-            mock_db.add.assert_called_once()
-            mock_db.commit.assert_called_once()
-            mock_db.refresh.assert_called_once()
+@pytest.mark.asyncio
+async def test_blob_written_only_after_commit(mock_db, test_issue_id, test_user, tmp_path):
+    """A failed commit leaves no object behind; a failed write deletes the committed attachment."""
+    file = MagicMock(filename="a.txt", content_type="text/plain")
+    file.read = AsyncMock(side_effect=[b"data", b""])
+    mock_db.add = MagicMock()
+    mock_db.scalar = AsyncMock(return_value=blob_path(hashlib.sha256(b"data").hexdigest(), "a.txt"))
+    mock_db.commit = AsyncMock(side_effect=RuntimeError("commit failed"))
+
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)), pytest.raises(RuntimeError):
+        await upload_attachment(mock_db, test_issue_id, file, test_user)
+    assert not (tmp_path / "blobs").exists()
+    assert not list((tmp_path / ".incoming").iterdir())
+
+    file.read = AsyncMock(side_effect=[b"data", b""])
+    mock_db.commit = AsyncMock()
+    with (
+        patch.object(settings, "UPLOAD_DIR", str(tmp_path)),
+        patch("app.attachments.service.write_blob", AsyncMock(side_effect=OSError("disk full"))),
+        pytest.raises(OSError),
+    ):
+        await upload_attachment(mock_db, test_issue_id, file, test_user)
+    mock_db.delete.assert_awaited_once_with(mock_db.add.call_args.args[0])
+    assert mock_db.commit.await_count == 2
+    assert not list((tmp_path / ".incoming").iterdir())
 
 
 @pytest.mark.asyncio
-async def test_upload_too_large_fails(mock_db, test_issue_id, test_user):
-    """Test that uploading a file larger than max size fails."""
+async def test_upload_too_large_fails(mock_db, test_issue_id, test_user, tmp_path):
+    """Test that uploading a file larger than max size fails and leaves nothing on disk."""
     chunk_size = 1024 * 64  # 64KB chunks
     # Build enough chunks to exceed MAX_FILE_SIZE
     num_chunks = (settings.MAX_FILE_SIZE // chunk_size) + 2
@@ -102,10 +130,14 @@ async def test_upload_too_large_fails(mock_db, test_issue_id, test_user):
 
     from fastapi import HTTPException
 
-    with pytest.raises(HTTPException) as exc_info:
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)), pytest.raises(HTTPException) as exc_info:
         await upload_attachment(mock_db, test_issue_id, file, test_user)
 
     assert exc_info.value.status_code == 413
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
+    # Reading stops at the first chunk over the limit
+    assert file.read.await_count == num_chunks - 1
+    mock_db.add.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,82 @@
+"""Tests for the streaming CSV and JSON import readers."""
+
+import io
+import json
+
+import pytest
+
+from app.imports import parsers
+from app.imports.parsers import ImportFormatError, build_mapping, read_csv, read_json
+
+JIRA_CSV = (
+    "Summary,Issue key,Issue id,Issue Type,Status,Labels,Labels,Parent id,Custom field (Story Points)\n"
+    'Fix login,FB-1,10001,Bug,In Progress,auth,ui,,3\n'
+    '"Multi-line, quoted\nsummary",FB-2,10002,Sub-task,To Do,,,10001,\n'
+)
+
+
+def test_csv_reads_repeated_label_columns_and_jira_headers():
+    records = list(read_csv(io.StringIO(JIRA_CSV), build_mapping()))
+
+    assert records == [
+        {"title": "Fix login", "source_key": "FB-1", "source_id": "10001", "type": "Bug", "status": "In Progress",
+         "labels": ["auth", "ui"], "story_points": "3"},
+        {"title": "Multi-line, quoted\nsummary", "source_key": "FB-2", "source_id": "10002", "type": "Sub-task",
+         "status": "To Do", "parent": "10001"},
+    ]
+
+
+def test_csv_without_title_column_is_rejected():
+    with pytest.raises(ImportFormatError):
+        list(read_csv(io.StringIO("Key,Status\nFB-1,Done\n"), build_mapping()))
+
+
+def test_mapping_overrides_and_ignores_columns():
+    mapping = build_mapping({"Headline": "title", "Status": None})
+
+    records = list(read_csv(io.StringIO("Headline,Status\nImported,Done\n"), mapping))
+
+    assert records == [{"title": "Imported"}]
+    with pytest.raises(ValueError):
+        build_mapping({"Headline": "summary_text"})
+
+
+def test_json_array_is_decoded_across_read_boundaries(monkeypatch):
+    monkeypatch.setattr(parsers, "READ_SIZE", 7)
+    issues = [
+        {
+            "id": "10001",
+            "key": "J-1",
+            "fields": {
+                "summary": "Epic",
+                "issuetype": {"name": "Epic"},
+                "assignee": {"displayName": "Ada", "emailAddress": "ada@example.com"},
+                "labels": ["a", "b"],
+            },
+        },
+        {
+            "key": "J-2",
+            "fields": {
+                "summary": "Story",
+                "parent": {"id": "10001", "key": "J-1"},
+                "description": {"type": "doc", "content": [
+                    {"type": "paragraph", "content": [{"type": "text", "text": "First"}]},
+                    {"type": "paragraph", "content": [{"type": "text", "text": "Second"}]},
+                ]},
+            },
+        },
+    ]
+
+    records = list(read_json(io.StringIO(json.dumps(issues, indent=2)), build_mapping()))
+
+    assert records[0] == {"source_id": "10001", "source_key": "J-1", "title": "Epic", "type": "Epic",
+                          "assignee": "ada@example.com", "labels": ["a", "b"]}
+    assert records[1]["parent"] == "J-1" and records[1]["description"] == "First\nSecond"
+
+
+def test_json_lines_and_malformed_json():
+    lines = '{"summary": "One"}\n{"summary": "Two"}\n'
+
+    assert [r["title"] for r in read_json(io.StringIO(lines), build_mapping())] == ["One", "Two"]
+    with pytest.raises(ImportFormatError):
+        list(read_json(io.StringIO('[{"summary": "One"}, {"summary": '), build_mapping()))
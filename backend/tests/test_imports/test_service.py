@@ -0,0 +1,273 @@
+"""Tests for issue import jobs: row mapping, batch writes and endpoints."""
+
+import uuid
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert, Update
+
+from app.config import settings
+from app.imports import service
+from app.imports.models import ImportIssueRef, ImportJob
+from app.issues.keys import IssueKeyAllocator
+from app.issues.models import Issue, IssueLabel, IssuePriority, IssueType
+from app.issues.ranking import MAX_RANK_LENGTH
+from app.main import app
+from tests.conftest import _make_test_user
+from tests.test_issues.test_crud import _make_auth_client
+from tests.test_issues.test_keys import FakeCounter
+
+TODO, DONE, ADA, REPORTER, LABEL = (uuid.uuid4() for _ in range(5))
+
+
+def _lookups() -> service.Lookups:
+    return service.Lookups(
+        statuses={"to do": TODO, "done": DONE},
+        default_status_id=TODO,
+        users={"ada lovelace": ADA, "ada@example.com": ADA},
+        labels={"backend": LABEL},
+    )
+
+
+def _job(**kwargs) -> ImportJob:
+    defaults = dict(
+        id=uuid.uuid4(), project_id=uuid.uuid4(), user_id=REPORTER, filename="jira.csv", format="csv", mapping={},
+        status="running", total_bytes=0, processed_bytes=0, rows_imported=0, rows_failed=0, parents_linked=0,
+        errors=[],
+    )
+    return ImportJob(**{**defaults, **kwargs})
+
+
+@pytest.fixture(autouse=True)
+def counter():
+    """Project counter the import reserves keys from."""
+    counter = FakeCounter(last_value=100)
+    with patch.object(service, "issue_keys", IssueKeyAllocator(session_factory=counter.session)):
+        yield counter
+
+
+def _db() -> AsyncMock:
+    """Mock session answering the rank and label statements; records multi-row inserts."""
+    db = AsyncMock()
+    db.inserts = {}
+
+    async def execute(stmt, params=None):
+        if isinstance(stmt, Insert) and params is None:
+            # Labels created by the import
+            names = [v for k, v in stmt.compile().params.items() if k.startswith("name")]
+            return MagicMock(all=MagicMock(return_value=[(name, uuid.uuid4()) for name in names]))
+        db.inserts.setdefault(stmt.table.name, []).extend(params)
+        return MagicMock()
+
+    db.execute = AsyncMock(side_effect=execute)
+    db.scalar = AsyncMock(return_value="i")  # last rank in the column
+    return db
+
+
+def test_rows_map_jira_values_through_the_lookups():
+    issue = service.prepare_issue(
+        {
+            "title": "Crash on save",
+            "type": "Sub-task",
+            "status": "DONE",
+            "priority": "Blocker",
+            "assignee": "Ada Lovelace",
+            "reporter": "someone@elsewhere.com",
+            "story_points": "2.5",
+            "due_date": "12/Mar/24 10:00 AM",
+            "labels": ["backend", "crash", "backend"],
+            "parent": "FB-7",
+        },
+        _lookups(),
+        REPORTER,
+    )
+
+    assert issue.values == {
+        "type": IssueType.subtask, "title": "Crash on save", "description": None, "status_id": DONE,
+        "priority": IssuePriority.critical, "assignee_id": ADA, "reporter_id": REPORTER, "story_points": 2,
+        "due_date": date(2024, 3, 12),
+    }
+    assert issue.labels == ["backend", "crash"] and issue.parent_ref == "FB-7"
+
+
+def test_unknown_values_fall_back_and_rows_without_title_are_skipped():
+    lookups = _lookups()
+    issue = service.prepare_issue(
+        {"title": "x", "type": "Improvement", "status": "Triage", "story_points": "lots", "due_date": "soon"},
+        lookups,
+        REPORTER,
+    )
+    batch, errors, row = service.read_batch(
+        iter([{"title": "a"}, {"type": "Bug"}, {"title": "b"}, {"title": "c"}]), lookups, REPORTER, 10, 3
+    )
+
+    assert issue.values["type"] == IssueType.task and issue.values["status_id"] == TODO
+    assert issue.values["story_points"] is None and issue.values["due_date"] is None
+    assert [p.values["title"] for p in batch] == ["a", "b"]
+    assert errors == [{"row": 12, "error": "Missing title"}] and row == 13
+
+
+@pytest.mark.asyncio
+async def test_batch_is_written_with_one_key_update_and_multi_row_inserts(counter):
+    db, job, lookups = _db(), _job(), _lookups()
+    batch = [
+        service.prepare_issue({"title": "Epic", "source_key": "J-1", "labels": ["backend", "new"]}, lookups, REPORTER),
+        service.prepare_issue({"title": "Story", "parent": "J-1"}, lookups, REPORTER),
+        service.prepare_issue({"title": "Loose"}, lookups, REPORTER),
+    ]
+
+    await service.write_batch(db, job, lookups, batch)
+
+    issues = db.inserts[Issue.__tablename__]
+    assert [i["key"] for i in issues] == ["FB-101", "FB-102", "FB-103"]
+    assert "i" < issues[0]["rank"] < issues[1]["rank"] < issues[2]["rank"]
+    assert counter.updates == [3]
+    assert [r["label_id"] for r in db.inserts[IssueLabel.__tablename__]] == [LABEL, lookups.labels["new"]]
+    refs = db.inserts[ImportIssueRef.__tablename__]
+    assert [(r["issue_id"], r["source_key"], r["parent_ref"]) for r in refs] == [
+        (issues[0]["id"], "J-1", None), (issues[1]["id"], None, "J-1")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_file_is_imported_in_bounded_batches(tmp_path):
+    job = _job()
+    rows = "".join(f"Issue {n},FB-{n}\n" if n != 3 else ",FB-3\n" for n in range(1, 6))
+    db = _db()
+
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)), patch.object(settings, "IMPORT_BATCH_SIZE", 2), \
+         patch.object(service, "load_lookups", AsyncMock(return_value=_lookups())), \
+         patch.object(service, "link_parents", AsyncMock(return_value=0)) as link:
+        path = service.import_path(job.id)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(("\ufeffSummary,Issue key\n" + rows).encode())
+        job.total_bytes = path.stat().st_size
+        await service._process(db, job)
+
+    assert db.commit.await_count == 4  # three batches, then the parent links
+    assert [i["title"] for i in db.inserts[Issue.__tablename__]] == ["Issue 1", "Issue 2", "Issue 4", "Issue 5"]
+    assert (job.rows_imported, job.rows_failed, job.errors) == (4, 1, [{"row": 3, "error": "Missing title"}])
+    assert job.status == "completed" and job.processed_bytes == job.total_bytes
+    link.assert_awaited_once()
+
+
+def _import_file(tmp_path, job: ImportJob, rows: str) -> None:
+    path = service.import_path(job.id)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(("Summary,Issue key\n" + rows).encode())
+    job.total_bytes = path.stat().st_size
+
+
+@pytest.mark.asyncio
+async def test_import_past_the_rank_head_space_into_one_status(tmp_path):
+    """More rows than appends fit in the leading rank digits land in one column with short, ordered ranks."""
+    job, db = _job(), _db()
+    ranks: dict[uuid.UUID, str] = {}
+    write = db.execute.side_effect
+
+    async def execute(stmt, params=None):
+        if isinstance(stmt, Update):  # the column being respaced
+            ranks.update((r["id"], r["rank"]) for r in params)
+            return MagicMock()
+        if params and stmt.table.name == Issue.__tablename__:
+            ranks.update((r["id"], r["rank"]) for r in params)
+        return await write(stmt, params)
+
+    db.execute = AsyncMock(side_effect=execute)
+    db.scalar = AsyncMock(side_effect=lambda stmt: max(ranks.values(), default=None))
+    db.scalars = AsyncMock(side_effect=lambda stmt: sorted(ranks, key=ranks.get))
+
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)), \
+         patch.object(service, "load_lookups", AsyncMock(return_value=_lookups())), \
+         patch.object(service, "link_parents", AsyncMock(return_value=0)):
+        _import_file(tmp_path, job, "".join(f"Issue {n},FB-{n}\n" for n in range(30000)))
+        await service._process(db, job)
+
+    assert job.status == "completed" and job.rows_imported == 30000
+    assert max(map(len, ranks.values())) <= MAX_RANK_LENGTH
+    assert sorted(ranks, key=ranks.get) == [i["id"] for i in db.inserts[Issue.__tablename__]]
+
+
+@pytest.mark.asyncio
+async def test_reclaimed_job_resumes_after_its_committed_rows(tmp_path):
+    job, db = _job(rows_imported=3, rows_failed=1, errors=[{"row": 3, "error": "Missing title"}]), _db()
+
+    with patch.object(settings, "UPLOAD_DIR", str(tmp_path)), \
+         patch.object(service, "load_lookups", AsyncMock(return_value=_lookups())), \
+         patch.object(service, "link_parents", AsyncMock(return_value=0)):
+        _import_file(tmp_path, job, "".join(f"Issue {n},FB-{n}\n" if n != 6 else ",FB-6\n" for n in range(1, 8)))
+        await service._process(db, job)
+
+    assert [i["title"] for i in db.inserts[Issue.__tablename__]] == ["Issue 5", "Issue 7"]
+    assert (job.rows_imported, job.rows_failed) == (5, 2)
+    assert [e["row"] for e in job.errors] == [3, 6] and job.heartbeat_at is not None
+
+
+@pytest.mark.asyncio
+async def test_claim_takes_pending_jobs_and_running_jobs_with_a_stale_heartbeat():
+    db = AsyncMock()
+
+    await service.claim_job(db)
+
+    sql = str(db.scalar.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert " OR import_jobs.status = " in sql and "AND import_jobs.heartbeat_at < " in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "heartbeat_at=now()" in sql and "started_at=coalesce(import_jobs.started_at, now())" in sql
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_start_import_queues_job_for_project_managers():
+    project_id, job = uuid.uuid4(), _job()
+    transport = _make_auth_client(_make_test_user(), AsyncMock())
+
+    with patch("app.imports.router.project_service.get_project", new_callable=AsyncMock), \
+         patch("app.imports.router.project_service.get_user_role_in_project", AsyncMock(return_value="admin")), \
+         patch("app.imports.router.service.create_import_job", AsyncMock(return_value=job)) as create, \
+         patch("app.imports.router.service.import_worker") as worker:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                f"/api/v1/projects/{project_id}/imports",
+                files={"file": ("jira.csv", b"Summary\nOne\n", "text/csv")},
+                data={"mapping": '{"Headline": "title"}'},
+            )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 202
+    assert response.headers["location"] == f"/api/v1/projects/{project_id}/imports/{job.id}"
+    assert response.json()["status"] == "running"
+    assert create.call_args.args[4] == {"Headline": "title"}
+    worker.wake.assert_called_once()
+
+
+@pytest.mark.parametrize("role, mapping, status", [("developer", None, 403), ("admin", "[1]", 422)])
+@pytest.mark.asyncio
+async def test_start_import_rejects_developers_and_bad_mappings(role, mapping, status):
+    transport = _make_auth_client(_make_test_user(), AsyncMock())
+
+    with patch("app.imports.router.project_service.get_project", new_callable=AsyncMock), \
+         patch("app.imports.router.project_service.get_user_role_in_project", AsyncMock(return_value=role)):
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                f"/api/v1/projects/{uuid.uuid4()}/imports",
+                files={"file": ("jira.csv", b"Summary\nOne\n", "text/csv")},
+                data={"mapping": mapping} if mapping else {},
+            )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == status
+
+
+@pytest.mark.asyncio
+async def test_import_status_of_another_project_is_not_found():
+    db = AsyncMock()
+    db.get = AsyncMock(return_value=_job())
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_import_job(db, uuid.uuid4(), uuid.uuid4())
+
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,161 @@
+"""Tests for bulk issue creation."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.sql.dml import Insert
+
+from app.issues import service
+from app.issues.keys import IssueKeyAllocator
+from app.issues.models import Issue, IssueLabel, IssuePriority, IssueType
+from app.issues.schemas import IssueBulkItem
+from app.main import app
+from tests.conftest import _make_test_user
+from tests.test_issues.test_crud import _make_auth_client
+from tests.test_issues.test_keys import FakeCounter
+
+DEFAULT_STATUS = uuid.uuid4()
+
+
+@pytest.fixture(autouse=True)
+def counter():
+    """Project counter the bulk path reserves keys from."""
+    counter = FakeCounter(last_value=9)
+    with patch.object(service, "issue_keys", IssueKeyAllocator(session_factory=counter.session)):
+        yield counter
+
+
+def _db(parents: dict | None = None, labels: list | None = None) -> AsyncMock:
+    """Mock session answering the bulk path's queries; records inserts."""
+    db = AsyncMock()
+    db.add = MagicMock()
+    db.inserts = {}
+
+    async def execute(stmt, params=None):
+        if isinstance(stmt, Insert):
+            db.inserts[stmt.table.name] = params
+            return MagicMock()
+        if "workflow_statuses" in str(stmt):
+            return MagicMock(scalar_one_or_none=MagicMock(return_value=MagicMock(id=DEFAULT_STATUS)))
+        return MagicMock(all=MagicMock(return_value=list((parents or {}).items())))
+
+    db.execute = AsyncMock(side_effect=execute)
+    db.scalars = AsyncMock(return_value=labels or [])
+    db.scalar = AsyncMock(return_value=None)  # empty column
+    return db
+
+
+def _item(type_: IssueType = IssueType.story, **kwargs) -> IssueBulkItem:
+    return IssueBulkItem(type=type_, title=f"{type_.value} {uuid.uuid4().hex[:6]}", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reserves_one_key_block_and_inserts_in_bulk(counter):
+    label, foreign_label = uuid.uuid4(), uuid.uuid4()
+    db = _db(labels=[label])
+    items = [
+        _item(IssueType.epic),
+        _item(IssueType.story, parent_index=0, label_ids=[label, foreign_label, label]),
+        _item(IssueType.subtask, parent_index=1),
+    ]
+
+    rows = await service.create_issues_bulk(db, uuid.uuid4(), items, _make_test_user())
+
+    assert [r["key"] for r in rows] == ["FB-10", "FB-11", "FB-12"]
+    assert rows[1]["parent_id"] == rows[0]["id"] and rows[2]["parent_id"] == rows[1]["id"]
+    assert {r["status_id"] for r in rows} == {DEFAULT_STATUS}
+    assert counter.updates == [3]
+    assert db.inserts[Issue.__tablename__] == rows
+    assert db.inserts[IssueLabel.__tablename__] == [{"issue_id": rows[1]["id"], "label_id": label}]
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_checks_existing_parents_in_one_query():
+    epic, task = uuid.uuid4(), uuid.uuid4()
+    db = _db(parents={epic: IssueType.epic, task: IssueType.task})
+
+    rows = await service.create_issues_bulk(
+        db, uuid.uuid4(), [_item(IssueType.story, parent_id=epic), _item(IssueType.subtask, parent_id=task)],
+        _make_test_user(),
+    )
+
+    assert [r["parent_id"] for r in rows] == [epic, task]
+    selects = [c for c in db.execute.call_args_list if "issues.type" in str(c.args[0])]
+    assert len(selects) == 1
+
+
+@pytest.mark.parametrize(
+    "items, status, detail",
+    [
+        ([_item(), _item(IssueType.subtask, parent_index=1)], 422, "issues[1]: parent_index must refer"),
+        ([_item(IssueType.epic), _item(IssueType.subtask, parent_index=0)], 422, "issues[1]: subtask parent must"),
+        ([_item(IssueType.story, parent_id=uuid.uuid4())], 404, "issues[0]: Parent issue not found"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_invalid_hierarchy_before_writing(items, status, detail):
+    db = _db()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.create_issues_bulk(db, uuid.uuid4(), items, _make_test_user())
+
+    assert exc_info.value.status_code == status and exc_info.value.detail.startswith(detail)
+    assert not db.inserts
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_notifies_assignees_other_than_reporter():
+    reporter, assignee = _make_test_user(), uuid.uuid4()
+    db = _db()
+
+    with patch.object(service, "enqueue_notifications") as enqueue:
+        await service.create_issues_bulk(
+            db, uuid.uuid4(), [_item(assignee_id=assignee), _item(assignee_id=reporter.id)], reporter
+        )
+
+    assert enqueue.call_count == 1 and enqueue.call_args.args[1] == [assignee]
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoint_returns_keys_in_request_order():
+    project_id, user = uuid.uuid4(), _make_test_user()
+    rows = [
+        {"id": uuid.uuid4(), "key": f"FB-{n}", "title": f"Imported {n}", "type": IssueType.task,
+         "priority": IssuePriority.low}
+        for n in (1, 2)
+    ]
+    transport = _make_auth_client(user, AsyncMock())
+
+    with patch("app.issues.router.project_service.get_project", new_callable=AsyncMock), \
+         patch("app.issues.router.project_service.get_user_role_in_project", AsyncMock(return_value="developer")), \
+         patch("app.issues.router.service.create_issues_bulk", AsyncMock(return_value=rows)) as create:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                f"/api/v1/projects/{project_id}/issues/bulk",
+                json={"issues": [{"type": "task", "title": "Imported 1"}, {"type": "task", "title": "Imported 2"}]},
+            )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 201
+    assert response.json()["created"] == 2 and [i["key"] for i in response.json()["issues"]] == ["FB-1", "FB-2"]
+    assert len(create.call_args.args[2]) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoint_forbids_viewers():
+    transport = _make_auth_client(_make_test_user(), AsyncMock())
+
+    with patch("app.issues.router.project_service.get_project", new_callable=AsyncMock), \
+         patch("app.issues.router.project_service.get_user_role_in_project", AsyncMock(return_value="viewer")):
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                f"/api/v1/projects/{uuid.uuid4()}/issues/bulk", json={"issues": [{"type": "task", "title": "x"}]}
+            )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 403
@@ -0,0 +1,138 @@
+"""Tests for bulk issue updates (multi-select actions)."""
+
+import uuid
+from collections import namedtuple
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.sql.dml import Delete, Insert, Update
+
+from app.issues import service
+from app.issues.models import IssueHistory, IssuePriority
+from app.issues.schemas import IssueBulkPatch
+from app.main import app
+from tests.conftest import _make_test_user
+from tests.test_issues.test_crud import _make_auth_client
+
+Row = namedtuple("Row", "id key title status_id priority assignee_id sprint_id")
+PROJECT, TODO, DONE, BACKEND, UI = (uuid.uuid4() for _ in range(5))
+
+
+def _rows(count: int, **fields) -> list[Row]:
+    defaults = dict(status_id=TODO, priority=IssuePriority.medium, assignee_id=None, sprint_id=None)
+    return [Row(uuid.uuid4(), f"FB-{n}", f"Issue {n}", **{**defaults, **fields}) for n in range(1, count + 1)]
+
+
+def _db(rows: list[Row], added=(), removed=()) -> AsyncMock:
+    """Mock session answering the bulk update's statements; records what was written."""
+    db = AsyncMock()
+    db.get = AsyncMock(return_value=MagicMock(project_id=PROJECT))
+    db.scalar = AsyncMock(return_value=None)  # empty target column
+    db.updates, db.history = [], []
+
+    async def execute(stmt, params=None):
+        if isinstance(stmt, Update):
+            db.updates.append((stmt, params))
+            return MagicMock()
+        if isinstance(stmt, Insert) and stmt.table.name == IssueHistory.__tablename__:
+            db.history.extend(params)
+            return MagicMock()
+        if isinstance(stmt, Insert):
+            return MagicMock(all=MagicMock(return_value=list(added)))
+        if isinstance(stmt, Delete):
+            return MagicMock(all=MagicMock(return_value=list(removed)))
+        if "FROM labels" in str(stmt):
+            return MagicMock(all=MagicMock(return_value=[(BACKEND, "backend"), (UI, "ui")]))
+        return MagicMock(all=MagicMock(return_value=rows))
+
+    db.execute = AsyncMock(side_effect=execute)
+    return db
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_writes_changed_issues_with_one_statement():
+    user, assignee = _make_test_user(), uuid.uuid4()
+    rows = _rows(3)
+    rows[2] = rows[2]._replace(status_id=DONE, assignee_id=assignee)
+    missing = uuid.uuid4()
+    db = _db(rows)
+
+    with patch.object(service, "enqueue_notifications") as enqueue:
+        updated, not_found = await service.update_issues_bulk(
+            db, PROJECT, [r.id for r in rows] + [missing],
+            IssueBulkPatch(status_id=DONE, assignee_id=assignee), user,
+        )
+
+    assert updated == [rows[0].id, rows[1].id] and not_found == [missing]
+    (stmt, _), (ranks, rank_params) = db.updates
+    assert "= ANY" in str(stmt) and stmt.compile().params["param_1"] == [rows[0].id, rows[1].id]
+    assert [p["id"] for p in rank_params] == [rows[0].id, rows[1].id]
+    assert rank_params[0]["rank"] < rank_params[1]["rank"]
+    assert [(h["issue_id"], h["field"], h["old_value"], h["new_value"]) for h in db.history] == [
+        (rows[0].id, "status_id", str(TODO), str(DONE)), (rows[0].id, "assignee_id", None, str(assignee)),
+        (rows[1].id, "status_id", str(TODO), str(DONE)), (rows[1].id, "assignee_id", None, str(assignee)),
+    ]
+    assert [c.args[2].issue_id for c in enqueue.call_args_list] == [rows[0].id, rows[1].id]
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_label_changes_are_diffed_in_the_database():
+    rows = _rows(2)
+    db = _db(rows, added=[(rows[0].id, BACKEND)], removed=[(rows[1].id, UI)])
+
+    updated, _ = await service.update_issues_bulk(
+        db, PROJECT, [r.id for r in rows], IssueBulkPatch(add_label_ids=[BACKEND], remove_label_ids=[UI]),
+        _make_test_user(),
+    )
+
+    assert updated == [rows[0].id, rows[1].id]
+    assert [(h["issue_id"], h["field"], h["old_value"], h["new_value"]) for h in db.history] == [
+        (rows[0].id, "labels", None, "backend"), (rows[1].id, "labels", "ui", None),
+    ]
+    # Only updated_at and the version are touched on the issues themselves
+    [(stmt, _)] = db.updates
+    assert set(stmt.compile().params) == {"updated_at", "version_1", "param_1"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_labels_of_other_projects():
+    db = _db(_rows(1))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.update_issues_bulk(
+            db, PROJECT, [uuid.uuid4()], IssueBulkPatch(add_label_ids=[uuid.uuid4()]), _make_test_user()
+        )
+
+    assert exc_info.value.status_code == 404
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "role, body, status",
+    [
+        ("developer", {"patch": {"priority": "high", "sprint_id": None}}, 200),
+        ("developer", {"patch": {"status_id": None}}, 422),
+        ("viewer", {"patch": {"priority": "high"}}, 403),
+    ],
+)
+@pytest.mark.asyncio
+async def test_bulk_update_endpoint(role, body, status):
+    issue_id = uuid.uuid4()
+    transport = _make_auth_client(_make_test_user(), AsyncMock())
+
+    with patch("app.issues.router.project_service.get_project", new_callable=AsyncMock), \
+         patch("app.issues.router.project_service.get_user_role_in_project", AsyncMock(return_value=role)), \
+         patch("app.issues.router.service.update_issues_bulk", AsyncMock(return_value=([issue_id], []))) as update:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.patch(
+                f"/api/v1/projects/{PROJECT}/issues/bulk", json={"ids": [str(issue_id)], **body}
+            )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == status
+    if status == 200:
+        assert response.json() == {"updated": [str(issue_id)], "missing": []}
+        assert update.call_args.args[3].model_dump(exclude_unset=True) == {"priority": "high", "sprint_id": None}
@@ -0,0 +1,115 @@
+"""Tests for the streaming issue export."""
+
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.imports.parsers import build_mapping, read_csv
+from app.issues import service
+from app.issues.models import IssuePriority, IssueType
+from app.main import app
+from tests.conftest import _make_test_user
+from tests.test_issues.test_crud import _make_auth_client
+
+CREATED = datetime(2026, 1, 5, 9, 30, tzinfo=timezone.utc)
+ROWS = [
+    ("FB-1", IssueType.epic, "Checkout", "To Do", IssuePriority.high, None, "pm@example.com", None, None, None,
+     None, None, CREATED, CREATED, None),
+    ("FB-2", IssueType.story, 'Pay with "cards", fast', "Done", IssuePriority.medium, "dev@example.com",
+     "pm@example.com", "Sprint 1", "FB-1", ["backend", "payments"], 5, date(2026, 2, 1), CREATED, CREATED,
+     "Line one\nLine two"),
+]
+
+
+class _Session:
+    """Stands in for ``async_session()``: streams the given partitions and records the statement."""
+
+    def __init__(self, partitions):
+        self.partitions = partitions
+        self.statement = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, statement):
+        self.statement = statement
+
+        async def partitions():
+            for partition in self.partitions:
+                yield partition
+
+        return MagicMock(partitions=partitions)
+
+
+async def _export(export_format: str, partitions, **filters) -> tuple[bytes, _Session]:
+    session = _Session(partitions)
+    with patch.object(service, "async_session", lambda: session):
+        body = b"".join([chunk async for chunk in service.export_issues(uuid.uuid4(), export_format, **filters)])
+    return body, session
+
+
+@pytest.mark.asyncio
+async def test_csv_export_streams_projected_rows_from_a_cursor():
+    body, session = await _export("csv", [ROWS[:1], ROWS[1:]], label_id=uuid.uuid4())
+
+    rows = list(csv.reader(io.StringIO(body.decode())))
+    assert rows[0][:3] == ["Issue key", "Issue Type", "Summary"]
+    assert rows[1][:5] == ["FB-1", "epic", "Checkout", "To Do", "high"] and rows[1][9] == ""
+    assert rows[2][2] == 'Pay with "cards", fast' and rows[2][8:12] == ["FB-1", "backend payments", "5", "2026-02-01"]
+    assert rows[2][14] == "Line one\nLine two"
+    assert session.statement.get_execution_options()["yield_per"] == service.EXPORT_BATCH_SIZE
+    # Plain columns, no Issue entities to hydrate
+    assert all(d["entity"] is None or d["expr"] is not d["entity"] for d in session.statement.column_descriptions)
+    assert "EXISTS" in str(session.statement)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_writes_one_object_per_line():
+    body, _ = await _export("ndjson", [ROWS])
+
+    lines = [json.loads(line) for line in body.decode().splitlines()]
+    assert [line["key"] for line in lines] == ["FB-1", "FB-2"]
+    assert lines[0]["labels"] == [] and lines[0]["assignee"] is None
+    assert lines[1]["labels"] == ["backend", "payments"] and lines[1]["created_at"] == CREATED.isoformat()
+
+
+@pytest.mark.asyncio
+async def test_csv_export_can_be_imported_again():
+    body, _ = await _export("csv", [ROWS])
+
+    records = list(read_csv(io.StringIO(body.decode()), build_mapping()))
+
+    assert records[1]["source_key"] == "FB-2" and records[1]["parent"] == "FB-1"
+    assert records[1]["labels"] == ["backend", "payments"] and records[1]["assignee"] == "dev@example.com"
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_is_not_taken_for_an_issue_id():
+    project = MagicMock()
+    project.key = "FB"
+    transport = _make_auth_client(_make_test_user(), AsyncMock())
+
+    async def chunks(*args):
+        yield b"Issue key\n"
+
+    with patch("app.issues.router.project_service.get_project", AsyncMock(return_value=project)), \
+         patch("app.issues.router.service.export_issues", MagicMock(side_effect=chunks)) as export:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(f"/api/v1/projects/{uuid.uuid4()}/issues/export?format=ndjson&priority=high")
+            invalid = await client.get(f"/api/v1/projects/{uuid.uuid4()}/issues/export?format=xlsx")
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="FB-issues.ndjson"'
+    assert export.call_args.args[1:5] == ("ndjson", None, None, "high")
+    assert invalid.status_code == 422
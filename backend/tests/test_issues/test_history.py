@@ -0,0 +1,101 @@
+"""Tests for field-level issue history recording and reads."""
+
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.common.pagination import decode_cursor
+from app.issues import service
+from app.issues.history import ChangeTracker
+from app.issues.models import Issue, IssuePriority, IssueType
+from app.issues.schemas import IssueUpdate
+from app.main import app
+from app.projects.models import Label
+from tests.conftest import _make_test_user
+from tests.test_issues.test_crud import _make_auth_client
+
+USER = _make_test_user()
+
+
+def _issue(**kwargs) -> Issue:
+    defaults = dict(
+        id=uuid.uuid4(), project_id=uuid.uuid4(), type=IssueType.task, key="FB-1", title="Old title",
+        status_id=uuid.uuid4(), priority=IssuePriority.medium, rank="i",
+    )
+    return Issue(**{**defaults, **kwargs})
+
+
+@pytest.mark.asyncio
+async def test_tracker_diffs_watched_issues_into_one_insert():
+    issue, other = _issue(), uuid.uuid4()
+    db = AsyncMock()
+    tracker = ChangeTracker(USER.id)
+
+    tracker.watch(issue)
+    issue.title = "New title"
+    issue.priority = IssuePriority.high
+    issue.story_points = None  # unchanged
+    tracker.record(other, "sprint_id", None, None)  # unchanged
+    tracker.record(other, "labels", "ui", None)
+    await tracker.flush(db)
+
+    db.execute.assert_awaited_once()
+    rows = db.execute.call_args.args[1]
+    assert [(r["issue_id"], r["field"], r["old_value"], r["new_value"]) for r in rows] == [
+        (other, "labels", "ui", None),
+        (issue.id, "title", "Old title", "New title"),
+        (issue.id, "priority", "medium", "high"),
+    ]
+    assert {r["user_id"] for r in rows} == {USER.id} and tracker.rows == []
+
+
+@pytest.mark.asyncio
+async def test_update_issue_records_fields_and_label_diff_in_the_same_transaction():
+    ui, backend = Label(id=uuid.uuid4(), name="ui"), uuid.uuid4()
+    issue = _issue(labels=[ui])
+    db = AsyncMock()
+    db.add = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[(backend, "backend")])))
+
+    with patch.object(service, "board_events"):
+        await service.update_issue(db, issue, IssueUpdate(title="New title", label_ids=[backend]), USER)
+
+    statements = [str(c.args[0]) for c in db.execute.call_args_list]
+    assert statements[0].startswith("DELETE FROM issue_labels")
+    assert statements[-1].startswith("INSERT INTO issue_history")
+    rows = db.execute.call_args.args[1]
+    assert [(r["field"], r["old_value"], r["new_value"]) for r in rows] == [
+        ("labels", "ui", None), ("labels", None, "backend"), ("title", "Old title", "New title"),
+    ]
+    assert db.add.call_args.args[0].label_id == backend
+    db.commit.assert_awaited_once()
+
+
+def test_history_is_not_loaded_with_the_issue():
+    assert Issue.history.property.lazy == "raise"
+
+
+@pytest.mark.asyncio
+async def test_history_endpoint_pages_with_a_cursor():
+    project_id, issue_id = uuid.uuid4(), uuid.uuid4()
+    entries = [
+        MagicMock(id=uuid.uuid4(), field="title", old_value=str(n), new_value=str(n + 1), user=USER,
+                  created_at=datetime(2026, 5, 1, 12, n, tzinfo=timezone.utc))
+        for n in range(3)
+    ]
+    transport = _make_auth_client(USER, AsyncMock())
+
+    with patch("app.issues.router.project_service.get_project", new_callable=AsyncMock), \
+         patch("app.issues.router.history.get_issue_history", AsyncMock(return_value=entries)) as get_history:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(f"/api/v1/projects/{project_id}/issues/{issue_id}/history?limit=2")
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert get_history.call_args.kwargs["limit"] == 3
+    data = response.json()
+    assert [item["new_value"] for item in data["items"]] == ["1", "2"]
+    assert decode_cursor(data["next_cursor"]) == (entries[1].created_at, entries[1].id)
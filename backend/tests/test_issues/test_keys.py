@@ -0,0 +1,106 @@
+"""Tests for issue key allocation from per-project counters."""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.issues.keys import IssueKeyAllocator
+
+
+class FakeCounter:
+    """A project's counter row behind mocked sessions; ``updates`` records each reservation's size."""
+
+    def __init__(self, last_value: int = 0, key: str | None = "FB"):
+        self.last_value = last_value
+        self.key = key
+        self.updates: list[int] = []
+        self.statements: list[str] = []
+        self.commits = 0
+
+    async def _execute(self, stmt):
+        self.statements.append(str(stmt))
+        count = stmt.compile().params["last_value_1"]
+        self.updates.append(count)
+        if self.key is None:  # no such project
+            return MagicMock(one_or_none=MagicMock(return_value=None))
+        self.last_value += count
+        return MagicMock(one_or_none=MagicMock(return_value=MagicMock(last_value=self.last_value, key=self.key)))
+
+    async def _commit(self):
+        self.commits += 1
+
+    def session(self) -> MagicMock:
+        db = AsyncMock()
+        db.execute = AsyncMock(side_effect=self._execute)
+        db.commit = AsyncMock(side_effect=self._commit)
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=db)
+        session.__aexit__ = AsyncMock(return_value=False)
+        return session
+
+
+@pytest.mark.asyncio
+async def test_keys_are_reserved_in_their_own_committed_transaction():
+    counter = FakeCounter(last_value=41)
+    keys = IssueKeyAllocator(session_factory=counter.session)
+
+    assert await keys.reserve(AsyncMock(), uuid.uuid4(), 1) == ["FB-42"]
+    assert await keys.reserve(AsyncMock(), uuid.uuid4(), 3) == ["FB-43", "FB-44", "FB-45"]
+    assert counter.updates == [1, 3] and counter.commits == 2
+
+
+@pytest.mark.asyncio
+async def test_counter_update_never_writes_the_projects_row():
+    counter = FakeCounter()
+
+    await IssueKeyAllocator(session_factory=counter.session).reserve(AsyncMock(), uuid.uuid4(), 1)
+
+    [stmt] = counter.statements
+    assert stmt.startswith("UPDATE project_issue_counters SET last_value=") and "FROM projects" in stmt
+
+
+@pytest.mark.asyncio
+async def test_blocks_are_handed_out_from_memory():
+    counter = FakeCounter()
+    keys = IssueKeyAllocator(block_size=10, session_factory=counter.session)
+    project, db = uuid.uuid4(), AsyncMock()
+    db.scalar = AsyncMock(return_value="FB")
+
+    first = [key for _ in range(3) for key in await keys.reserve(db, project, 1)]
+    bulk = await keys.reserve(db, project, 9)  # the block's 7 left, then a new block
+    concurrent = await asyncio.gather(*(keys.reserve(db, project, 1) for _ in range(20)))
+
+    assert first == ["FB-1", "FB-2", "FB-3"]
+    assert bulk == [f"FB-{n}" for n in range(4, 13)]
+    assert sorted(int(k.split("-")[1]) for [k] in concurrent) == list(range(13, 33))
+    assert counter.updates == [10, 10, 10, 10]
+
+
+@pytest.mark.asyncio
+async def test_cached_blocks_follow_a_renamed_project_key():
+    counter = FakeCounter()
+    keys = IssueKeyAllocator(block_size=10, session_factory=counter.session)
+    project, db = uuid.uuid4(), AsyncMock()
+    db.scalar = AsyncMock(side_effect=["FB", "FLOW"])
+
+    assert await keys.reserve(db, project, 1) == ["FB-1"]
+    assert await keys.reserve(db, project, 1) == ["FLOW-2"]
+    assert counter.updates == [10]
+
+
+@pytest.mark.asyncio
+async def test_unknown_project_is_not_found():
+    keys = IssueKeyAllocator(session_factory=FakeCounter(key=None).session)
+    blocks = IssueKeyAllocator(block_size=10, session_factory=FakeCounter().session)
+    db = AsyncMock()
+    db.scalar = AsyncMock(return_value=None)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await keys.reserve(db, uuid.uuid4(), 1)
+    with pytest.raises(HTTPException) as block_exc_info:
+        await blocks.reserve(db, uuid.uuid4(), 1)
+
+    assert exc_info.value.status_code == block_exc_info.value.status_code == 404
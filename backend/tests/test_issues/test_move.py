@@ -0,0 +1,230 @@
+"""Tests for rank-based board ordering and the move endpoint."""
+
+import random
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from app.issues import ranking, service
+from app.issues.models import Issue
+from app.issues.ranking import rank_between, spread_ranks
+from app.issues.schemas import IssueMove
+from app.main import app
+from tests.conftest import _make_test_user
+from tests.test_issues.test_crud import _make_auth_client, _make_test_issue
+
+PROJECT, COLUMN = uuid.uuid4(), uuid.uuid4()
+USER = _make_test_user()
+
+
+def test_ranks_between_neighbours_keep_order_without_renumbering():
+    rng = random.Random(46)
+    ranks = [rank_between(None, None)]
+    for _ in range(2000):
+        n = rng.randrange(len(ranks) + 1)
+        after = ranks[n - 1] if n else None
+        before = ranks[n] if n < len(ranks) else None
+        rank = rank_between(after, before)
+        assert (after is None or after < rank) and (before is None or rank < before)
+        assert not rank.endswith("0")
+        ranks.insert(n, rank)
+
+    assert max(map(len, ranks)) < ranking.REBALANCE_LENGTH
+    with pytest.raises(ValueError):
+        rank_between("b", "b")
+
+
+def test_appending_steps_the_leading_digits():
+    ranks = [rank_between(None, None)]
+    for _ in range(1000):
+        ranks.append(rank_between(ranks[-1], None))
+
+    assert ranks == sorted(ranks) and max(map(len, ranks)) <= ranking.HEAD_WIDTH
+
+
+def test_spread_ranks_are_even_and_leave_room_at_both_ends():
+    ranks = spread_ranks(500)
+
+    assert ranks == sorted(ranks) and len(set(ranks)) == 500
+    assert rank_between(None, ranks[0]) < ranks[0] and len(rank_between(ranks[-1], None)) <= ranking.HEAD_WIDTH
+
+
+class FakeColumn:
+    """One board column behind a mocked session: the max() probe, and the respacing's select and update."""
+
+    def __init__(self):
+        self.ranks: dict[uuid.UUID, str] = {}
+        self.respaced = 0
+        self.db = AsyncMock()
+        self.db.scalar = AsyncMock(side_effect=self._max)
+        self.db.scalars = AsyncMock(side_effect=self._ordered)
+        self.db.execute = AsyncMock(side_effect=self._update)
+
+    async def _max(self, stmt):
+        return max(self.ranks.values(), default=None)
+
+    async def _ordered(self, stmt):
+        return sorted(self.ranks, key=self.ranks.get)
+
+    async def _update(self, stmt, params):
+        self.respaced += 1
+        self.ranks.update((row["id"], row["rank"]) for row in params)
+
+    async def append(self, count: int) -> list[str]:
+        ranks = await ranking.append_ranks(self.db, PROJECT, [COLUMN] * count)
+        self.ranks.update((uuid.uuid4(), rank) for rank in ranks)
+        return ranks
+
+
+@pytest.mark.asyncio
+async def test_appending_past_the_head_space_respaces_the_column():
+    """Far more appends than the leading digits hold (46656 / 2 from the middle) keep ranks short and ordered."""
+    column = FakeColumn()
+
+    for _ in range(120):
+        existing = list(column.ranks)
+        ranks = await column.append(500)
+        assert ranks == sorted(ranks) and ranks[0] > max((column.ranks[i] for i in existing), default="")
+
+    ordered = sorted(column.ranks.values())
+    assert len(set(ordered)) == 60000 and column.respaced >= 2
+    assert max(map(len, ordered)) <= ranking.HEAD_WIDTH < ranking.MAX_RANK_LENGTH
+
+
+@pytest.mark.asyncio
+async def test_batch_larger_than_the_head_space_is_spread_after_the_tail():
+    column = FakeColumn()
+    last = uuid.uuid4()
+    column.ranks[last] = "zzzzzz"
+
+    ranks = await column.append(30000)
+
+    assert column.respaced == 1 and ranks == sorted(ranks) and ranks[0] > column.ranks[last]
+    assert len(set(ranks)) == 30000 and max(map(len, ranks)) <= ranking.MAX_RANK_LENGTH
+
+
+def _issue(rank: str = "i") -> Issue:
+    return Issue(id=uuid.uuid4(), project_id=PROJECT, status_id=uuid.uuid4(), key="FB-1", title="Card", rank=rank)
+
+
+def _db(neighbours: dict) -> AsyncMock:
+    """Mock session with the target column's status and the neighbours' (id, rank) rows."""
+    db = AsyncMock()
+    db.get = AsyncMock(return_value=MagicMock(project_id=PROJECT))
+    db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=list(neighbours.items()))))
+    return db
+
+
+@pytest.mark.asyncio
+async def test_move_between_neighbours_updates_only_the_moved_issue():
+    issue, above, below = _issue(), uuid.uuid4(), uuid.uuid4()
+    db = _db({above: "a", below: "c"})
+
+    with patch.object(service, "board_events") as events, patch.object(service, "rank_rebalancer") as rebalancer:
+        await service.move_issue(db, issue, IssueMove(status_id=COLUMN, after_id=above, before_id=below), USER)
+
+    assert (issue.status_id, issue.rank) == (COLUMN, "b")
+    lock, history = db.execute.call_args_list
+    assert "FOR UPDATE" in str(lock.args[0])
+    assert [(h["field"], h["new_value"]) for h in history.args[1]] == [("status_id", str(COLUMN))]
+    db.commit.assert_awaited_once()
+    rebalancer.request.assert_not_called()
+    assert events.publish_issue.call_args.args[1:] == ("moved", {"status_id", "rank"})
+
+
+@pytest.mark.asyncio
+async def test_tied_neighbours_respace_the_column_first():
+    issue, above, below = _issue(), uuid.uuid4(), uuid.uuid4()
+    db = _db({above: "k", below: "k"})
+    respaced = {above: "90nayv", below: "91alxq"}
+
+    with patch.object(service, "rebalance_column", AsyncMock(return_value=respaced)) as rebalance, \
+         patch.object(service, "board_events"):
+        await service.move_issue(db, issue, IssueMove(status_id=COLUMN, after_id=above, before_id=below), USER)
+
+    rebalance.assert_awaited_once_with(db, PROJECT, COLUMN)
+    assert "90nayv" < issue.rank < "91alxq"
+
+
+@pytest.mark.asyncio
+async def test_long_ranks_queue_background_respacing():
+    issue, above, below = _issue(), uuid.uuid4(), uuid.uuid4()
+    db = _db({above: "a" * 30, below: "a" * 30 + "1"})
+
+    with patch.object(service, "board_events"), patch.object(service, "rank_rebalancer") as rebalancer:
+        await service.move_issue(db, issue, IssueMove(status_id=COLUMN, after_id=above, before_id=below), USER)
+
+    rebalancer.request.assert_called_once_with(PROJECT, COLUMN)
+
+
+@pytest.mark.asyncio
+async def test_move_without_neighbours_appends_to_the_column():
+    issue = _issue()
+    db = _db({})
+    db.scalar = AsyncMock(return_value="q")
+
+    with patch.object(service, "board_events"):
+        await service.move_issue(db, issue, IssueMove(status_id=COLUMN), USER)
+
+    assert issue.rank > "q"
+    # Only the status change's history row; no neighbours to read
+    assert "INSERT INTO issue_history" in str(db.execute.call_args.args[0])
+    db.execute.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "neighbours",
+    [
+        {},  # the neighbours left the column meanwhile
+        {"after": "c", "before": "a"},  # the board was reordered meanwhile
+    ],
+)
+@pytest.mark.asyncio
+async def test_stale_neighbours_are_a_conflict(neighbours):
+    above, below = uuid.uuid4(), uuid.uuid4()
+    db = _db({above if name == "after" else below: rank for name, rank in neighbours.items()})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.move_issue(db, _issue(), IssueMove(status_id=COLUMN, after_id=above, before_id=below), USER)
+
+    assert exc_info.value.status_code == 409
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_rebalance_column_writes_spread_ranks_in_one_statement():
+    ids = [uuid.uuid4() for _ in range(3)]
+    db = AsyncMock()
+    db.scalars = AsyncMock(return_value=ids)
+
+    ranks = await ranking.rebalance_column(db, PROJECT, COLUMN)
+
+    assert list(ranks) == ids and list(ranks.values()) == spread_ranks(3)
+    assert "FOR UPDATE" in str(db.scalars.call_args.args[0])
+    assert db.execute.call_args.args[1] == [{"id": i, "rank": r} for i, r in ranks.items()]
+
+
+@pytest.mark.parametrize("role, status", [("developer", 200), ("viewer", 403)])
+@pytest.mark.asyncio
+async def test_move_endpoint(role, status):
+    issue = _make_test_issue()
+    transport = _make_auth_client(_make_test_user(), AsyncMock())
+
+    with patch("app.issues.router.project_service.get_project", new_callable=AsyncMock), \
+         patch("app.issues.router.project_service.get_user_role_in_project", AsyncMock(return_value=role)), \
+         patch("app.issues.router.service.get_issue", AsyncMock(return_value=issue)), \
+         patch("app.issues.router.service.move_issue", AsyncMock(return_value=issue)) as move, \
+         patch("app.issues.router.service.get_children", AsyncMock(return_value=[])):
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                f"/api/v1/projects/{issue.project_id}/issues/{issue.id}/move",
+                json={"status_id": str(COLUMN), "after_id": str(uuid.uuid4())},
+            )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == status
+    if status == 200:
+        assert response.json()["rank"] == "i" and move.call_args.args[2].before_id is None
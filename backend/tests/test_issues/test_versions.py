@@ -0,0 +1,124 @@
+"""Tests for optimistic concurrency control on issue edits."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.issues import service
+from app.issues.models import Issue
+from app.issues.schemas import IssueMove, IssueUpdate
+from app.main import app
+from tests.conftest import _make_test_user
+from tests.test_issues.test_crud import _make_auth_client, _make_test_issue
+
+USER = _make_test_user()
+
+
+def _issue() -> Issue:
+    return Issue(id=uuid.uuid4(), project_id=uuid.uuid4(), status_id=uuid.uuid4(), key="FB-1", title="Card",
+                 rank="i", version=3)
+
+
+@pytest.mark.asyncio
+async def test_edit_claims_the_version_it_was_based_on():
+    issue = _issue()
+    db = AsyncMock()
+    db.scalar = AsyncMock(return_value=3)
+
+    with patch.object(service, "board_events"):
+        await service.update_issue(db, issue, IssueUpdate(title="Renamed"), USER, version=2)
+
+    stmt = db.scalar.call_args_list[0].args[0]
+    assert str(stmt).startswith("UPDATE issues SET version=(issues.version + :version_1)")
+    assert "issues.version = :version_2" in str(stmt) and "FOR UPDATE" not in str(stmt)
+    assert stmt.compile().params["version_2"] == 2
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_edit_without_if_match_checks_the_loaded_version():
+    issue = _issue()
+    db = AsyncMock()
+    db.scalar = AsyncMock(return_value=4)
+
+    await service.claim_version(db, issue)
+
+    assert db.scalar.call_args.args[0].compile().params["version_2"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_move_writes_nothing():
+    issue = _issue()
+    db = AsyncMock()
+    db.get = AsyncMock(return_value=MagicMock(project_id=issue.project_id))
+    db.scalar = AsyncMock(return_value=None)  # no row at that version
+
+    with pytest.raises(service.IssueVersionConflict):
+        await service.move_issue(db, issue, IssueMove(status_id=uuid.uuid4()), USER, version=3)
+
+    db.execute.assert_not_awaited()
+    db.rollback.assert_awaited_once()
+    db.commit.assert_not_awaited()
+    assert issue.rank == "i"
+
+
+@pytest.mark.parametrize(
+    "if_match, version, status",
+    [
+        ('"3"', 3, 200),
+        ('W/"3"', 3, 200),
+        (None, None, 200),
+        ("*", None, 200),
+        ('"three"', None, 400),
+    ],
+)
+@pytest.mark.asyncio
+async def test_update_endpoint_reads_if_match(if_match, version, status):
+    issue = _make_test_issue()
+    issue.version = 4
+    transport = _make_auth_client(USER, AsyncMock())
+    headers = {"If-Match": if_match} if if_match else {}
+
+    with patch("app.issues.router.project_service.get_project", new_callable=AsyncMock), \
+         patch("app.issues.router.project_service.get_user_role_in_project", AsyncMock(return_value="developer")), \
+         patch("app.issues.router.service.get_issue", AsyncMock(return_value=issue)), \
+         patch("app.issues.router.service.update_issue", AsyncMock(return_value=issue)) as update, \
+         patch("app.issues.router.service.get_children", AsyncMock(return_value=[])):
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.patch(
+                f"/api/v1/projects/{issue.project_id}/issues/{issue.id}", json={"title": "Renamed"}, headers=headers
+            )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == status
+    if status == 200:
+        assert update.call_args.args[4] == version
+        assert response.headers["ETag"] == '"4"' and response.json()["version"] == 4
+
+
+@pytest.mark.asyncio
+async def test_version_conflict_returns_the_current_issue():
+    issue = _make_test_issue()
+    issue.version = 7
+    transport = _make_auth_client(USER, AsyncMock())
+
+    with patch("app.issues.router.project_service.get_project", new_callable=AsyncMock), \
+         patch("app.issues.router.project_service.get_user_role_in_project", AsyncMock(return_value="developer")), \
+         patch("app.issues.router.service.get_issue", AsyncMock(return_value=issue)) as get_issue, \
+         patch("app.issues.router.service.move_issue", AsyncMock(side_effect=service.IssueVersionConflict(issue.id))), \
+         patch("app.issues.router.service.get_children", AsyncMock(return_value=[])):
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                f"/api/v1/projects/{issue.project_id}/issues/{issue.id}/move",
+                json={"status_id": str(uuid.uuid4())},
+                headers={"If-Match": '"6"'},
+            )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 409
+    assert get_issue.await_count == 2  # reloaded after the rollback
+    detail = response.json()["detail"]
+    assert detail["issue"]["id"] == str(issue.id) and detail["issue"]["version"] == 7
+    assert response.headers["ETag"] == '"7"'
@@ -0,0 +1,60 @@
+"""Shared fixtures for notification and real-time delivery tests."""
+
+import asyncio
+
+import pytest
+
+from app.notifications.manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket."""
+
+    def __init__(self, fail: bool = False, block: asyncio.Event | None = None):
+        self.sent: list[str] = []
+        self.fail = fail
+        self.block = block
+        self.accepted = False
+        self.closed_with: int | None = None
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_text(self, text: str):
+        if self.block is not None:
+            await self.block.wait()
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def drain():
+    """Let writer tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def connect(mgr: ConnectionManager, ws: FakeWebSocket, channel: str, **kwargs):
+    """Connect a socket and discard the frames delivered on connect (hello/replay)."""
+    conn = await mgr.connect(ws, channel, **kwargs)
+    await drain()
+    ws.sent.clear()
+    return conn
+
+
+@pytest.fixture
+async def make_manager():
+    """Build ConnectionManagers and stop their writer tasks after the test."""
+    managers = []
+
+    def _make(**kwargs) -> ConnectionManager:
+        mgr = ConnectionManager(**kwargs)
+        managers.append(mgr)
+        return mgr
+
+    yield _make
+    for mgr in managers:
+        await mgr.shutdown()
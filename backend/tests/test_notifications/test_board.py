@@ -0,0 +1,110 @@
+"""Tests for the project board event stream."""
+
+import asyncio
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.auth.utils import create_access_token
+from app.main import app
+from app.notifications.board import BoardEventBus
+from tests.test_notifications.conftest import FakeWebSocket, drain
+
+
+def _make_issue(project_id: uuid.UUID, **fields) -> MagicMock:
+    issue = MagicMock()
+    issue.id = fields.pop("id", uuid.uuid4())
+    issue.project_id = project_id
+    issue.key = "FB-1"
+    issue.title = "Card"
+    issue.type.value = "task"
+    issue.status_id = uuid.uuid4()
+    issue.priority.value = "medium"
+    issue.assignee_id = None
+    issue.sprint_id = None
+    issue.parent_id = None
+    issue.story_points = None
+    issue.rank = "i"
+    issue.labels = []
+    for name, value in fields.items():
+        setattr(issue, name, value)
+    return issue
+
+
+async def _frames(ws: FakeWebSocket, window: float) -> list[dict]:
+    await asyncio.sleep(window * 2)
+    await drain()
+    return [frame for frame in map(json.loads, ws.sent) if frame["type"] == "board"]
+
+
+@pytest.mark.asyncio
+async def test_burst_is_coalesced_into_one_delta_per_issue(make_manager):
+    """Several updates to one issue inside a window produce a single merged delta."""
+    mgr = make_manager()
+    bus = BoardEventBus(mgr, window=0.02)
+    project_id = uuid.uuid4()
+    ws = FakeWebSocket()
+    await mgr.connect(ws, str(project_id))
+
+    issue = _make_issue(project_id)
+    bus.publish_issue(issue, "updated", {"title"})
+    issue.title = "Renamed"
+    bus.publish_issue(issue, "moved", {"status_id"})
+    bus.publish_issue(issue, "updated", {"title"})
+
+    frames = await _frames(ws, bus.window)
+
+    assert len(frames) == 1
+    assert frames[0]["type"] == "board"
+    (delta,) = frames[0]["events"]
+    assert delta["op"] == "moved"
+    assert delta["fields"] == {"title": "Renamed", "status_id": str(issue.status_id)}
+
+
+@pytest.mark.asyncio
+async def test_delete_supersedes_earlier_ops(make_manager):
+    """A delete inside the window drops the fields of earlier deltas."""
+    mgr = make_manager()
+    bus = BoardEventBus(mgr, window=0.02)
+    project_id = uuid.uuid4()
+    ws = FakeWebSocket()
+    await mgr.connect(ws, str(project_id))
+
+    issue = _make_issue(project_id)
+    bus.publish_issue(issue, "created")
+    bus.publish_issue(issue, "deleted")
+
+    frames = await _frames(ws, bus.window)
+
+    assert frames[0]["events"] == [{"entity": "issue", "id": str(issue.id), "op": "deleted"}]
+
+
+@pytest.mark.asyncio
+async def test_publish_without_subscribers_is_noop(make_manager):
+    """Nothing is buffered for projects nobody is watching."""
+    bus = BoardEventBus(make_manager(), window=0.02)
+    bus.publish_issue(_make_issue(uuid.uuid4()), "created")
+    assert bus._pending == {}
+
+
+def test_subscribe_rejects_non_member():
+    """Membership is checked at subscribe time and non-members are refused."""
+    project_id = uuid.uuid4()
+    token = create_access_token(str(uuid.uuid4()), "developer")
+    session = AsyncMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+
+    with patch("app.notifications.router.async_session", return_value=session), \
+         patch("app.notifications.router.get_user_role_in_project", new_callable=AsyncMock) as mock_role:
+        mock_role.return_value = None
+        client = TestClient(app)  # no context manager: skip startup table creation
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect(f"/api/v1/ws/projects/{project_id}?token={token}") as ws:
+                ws.receive_text()
+
+    assert exc_info.value.code == 1008
@@ -0,0 +1,154 @@
+"""Tests for bulk notification creation, coalescing and digest delivery."""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.notifications import service
+from app.notifications.digest import NotificationDigest
+from app.notifications.models import NotificationType
+from app.notifications.schemas import NotificationTemplate
+from tests.test_notifications.conftest import FakeWebSocket, connect, drain
+
+TEMPLATE = NotificationTemplate(issue_id=uuid.uuid4(), type="commented", title="New comment on FB-1", body="Ann: hi")
+
+
+def _row(user_id: uuid.UUID, count: int = 1, issue_id: uuid.UUID | None = None) -> SimpleNamespace:
+    """A row shaped like the columns returned by the bulk UPDATE/INSERT."""
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        issue_id=issue_id or TEMPLATE.issue_id,
+        type=NotificationType.commented,
+        title=TEMPLATE.title,
+        message=TEMPLATE.body,
+        read=False,
+        count=count,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def _make_db(*results: list) -> AsyncMock:
+    """Session whose successive execute() calls return the given row lists."""
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=[MagicMock(all=MagicMock(return_value=rows)) for rows in results])
+    return db
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_merges_and_inserts_in_bulk_statements():
+    """Recipients with a recent unread row are merged; the rest share one multi-row INSERT and counter upsert."""
+    merged_user, new_user, other_user = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    merged = _row(merged_user, count=3)
+    inserted = [_row(new_user), _row(other_user)]
+    db = _make_db([merged], inserted, [])
+
+    result = await service.create_notifications_bulk(
+        db, [merged_user, new_user, new_user, other_user], TEMPLATE, coalesce_window=60
+    )
+
+    update_stmt, insert_stmt, counter_stmt = (call.args[0] for call in db.execute.call_args_list)
+    assert str(update_stmt).startswith("UPDATE notifications SET")
+    assert str(insert_stmt).startswith("INSERT INTO notifications")
+    assert {params["user_id"] for params in _insert_rows(insert_stmt)} == {new_user, other_user}
+    # Only new rows are counted: the merged one was already unread
+    assert str(counter_stmt).startswith("INSERT INTO notification_counters")
+    assert {params["user_id"] for params in _insert_rows(counter_stmt)} == {new_user, other_user}
+    assert [n.count for n in result] == [3, 1, 1]
+    db.commit.assert_called_once()
+    db.refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_without_coalescing_only_inserts():
+    user_id = uuid.uuid4()
+    db = _make_db([_row(user_id)], [])
+
+    (notification,) = await service.create_notifications_bulk(db, [user_id], TEMPLATE, coalesce_window=0)
+
+    insert_stmt, _ = (call.args[0] for call in db.execute.call_args_list)
+    assert str(insert_stmt).startswith("INSERT INTO notifications")
+    assert notification.body == TEMPLATE.body
+
+
+@pytest.mark.asyncio
+async def test_outbox_handler_accepts_multi_and_single_recipient_events():
+    """Batched events become one store per event and a single push for the batch."""
+    user_a, user_b = uuid.uuid4(), uuid.uuid4()
+    payloads = [
+        {"recipients": [str(user_a), str(user_b)], "template": TEMPLATE.model_dump(mode="json")},
+        {"user_id": str(user_a), **TEMPLATE.model_dump(mode="json")},
+    ]
+    db = AsyncMock()
+    with patch.object(service, "_store_notifications", AsyncMock(return_value=[])) as mock_store, \
+         patch.object(service, "_push", AsyncMock()) as mock_push:
+        push = await service.deliver_outbox_notifications(db, payloads)
+        await push()
+
+    assert [call.args[1] for call in mock_store.call_args_list] == [[user_a, user_b], [user_a]]
+    mock_push.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_digest_users_get_one_batched_frame(make_manager):
+    """Pushes for digest-mode users are held and sent as a single digest frame."""
+    mgr = make_manager()
+    batcher = NotificationDigest(mgr, interval=0.02)
+    user_id = uuid.uuid4()
+    ws = FakeWebSocket()
+    await connect(mgr, ws, str(user_id))
+
+    first = _row(user_id)
+    other = _row(user_id, issue_id=uuid.uuid4())
+    db = AsyncMock()
+    db.scalars = AsyncMock(return_value=[user_id])
+    with patch.object(service, "manager", mgr), patch.object(service, "digest", batcher):
+        await service._push(db, [first])
+        first.count = 2
+        await service._push(db, [first, other])
+        await drain()
+        assert ws.sent == []
+
+        await asyncio.sleep(0.05)
+        await drain()
+
+    (frame,) = map(json.loads, ws.sent)
+    assert frame["type"] == "digest"
+    assert {(n["id"], n["count"]) for n in frame["data"]} == {(str(first.id), 2), (str(other.id), 1)}
+
+
+@pytest.mark.asyncio
+async def test_push_fans_out_to_each_connected_recipient(make_manager):
+    mgr = make_manager()
+    user_a, user_b, offline = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+    await connect(mgr, ws_a, str(user_a))
+    await connect(mgr, ws_b, str(user_b))
+    db = AsyncMock()
+    db.scalars = AsyncMock(return_value=[])
+
+    with patch.object(service, "manager", mgr):
+        await service._push(db, [_row(user_a), _row(user_b), _row(offline)])
+        await drain()
+
+    assert [json.loads(text)["type"] for text in ws_a.sent + ws_b.sent] == ["notification", "notification"]
+    assert offline not in db.scalars.call_args.args[0].compile().params["id_1"]
+
+
+@pytest.mark.asyncio
+async def test_push_skips_users_without_connections(make_manager):
+    """No preference lookup or encoding happens for users nobody is listening for."""
+    db = AsyncMock()
+    with patch.object(service, "manager", make_manager()):
+        await service._push(db, [_row(uuid.uuid4())])
+    db.scalars.assert_not_called()
+
+
+def _insert_rows(statement) -> list[dict]:
+    """Per-row parameters of a multi-VALUES INSERT."""
+    return [{getattr(key, "key", key): value for key, value in row.items()} for row in statement._multi_values[0]]
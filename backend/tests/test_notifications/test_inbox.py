@@ -0,0 +1,124 @@
+"""Tests for the cursor-paginated inbox and batch mark-read."""
+
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from pydantic import ValidationError
+
+from app.auth.dependencies import get_current_user
+from app.common.pagination import decode_cursor, encode_cursor
+from app.database import get_db
+from app.main import app
+from app.notifications import service
+from app.notifications.models import NotificationType
+from app.notifications.schemas import MarkReadRequest
+from tests.conftest import _make_test_user
+from tests.test_notifications.conftest import FakeWebSocket, connect, drain
+
+
+def _notification(created_at: datetime) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        type=NotificationType.assigned,
+        title="Assigned",
+        message=None,
+        read=False,
+        count=1,
+        issue_id=None,
+        created_at=created_at,
+    )
+
+
+def _result(rows: list) -> MagicMock:
+    return MagicMock(all=MagicMock(return_value=rows))
+
+
+def test_cursor_round_trip_and_invalid_cursor():
+    position = (datetime(2026, 5, 4, 3, 2, 1, 123456, tzinfo=timezone.utc), uuid.uuid4())
+
+    assert decode_cursor(encode_cursor(*position)) == position
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_mark_read_request_needs_exactly_one_selector():
+    assert MarkReadRequest(ids=[uuid.uuid4()]).up_to is None
+    with pytest.raises(ValidationError):
+        MarkReadRequest()
+    with pytest.raises(ValidationError):
+        MarkReadRequest(ids=[], up_to="abc")
+
+
+@pytest.mark.asyncio
+async def test_mark_read_bulk_is_one_update_and_pushes_unread_count(make_manager):
+    """The marked rows are flipped in one UPDATE, the counter follows, and open tabs get the new count."""
+    mgr = make_manager()
+    user = _make_test_user()
+    ws = FakeWebSocket()
+    await connect(mgr, ws, str(user.id))
+    ids = [uuid.uuid4() for _ in range(3)]
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=_result([(notification_id,) for notification_id in ids]))
+    db.scalar = AsyncMock(return_value=4)
+
+    with patch.object(service, "manager", mgr):
+        assert await service.mark_read_bulk(db, user, ids=ids) == (3, 4)
+        await drain()
+
+    (update_stmt,) = (call.args[0] for call in db.execute.call_args_list)
+    assert str(update_stmt).startswith("UPDATE notifications SET read=")
+    assert str(db.scalar.call_args.args[0]).startswith("UPDATE notification_counters SET unread=greatest(")
+    db.commit.assert_awaited_once()
+    frame = json.loads(ws.sent[-1])
+    assert (frame["type"], frame["count"]) == ("unread_count", 4)
+
+
+@pytest.mark.asyncio
+async def test_mark_read_up_to_cursor_when_nothing_changes():
+    """A watermark covering only read rows touches neither the counter nor the transaction."""
+    user = _make_test_user()
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid.uuid4())
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=[_result([]), MagicMock(one_or_none=MagicMock(return_value=None))])
+
+    assert await service.mark_read_bulk(db, user, up_to=cursor) == (0, 0)
+
+    assert "(notifications.created_at, notifications.id) <=" in str(db.execute.call_args_list[0].args[0])
+    db.scalar.assert_not_called()
+    db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_returns_counter_total_and_next_cursor():
+    user = _make_test_user()
+    now = datetime.now(timezone.utc)
+    page = [_notification(now - timedelta(minutes=minutes)) for minutes in range(3)]
+
+    async def override_get_db():
+        yield AsyncMock()
+
+    async def override_get_current_user():
+        return user
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    with patch("app.notifications.router.service.get_notifications", AsyncMock(return_value=page)) as mock_list, \
+         patch("app.notifications.router.service.get_counters", AsyncMock(return_value=(240, 7))):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/api/v1/notifications", params={"limit": 2})
+            last = await client.get("/api/v1/notifications", params={"limit": 3, "unread_only": True})
+    app.dependency_overrides.clear()
+
+    assert mock_list.call_args_list[0].kwargs["limit"] == 3
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [str(page[0].id), str(page[1].id)]
+    assert data["total"] == 240
+    assert decode_cursor(data["next_cursor"]) == (page[1].created_at, page[1].id)
+    assert (last.json()["total"], last.json()["next_cursor"]) == (7, None)
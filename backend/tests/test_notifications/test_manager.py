@@ -0,0 +1,215 @@
+"""Tests for the WebSocket ConnectionManager delivery pipeline."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.notifications.manager import PING_FRAME, OverflowPolicy
+from tests.test_notifications.conftest import FakeWebSocket, connect, drain
+
+
+@pytest.mark.asyncio
+async def test_send_to_user_delivers_to_all_connections(make_manager):
+    """Every connection of a user receives the same encoded message."""
+    mgr = make_manager(queue_size=8)
+    ws1, ws2 = FakeWebSocket(), FakeWebSocket()
+    await connect(mgr, ws1, "u1")
+    await connect(mgr, ws2, "u1")
+
+    await mgr.send_to_user("u1", {"type": "notification", "data": {"id": "n1"}})
+    await drain()
+
+    assert ws1.sent == ws2.sent
+    assert json.loads(ws1.sent[0]) == {"type": "notification", "data": {"id": "n1"}, "seq": 1}
+    assert mgr.stats()["sent"] == 4  # hello + message on each socket
+
+
+@pytest.mark.asyncio
+async def test_slow_socket_does_not_block_send(make_manager):
+    """A socket stuck in send_text does not stall send_to_user or other sockets."""
+    mgr = make_manager(queue_size=8)
+    gate = asyncio.Event()
+    slow, fast = FakeWebSocket(block=gate), FakeWebSocket()
+    await connect(mgr, slow, "u1")
+    await connect(mgr, fast, "u1")
+
+    await asyncio.wait_for(mgr.send_to_user("u1", {"n": 1}), timeout=0.1)
+    await drain()
+
+    assert len(fast.sent) == 1
+    assert slow.sent == []
+    gate.set()
+    await drain()
+    assert json.loads(slow.sent[0])["type"] == "hello"
+    assert json.loads(slow.sent[1]) == {"n": 1, "seq": 1}
+
+
+@pytest.mark.asyncio
+async def test_failed_socket_is_removed(make_manager):
+    """A socket whose send fails is reaped from the registry immediately."""
+    mgr = make_manager(queue_size=8)
+    dead, alive = FakeWebSocket(fail=True), FakeWebSocket()
+    await connect(mgr, dead, "u1")
+    await connect(mgr, alive, "u1")
+
+    await mgr.send_to_user("u1", {"n": 1})
+    await drain()
+
+    assert mgr.stats()["connections"] == 1
+    assert mgr.stats()["send_failures"] == 1
+    assert len(alive.sent) == 1
+
+
+@pytest.mark.asyncio
+async def test_overflow_drop_oldest(make_manager):
+    """With drop_oldest, a full queue discards the oldest pending message."""
+    mgr = make_manager(queue_size=2, overflow_policy=OverflowPolicy.drop_oldest)
+    gate = asyncio.Event()
+    ws = FakeWebSocket(block=gate)
+    await connect(mgr, ws, "u1")
+    await drain()
+
+    # The hello frame is held by the blocked writer; the next three overflow the queue
+    for n in range(3):
+        await mgr.send_to_user("u1", {"n": n})
+        await drain()
+
+    assert mgr.stats()["dropped"] == 1
+    assert mgr.stats()["queue_depth_max"] == 2
+    gate.set()
+    await drain()
+    assert [json.loads(t).get("n") for t in ws.sent] == [None, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_overflow_disconnect(make_manager):
+    """With disconnect, a full queue closes and unregisters the connection."""
+    mgr = make_manager(queue_size=1, overflow_policy=OverflowPolicy.disconnect)
+    ws = FakeWebSocket(block=asyncio.Event())
+    await connect(mgr, ws, "u1")
+    await drain()
+
+    for n in range(3):
+        await mgr.send_to_user("u1", {"n": n})
+        await drain()
+
+    stats = mgr.stats()
+    assert stats["connections"] == 0
+    assert stats["slow_consumer_disconnects"] == 1
+    assert ws.closed_with == 1013
+
+
+@pytest.mark.asyncio
+async def test_disconnect_is_idempotent(make_manager):
+    """Disconnecting an already-reaped socket is a no-op."""
+    mgr = make_manager(queue_size=4)
+    ws = FakeWebSocket()
+    await connect(mgr, ws, "u1")
+    mgr.disconnect(ws, "u1")
+    mgr.disconnect(ws, "u1")
+    assert mgr.stats()["connections"] == 0
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_pings_active_connection(make_manager):
+    """The timer wheel sends a ping frame and reschedules a live connection."""
+    mgr = make_manager(queue_size=4, heartbeat_interval=1, idle_timeout=10, timer_tick=1)
+    ws = FakeWebSocket()
+    await connect(mgr, ws, "u1")
+
+    mgr.wheel.advance()
+    await drain()
+
+    assert ws.sent == [PING_FRAME.text]
+    assert len(mgr.wheel) == 1
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_reaps_idle_connection(make_manager):
+    """A connection silent for longer than the idle timeout is closed."""
+    mgr = make_manager(queue_size=4, heartbeat_interval=1, idle_timeout=5, timer_tick=1)
+    ws = FakeWebSocket()
+    conn = await connect(mgr, ws, "u1")
+    conn.last_seen -= 10
+
+    mgr.wheel.advance()
+    await drain()
+
+    stats = mgr.stats()
+    assert stats["connections"] == 0
+    assert stats["idle_disconnects"] == 1
+    assert ws.closed_with == 1001
+    assert len(mgr.wheel) == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_connection_holds_no_writer_task(make_manager):
+    """Writer tasks exist only while messages are pending."""
+    mgr = make_manager(queue_size=4)
+    ws = FakeWebSocket()
+    conn = await connect(mgr, ws, "u1")
+    assert conn.writer is None
+
+    await mgr.send_to_user("u1", {"n": 1})
+    assert conn.writer is not None
+    await drain()
+
+    assert conn.writer is None
+    assert mgr.stats()["memory_bytes_per_connection"] > 0
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_missed_events(make_manager):
+    """A client resuming with its epoch and last_seq receives only the frames it missed."""
+    mgr = make_manager(queue_size=16, replay_buffer_size=8)
+    first = FakeWebSocket()
+    await mgr.connect(first, "u1")
+    await drain()
+    epoch = json.loads(first.sent[0])["epoch"]
+
+    for n in range(3):
+        await mgr.send_to_user("u1", {"n": n})
+    await drain()
+    mgr.disconnect(first, "u1")
+    for n in range(3, 5):
+        await mgr.send_to_user("u1", {"n": n})
+
+    second = FakeWebSocket()
+    await mgr.connect(second, "u1", last_seq=3, epoch=epoch)
+    await drain()
+
+    frames = [json.loads(t) for t in second.sent]
+    assert frames[0] == {"type": "hello", "epoch": epoch, "seq": 5}
+    assert [(f["seq"], f["n"]) for f in frames[1:]] == [(4, 3), (5, 4)]
+    assert mgr.stats()["replayed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reconnect_with_large_gap_requires_resync(make_manager):
+    """If missed frames fell out of the ring buffer the client is told to resync."""
+    mgr = make_manager(queue_size=16, replay_buffer_size=2)
+    ws = FakeWebSocket()
+    await connect(mgr, ws, "u1")
+    epoch = mgr.logs.get("u1").epoch
+    for n in range(5):
+        await mgr.send_to_user("u1", {"n": n})
+    mgr.disconnect(ws, "u1")
+
+    resumed = FakeWebSocket()
+    await mgr.connect(resumed, "u1", last_seq=1, epoch=epoch)
+    await drain()
+
+    assert [json.loads(t)["type"] for t in resumed.sent] == ["hello", "resync_required"]
+    assert mgr.stats()["resyncs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reconnect_with_unknown_epoch_requires_resync(make_manager):
+    """Sequence numbers from another epoch (e.g. a restarted worker) are not trusted."""
+    mgr = make_manager(queue_size=16)
+    ws = FakeWebSocket()
+    await mgr.connect(ws, "u1", last_seq=0, epoch="stale")
+    await drain()
+
+    assert [json.loads(t)["type"] for t in ws.sent] == ["hello", "resync_required"]
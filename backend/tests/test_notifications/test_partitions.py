@@ -0,0 +1,131 @@
+"""Tests for notification partition management and retention."""
+
+import gzip
+import json
+import uuid
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.common.pagination import encode_cursor
+from app.database import Base
+from app.notifications import partitions, service
+
+
+class FakeStream:
+    """Async result yielding row batches like ``AsyncResult.mappings().partitions()``."""
+
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    async def partitions(self, size: int):
+        for start in range(0, len(self.rows), size):
+            yield self.rows[start:start + size]
+
+
+def _conn(partition_names: list[str], rows: list[dict] | None = None) -> AsyncMock:
+    """Mock connection; ``log`` records statements and transaction boundaries in order."""
+    conn = AsyncMock()
+    conn.log = []
+    listing = MagicMock()
+    listing.all.return_value = [(name,) for name in partition_names]
+
+    async def execute(stmt, params=None):
+        conn.log.append(str(stmt))
+        return listing
+
+    async def stream(stmt):
+        conn.log.append(str(stmt))
+        return FakeStream(rows or [])
+
+    conn.execute = AsyncMock(side_effect=execute)
+    conn.stream = AsyncMock(side_effect=stream)
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock(side_effect=lambda: conn.log.append("BEGIN"))
+    transaction.__aexit__ = AsyncMock(side_effect=lambda *exc: conn.log.append("COMMIT"))
+    conn.begin = MagicMock(return_value=transaction)
+    return conn
+
+
+def _sql(conn: AsyncMock) -> list[str]:
+    return [str(call.args[0]) for call in conn.execute.call_args_list]
+
+
+def test_notifications_table_is_range_partitioned_on_created_at():
+    table = Base.metadata.tables["notifications"]
+    assert table.dialect_options["postgresql"]["partition_by"] == "RANGE (created_at)"
+    assert {column.name for column in table.primary_key} == {"id", "created_at"}
+
+
+def test_month_arithmetic_and_names():
+    assert partitions.add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert partitions.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partitions.partition_name(date(2026, 3, 1)) == "notifications_2026_03"
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_current_and_upcoming_months():
+    conn = _conn([])
+
+    names = await partitions.ensure_partitions(conn, months_ahead=2, today=date(2026, 11, 15))
+
+    assert names == ["notifications_2026_11", "notifications_2026_12", "notifications_2027_01"]
+    assert _sql(conn)[2] == (
+        "CREATE TABLE IF NOT EXISTS notifications_2027_01 PARTITION OF notifications "
+        "FOR VALUES FROM ('2027-01-01 00:00:00+00') TO ('2027-02-01 00:00:00+00')"
+    )
+
+
+@pytest.mark.asyncio
+async def test_drop_expired_partitions_archives_then_drops(tmp_path):
+    """Partitions older than the retention period are exported to NDJSON and dropped whole."""
+    row = {"id": uuid.uuid4(), "title": "Old", "created_at": datetime(2025, 12, 3, tzinfo=timezone.utc)}
+    conn = _conn(
+        ["notifications_2026_01", "notifications_2025_12", "notifications_2025_11", "notifications_default_x"],
+        rows=[row],
+    )
+
+    dropped = await partitions.drop_expired_partitions(
+        conn, retention_months=11, archive_dir=str(tmp_path), today=date(2026, 12, 20)
+    )
+
+    assert dropped == ["notifications_2025_11", "notifications_2025_12"]
+    # Each partition is archived in its own transaction, before the short one that detaches it
+    transactions = "\n".join(conn.log).split("COMMIT")
+    assert [t.count("BEGIN") for t in transactions[:-1]] == [1] * 5
+    listing, *steps = transactions[:-1]
+    assert "pg_inherits" in listing
+    for archive, drop, name in zip(steps[::2], steps[1::2], dropped):
+        assert archive.strip() == f"BEGIN\nSELECT * FROM {name} ORDER BY created_at, id"
+        release, *rest = drop.strip().split("\n")[1:]
+        assert release.startswith("UPDATE notification_counters") and f"FROM {name} GROUP BY" in release
+        assert rest == [f"ALTER TABLE notifications DETACH PARTITION {name}", f"DROP TABLE {name}"]
+    with gzip.open(tmp_path / "notifications_2025_12.ndjson.gz", "rt") as archive:
+        (line,) = archive.read().splitlines()
+    assert json.loads(line) == {"id": str(row["id"]), "title": "Old", "created_at": "2025-12-03 00:00:00+00:00"}
+    assert not list(tmp_path.glob("*.partial"))
+
+
+@pytest.mark.asyncio
+async def test_zero_retention_keeps_everything():
+    conn = _conn(["notifications_2000_01"])
+    assert await partitions.drop_expired_partitions(conn, retention_months=0) == []
+    conn.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_notifications_cursor_bounds_created_at():
+    """A page cursor puts an upper bound on created_at, so newer partitions are pruned."""
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=MagicMock())
+    cursor = encode_cursor(datetime(2026, 3, 1, tzinfo=timezone.utc), uuid.uuid4())
+
+    await service.get_notifications(db, uuid.uuid4(), cursor=cursor)
+
+    query = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "(notifications.created_at, notifications.id) < (" in query
@@ -0,0 +1,78 @@
+"""Tests for Server-Sent Events delivery of notifications."""
+
+import asyncio
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.main import app
+from app.notifications.manager import KEEPALIVE_FRAME
+from app.notifications.router import _parse_last_event_id
+from tests.test_notifications.conftest import FakeWebSocket, connect, drain
+
+
+async def _read(stream, count: int) -> list[str]:
+    return [await asyncio.wait_for(anext(stream), timeout=0.5) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_stream_receives_same_frames_as_websocket(make_manager):
+    """SSE and WebSocket subscribers share one encoded frame per message."""
+    mgr = make_manager()
+    ws = FakeWebSocket()
+    await connect(mgr, ws, "u1")
+    conn = mgr.open_stream("u1")
+    stream = mgr.stream(conn)
+    hello = json.loads((await _read(stream, 1))[0].split("data: ", 1)[1])
+    assert hello["type"] == "hello"
+
+    mgr.broadcast("u1", {"type": "notification"})
+    await drain()
+    (message,) = await _read(stream, 1)
+
+    assert message == f"id: {hello['epoch']}:1\ndata: {ws.sent[0]}\n\n"
+    assert mgr.stats()["sse_connections"] == 1
+    await stream.aclose()
+    assert mgr.stats()["connections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_from_last_event_id(make_manager):
+    """A reconnecting stream replays only the frames after its last event ID."""
+    mgr = make_manager()
+    for n in range(3):
+        mgr.open_stream("u1")  # keep the channel's replay buffer alive
+        mgr.broadcast("u1", {"n": n})
+    epoch = mgr.logs.get("u1").epoch
+
+    conn = mgr.open_stream("u1", last_seq=1, epoch=epoch)
+    frames = [frame.text for frame in conn.pending]
+
+    assert [json.loads(text).get("n") for text in frames[1:]] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_stream_gets_keepalive_and_is_never_idle_reaped(make_manager):
+    """SSE clients can't answer pings, so they get comments instead of idle timeouts."""
+    mgr = make_manager(heartbeat_interval=1.0, idle_timeout=0.0)
+    conn = mgr.open_stream("u1")
+    conn.pending.clear()
+
+    mgr._heartbeat(conn)
+
+    assert list(conn.pending) == [KEEPALIVE_FRAME]
+    assert KEEPALIVE_FRAME.sse() == ": keep-alive\n\n"
+    assert mgr.stats()["idle_disconnects"] == 0
+
+
+def test_parse_last_event_id():
+    assert _parse_last_event_id("abc123:42") == ("abc123", 42)
+    assert _parse_last_event_id("garbage") == (None, None)
+    assert _parse_last_event_id(None) == (None, None)
+
+
+def test_stream_rejects_invalid_token():
+    client = TestClient(app)  # no context manager: skip startup table creation
+    response = client.get("/api/v1/notifications/stream", params={"token": "nope"})
+    assert response.status_code == 401
@@ -0,0 +1,125 @@
+"""Tests for outbox enqueueing and batch dispatch."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.comments import schemas as comment_schemas
+from app.comments import service as comment_service
+from app.outbox import service as outbox
+from app.outbox.dispatcher import OutboxDispatcher, _wake_after_commit
+from app.outbox.models import OutboxEvent
+
+
+def _event(event_id: int, kind: str, payload: dict) -> OutboxEvent:
+    event = OutboxEvent(kind=kind, payload=payload)
+    event.id = event_id
+    event.attempts = 0
+    return event
+
+
+def _session_with(events: list[OutboxEvent]) -> AsyncMock:
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = events
+
+    async def execute(statement, *args, **kwargs):
+        db.statements.append(statement)
+        return result
+
+    db.statements = []
+    db.execute = AsyncMock(side_effect=execute)
+    db.begin_nested = MagicMock(return_value=AsyncMock())
+    db.__aenter__ = AsyncMock(return_value=db)
+    db.__aexit__ = AsyncMock(return_value=False)
+    return db
+
+
+def test_enqueue_adds_event_and_flags_session():
+    """Enqueued events ride on the caller's transaction and mark it for a wake-up."""
+    db = MagicMock()
+    db.info = {}
+
+    event = outbox.enqueue(db, "notification", {"title": "Hi"})
+
+    db.add.assert_called_once_with(event)
+    assert event.kind == "notification"
+    assert db.info[outbox.PENDING_FLAG] is True
+
+
+def test_commit_of_flagged_session_wakes_dispatcher():
+    session = MagicMock()
+    session.info = {outbox.PENDING_FLAG: True}
+    with patch("app.outbox.dispatcher.dispatcher") as mock_dispatcher:
+        _wake_after_commit(session)
+        _wake_after_commit(session)
+    mock_dispatcher.wake.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_run_once_dispatches_batches_and_retries_failures():
+    """Handled events are deleted in the same commit; failures are kept with backoff."""
+    events = [_event(1, "notification", {"n": 1}), _event(2, "webhook", {"n": 2}), _event(3, "notification", {"n": 3})]
+    db = _session_with(events)
+    pushed = AsyncMock()
+    order = []
+    db.commit = AsyncMock(side_effect=lambda: order.append("commit"))
+    pushed.side_effect = lambda: order.append("push")
+
+    async def notify(session, payloads):
+        assert payloads == [{"n": 1}, {"n": 3}]
+        return pushed
+
+    async def webhook(session, payloads):
+        raise RuntimeError("endpoint down")
+
+    dispatcher = OutboxDispatcher(workers=1, batch_size=10)
+    dispatcher.register("notification", notify)
+    dispatcher.register("webhook", webhook)
+    with patch("app.outbox.dispatcher.async_session", return_value=db):
+        claimed = await dispatcher.run_once()
+
+    assert claimed == 3
+    claim, purge = db.statements
+    assert "FOR UPDATE SKIP LOCKED" in str(claim.compile(dialect=postgresql.dialect()))
+    assert str(purge).startswith("DELETE FROM outbox_events")
+    assert purge.compile().params == {"id_1": [1, 3]}
+    assert order == ["commit", "push"]
+    assert events[1].attempts == 1
+    assert events[1].last_error == "endpoint down"
+
+
+@pytest.mark.asyncio
+async def test_run_once_without_events_does_nothing():
+    db = _session_with([])
+    with patch("app.outbox.dispatcher.async_session", return_value=db):
+        assert await OutboxDispatcher().run_once() == 0
+    db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_comment_enqueues_notification_in_same_transaction():
+    """Comment notifications are written to the outbox and committed once with the comment."""
+    db = AsyncMock()
+    db.add = MagicMock()
+    db.info = {}
+    issue = MagicMock()
+    issue.id = uuid.uuid4()
+    issue.key = "TST-1"
+    issue.assignee_id = uuid.uuid4()
+    issue.reporter_id = None
+    db.get = AsyncMock(return_value=issue)
+    author = MagicMock()
+    author.id = uuid.uuid4()
+    author.name = "Ann"
+
+    with patch.object(comment_service.board_events, "is_watched", return_value=False):
+        await comment_service.create_comment(db, issue.id, comment_schemas.CommentCreate(content="Hi"), author)
+
+    added = [call.args[0] for call in db.add.call_args_list]
+    (event,) = [obj for obj in added if isinstance(obj, OutboxEvent)]
+    assert event.payload["recipients"] == [str(issue.assignee_id)]
+    db.commit.assert_called_once()
+
@@ -1,16 +1,18 @@
-"""Tests to verify that all 14 SQLAlchemy models register correctly in Base.metadata."""
+"""Tests to verify that all 21 SQLAlchemy models register correctly in Base.metadata."""
 
 from app.database import Base
 
 # Import all models to ensure they register with Base.metadata
 from app.auth.models import User  # noqa: F401
-from app.projects.models import Label, Project, ProjectMember, WorkflowStatus  # noqa: F401
+from app.projects.models import Label, Project, ProjectIssueCounter, ProjectMember, WorkflowStatus  # noqa: F401
 from app.sprints.models import Sprint  # noqa: F401
 from app.issues.models import Issue, IssueHistory, IssueLabel, IssueRelation  # noqa: F401
 from app.comments.models import Comment  # noqa: F401
-from app.attachments.models import Attachment  # noqa: F401
-from app.notifications.models import Notification  # noqa: F401
+from app.attachments.models import Attachment, AttachmentBlob, UploadSession  # noqa: F401
+from app.notifications.models import Notification, NotificationCounter  # noqa: F401
 from app.search.models import SavedFilter  # noqa: F401
+from app.outbox.models import OutboxEvent  # noqa: F401
+from app.imports.models import ImportIssueRef, ImportJob  # noqa: F401
 
 
 EXPECTED_TABLES = [
@@ -28,15 +30,22 @@ EXPECTED_TABLES = [
     "attachments",
     "notifications",
     "saved_filters",
+    "outbox_events",
+    "notification_counters",
+    "attachment_blobs",
+    "upload_sessions",
+    "import_jobs",
+    "import_issue_refs",
+    "project_issue_counters",
 ]
 
 
-def test_all_14_tables_registered():
-    """All 14 tables from the DDL must be registered in Base.metadata."""
+def test_all_21_tables_registered():
+    """All 21 tables from the DDL must be registered in Base.metadata."""
     registered = set(Base.metadata.tables.keys())
     for table_name in EXPECTED_TABLES:
         assert table_name in registered, f"Table '{table_name}' not found in metadata. Got: {registered}"
-    assert len(registered) == 14, f"Expected 14 tables, got {len(registered)}: {registered}"
+    assert len(registered) == 21, f"Expected 21 tables, got {len(registered)}: {registered}"
 
 
 def test_users_table_columns():
@@ -54,7 +63,7 @@ def test_issues_table_columns():
     required = {
         "id", "project_id", "type", "key", "title", "description", "status_id",
         "priority", "assignee_id", "reporter_id", "sprint_id", "parent_id",
-        "story_points", "due_date", "position", "created_at", "updated_at",
+        "story_points", "due_date", "rank", "version", "created_at", "updated_at",
     }
     assert required.issubset(column_names), f"Missing columns: {required - column_names}"
 
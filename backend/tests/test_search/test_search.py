@@ -41,7 +41,8 @@ def _make_test_issue(
     issue.parent_id = None
     issue.story_points = None
     issue.due_date = None
-    issue.position = 0
+    issue.rank = "i"
+    issue.version = 1
     issue.created_at = datetime.now(timezone.utc)
     issue.updated_at = datetime.now(timezone.utc)
     issue.labels = []
@@ -1,5 +1,8 @@
 import client from './client'
-import type { Attachment } from '../types/attachment'
+import type { Attachment, UploadSession } from '../types/attachment'
+
+const uploadsPath = (projectId: string, issueId: string) =>
+  `/api/v1/projects/${projectId}/issues/${issueId}/attachments/uploads`
 
 export const attachmentApi = {
   list: (projectId: string, issueId: string) =>
@@ -15,6 +18,33 @@ export const attachmentApi = {
     ).then(r => r.data)
   },
 
+  // Resumable uploads for large files: create a session, PATCH chunks at offsets, complete
+  createUpload: (projectId: string, issueId: string, file: File) =>
+    client.post<UploadSession>(uploadsPath(projectId, issueId), {
+      filename: file.name,
+      size: file.size,
+      mime_type: file.type || 'application/octet-stream',
+    }).then(r => r.data),
+
+  getUpload: (projectId: string, issueId: string, uploadId: string) =>
+    client.get<UploadSession>(`${uploadsPath(projectId, issueId)}/${uploadId}`).then(r => r.data),
+
+  uploadChunk: (projectId: string, issueId: string, uploadId: string, offset: number, chunk: Blob) =>
+    client.patch<UploadSession>(`${uploadsPath(projectId, issueId)}/${uploadId}`, chunk, {
+      headers: { 'Content-Type': 'application/offset+octet-stream', 'Upload-Offset': String(offset) },
+    }).then(r => r.data),
+
+  completeUpload: (projectId: string, issueId: string, uploadId: string) =>
+    client.post<Attachment>(`${uploadsPath(projectId, issueId)}/${uploadId}/complete`).then(r => r.data),
+
+  // Authenticated binary fetch (e.g. a preview), for use as an object URL
+  fetchBlob: (url: string) =>
+    client.get<Blob>(url, { responseType: 'blob' }).then(r => r.data),
+
+  // ZIP of every attachment on an issue
+  archiveUrl: (projectId: string, issueId: string) =>
+    `/api/v1/projects/${projectId}/issues/${issueId}/attachments/archive`,
+
   delete: (projectId: string, issueId: string, attachmentId: string) =>
     client.delete(`/api/v1/projects/${projectId}/issues/${issueId}/attachments/${attachmentId}`).then(r => r.data),
 }
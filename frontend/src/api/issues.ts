@@ -1,5 +1,11 @@
 import client from './client';
-import type { Issue, CreateIssueRequest, UpdateIssueRequest, MoveIssueRequest } from '../types/issue';
+import type {
+  Issue,
+  CreateIssueRequest,
+  UpdateIssueRequest,
+  MoveIssueRequest,
+  IssueHistoryPage,
+} from '../types/issue';
 
 export interface StatusBrief {
   id: string;
@@ -28,6 +34,8 @@ export interface IssueListItem {
   sprint_id: string | null;
   story_points: number | null;
   label_count: number;
+  rank: string; // Board order within the status column
+  version: number; // Sent back as If-Match by edits based on this item
   created_at: string;
   parent_id?: string | null; // For grouping in backlog
 }
@@ -51,6 +59,9 @@ export interface IssueFilters {
   size?: number;
 }
 
+// If-Match for an edit based on a known issue version; a stale one gets a 409 with the current issue
+const ifMatch = (version?: number) => (version === undefined ? undefined : { 'If-Match': `"${version}"` });
+
 export const issueApi = {
   list: (projectId: string, filters?: IssueFilters) =>
     client.get<IssueListResponse>(`/api/v1/projects/${projectId}/issues`, { params: filters }).then(r => r.data),
@@ -61,12 +72,21 @@ export const issueApi = {
   create: (projectId: string, data: CreateIssueRequest) =>
     client.post<Issue>(`/api/v1/projects/${projectId}/issues`, data).then(r => r.data),
 
-  update: (projectId: string, issueId: string, data: UpdateIssueRequest) =>
-    client.patch<Issue>(`/api/v1/projects/${projectId}/issues/${issueId}`, data).then(r => r.data),
+  update: (projectId: string, issueId: string, data: UpdateIssueRequest, version?: number) =>
+    client
+      .patch<Issue>(`/api/v1/projects/${projectId}/issues/${issueId}`, data, { headers: ifMatch(version) })
+      .then(r => r.data),
 
   delete: (projectId: string, issueId: string) =>
     client.delete(`/api/v1/projects/${projectId}/issues/${issueId}`),
 
-  move: (projectId: string, issueId: string, data: MoveIssueRequest) =>
-    client.post(`/api/v1/projects/${projectId}/issues/${issueId}/move`, data).then(r => r.data),
+  move: (projectId: string, issueId: string, data: MoveIssueRequest, version?: number) =>
+    client
+      .post(`/api/v1/projects/${projectId}/issues/${issueId}/move`, data, { headers: ifMatch(version) })
+      .then(r => r.data),
+
+  history: (projectId: string, issueId: string, cursor?: string) =>
+    client
+      .get<IssueHistoryPage>(`/api/v1/projects/${projectId}/issues/${issueId}/history`, { params: { cursor } })
+      .then(r => r.data),
 };
@@ -3,16 +3,23 @@
  */
 
 import api from './client';
-import type { Notification, NotificationListResponse, MarkReadResponse } from '@/types/notification';
+import type {
+  Notification,
+  NotificationListResponse,
+  NotificationPreferences,
+  MarkReadRequest,
+  MarkReadResponse,
+} from '@/types/notification';
 
 export const notificationApi = {
   /**
    * List notifications for the current user
    * @param unreadOnly If true, only return unread notifications
    * @param limit Maximum number of notifications to return
+   * @param cursor next_cursor of the previous page
    */
-  list: (unreadOnly: boolean = false, limit: number = 50): Promise<NotificationListResponse> =>
-    api.get('/api/v1/notifications', { params: { unread_only: unreadOnly, limit } }).then(r => r.data),
+  list: (unreadOnly: boolean = false, limit: number = 50, cursor?: string): Promise<NotificationListResponse> =>
+    api.get('/api/v1/notifications', { params: { unread_only: unreadOnly, limit, cursor } }).then(r => r.data),
 
   /**
    * Get count of unread notifications
@@ -27,9 +34,29 @@ export const notificationApi = {
   markRead: (id: string): Promise<Notification> =>
     api.patch(`/api/v1/notifications/${id}/read`).then(r => r.data),
 
+  /**
+   * Mark several notifications as read in one request
+   * @param selection Notification ids, or a cursor up to which everything is marked read
+   */
+  markReadBulk: (selection: MarkReadRequest): Promise<MarkReadResponse> =>
+    api.post('/api/v1/notifications/read', selection).then(r => r.data),
+
   /**
    * Mark all unread notifications as read
    */
   markAllRead: (): Promise<MarkReadResponse> =>
     api.post('/api/v1/notifications/read-all').then(r => r.data),
+
+  /**
+   * Get notification delivery preferences
+   */
+  getPreferences: (): Promise<NotificationPreferences> =>
+    api.get('/api/v1/notifications/preferences').then(r => r.data),
+
+  /**
+   * Update notification delivery preferences
+   * @param prefs New preferences (digest batches real-time pushes)
+   */
+  updatePreferences: (prefs: NotificationPreferences): Promise<NotificationPreferences> =>
+    api.put('/api/v1/notifications/preferences', prefs).then(r => r.data),
 };
@@ -1,9 +1,10 @@
 import { useRef, useState } from 'react'
-import { FileImage, FileText, Trash2, Upload } from 'lucide-react'
+import { Download, FileImage, FileText, Trash2, Upload } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { Label } from '@/components/ui/label'
 import { UserAvatar } from '@/components/ui/UserAvatar'
-import { useAttachments, useUploadAttachment, useDeleteAttachment } from '@/hooks/useAttachments'
+import { attachmentApi } from '@/api/attachments'
+import { useAttachments, useAuthorizedImage, useUploadAttachment, useDeleteAttachment } from '@/hooks/useAttachments'
 import type { Attachment } from '@/types/attachment'
 
 interface AttachmentListProps {
@@ -12,7 +13,7 @@ interface AttachmentListProps {
   currentUserId: string
 }
 
-const MAX_FILE_SIZE = 10 * 1024 * 1024 // 10MB
+const MAX_FILE_SIZE = 2 * 1024 * 1024 * 1024 // 2GB, uploaded in chunks above 10MB
 
 function formatFileSize(bytes: number): string {
   if (bytes < 1024) return `${bytes}B`
@@ -34,6 +35,18 @@ function isImageFile(mimeType: string): boolean {
   return mimeType.startsWith('image/')
 }
 
+function AttachmentThumbnail({ attachment }: { attachment: Attachment }) {
+  // Falls back to the original when the server renders no previews
+  const thumbnail = useAuthorizedImage(attachment.thumbnail_url ?? attachment.url)
+  return (
+    <img
+      src={thumbnail ?? undefined}
+      alt={attachment.filename}
+      className="h-10 w-10 object-cover rounded"
+    />
+  )
+}
+
 export function AttachmentList({ projectId, issueId, currentUserId }: AttachmentListProps) {
   const { data: attachments = [], isLoading } = useAttachments(projectId, issueId)
   const uploadMutation = useUploadAttachment(projectId, issueId)
@@ -64,6 +77,33 @@ export function AttachmentList({ projectId, issueId, currentUserId }: Attachment
     }
   }
 
+  // Downloads need the bearer token, so fetch the file and open it as an object URL
+  const handleOpen = async (event: React.MouseEvent, attachment: Attachment) => {
+    event.preventDefault()
+    try {
+      const blob = await attachmentApi.fetchBlob(`${attachment.url}?inline=true`)
+      const objectUrl = URL.createObjectURL(blob)
+      window.open(objectUrl, '_blank', 'noopener,noreferrer')
+      setTimeout(() => URL.revokeObjectURL(objectUrl), 60_000)
+    } catch (error) {
+      console.error('Failed to open attachment:', error)
+    }
+  }
+
+  const handleDownloadAll = async () => {
+    try {
+      const blob = await attachmentApi.fetchBlob(attachmentApi.archiveUrl(projectId, issueId))
+      const objectUrl = URL.createObjectURL(blob)
+      const link = document.createElement('a')
+      link.href = objectUrl
+      link.download = 'attachments.zip'
+      link.click()
+      URL.revokeObjectURL(objectUrl)
+    } catch (error) {
+      console.error('Failed to download attachments:', error)
+    }
+  }
+
   const handleDelete = async (attachment: Attachment) => {
     if (!confirm(`Delete ${attachment.filename}?`)) return
     try {
@@ -85,16 +125,24 @@ export function AttachmentList({ projectId, issueId, currentUserId }: Attachment
           hidden
           onChange={handleFileSelect}
         />
-        <Button
-          size="sm"
-          variant="outline"
-          onClick={() => fileInputRef.current?.click()}
-          disabled={uploadMutation.isPending}
-          className="text-xs h-8"
-        >
-          <Upload className="h-3 w-3 mr-1" />
-          {uploadMutation.isPending ? 'Uploading...' : 'Add File'}
-        </Button>
+        <div className="flex items-center gap-2">
+          {attachments.length > 1 && (
+            <Button size="sm" variant="outline" onClick={handleDownloadAll} className="text-xs h-8">
+              <Download className="h-3 w-3 mr-1" />
+              Download all
+            </Button>
+          )}
+          <Button
+            size="sm"
+            variant="outline"
+            onClick={() => fileInputRef.current?.click()}
+            disabled={uploadMutation.isPending}
+            className="text-xs h-8"
+          >
+            <Upload className="h-3 w-3 mr-1" />
+            {uploadMutation.isPending ? 'Uploading...' : 'Add File'}
+          </Button>
+        </div>
       </div>
 
       {uploadError && (
@@ -117,11 +165,7 @@ export function AttachmentList({ projectId, issueId, currentUserId }: Attachment
               {/* Icon/Preview */}
               <div className="flex-shrink-0">
                 {isImageFile(attachment.mime_type) ? (
-                  <img
-                    src={attachment.url}
-                    alt={attachment.filename}
-                    className="h-10 w-10 object-cover rounded"
-                  />
+                  <AttachmentThumbnail attachment={attachment} />
                 ) : (
                   <div className="h-10 w-10 flex items-center justify-center bg-gray-100 dark:bg-gray-800 rounded">
                     {getFileIcon(attachment.mime_type, attachment.filename)}
@@ -133,6 +177,7 @@ export function AttachmentList({ projectId, issueId, currentUserId }: Attachment
               <div className="flex-1 min-w-0">
                 <a
                   href={attachment.url}
+                  onClick={event => handleOpen(event, attachment)}
                   target="_blank"
                   rel="noopener noreferrer"
                   className="block text-sm font-medium text-blue-600 dark:text-blue-400 hover:underline truncate"
@@ -65,7 +65,8 @@ describe('IssueRow', () => {
     parent_id: null,
     story_points: 5,
     due_date: null,
-    position: 0,
+    rank: 'i',
+    version: 1,
     labels: [],
     created_at: '2024-01-01T10:00:00Z',
     updated_at: '2024-01-01T10:00:00Z',
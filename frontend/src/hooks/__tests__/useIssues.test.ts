@@ -124,7 +124,8 @@ describe('useIssue', () => {
       parent_id: null,
       story_points: 5,
       due_date: null,
-      position: 0,
+      rank: 'i',
+      version: 1,
       labels: [],
       created_at: '2024-01-01T10:00:00Z',
       updated_at: '2024-01-01T10:00:00Z',
@@ -182,7 +183,8 @@ describe('useCreateIssue', () => {
       parent_id: null,
       story_points: 3,
       due_date: null,
-      position: 0,
+      rank: 'i',
+      version: 1,
       labels: [],
       created_at: '2024-01-02T10:00:00Z',
       updated_at: '2024-01-02T10:00:00Z',
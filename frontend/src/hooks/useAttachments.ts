@@ -1,3 +1,4 @@
+import { useEffect, useState } from 'react'
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import { attachmentApi } from '@/api/attachments'
 import type { Attachment } from '@/types/attachment'
@@ -15,11 +16,64 @@ export function useAttachments(projectId: string, issueId: string) {
   })
 }
 
+/**
+ * Object URL for an authenticated image (attachment endpoints need the bearer token,
+ * which <img src> cannot send). Returns null until loaded or when url is null.
+ */
+export function useAuthorizedImage(url: string | null) {
+  const [objectUrl, setObjectUrl] = useState<string | null>(null)
+
+  useEffect(() => {
+    if (!url) return
+    let revoked = false
+    let created: string | null = null
+    attachmentApi.fetchBlob(url).then(blob => {
+      if (revoked) return
+      created = URL.createObjectURL(blob)
+      setObjectUrl(created)
+    }).catch(() => setObjectUrl(null))
+    return () => {
+      revoked = true
+      if (created) URL.revokeObjectURL(created)
+      setObjectUrl(null)
+    }
+  }, [url])
+
+  return objectUrl
+}
+
+// Files above the single-request limit go through a resumable upload session
+export const SIMPLE_UPLOAD_LIMIT = 10 * 1024 * 1024
+const CHUNK_SIZE = 8 * 1024 * 1024
+const MAX_CHUNK_RETRIES = 5
+
+async function uploadResumable(projectId: string, issueId: string, file: File): Promise<Attachment> {
+  const session = await attachmentApi.createUpload(projectId, issueId, file)
+  let offset = 0
+  let failures = 0
+  while (offset < file.size) {
+    try {
+      const chunk = file.slice(offset, Math.min(offset + CHUNK_SIZE, file.size))
+      offset = (await attachmentApi.uploadChunk(projectId, issueId, session.id, offset, chunk)).offset
+      failures = 0
+    } catch (error) {
+      if (++failures > MAX_CHUNK_RETRIES) throw error
+      await new Promise(resolve => setTimeout(resolve, 1000 * failures))
+      // Resume from whatever the server kept
+      offset = (await attachmentApi.getUpload(projectId, issueId, session.id)).offset
+    }
+  }
+  return attachmentApi.completeUpload(projectId, issueId, session.id)
+}
+
 export function useUploadAttachment(projectId: string, issueId: string) {
   const queryClient = useQueryClient()
 
   return useMutation({
-    mutationFn: (file: File) => attachmentApi.upload(projectId, issueId, file),
+    mutationFn: (file: File) =>
+      file.size > SIMPLE_UPLOAD_LIMIT
+        ? uploadResumable(projectId, issueId, file)
+        : attachmentApi.upload(projectId, issueId, file),
     onSuccess: (newAttachment) => {
       // Update the attachments list in cache
       queryClient.setQueryData(
@@ -1,6 +1,6 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { issueApi } from '@/api/issues';
-import type { CreateIssueRequest, UpdateIssueRequest } from '@/types/issue';
+import type { CreateIssueRequest, MoveIssueRequest, UpdateIssueRequest } from '@/types/issue';
 
 export const issueKeys = {
   all: ['issues'] as const,
@@ -61,8 +61,8 @@ export function useDeleteIssue(projectId: string) {
 export function useMoveIssue(projectId: string) {
   const qc = useQueryClient();
   return useMutation({
-    mutationFn: ({ issueId, data }: { issueId: string; data: { status_id: string; position: number } }) =>
-      issueApi.move(projectId, issueId, data),
+    mutationFn: ({ issueId, data, version }: { issueId: string; data: MoveIssueRequest; version?: number }) =>
+      issueApi.move(projectId, issueId, data, version),
     onSuccess: () => {
       qc.invalidateQueries({ queryKey: issueKeys.byProject(projectId) });
     },
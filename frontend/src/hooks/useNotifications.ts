@@ -7,7 +7,7 @@ import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { notificationApi } from '@/api/notifications';
 import { useAuthStore } from '@/stores/auth-store';
 import { useNotificationStore } from '@/stores/notification-store';
-import type { NotificationListResponse, WebSocketMessage } from '@/types/notification';
+import type { MarkReadRequest, NotificationListResponse, WebSocketMessage } from '@/types/notification';
 
 export const notificationKeys = {
   all: ['notifications'] as const,
@@ -56,19 +56,36 @@ export function useMarkNotificationRead() {
   });
 }
 
+/**
+ * Mutation hook to mark several notifications as read in one request
+ */
+export function useMarkNotificationsRead() {
+  const qc = useQueryClient();
+  const setUnreadCount = useNotificationStore((s) => s.setUnreadCount);
+
+  return useMutation({
+    mutationFn: (selection: MarkReadRequest) => notificationApi.markReadBulk(selection),
+    onSuccess: (data) => {
+      qc.invalidateQueries({ queryKey: notificationKeys.list() });
+      qc.invalidateQueries({ queryKey: notificationKeys.unreadCount() });
+      setUnreadCount(data.unread_count);
+    },
+  });
+}
+
 /**
  * Mutation hook to mark all notifications as read
  */
 export function useMarkAllNotificationsRead() {
   const qc = useQueryClient();
-  const reset = useNotificationStore((s) => s.reset);
+  const setUnreadCount = useNotificationStore((s) => s.setUnreadCount);
 
   return useMutation({
     mutationFn: () => notificationApi.markAllRead(),
-    onSuccess: () => {
+    onSuccess: (data) => {
       qc.invalidateQueries({ queryKey: notificationKeys.list() });
       qc.invalidateQueries({ queryKey: notificationKeys.unreadCount() });
-      reset();
+      setUnreadCount(data.unread_count);
     },
   });
 }
@@ -87,8 +104,11 @@ export function useWebSocketNotifications() {
   const { user, token } = useAuthStore();
   const qc = useQueryClient();
   const increment = useNotificationStore((s) => s.increment);
+  const setUnreadCount = useNotificationStore((s) => s.setUnreadCount);
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null);
+  // Stream position, sent on reconnect so the server replays only missed events
+  const streamRef = useRef<{ epoch: string; seq: number } | null>(null);
 
   useEffect(() => {
     if (!user || !token) {
@@ -103,7 +123,10 @@ export function useWebSocketNotifications() {
     const connectWebSocket = () => {
       const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
       const host = import.meta.env.VITE_API_URL || 'http://localhost:8000';
-      const wsUrl = `${protocol}//${host.replace(/^https?:\/\//, '')}/ws/notifications?token=${token}`;
+      const resume = streamRef.current
+        ? `&epoch=${streamRef.current.epoch}&last_seq=${streamRef.current.seq}`
+        : '';
+      const wsUrl = `${protocol}//${host.replace(/^https?:\/\//, '')}/ws/notifications?token=${token}${resume}`;
 
       try {
         const ws = new WebSocket(wsUrl);
@@ -118,20 +141,56 @@ export function useWebSocketNotifications() {
           try {
             const msg: WebSocketMessage = JSON.parse(event.data);
 
-            if (msg.type === 'notification' && msg.data) {
-              // Add notification to React Query cache
+            // Answer server heartbeats so the connection isn't closed as idle
+            if (msg.type === 'ping') {
+              ws.send('pong');
+              return;
+            }
+
+            if (msg.type === 'hello' && msg.epoch) {
+              if (streamRef.current?.epoch !== msg.epoch) {
+                streamRef.current = { epoch: msg.epoch, seq: msg.seq ?? 0 };
+              }
+              return;
+            }
+
+            if (msg.type === 'resync_required') {
+              // Missed events are no longer buffered server-side: refetch
+              streamRef.current = msg.epoch ? { epoch: msg.epoch, seq: msg.seq ?? 0 } : null;
+              qc.invalidateQueries({ queryKey: notificationKeys.all });
+              return;
+            }
+
+            if (msg.seq !== undefined && streamRef.current) {
+              streamRef.current.seq = msg.seq;
+            }
+
+            // Notifications were marked read (possibly in another tab): take the server's count
+            if (msg.type === 'unread_count' && msg.count !== undefined) {
+              setUnreadCount(msg.count);
+              qc.invalidateQueries({ queryKey: notificationKeys.list() });
+              return;
+            }
+
+            if ((msg.type === 'notification' || msg.type === 'digest') && msg.data) {
+              const incoming = Array.isArray(msg.data) ? msg.data : [msg.data];
+              // Coalesced notifications reuse their id: replace instead of prepending
               qc.setQueryData<NotificationListResponse>(notificationKeys.list(), (prev) => {
-                if (!prev) return { items: [msg.data!], total: 1 };
+                if (!prev) return { items: incoming, total: incoming.length, next_cursor: null };
+                const known = new Set(prev.items.map((n) => n.id));
+                const added = incoming.filter((n) => !known.has(n.id));
+                const updated = new Map(incoming.map((n) => [n.id, n]));
                 return {
-                  items: [msg.data!, ...prev.items],
-                  total: prev.total + 1,
+                  items: [...added, ...prev.items.map((n) => updated.get(n.id) ?? n)],
+                  total: prev.total + added.length,
+                  next_cursor: prev.next_cursor,
                 };
               });
 
-              // Increment unread count if notification is unread
-              if (!msg.data.read) {
-                increment();
-              }
+              // A coalesced row (count > 1) was already unread: only new rows bump the count
+              incoming.forEach((n) => {
+                if (!n.read && n.count === 1) increment();
+              });
             }
           } catch (e) {
             console.error('Error parsing WebSocket message:', e);
@@ -168,5 +227,5 @@ export function useWebSocketNotifications() {
         wsRef.current = null;
       }
     };
-  }, [user, token, qc, increment]);
+  }, [user, token, qc, increment, setUnreadCount]);
 }
@@ -67,29 +67,39 @@ export function BoardPage() {
     if (!over) return;
 
     const draggedIssueId = active.id as string;
-    const targetStatusId = over.id as string;
+    const currentIssues = optimisticIssues.length > 0 ? optimisticIssues : issueList?.items || [];
 
     // Find the dragged issue
-    const draggedIssue = (optimisticIssues.length > 0 ? optimisticIssues : issueList?.items || []).find(
-      (i) => i.id === draggedIssueId
-    );
+    const draggedIssue = currentIssues.find((i) => i.id === draggedIssueId);
     if (!draggedIssue) return;
 
-    // If dropped on the same column and same position, do nothing
-    if (draggedIssue.status_id === targetStatusId) {
-      return;
+    // Dropped on a card (take its place) or on a column (append to it)
+    const overIssue = currentIssues.find((i) => i.id === over.id);
+    const targetStatusId = overIssue ? overIssue.status_id : (over.id as string);
+    if (!targetStatusId || !issuesByStatus[targetStatusId]) return;
+
+    const targetColumn = issuesByStatus[targetStatusId];
+    const column = targetColumn.filter((i) => i.id !== draggedIssueId);
+    const currentIndex = targetColumn.indexOf(draggedIssue);
+    let index = overIssue ? column.indexOf(overIssue) : column.length;
+    if (index < 0) return;
+    // Dragging down within a column lands below the card it was dropped on
+    if (overIssue && currentIndex !== -1 && currentIndex < targetColumn.indexOf(overIssue)) {
+      index += 1;
     }
 
-    // Calculate new position (append to end of target column)
-    const targetColumnIssues = issuesByStatus[targetStatusId] || [];
-    const newPosition = targetColumnIssues.length;
+    // If dropped on the same column and same position, do nothing
+    if (index === currentIndex) return;
 
-    // Optimistic update
-    const newIssueList = (optimisticIssues.length > 0 ? optimisticIssues : issueList?.items || []).map((i) =>
-      i.id === draggedIssueId
-        ? { ...i, status_id: targetStatusId, position: newPosition }
-        : i
-    );
+    // The server ranks the card between its new neighbours
+    const after = column[index - 1];
+    const before = column[index];
+
+    // Optimistic update: move the card next to its new neighbours
+    const moved = { ...draggedIssue, status_id: targetStatusId };
+    const newIssueList = currentIssues.filter((i) => i.id !== draggedIssueId);
+    const anchor = before ? newIssueList.indexOf(before) : after ? newIssueList.indexOf(after) + 1 : newIssueList.length;
+    newIssueList.splice(anchor, 0, moved);
     setOptimisticIssues(newIssueList);
 
     // Call API
@@ -98,8 +108,10 @@ export function BoardPage() {
         issueId: draggedIssueId,
         data: {
           status_id: targetStatusId,
-          position: newPosition,
+          after_id: after?.id,
+          before_id: before?.id,
         },
+        version: draggedIssue.version,
       },
       {
         onError: () => {
@@ -151,7 +163,8 @@ export function BoardPage() {
       parent_id: null,
       story_points: issue.story_points,
       due_date: null,
-      position: issue.position,
+      rank: issue.rank,
+      version: issue.version,
       labels: [],
       created_at: issue.created_at,
       updated_at: issue.updated_at,
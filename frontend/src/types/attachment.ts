@@ -7,6 +7,18 @@ export interface Attachment {
   size: number
   mime_type: string
   url: string
+  thumbnail_url: string | null
+  preview_url: string | null
   created_at: string
   uploader: Pick<User, 'id' | 'name' | 'avatar_url'>
 }
+
+export interface UploadSession {
+  id: string
+  issue_id: string
+  filename: string
+  mime_type: string
+  size: number
+  offset: number
+  expires_at: string
+}
@@ -27,7 +27,9 @@ export interface Issue {
   parent_id: string | null;
   story_points: number | null;
   due_date: string | null;
-  position: number;
+  rank: string;
+  /** Concurrency token; send it back as If-Match when editing */
+  version: number;
   labels: Label[];
   created_at: string;
   updated_at: string;
@@ -43,13 +45,17 @@ export interface IssueRelation {
 
 export interface IssueHistory {
   id: string;
-  issue_id: string;
-  user_id: string;
-  user: User;
   field: string;
   old_value: string | null;
   new_value: string | null;
+  user: Pick<User, 'id' | 'name' | 'email' | 'avatar_url'>;
   created_at: string;
+  cursor: string;
+}
+
+export interface IssueHistoryPage {
+  items: IssueHistory[];
+  next_cursor: string | null;
 }
 
 export interface CreateIssueRequest {
@@ -78,7 +84,10 @@ export interface UpdateIssueRequest {
 
 export interface MoveIssueRequest {
   status_id: string;
-  position: number;
+  /** Issue just above the card; omitted at the top of the column */
+  after_id?: string;
+  /** Issue just below the card; omit both to append to the column */
+  before_id?: string;
 }
 
 export interface IssueListItem {
@@ -98,7 +107,9 @@ export interface IssueListItem {
   parent_id: string | null;
   story_points: number | null;
   due_date: string | null;
-  position: number;
+  rank: string;
+  /** Concurrency token; send it back as If-Match when editing */
+  version: number;
   labels: Label[];
   created_at: string;
   updated_at: string;
@@ -10,20 +10,33 @@ export interface Notification {
   title: string;
   body: string | null;
   read: boolean;
+  count: number;
   issue_id: string | null;
   created_at: string;
+  cursor: string | null;
 }
 
 export interface NotificationListResponse {
   items: Notification[];
   total: number;
+  next_cursor: string | null;
 }
 
+export type MarkReadRequest = { ids: string[] } | { up_to: string };
+
 export interface MarkReadResponse {
   count: number;
+  unread_count: number;
+}
+
+export interface NotificationPreferences {
+  digest: boolean;
 }
 
 export interface WebSocketMessage {
   type: string;
-  data?: Notification;
+  data?: Notification | Notification[];
+  seq?: number;
+  epoch?: string;
+  count?: number;
 }